@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { refreshTermResults } from '@/app/lib/term-results';
 import { z } from 'zod';
 
 const assignSubjectsSchema = z.object({
@@ -58,6 +59,11 @@ export async function POST(request: Request) {
 
             await client.query('COMMIT');
 
+            // The subject list decides which marks count towards each
+            // student's totals: re-aggregate the whole class
+            await refreshTermResults({ class_id, academic_year_id }).catch(e =>
+                console.warn('Could not refresh student_term_results:', e.message));
+
             return NextResponse.json({
                 success: true,
                 message: 'Subjects assigned successfully'
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { refreshEnrollmentResults } from '@/app/lib/term-results';
 import { z } from 'zod';
 
 const enrollStudentSchema = z.object({
@@ -56,6 +57,7 @@ export async function POST(request: Request) {
     `;
 
         const { rows } = await db.query(insertQuery, [student_id, class_id, section_id, academic_year_id, roll_no || null]);
+        await refreshEnrollmentResults([student_id], academic_year_id);
 
         return NextResponse.json({
             success: true,
@@ -2,6 +2,8 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpAllReportVersions } from '@/app/lib/pdf-cache';
+import { refreshEnrollmentResults } from '@/app/lib/term-results';
 
 export async function PUT(
     request: Request,
@@ -87,8 +89,14 @@ export async function PUT(
                     FROM sections s WHERE s.id = $2
                  `, [studentId, section_id, academic_year_id, roll_no]);
             }
+
+            // A new section or class moves the student's stored results and
+            // ranks with them
+            if (section_id) await refreshEnrollmentResults([studentId], academic_year_id);
         }
 
+        await bumpAllReportVersions(studentId);
+
         return NextResponse.json({
             success: true,
             message: 'Student updated successfully'
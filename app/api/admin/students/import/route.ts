@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { stageStudents, resolveStaged, insertStaged, ImportError } from '@/app/lib/student-import';
 import { z } from 'zod';
 
 // Helper to normalize DD-MMM-YY to YYYY-MM-DD
@@ -101,7 +102,6 @@ export async function POST(request: Request) {
 
         const { action, data } = result.data;
 
-        // Fetch Masters for Validation
         const activeYearRes = await db.query('SELECT id FROM academic_years WHERE is_active = true LIMIT 1');
         const activeYearId = activeYearRes.rows[0]?.id;
 
@@ -109,76 +109,45 @@ export async function POST(request: Request) {
             return NextResponse.json({ success: false, message: 'No active academic year found' }, { status: 400 });
         }
 
-        const classesRes = await db.query('SELECT id, class_name FROM classes');
-        const sectionsRes = await db.query('SELECT id, section_name, class_id FROM sections');
-
-        // Create Lookups (Case insensitive)
-        const classMap = new Map<string, number>(); // lowercase name -> id
-        classesRes.rows.forEach(c => classMap.set(c.class_name.toLowerCase(), c.id));
-
-        // Map: classId_sectionNameLower -> sectionId
-        const sectionMap = new Map<string, number>();
-        sectionsRes.rows.forEach(s => sectionMap.set(`${s.class_id}_${s.section_name.toLowerCase()}`, s.id));
-
-        const errors: any[] = [];
-        const validData: any[] = [];
-
-        // 2. Validation Logic 
-        for (let i = 0; i < data.length; i++) {
-            const row = data[i];
-            let rowError: string | null = null;
-
-            // 1. Validate Date
-            if (!/^\d{4}-\d{2}-\d{2}$/.test(row.dob)) {
-                rowError = 'Invalid DOB Format (YYYY-MM-DD)';
-            }
-
-            // 2. Validate Class & Section
-            const classId = classMap.get(row.class_name.toLowerCase());
-            if (!classId) {
-                rowError = rowError || `Class '${row.class_name}' not found`;
-            }
-
-            let sectionId = null;
-            if (classId) {
-                sectionId = sectionMap.get(`${classId}_${row.section_name.toLowerCase()}`);
-                if (!sectionId) {
-                    rowError = rowError || `Section '${row.section_name}' not found in Class '${row.class_name}'`;
+        // 2. Validation Logic: stage the whole file and resolve classes,
+        // sections and duplicate admission numbers in one query
+        const client = await db.pool.connect();
+        try {
+            await client.query('BEGIN');
+            await stageStudents(client, data);
+            const resolved = await resolveStaged(client);
+
+            const errors: ImportError[] = [];
+            const validData: any[] = [];
+            for (const r of resolved) {
+                const row = data[r.index];
+                if (r.error) {
+                    errors.push({ index: r.index, admission_no: row.admission_no, error: r.error });
+                } else {
+                    // Attach resolved IDs to the object for confirmed insert
+                    validData.push({ ...row, class_id: r.class_id, section_id: r.section_id });
                 }
             }
 
-            // 3. Duplicate Check
-            const dupCheck = await db.query('SELECT id FROM students WHERE admission_no = $1', [row.admission_no]);
-            if (dupCheck.rows.length > 0) {
-                rowError = 'Admission number already exists';
-            }
-
-            if (rowError) {
-                errors.push({ index: i, admission_no: row.admission_no, error: rowError });
-            } else {
-                // Attach resolved IDs to the object for confirmed insert
-                validData.push({ ...row, class_id: classId, section_id: sectionId });
+            if (action === 'preview') {
+                await client.query('ROLLBACK');
+                return NextResponse.json({
+                    success: true,
+                    data: {
+                        summary: {
+                            total: data.length,
+                            valid: validData.length,
+                            invalid: errors.length,
+                        },
+                        errors,
+                        validData: validData,
+                    }
+                });
             }
-        }
-
-        if (action === 'preview') {
-            return NextResponse.json({
-                success: true,
-                data: {
-                    summary: {
-                        total: data.length,
-                        valid: validData.length,
-                        invalid: errors.length,
-                    },
-                    errors,
-                    validData: validData,
-                }
-            });
-        }
 
-        // CONFIRM ACTION
-        if (action === 'confirm') {
+            // CONFIRM ACTION
             if (validData.length === 0) {
+                await client.query('ROLLBACK');
                 return NextResponse.json({
                     success: false,
                     error_code: 'NO_DATA',
@@ -195,62 +164,28 @@ export async function POST(request: Request) {
             }
 
             // Bulk Insert
-            const client = await db.pool.connect();
-            try {
-                await client.query('BEGIN');
-
-                for (const row of validData) {
-                    // 1. Insert Student
-                    // Handle optional types
-                    const admissionDate = row.admission_date ? new Date(row.admission_date) : new Date();
-
-                    const studentRes = await client.query(`
-                        INSERT INTO students 
-                        (admission_no, student_name, father_name, mother_name, dob, admission_date, 
-                         blood_group, gender, address, phone_no, emergency_no, category, 
-                         aadhar_no, ppp_id, apaar_id, srn_no, board_roll_x, board_roll_xii, education_reg_no, student_code, stream, subject_count) 
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22) 
-                        RETURNING id`,
-                        [
-                            row.admission_no, row.student_name, row.father_name, row.mother_name || '', row.dob, admissionDate,
-                            row.blood_group || '', row.gender || 'Male', row.address || '', row.phone_no || '', row.emergency_no || '', row.category || 'General',
-                            row.aadhar_no || '', row.ppp_id || '', row.apaar_id || '', row.srn_no || '', row.board_roll_x || '', row.board_roll_xii || '', row.education_reg_no || '',
-                            row.student_code || '',
-                            row.stream || null,
-                            row.subject_count || 5
-                        ]
-                    );
-                    const studentId = studentRes.rows[0].id;
+            const imported = await insertStaged(client, activeYearId);
+            await client.query('COMMIT');
 
-                    // 2. Enroll Student
-                    await client.query(
-                        'INSERT INTO student_enrollments (student_id, class_id, section_id, academic_year_id) VALUES ($1, $2, $3, $4)',
-                        [studentId, row.class_id, row.section_id, activeYearId]
-                    );
+            return NextResponse.json({
+                success: true,
+                message: `Imported: ${imported}, Failed/Skipped: ${errors.length}`,
+                data: {
+                    summary: {
+                        total: data.length,
+                        imported,
+                        failed: errors.length
+                    },
+                    errors: errors,
+                    message: `Imported: ${imported}, Failed/Skipped: ${errors.length}`
                 }
+            });
 
-                await client.query('COMMIT');
-
-                return NextResponse.json({
-                    success: true,
-                    message: `Imported: ${validData.length}, Failed/Skipped: ${errors.length}`,
-                    data: {
-                        summary: {
-                            total: data.length,
-                            imported: validData.length,
-                            failed: errors.length
-                        },
-                        errors: errors,
-                        message: `Imported: ${validData.length}, Failed/Skipped: ${errors.length}`
-                    }
-                });
-
-            } catch (e) {
-                await client.query('ROLLBACK');
-                throw e;
-            } finally {
-                client.release();
-            }
+        } catch (e) {
+            await client.query('ROLLBACK');
+            throw e;
+        } finally {
+            client.release();
         }
 
     } catch (error: any) {
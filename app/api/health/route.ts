@@ -1,9 +1,26 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
+import { getPdfCache } from '@/app/lib/pdf-cache';
+import { getMetrics } from '@/app/lib/metrics';
 
 export const dynamic = 'force-dynamic';
 
-export async function GET() {
+// Prometheus scrapes with ?format=prometheus (or an Accept header asking for
+// the text exposition format) and gets the span, request and pg pool metrics
+function wantsMetrics(request: Request) {
+    const format = new URL(request.url).searchParams.get('format');
+    if (format) return format === 'prometheus';
+    const accept = request.headers.get('Accept') || '';
+    return accept.includes('text/plain') || accept.includes('application/openmetrics-text');
+}
+
+export async function GET(request: Request) {
+    if (wantsMetrics(request)) {
+        return new NextResponse(getMetrics().render(), {
+            headers: { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8' },
+        });
+    }
+
     try {
         const start = Date.now();
         await db.query('SELECT 1');
@@ -15,7 +32,9 @@ export async function GET() {
             latency: `${duration}ms`,
             env: process.env.NODE_ENV,
             // Do not expose full connection string, just check if it exists
-            has_db_url: !!process.env.DATABASE_URL
+            has_db_url: !!process.env.DATABASE_URL,
+            // Hits are renders the cache saved
+            pdf_cache: getPdfCache().stats(),
         });
     } catch (error: any) {
         return NextResponse.json({
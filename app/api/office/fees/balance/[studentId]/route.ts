@@ -20,7 +20,7 @@ export async function GET(request: Request, { params }: { params: { studentId: s
         const studentId = parseInt(params.studentId);
 
         // Student + enrollment
-        const studentRes = await db.query(`
+        const studentRes = await db.prepared('fees.balance.student', `
             SELECT s.student_name, s.admission_no, s.father_name, s.is_new_student,
                    s.stream, s.subject_count,
                    se.class_id, se.academic_year_id,
@@ -45,7 +45,7 @@ export async function GET(request: Request, { params }: { params: { studentId: s
         // Fee structures with aggregated payments
         let feeDetails: any[] = [];
         if (class_id && academic_year_id) {
-            const res = await db.query(`
+            const res = await db.prepared('fees.balance.structures', `
                 SELECT
                     fs.id AS fee_structure_id,
                     fs.amount,
@@ -92,7 +92,7 @@ export async function GET(request: Request, { params }: { params: { studentId: s
         }
 
         // Payment history
-        const historyRes = await db.query(`
+        const historyRes = await db.prepared('fees.balance.history', `
             SELECT sfp.id, sfp.amount_paid, sfp.payment_date, sfp.payment_mode,
                    sfp.transaction_reference, sfp.batch_id,
                    fh.head_name, fs.due_date
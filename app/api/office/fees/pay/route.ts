@@ -2,6 +2,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { recordPayments } from '@/app/lib/fee-ledger';
 
 export const dynamic = 'force-dynamic';
 
@@ -39,53 +40,67 @@ export async function POST(request: Request) {
         const insertedPayments: any[] = [];
         const skipped: any[] = [];
 
-        for (const item of items) {
-            const { fee_structure_id, amount_paid: explicitAmount } = item;
-
-            // Get fee amount
-            const fsRes = await db.query(
-                'SELECT amount FROM fee_structures WHERE id = $1',
-                [fee_structure_id]
-            );
-            if (!fsRes.rows[0]) { skipped.push({ fee_structure_id, reason: 'not_found' }); continue; }
-
-            const feeAmount = Number(fsRes.rows[0].amount);
-
-            // Get already paid for this fee structure
-            const alreadyPaidRes = await db.query(
-                'SELECT COALESCE(SUM(amount_paid), 0) AS total_paid FROM student_fee_payments WHERE fee_structure_id = $1 AND student_id = $2',
-                [fee_structure_id, student_id]
-            );
-            const alreadyPaid = Number(alreadyPaidRes.rows[0].total_paid);
-            const remaining = feeAmount - alreadyPaid;
-
-            if (remaining <= 0) {
-                // Already fully paid
-                skipped.push({ fee_structure_id, reason: 'already_paid' });
-                continue;
+        // Payments and the daily ledger rollups are written together
+        const client = await db.pool.connect();
+        try {
+            await client.query('BEGIN');
+
+            for (const item of items) {
+                const { fee_structure_id, amount_paid: explicitAmount } = item;
+
+                // Get fee amount
+                const fsRes = await client.query(
+                    'SELECT amount FROM fee_structures WHERE id = $1',
+                    [fee_structure_id]
+                );
+                if (!fsRes.rows[0]) { skipped.push({ fee_structure_id, reason: 'not_found' }); continue; }
+
+                const feeAmount = Number(fsRes.rows[0].amount);
+
+                // Get already paid for this fee structure
+                const alreadyPaidRes = await client.query(
+                    'SELECT COALESCE(SUM(amount_paid), 0) AS total_paid FROM student_fee_payments WHERE fee_structure_id = $1 AND student_id = $2',
+                    [fee_structure_id, student_id]
+                );
+                const alreadyPaid = Number(alreadyPaidRes.rows[0].total_paid);
+                const remaining = feeAmount - alreadyPaid;
+
+                if (remaining <= 0) {
+                    // Already fully paid
+                    skipped.push({ fee_structure_id, reason: 'already_paid' });
+                    continue;
+                }
+
+                // Use explicit amount if provided, else use remaining balance
+                // Cap at remaining to prevent overpayment
+                const amountToRecord = Math.min(
+                    explicitAmount !== undefined && explicitAmount > 0 ? explicitAmount : remaining,
+                    remaining
+                );
+
+                // Insert payment
+                const result = await client.query(`
+                    INSERT INTO student_fee_payments
+                        (student_id, fee_structure_id, amount_paid, payment_mode,
+                         transaction_reference, remarks, academic_year_id, batch_id, payment_date)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, CURRENT_DATE)
+                    RETURNING id, amount_paid, payment_date
+                `, [
+                    student_id, fee_structure_id, amountToRecord, payment_mode,
+                    transaction_reference || null, remarks || null,
+                    academic_year_id, batch_id,
+                ]);
+
+                insertedPayments.push(result.rows[0]);
             }
 
-            // Use explicit amount if provided, else use remaining balance
-            // Cap at remaining to prevent overpayment
-            const amountToRecord = Math.min(
-                explicitAmount !== undefined && explicitAmount > 0 ? explicitAmount : remaining,
-                remaining
-            );
-
-            // Insert payment
-            const result = await db.query(`
-                INSERT INTO student_fee_payments
-                    (student_id, fee_structure_id, amount_paid, payment_mode,
-                     transaction_reference, remarks, academic_year_id, batch_id, payment_date)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, CURRENT_DATE)
-                RETURNING id, amount_paid, payment_date
-            `, [
-                student_id, fee_structure_id, amountToRecord, payment_mode,
-                transaction_reference || null, remarks || null,
-                academic_year_id, batch_id,
-            ]);
-
-            insertedPayments.push(result.rows[0]);
+            await recordPayments(client, insertedPayments.map(p => p.id));
+            await client.query('COMMIT');
+        } catch (e) {
+            await client.query('ROLLBACK');
+            throw e;
+        } finally {
+            client.release();
         }
 
         if (insertedPayments.length === 0) {
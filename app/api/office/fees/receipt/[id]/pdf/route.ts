@@ -1,6 +1,6 @@
 
 import { NextResponse } from 'next/server';
-import { generatePagePdf } from '@/app/lib/pdf-engine';
+import { renderReceiptPdf, serverTimingHeader } from '@/app/lib/pdf-engine';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
 
 export const dynamic = 'force-dynamic';
@@ -22,17 +22,18 @@ export async function GET(request: Request, { params }: { params: { id: string }
         }
 
         const receiptId = params.id;
-        const internalToken = process.env.PDF_INTERNAL_TOKEN || 'default_secret';
-        const baseUrl = process.env.NEXT_PUBLIC_APP_URL || 'http://localhost:3000';
 
-        const receiptUrl = `${baseUrl}/print/receipt/${receiptId}?token=${internalToken}`;
-
-        const pdfBuffer = await generatePagePdf(receiptUrl);
+        const receipt = await renderReceiptPdf(receiptId);
+        if (!receipt) {
+            return NextResponse.json({ success: false, message: 'Receipt not found' }, { status: 404 });
+        }
+        const { buffer: pdfBuffer, timings, cache_hit } = receipt;
 
         return new NextResponse(pdfBuffer as any, {
             headers: {
                 'Content-Type': 'application/pdf',
                 'Content-Disposition': `inline; filename="receipt-${receiptId}.pdf"`,
+                'Server-Timing': serverTimingHeader(timings, cache_hit),
             },
         });
 
@@ -0,0 +1,76 @@
+import { NextResponse } from 'next/server';
+import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { getCollectionSummary } from '@/app/lib/fee-ledger';
+import { z } from 'zod';
+
+export const dynamic = 'force-dynamic';
+
+const isoDate = z.string().regex(/^\d{4}-\d{2}-\d{2}$/, 'Expected YYYY-MM-DD');
+
+const collectionsSchema = z.object({
+    period: z.enum(['daily', 'monthly', 'custom']).default('daily'),
+    date: isoDate.optional(),
+    month: z.string().regex(/^\d{4}-(0[1-9]|1[0-2])$/, 'Expected YYYY-MM').optional(),
+    from: isoDate.optional(),
+    to: isoDate.optional(),
+    academic_year_id: z.coerce.number().int().positive().optional(),
+})
+    .refine(data => data.period !== 'monthly' || data.month, { message: 'month is required for a monthly report' })
+    .refine(data => data.period !== 'custom' || (data.from && data.to), { message: 'from and to are required for a custom report' })
+    .refine(data => data.period !== 'custom' || data.from! <= data.to!, { message: 'from must not be after to' });
+
+/**
+ * Fee collections for a day (?date=), a month (?period=monthly&month=YYYY-MM)
+ * or a custom range (?period=custom&from=&to=), broken down by payment mode,
+ * day, class/section and fee head. Answered from fee_ledger_daily alone, so
+ * the cost depends on the number of days, not the number of payments.
+ */
+export async function GET(request: Request) {
+    try {
+        const { searchParams } = new URL(request.url);
+        const token = extractToken(request.headers.get('Authorization')) || searchParams.get('token') || '';
+        const user = await verifyAuth(token);
+
+        if (!user || (user.role !== UserRole.OFFICE && user.role !== UserRole.ADMIN)) {
+            return NextResponse.json(
+                { success: false, error_code: 'FORBIDDEN', message: 'Unauthorized' },
+                { status: 403 }
+            );
+        }
+
+        const params = Object.fromEntries(searchParams);
+        delete params.token;
+        const result = collectionsSchema.safeParse(params);
+
+        if (!result.success) {
+            return NextResponse.json(
+                { success: false, error_code: 'VALIDATION_ERROR', message: JSON.stringify(result.error.flatten()) },
+                { status: 400 }
+            );
+        }
+
+        const { period, date, month, from, to, academic_year_id } = result.data;
+        let range: { from: string; to: string };
+        if (period === 'monthly') {
+            const [year, mon] = month!.split('-').map(Number);
+            // Day 0 of the next month is the last day of this one
+            range = { from: `${month}-01`, to: new Date(Date.UTC(year, mon, 0)).toISOString().split('T')[0] };
+        } else if (period === 'custom') {
+            range = { from: from!, to: to! };
+        } else {
+            const day = date || new Date().toISOString().split('T')[0];
+            range = { from: day, to: day };
+        }
+
+        const summary = await getCollectionSummary({ ...range, academic_year_id });
+
+        return NextResponse.json({ success: true, data: { period, ...summary } });
+
+    } catch (error: any) {
+        console.error('Collections Report Error:', error);
+        return NextResponse.json(
+            { success: false, error_code: 'INTERNAL_ERROR', message: error.message },
+            { status: 500 }
+        );
+    }
+}
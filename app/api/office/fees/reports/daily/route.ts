@@ -2,6 +2,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { getCollectionSummary, summarizeTransactions, UNDEFINED_TABLE } from '@/app/lib/fee-ledger';
 
 export const dynamic = 'force-dynamic';
 
@@ -27,42 +28,53 @@ export async function GET(request: Request) {
             return NextResponse.json({ success: false, message: 'Unauthorized' }, { status: 403 });
         }
 
-        // 1. Get Transactions for the date
-        const result = await db.query(`
-            SELECT fp.*, s.student_name, s.admission_no, 
-                   c.class_name, sec.section_name
-            FROM student_fee_payments fp
-            JOIN students s ON fp.student_id = s.id
-            LEFT JOIN student_enrollments se ON s.id = se.student_id 
-                 AND se.academic_year_id = (SELECT id FROM academic_years WHERE is_active = true LIMIT 1)
-            LEFT JOIN classes c ON se.class_id = c.id
-            LEFT JOIN sections sec ON se.section_id = sec.id
-            WHERE date(fp.payment_date) = $1
-            ORDER BY fp.payment_date DESC
-        `, [queryDate]);
+        // Totals come from the ledger rollups; the rows are for the
+        // transaction listing and the fallback below
+        const [result, ledger] = await Promise.all([
+            db.query(`
+                SELECT fp.*, s.student_name, s.admission_no,
+                       c.id AS class_id, c.class_name, sec.id AS section_id, sec.section_name,
+                       fh.id AS fee_head_id, fh.head_name
+                FROM student_fee_payments fp
+                JOIN students s ON fp.student_id = s.id
+                LEFT JOIN student_enrollments se ON s.id = se.student_id
+                     AND se.academic_year_id = (SELECT id FROM academic_years WHERE is_active = true LIMIT 1)
+                LEFT JOIN classes c ON se.class_id = c.id
+                LEFT JOIN sections sec ON se.section_id = sec.id
+                LEFT JOIN fee_structures fs ON fp.fee_structure_id = fs.id
+                LEFT JOIN fee_heads fh ON fs.fee_head_id = fh.id
+                WHERE fp.payment_date = $1
+                ORDER BY fp.payment_date DESC, fp.id DESC
+            `, [queryDate]),
+            getCollectionSummary({ from: queryDate, to: queryDate }).catch((e: any) => {
+                if (e.code === UNDEFINED_TABLE) return null;
+                throw e;
+            }),
+        ]);
 
-        const transactions = result.rows;
-
-        // 2. Calculate Summary by Mode
-        const summaryByMode: Record<string, number> = {};
-        let totalCollection = 0;
-
-        transactions.forEach(t => {
-            const amount = Number(t.amount_paid);
-            const mode = t.payment_mode || 'UNKNOWN';
-            // Use number or 0
-            const current = summaryByMode[mode] || 0;
-            summaryByMode[mode] = current + amount;
-            totalCollection += amount;
-        });
+        // The printed totals must match the listing: when the ledger is not
+        // migrated yet or has drifted (payments recorded before it existed),
+        // sum the day's transactions instead
+        const fromRows = summarizeTransactions(queryDate, queryDate, result.rows);
+        const inStep = ledger !== null
+            && ledger.transactionCount === fromRows.transactionCount
+            && Math.abs(ledger.totalCollection - fromRows.totalCollection) < 0.005;
+        if (ledger && !inStep) {
+            console.warn(`fee_ledger_daily disagrees with the payments of ${queryDate}; run scripts/rebuild-fee-ledger.js`);
+        }
+        const summary = inStep && ledger ? ledger : fromRows;
 
         return NextResponse.json({
             success: true,
             data: {
                 date: queryDate,
-                totalCollection,
-                summaryByMode,
-                transactions
+                totalCollection: summary.totalCollection,
+                transactionCount: summary.transactionCount,
+                summaryByMode: summary.summaryByMode,
+                byClass: summary.byClass,
+                byHead: summary.byHead,
+                totalsSource: inStep ? 'ledger' : 'transactions',
+                transactions: result.rows
             }
         });
 
@@ -21,7 +21,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
         }
 
         // 1. Student + enrollment
-        const studentRes = await db.query(`
+        const studentRes = await db.prepared('fees.student.student', `
             SELECT s.student_name, s.admission_no, s.father_name, s.mother_name,
                    s.id AS student_code, s.stream, s.subject_count,
                    se.class_id, se.section_id, se.academic_year_id, se.roll_no,
@@ -45,7 +45,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
 
         // 2. New-student check: read the explicit is_new_student flag set when the student was added
         let isNewStudent = false;
-        const newStudentRes = await db.query(
+        const newStudentRes = await db.prepared('fees.student.is_new',
             'SELECT is_new_student FROM students WHERE id = $1',
             [studentId]
         );
@@ -54,7 +54,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
         // 3. Fetch all fee structures WITH aggregated payment totals for this student
         let feeItems: any[] = [];
         if (class_id && academic_year_id) {
-            const res = await db.query(`
+            const res = await db.prepared('fees.student.structures', `
                 SELECT
                     fs.id AS fee_structure_id,
                     fs.amount,
@@ -166,7 +166,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
         }
 
         // 5. Full payment history
-        const historyRes = await db.query(`
+        const historyRes = await db.prepared('fees.student.history', `
             SELECT id, amount_paid, payment_date, payment_mode,
                    transaction_reference, remarks, batch_id, fee_structure_id
             FROM student_fee_payments
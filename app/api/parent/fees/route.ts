@@ -19,7 +19,7 @@ export async function GET(request: Request) {
         const studentId = parseInt(user.user_id);
 
         // 1. Get student + active enrollment
-        const studentRes = await db.query(`
+        const studentRes = await db.prepared('fees.parent.student', `
             SELECT s.student_name, s.admission_no, s.is_new_student,
                    se.class_id, se.academic_year_id,
                    c.class_name, ay.year_name
@@ -44,7 +44,7 @@ export async function GET(request: Request) {
         let pendingDues: any[] = [];
 
         if (class_id && academic_year_id) {
-            const pendingRes = await db.query(`
+            const pendingRes = await db.prepared('fees.parent.pending', `
                 SELECT
                     fs.id AS fee_structure_id,
                     fh.head_name,
@@ -79,7 +79,7 @@ export async function GET(request: Request) {
         }
 
         // 3. Get payment history
-        const historyRes = await db.query(`
+        const historyRes = await db.prepared('fees.parent.history', `
             SELECT
                 sfp.id,
                 sfp.amount_paid,
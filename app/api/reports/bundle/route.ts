@@ -0,0 +1,170 @@
+import { NextResponse } from 'next/server';
+import { db } from '@/app/lib/db';
+import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { BUNDLE_PDF_MAX_CARDS, generateStudentPdfs, renderBundlePdfStream } from '@/app/lib/pdf-engine';
+import { getTemplateForClass, ReportTemplate } from '@/app/lib/report-mapping';
+import { ZipStream } from '@/app/lib/zip-stream';
+import { z } from 'zod';
+
+export const dynamic = 'force-dynamic';
+
+const bundleSchema = z.object({
+    academic_year_id: z.coerce.number().int().positive(),
+    class_id: z.coerce.number().int().positive().optional(),
+    section_id: z.coerce.number().int().positive().optional(),
+    format: z.enum(['zip', 'pdf']).default('zip'),
+    part: z.coerce.number().int().positive().default(1),
+    concurrency: z.coerce.number().int().positive().max(16).optional(),
+}).refine(data => data.class_id || data.section_id, { message: 'class_id or section_id is required' });
+
+function safeFileName(value: string) {
+    return value.replace(/[^A-Za-z0-9_-]+/g, '_').replace(/^_+|_+$/g, '');
+}
+
+/**
+ * Export the report cards of a class or section as one download.
+ *
+ *   format=zip  one PDF per student; each card is written to the response as
+ *               soon as it is rendered, so only `concurrency` cards are in
+ *               memory at a time
+ *   format=pdf  one merged PDF (classes III-VIII), streamed from Chromium.
+ *               Chromium lays out the whole document before the first byte,
+ *               so a PDF holds at most BUNDLE_PDF_MAX_CARDS cards: larger
+ *               classes come in parts, in roll-number order, fetched with
+ *               part=1..N (the X-Bundle-Parts header gives N)
+ */
+export async function GET(request: Request) {
+    try {
+        const token = extractToken(request.headers.get('Authorization'));
+        const user = await verifyAuth(token);
+
+        if (!user || (user.role !== UserRole.TEACHER && user.role !== UserRole.ADMIN)) {
+            return NextResponse.json(
+                { success: false, error_code: 'FORBIDDEN', message: 'Access denied' },
+                { status: 403 }
+            );
+        }
+
+        const { searchParams } = new URL(request.url);
+        const result = bundleSchema.safeParse(Object.fromEntries(searchParams));
+
+        if (!result.success) {
+            return NextResponse.json(
+                { success: false, error_code: 'VALIDATION_ERROR', message: JSON.stringify(result.error.flatten()) },
+                { status: 400 }
+            );
+        }
+
+        const { academic_year_id, class_id, section_id, format, part, concurrency } = result.data;
+
+        const { rows: students } = await db.query(`
+            SELECT s.id, s.admission_no, s.student_name, se.roll_no, c.class_name, sec.section_name
+            FROM student_enrollments se
+            JOIN students s ON se.student_id = s.id
+            JOIN classes c ON se.class_id = c.id
+            JOIN sections sec ON se.section_id = sec.id
+            WHERE se.academic_year_id = $1
+              AND ($2::int IS NULL OR se.class_id = $2)
+              AND ($3::int IS NULL OR se.section_id = $3)
+            ORDER BY c.display_order, sec.section_name, se.roll_no, s.student_name
+        `, [academic_year_id, class_id ?? null, section_id ?? null]);
+
+        if (students.length === 0) {
+            return NextResponse.json(
+                { success: false, error_code: 'NOT_FOUND', message: 'No students found for this class/section' },
+                { status: 404 }
+            );
+        }
+
+        const first = students[0];
+        const bundleName = safeFileName(
+            `Report_Cards_${first.class_name}${section_id ? `_${first.section_name}` : ''}`
+        );
+
+        if (format === 'pdf') {
+            // The foundational card loads its data client-side, one student per
+            // page, so it cannot be laid out as a merged document
+            const unsupported = students.find(s => getTemplateForClass(s.class_name) !== ReportTemplate.III_VIII);
+            if (unsupported) {
+                return NextResponse.json(
+                    { success: false, error_code: 'VALIDATION_ERROR', message: `Merged PDF is only available for classes III-VIII; use format=zip for class ${unsupported.class_name}` },
+                    { status: 400 }
+                );
+            }
+
+            const parts = Math.ceil(students.length / BUNDLE_PDF_MAX_CARDS);
+            if (part > parts) {
+                return NextResponse.json(
+                    { success: false, error_code: 'NOT_FOUND', message: `This bundle has ${parts} part(s) of up to ${BUNDLE_PDF_MAX_CARDS} report cards` },
+                    { status: 404 }
+                );
+            }
+
+            const slice = students.slice((part - 1) * BUNDLE_PDF_MAX_CARDS, part * BUNDLE_PDF_MAX_CARDS);
+            const stream = await renderBundlePdfStream({ academic_year_id, student_ids: slice.map(s => s.id) });
+            const fileName = parts > 1 ? `${bundleName}_part${part}of${parts}` : bundleName;
+            return new NextResponse(stream as any, {
+                headers: {
+                    'Content-Type': 'application/pdf',
+                    'Content-Disposition': `attachment; filename="${fileName}.pdf"`,
+                    'X-Bundle-Part': String(part),
+                    'X-Bundle-Parts': String(parts),
+                },
+            });
+        }
+
+        const zip = new ZipStream();
+        const names = new Map<number, string>(students.map(s => [
+            s.id,
+            `${String(s.roll_no ?? 0).padStart(2, '0')}_${safeFileName(s.student_name)}_${safeFileName(s.admission_no)}.pdf`,
+        ]));
+        const failures: string[] = [];
+        const cards = generateStudentPdfs(students.map(s => s.id), academic_year_id, concurrency);
+        let finished = false;
+
+        // Pull-based: the next card is only awaited when the client has taken
+        // the previous one, which bounds memory whatever the class size
+        const body = new ReadableStream<Uint8Array>({
+            async pull(controller) {
+                // Must enqueue before returning, otherwise the stream stalls:
+                // failed cards are recorded and the loop moves on
+                while (!finished) {
+                    const { done, value } = await cards.next();
+                    if (done) {
+                        if (failures.length > 0) {
+                            zip.file('errors.txt', Buffer.from(failures.join('\n') + '\n')).forEach(chunk => controller.enqueue(chunk));
+                        }
+                        controller.enqueue(zip.end());
+                        controller.close();
+                        finished = true;
+                        return;
+                    }
+                    if (value.buffer) {
+                        zip.file(names.get(value.student_id)!, value.buffer).forEach(chunk => controller.enqueue(chunk));
+                        return;
+                    }
+                    console.error(`Bundle: report card for student ${value.student_id} failed:`, value.error);
+                    failures.push(`${names.get(value.student_id)}: ${value.error}`);
+                }
+            },
+            async cancel() {
+                finished = true;
+                await cards.return(undefined);
+            },
+        });
+
+        return new NextResponse(body as any, {
+            headers: {
+                'Content-Type': 'application/zip',
+                'Content-Disposition': `attachment; filename="${bundleName}.zip"`,
+            },
+        });
+
+    } catch (error: any) {
+        console.error('Bundle Export Error:', error);
+        return NextResponse.json(
+            { success: false, error_code: 'INTERNAL_ERROR', message: error.message },
+            { status: 500 }
+        );
+    }
+}
@@ -2,10 +2,15 @@ import { NextRequest, NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import XLSX from 'xlsx-js-style';
 import { extractToken, verifyAuth } from '@/app/lib/auth';
+import { timed, traceRequest } from '@/app/lib/metrics';
 
 export const dynamic = 'force-dynamic';
 
 export async function GET(req: NextRequest) {
+    return traceRequest('GET /api/reports/cumulative/co-scholastic', () => exportCoScholastic(req));
+}
+
+async function exportCoScholastic(req: NextRequest) {
     try {
         const token = extractToken(req.headers.get('Authorization'));
         const auth = await verifyAuth(token);
@@ -38,7 +43,7 @@ export async function GET(req: NextRequest) {
 
         studentQuery += ` ORDER BY se.roll_no, s.student_name`;
 
-        const studentsRes = await db.query(studentQuery, queryParams);
+        const studentsRes = await timed('cumulative.students', () => db.query(studentQuery, queryParams));
         const students = studentsRes.rows;
         const studentIds = students.map(s => s.id);
 
@@ -64,7 +69,7 @@ export async function GET(req: NextRequest) {
             ORDER BY dom.id, sub.id
         `;
 
-        const scoresRes = await db.query(scoresQuery, [studentIds, academicYearId]);
+        const scoresRes = await timed('cumulative.scores', () => db.query(scoresQuery, [studentIds, academicYearId]));
         const scores = scoresRes.rows;
 
         // 3. Pivot Data
@@ -124,7 +129,7 @@ export async function GET(req: NextRequest) {
         sortedKeys.forEach(() => wscols.push({ wch: 20 }));
         worksheet['!cols'] = wscols;
 
-        const buf = XLSX.write(workbook, { type: "buffer", bookType: "xlsx" });
+        const buf = await timed('cumulative.write_xlsx', async () => XLSX.write(workbook, { type: "buffer", bookType: "xlsx" }));
 
         return new NextResponse(buf, {
             status: 200,
@@ -2,10 +2,15 @@ import { NextRequest, NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import XLSX from 'xlsx-js-style';
 import { extractToken, verifyAuth } from '@/app/lib/auth';
+import { timed, traceRequest } from '@/app/lib/metrics';
 
 export const dynamic = 'force-dynamic';
 
 export async function GET(req: NextRequest) {
+    return traceRequest('GET /api/reports/cumulative/scholastic', () => exportScholastic(req));
+}
+
+async function exportScholastic(req: NextRequest) {
     try {
         const token = extractToken(req.headers.get('Authorization'));
         const auth = await verifyAuth(token);
@@ -39,7 +44,7 @@ export async function GET(req: NextRequest) {
 
         studentQuery += ` ORDER BY se.roll_no, s.student_name`;
 
-        const studentsRes = await db.query(studentQuery, queryParams);
+        const studentsRes = await timed('cumulative.students', () => db.query(studentQuery, queryParams));
         const students = studentsRes.rows;
 
         if (students.length === 0) {
@@ -63,7 +68,7 @@ export async function GET(req: NextRequest) {
         // Need student IDs for the scores check
         const studentIds = students.map(s => s.id);
 
-        const subjectsRes = await db.query(subjectsQuery, [classId, academicYearId, studentIds]);
+        const subjectsRes = await timed('cumulative.subjects', () => db.query(subjectsQuery, [classId, academicYearId, studentIds]));
         const subjects = subjectsRes.rows.map(r => r.subject_name);
 
         // b. Terms (Filter if param provided)
@@ -102,9 +107,37 @@ export async function GET(req: NextRequest) {
         `;
 
 
-        const scoresRes = await db.query(scoresQuery, [studentIds, academicYearId]);
+        const scoresRes = await timed('cumulative.scores', () => db.query(scoresQuery, [studentIds, academicYearId]));
         const scores = scoresRes.rows;
 
+        // d. Totals and ranks kept in student_term_results (app/lib/term-results.ts).
+        // Rank is within the section for a section export, else within the class.
+        // Without the table (not migrated yet) the Result block is left out.
+        const rankColumn = sectionId ? 'section_rank' : 'class_rank';
+        const results = new Map<number, any>();
+        let hasResults = true;
+        try {
+            const resultsRes = await timed('cumulative.results', () => db.query(`
+                SELECT student_id, term1_total::float8 AS term1_total, term2_total::float8 AS term2_total,
+                    grand_total::float8 AS grand_total, percentage::float8 AS percentage, ${rankColumn} AS rank
+                FROM student_term_results
+                WHERE student_id = ANY($1) AND academic_year_id = $2
+            `, [studentIds, academicYearId]));
+            resultsRes.rows.forEach(r => results.set(r.student_id, r));
+        } catch (e: any) {
+            console.warn('Could not read student_term_results:', e.message);
+            hasResults = false;
+        }
+        const RESULT_COLUMNS: { label: string; value: (r: any) => any }[] = [
+            ...terms.map(term => ({
+                label: term,
+                value: (r: any) => term === 'Term I' ? r.term1_total : term === 'Term II' ? r.term2_total : '',
+            })),
+            ...(termNameParam ? [] : [{ label: 'Final (Avg)', value: (r: any) => r.grand_total }]),
+            { label: '%', value: (r: any) => r.percentage ?? '' },
+            { label: 'Rank', value: (r: any) => r.rank ?? '' },
+        ];
+
         // 4. Construct Excel Data & Styles
 
         // Define Styles
@@ -182,6 +215,22 @@ export async function GET(req: NextRequest) {
             merges.push({ s: { r: 0, c: subjectStartCol }, e: { r: 0, c: colIndex - 1 } });
         });
 
+        // Result block after the subjects
+        const resultStartCol = colIndex;
+        if (hasResults) {
+            RESULT_COLUMNS.forEach(col => {
+                headerRow1[colIndex] = createCell(col.label, headerStyle);
+                headerRow2[colIndex] = createCell('', headerStyle);
+                merges.push({ s: { r: 1, c: colIndex }, e: { r: 2, c: colIndex } });
+                colIndex++;
+            });
+            headerRow0[resultStartCol] = createCell('Result', headerStyle);
+            for (let i = resultStartCol + 1; i < colIndex; i++) {
+                headerRow0[i] = createCell('', headerStyle);
+            }
+            merges.push({ s: { r: 0, c: resultStartCol }, e: { r: 0, c: colIndex - 1 } });
+        }
+
         // Fill remaining empty cells in header rows to complete the rectangle for proper borders
         for (let i = 3; i < colIndex; i++) {
             if (!headerRow0[i]) headerRow0[i] = createCell('', headerStyle);
@@ -209,6 +258,13 @@ export async function GET(req: NextRequest) {
                     });
                 });
             });
+
+            if (hasResults) {
+                const result = results.get(student.id);
+                RESULT_COLUMNS.forEach(col => {
+                    row.push(createCell(result ? col.value(result) : ''));
+                });
+            }
             dataRows.push(row);
         });
 
@@ -226,7 +282,7 @@ export async function GET(req: NextRequest) {
         ];
         // Add minimal width for data columns
         for (let i = 3; i < colIndex; i++) {
-            wscols.push({ wch: 6 });
+            wscols.push({ wch: i < resultStartCol ? 6 : 9 });
         }
         worksheet['!cols'] = wscols;
 
@@ -234,7 +290,7 @@ export async function GET(req: NextRequest) {
         XLSX.utils.book_append_sheet(wb, worksheet, "Scholastic");
 
         // Write with styles
-        const buf = XLSX.write(wb, { type: "buffer", bookType: "xlsx" });
+        const buf = await timed('cumulative.write_xlsx', async () => XLSX.write(wb, { type: "buffer", bookType: "xlsx" }));
 
         return new NextResponse(buf, {
             status: 200,
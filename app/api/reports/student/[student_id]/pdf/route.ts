@@ -1,8 +1,13 @@
 import { NextResponse } from 'next/server';
 import { verifyAuth, extractToken } from '@/app/lib/auth';
-import { generatePdf } from '@/app/lib/pdf-engine';
+import { renderStudentPdf, serverTimingHeader } from '@/app/lib/pdf-engine';
+import { traceRequest } from '@/app/lib/metrics';
 
 export async function POST(request: Request, context: { params: Promise<{ student_id: string }> }) {
+    return traceRequest('POST /api/reports/student/pdf', () => renderPdf(request, context));
+}
+
+async function renderPdf(request: Request, context: { params: Promise<{ student_id: string }> }) {
     try {
         const token = extractToken(request.headers.get('Authorization'));
         const user = await verifyAuth(token);
@@ -37,14 +42,15 @@ export async function POST(request: Request, context: { params: Promise<{ studen
         const params = await context.params;
         const student_id = parseInt(params.student_id, 10);
 
-        // Generate PDF
-        const pdfBuffer = await generatePdf(student_id, Number(academic_year_id));
+        // Served from the PDF cache, or rendered on a warm page from the shared pool
+        const { buffer: pdfBuffer, timings, cache_hit } = await renderStudentPdf(student_id, Number(academic_year_id));
 
         // Return PDF Stream
         return new NextResponse(pdfBuffer as any, {
             headers: {
                 'Content-Type': 'application/pdf',
                 'Content-Disposition': `attachment; filename="Report_Card_${student_id}.pdf"`,
+                'Server-Timing': serverTimingHeader(timings, cache_hit),
             },
         });
 
@@ -0,0 +1,53 @@
+import { NextResponse } from 'next/server';
+import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { getToppers } from '@/app/lib/term-results';
+import { z } from 'zod';
+
+export const dynamic = 'force-dynamic';
+
+const toppersSchema = z.object({
+    academic_year_id: z.coerce.number().int().positive(),
+    class_id: z.coerce.number().int().positive().optional(),
+    section_id: z.coerce.number().int().positive().optional(),
+    limit: z.coerce.number().int().positive().max(100).default(3),
+}).refine(data => data.class_id || data.section_id, { message: 'class_id or section_id is required' });
+
+/**
+ * Top N students of a section (section_id) or of a whole class (class_id) by
+ * overall percentage, read from the ranks kept in student_term_results.
+ */
+export async function GET(request: Request) {
+    try {
+        const token = extractToken(request.headers.get('Authorization'));
+        const user = await verifyAuth(token);
+
+        if (!user || (user.role !== UserRole.TEACHER && user.role !== UserRole.ADMIN)) {
+            return NextResponse.json(
+                { success: false, error_code: 'FORBIDDEN', message: 'Access denied' },
+                { status: 403 }
+            );
+        }
+
+        const { searchParams } = new URL(request.url);
+        const result = toppersSchema.safeParse(Object.fromEntries(searchParams));
+
+        if (!result.success) {
+            return NextResponse.json(
+                { success: false, error_code: 'VALIDATION_ERROR', message: JSON.stringify(result.error.flatten()) },
+                { status: 400 }
+            );
+        }
+
+        const { academic_year_id, class_id, section_id, limit } = result.data;
+        const toppers = await getToppers({ academic_year_id, class_id, section_id }, limit);
+
+        return NextResponse.json({ success: true, data: toppers });
+
+    } catch (error: any) {
+        console.error('Toppers Error:', error);
+        return NextResponse.json(
+            { success: false, error_code: 'INTERNAL_ERROR', message: error.message },
+            { status: 500 }
+        );
+    }
+}
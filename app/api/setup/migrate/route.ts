@@ -378,6 +378,61 @@ export async function GET() {
             );
         `);
 
+        // 6. Report card versions (PDF cache invalidation)
+        await db.query(`
+            CREATE TABLE IF NOT EXISTS report_card_versions (
+                student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+                academic_year_id INT NOT NULL,
+                version          INT NOT NULL DEFAULT 0,
+                updated_at       TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (student_id, academic_year_id)
+            );
+        `);
+
+        // 7. Student term results (precomputed totals and ranks)
+        await db.query(`
+            CREATE TABLE IF NOT EXISTS student_term_results (
+                student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+                academic_year_id INT NOT NULL,
+                class_id         INT NOT NULL,
+                section_id       INT NOT NULL,
+                subject_totals   JSONB NOT NULL DEFAULT '{}',
+                term1_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+                term1_subjects   INT NOT NULL DEFAULT 0,
+                term2_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+                term2_subjects   INT NOT NULL DEFAULT 0,
+                grand_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+                max_marks        INT NOT NULL DEFAULT 0,
+                percentage       NUMERIC(5,2),
+                section_rank     INT,
+                class_rank       INT,
+                updated_at       TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (student_id, academic_year_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_term_results_section_rank
+                ON student_term_results (academic_year_id, section_id, section_rank);
+            CREATE INDEX IF NOT EXISTS idx_term_results_class_rank
+                ON student_term_results (academic_year_id, class_id, class_rank);
+        `);
+
+        // 8. Daily fee ledger (collections per day, mode, class/section and fee head)
+        await db.query(`
+            CREATE TABLE IF NOT EXISTS fee_ledger_daily (
+                payment_date     DATE NOT NULL,
+                payment_mode     VARCHAR(50) NOT NULL,
+                academic_year_id INT NOT NULL DEFAULT 0,
+                class_id         INT NOT NULL DEFAULT 0,
+                section_id       INT NOT NULL DEFAULT 0,
+                fee_head_id      INT NOT NULL DEFAULT 0,
+                amount           NUMERIC(14,2) NOT NULL DEFAULT 0,
+                payment_count    INT NOT NULL DEFAULT 0,
+                updated_at       TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_fee_payments_payment_date
+                ON student_fee_payments (payment_date);
+        `);
+
         return NextResponse.json({
             success: true,
             message: 'Migration and Fee Seeding Completed Successfully.'
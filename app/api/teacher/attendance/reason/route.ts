@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
 import { z } from 'zod';
 
 const reasonSchema = z.object({
@@ -41,6 +42,7 @@ export async function POST(request: Request) {
         `;
 
         await db.query(query, [reason_for_low_attendance, student_id, academic_year_id]);
+        await bumpReportVersions([student_id], academic_year_id);
 
         return NextResponse.json({
             success: true,
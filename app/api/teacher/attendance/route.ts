@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
 import { z } from 'zod';
 
 const attendanceSchema = z.object({
@@ -45,6 +46,7 @@ export async function POST(request: Request) {
     `;
 
         const { rows } = await db.query(query, [student_id, month_id, working_days, days_present, academic_year_id, reason_for_low_attendance]);
+        await bumpReportVersions([student_id], academic_year_id);
 
         return NextResponse.json({
             success: true,
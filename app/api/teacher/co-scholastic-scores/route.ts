@@ -1,6 +1,8 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
+import { upsertCoScholasticScores, bumpTouchedReports } from '@/app/lib/score-upsert';
 import { z } from 'zod';
 
 const scoreSchema = z.object({
@@ -11,6 +13,9 @@ const scoreSchema = z.object({
     academic_year_id: z.number().int().positive(),
 });
 
+// A single grade, or a whole grid saved with one multi-row upsert
+const bodySchema = z.union([scoreSchema, z.array(scoreSchema)]);
+
 export async function POST(request: Request) {
     try {
         const token = extractToken(request.headers.get('Authorization'));
@@ -24,7 +29,7 @@ export async function POST(request: Request) {
         }
 
         const body = await request.json();
-        const result = scoreSchema.safeParse(body);
+        const result = bodySchema.safeParse(body);
 
         if (!result.success) {
             return NextResponse.json(
@@ -33,21 +38,18 @@ export async function POST(request: Request) {
             );
         }
 
-        const { student_id, sub_skill_id, term_id, grade, academic_year_id } = result.data;
-
-        const query = `
-      INSERT INTO co_scholastic_scores (student_id, sub_skill_id, term_id, grade, academic_year_id)
-      VALUES ($1, $2, $3, $4, $5)
-      ON CONFLICT (student_id, sub_skill_id, term_id, academic_year_id)
-      DO UPDATE SET grade = EXCLUDED.grade
-      RETURNING id
-    `;
+        if (Array.isArray(result.data)) {
+            const ids = await upsertCoScholasticScores(db, result.data);
+            await bumpTouchedReports(result.data);
+            return NextResponse.json({ success: true, data: { saved: ids.length } });
+        }
 
-        const { rows } = await db.query(query, [student_id, sub_skill_id, term_id, grade, academic_year_id]);
+        const [id] = await upsertCoScholasticScores(db, [result.data]);
+        await bumpReportVersions([result.data.student_id], result.data.academic_year_id);
 
         return NextResponse.json({
             success: true,
-            data: rows[0],
+            data: { id },
         });
 
     } catch (error: any) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { upsertFoundationalRatings, bumpTouchedReports } from '@/app/lib/score-upsert';
 
 export const dynamic = 'force-dynamic';
 
@@ -34,7 +35,7 @@ export async function GET(request: Request) {
     }
 }
 
-// POST: upsert a single rating
+// POST: upsert a single rating, or an array of ratings in one statement
 export async function POST(request: Request) {
     try {
         const token = extractToken(request.headers.get('Authorization'));
@@ -43,25 +44,29 @@ export async function POST(request: Request) {
             return NextResponse.json({ success: false, message: 'Access denied' }, { status: 403 });
         }
 
-        const { student_id, academic_year_id, term, domain, skill_key, rating } = await request.json();
+        const body = await request.json();
+        const ratings: any[] = Array.isArray(body) ? body : [body];
 
-        if (!student_id || !academic_year_id || !term || !domain || !skill_key) {
-            return NextResponse.json({ success: false, message: 'Missing required fields' }, { status: 400 });
-        }
+        for (const { student_id, academic_year_id, term, domain, skill_key, rating } of ratings) {
+            if (!student_id || !academic_year_id || !term || !domain || !skill_key) {
+                return NextResponse.json({ success: false, message: 'Missing required fields' }, { status: 400 });
+            }
 
-        if (rating && !['A', 'B', 'C'].includes(rating)) {
-            return NextResponse.json({ success: false, message: 'rating must be A, B, or C' }, { status: 400 });
+            if (rating && !['A', 'B', 'C'].includes(rating)) {
+                return NextResponse.json({ success: false, message: 'rating must be A, B, or C' }, { status: 400 });
+            }
         }
 
-        const { rows } = await db.query(`
-            INSERT INTO foundational_skill_ratings (student_id, academic_year_id, term, domain, skill_key, rating, updated_at)
-            VALUES ($1, $2, $3, $4, $5, $6, NOW())
-            ON CONFLICT (student_id, academic_year_id, term, domain, skill_key)
-            DO UPDATE SET rating = EXCLUDED.rating, updated_at = NOW()
-            RETURNING id, rating
-        `, [student_id, academic_year_id, term, domain, skill_key, rating || null]);
+        const rows = await upsertFoundationalRatings(db, ratings.map(r => ({
+            ...r, student_id: Number(r.student_id), academic_year_id: Number(r.academic_year_id),
+        })));
+        // Ratings are not part of the report payload hash: the version bump
+        // is what keeps cached foundational cards fresh
+        await bumpTouchedReports(ratings.map(r => ({
+            student_id: Number(r.student_id), academic_year_id: Number(r.academic_year_id),
+        })));
 
-        return NextResponse.json({ success: true, data: rows[0] });
+        return NextResponse.json({ success: true, data: Array.isArray(body) ? { saved: rows.length } : rows[0] });
     } catch (err: any) {
         return NextResponse.json({ success: false, message: err.message }, { status: 500 });
     }
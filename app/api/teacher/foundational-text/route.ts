@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
 
 export const dynamic = 'force-dynamic';
 
@@ -55,6 +56,7 @@ export async function POST(request: Request) {
             ON CONFLICT (student_id, academic_year_id, term, field_key)
             DO UPDATE SET field_value = EXCLUDED.field_value, updated_at = NOW()
         `, [student_id, academic_year_id, term, field_key, field_value ?? '']);
+        await bumpReportVersions([Number(student_id)], Number(academic_year_id));
 
         return NextResponse.json({ success: true });
     } catch (err: any) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
 import { z } from 'zod';
 
 const remarkSchema = z.object({
@@ -60,6 +61,7 @@ export async function POST(request: Request) {
             const { rows } = await client.query(insertQuery, [student_id, remark_type_id, aspect ?? null, remark_text, academic_year_id]);
 
             await client.query('COMMIT');
+            await bumpReportVersions([student_id], academic_year_id);
 
             return NextResponse.json({
                 success: true,
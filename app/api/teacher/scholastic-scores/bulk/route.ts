@@ -1,6 +1,8 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { upsertScholasticScores, bumpTouchedReports } from '@/app/lib/score-upsert';
+import { refreshTouchedResults } from '@/app/lib/term-results';
 import { z } from 'zod';
 
 const bulkScoreSchema = z.array(z.object({
@@ -37,42 +39,16 @@ export async function POST(request: Request) {
 
         const scores = result.data;
 
-        // Transaction for bulk upsert
-        const client = await db.pool.connect();
-        try {
-            await client.query('BEGIN');
+        // One multi-row upsert for the whole grid; grades (where the column
+        // still exists) are computed in the same statement
+        await upsertScholasticScores(db, scores);
+        await bumpTouchedReports(scores);
+        await refreshTouchedResults(scores);
 
-            const query = `
-        INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, academic_year_id)
-        VALUES ($1, $2, $3, $4, $5, $6)
-        ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
-        DO UPDATE SET marks = EXCLUDED.marks
-      `;
-
-            for (const score of scores) {
-                await client.query(query, [
-                    score.student_id,
-                    score.subject_id,
-                    score.component_id,
-                    score.term_id,
-                    score.marks ?? null,
-                    score.academic_year_id
-                ]);
-            }
-
-            await client.query('COMMIT');
-
-            return NextResponse.json({
-                success: true,
-                message: 'Bulk scores updated successfully'
-            });
-
-        } catch (e) {
-            await client.query('ROLLBACK');
-            throw e;
-        } finally {
-            client.release();
-        }
+        return NextResponse.json({
+            success: true,
+            message: 'Bulk scores updated successfully'
+        });
 
     } catch (error: any) {
         return NextResponse.json(
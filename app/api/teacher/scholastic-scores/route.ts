@@ -1,6 +1,9 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/app/lib/db';
 import { verifyAuth, UserRole, extractToken } from '@/app/lib/auth';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
+import { upsertScholasticScores } from '@/app/lib/score-upsert';
+import { refreshTouchedResults } from '@/app/lib/term-results';
 import { z } from 'zod';
 
 const scoreSchema = z.object({
@@ -12,17 +15,6 @@ const scoreSchema = z.object({
     academic_year_id: z.number().int().positive(),
 });
 
-function calculateGrade(percentage: number): string {
-    if (percentage >= 91) return 'A1';
-    if (percentage >= 81) return 'A2';
-    if (percentage >= 71) return 'B1';
-    if (percentage >= 61) return 'B2';
-    if (percentage >= 51) return 'C1';
-    if (percentage >= 41) return 'C2';
-    if (percentage >= 33) return 'D';
-    return 'E';
-}
-
 export async function POST(request: Request) {
     try {
         const token = extractToken(request.headers.get('Authorization'));
@@ -45,57 +37,12 @@ export async function POST(request: Request) {
             );
         }
 
-        const { student_id, subject_id, component_id, term_id, marks, academic_year_id } = result.data;
-
-        // Strategy: Try saving WITHOUT grade first (assuming schema is fixed).
-        // If it fails with "null value in column grade", retry WITH grade.
-
-        try {
-            const queryNoGrade = `
-                INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, academic_year_id)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
-                DO UPDATE SET marks = EXCLUDED.marks
-                RETURNING id
-            `;
-            const { rows } = await db.query(queryNoGrade, [student_id, subject_id, component_id, term_id, marks ?? null, academic_year_id]);
-            return NextResponse.json({ success: true, data: rows[0] });
-
-        } catch (err: any) {
-            // Check for specific "not-null constraint" error on "grade" column
-            if (err.message && err.message.includes('null value in column "grade"') && err.message.includes('not-null constraint')) {
-                // FALLBACK: The DB still requires a grade. Calculate and insert it.
-                console.warn('Database requires Grade. Switching to fallback insert with calculated grade.');
-
-                let grade = 'NA'; // Default safe value
-                if (marks !== null && marks !== undefined) {
-                    try {
-                        const compRes = await db.query('SELECT max_marks FROM assessment_components WHERE id = $1', [component_id]);
-                        const maxMarks = compRes.rows[0]?.max_marks || 100;
-                        const percentage = (marks / maxMarks) * 100;
-                        grade = calculateGrade(percentage);
-                    } catch (e) {
-                        // If max_marks column is missing, just use NA. User doesn't want grades anyway.
-                        console.warn('Could not fetch max_marks for grade calculation, using NA:', e);
-                        grade = 'NA';
-                    }
-                } else {
-                    grade = 'AB'; // Absent/Null
-                }
-
-                const queryWithGrade = `
-                    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
-                    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
-                    RETURNING id
-                `;
-                const { rows } = await db.query(queryWithGrade, [student_id, subject_id, component_id, term_id, marks ?? null, grade, academic_year_id]);
-                return NextResponse.json({ success: true, data: rows[0] });
-            } else {
-                throw err; // Re-throw real errors
-            }
-        }
+        // Shares the bulk path: the grade, where the column still exists, is
+        // computed from assessment_components.max_marks in the same statement
+        const [id] = await upsertScholasticScores(db, [result.data]);
+        await bumpReportVersions([result.data.student_id], result.data.academic_year_id);
+        await refreshTouchedResults([result.data]);
+        return NextResponse.json({ success: true, data: { id } });
 
     } catch (error: any) {
         console.error('Database Error in POST scholastic-scores:', error);
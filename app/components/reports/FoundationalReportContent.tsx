@@ -3,10 +3,11 @@
 import { useEffect, useState, Suspense } from 'react';
 import { useSearchParams } from 'next/navigation';
 import {
-    FOUNDATIONAL_DOMAINS, SELF_ASSESS_FIELDS, PARENT_FEEDBACK_FIELDS,
+    FOUNDATIONAL_DOMAIN_INDEX, SELF_ASSESS_FIELDS, PARENT_FEEDBACK_FIELDS,
     RATINGS, isSubSection,
 } from '@/app/lib/foundational-skills';
-import { PRINT_STYLES } from '@/app/lib/print-styles';
+import { INLINE_PRINT_STYLES, PRINT_STYLES } from '@/app/lib/print-styles';
+import PrintStyles from '@/app/components/reports/PrintStyles';
 
 // ── style tokens matching the HTML reference ──────────────────────────────────
 const C = {
@@ -96,7 +97,7 @@ function GoldBar() {
 
 // ── Domain table (used for Pages 2–4) ────────────────────────────────────────
 function DomainTable({ domainKey, ratings, rowHeight, tableHeader }: { domainKey: string; ratings: RatingMap; rowHeight?: number; tableHeader?: string }) {
-    const domain = FOUNDATIONAL_DOMAINS.find(d => d.key === domainKey)!;
+    const domain = FOUNDATIONAL_DOMAIN_INDEX.get(domainKey)!;
     const rows: React.ReactNode[] = [];
     let i = 0;
     domain.sections.forEach(sec => {
@@ -233,7 +234,7 @@ export function FoundationalReportContent({ autoPrint = true }: { autoPrint?: bo
     }
 
     return (
-        <div className="foundational-page" style={{ fontFamily: "'Nunito', 'Segoe UI', Arial, sans-serif", background: '#dde8f5', padding: '24px 12px' }}>
+        <div className="foundational-page hpc-foundational" style={{ fontFamily: "'Nunito', 'Segoe UI', Arial, sans-serif", background: '#dde8f5', padding: '24px 12px' }}>
 
             {/* ── PAGE 1: General Info + Attendance + All About Me ── */}
             <Page showHeader>
@@ -533,7 +534,8 @@ export function FoundationalReportContent({ autoPrint = true }: { autoPrint?: bo
                 </div>
             </Page>
 
-            <style>{`
+            {/* Built into the shared stylesheet by build_print_css.py */}
+            {INLINE_PRINT_STYLES ? <style>{`
                 ${PRINT_STYLES}
                 @import url('https://fonts.googleapis.com/css2?family=Nunito:wght@400;600;700;800&display=swap');
                 html, body { margin: 0; padding: 0; }
@@ -629,7 +631,8 @@ export function FoundationalReportContent({ autoPrint = true }: { autoPrint?: bo
                 .foundational-page .attendance-table td:last-child {
                     background: ${C.rowEven} !important;
                 }
-            `}</style>        </div>
+            `}</style> : <PrintStyles />}
+        </div>
     );
 }
 
@@ -0,0 +1,11 @@
+import { INLINE_PRINT_STYLES, PRINT_STYLES } from '@/app/lib/print-styles';
+import { PRINT_STYLESHEET_HREF } from '@/app/lib/print-stylesheet';
+
+// The report card CSS: one cacheable, content-hashed stylesheet, or the
+// legacy inline copy when NEXT_PUBLIC_PRINT_CSS_INLINE=1
+export default function PrintStyles() {
+    if (INLINE_PRINT_STYLES) {
+        return <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />;
+    }
+    return <link rel="stylesheet" href={PRINT_STYLESHEET_HREF} />;
+}
@@ -1,4 +1,6 @@
 import React from 'react';
+import { INLINE_PRINT_STYLES } from '@/app/lib/print-styles';
+import PrintStyles from '@/app/components/reports/PrintStyles';
 
 interface ReportData {
     student: any;
@@ -7,6 +9,8 @@ interface ReportData {
     attendance: any[];
     remarks: any[];
     subjects?: any[];
+    // Row of student_term_results (see app/lib/term-results.ts), or null
+    term_results?: any;
 }
 // ── style tokens matching the Foundational Stage HTML reference ──
 const C = {
@@ -58,12 +62,46 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
     if (!reportData) return null;
 
     // --- Helpers ---
+    // Lookup maps are built once per render so every table cell is an O(1) read.
+    // Maps are nested and keyed by the row strings themselves, so a lookup never
+    // has to build a composite key.
+    const scholasticIndex = new Map<string, Map<string, Map<string, any>>>();
+    reportData.scholastic?.forEach((s: any) => {
+        let byComponent = scholasticIndex.get(s.subject_name);
+        if (!byComponent) scholasticIndex.set(s.subject_name, byComponent = new Map());
+        let byTerm = byComponent.get(s.component_name);
+        if (!byTerm) byComponent.set(s.component_name, byTerm = new Map());
+        if (!byTerm.has(s.term_name)) byTerm.set(s.term_name, s);
+    });
+
+    // Sub-skill names repeat across domains (Dance and Music both grade
+    // 'Rhythm'), so co-scholastic and personality grades are keyed by domain first
+    const skillIndex = new Map<string, Map<string, Map<string, any>>>();
+    reportData.co_scholastic?.forEach((cs: any) => {
+        let bySkill = skillIndex.get(cs.domain_name);
+        if (!bySkill) skillIndex.set(cs.domain_name, bySkill = new Map());
+        let byTerm = bySkill.get(cs.sub_skill_name);
+        if (!byTerm) bySkill.set(cs.sub_skill_name, byTerm = new Map());
+        if (!byTerm.has(cs.term_name)) byTerm.set(cs.term_name, cs);
+    });
+
+    // Months are looked up by their three-letter prefix ('Jun' -> 'June')
+    const attendanceIndex = new Map<string, any>();
+    reportData.attendance?.forEach((a: any) => {
+        const key = a.month_name?.slice(0, 3);
+        if (key && !attendanceIndex.has(key)) attendanceIndex.set(key, a);
+    });
+
+    const remarkIndex = new Map<string, Map<string, string>>();
+    reportData.remarks?.forEach((r: any) => {
+        let byAspect = remarkIndex.get(r.type_name);
+        if (!byAspect) remarkIndex.set(r.type_name, byAspect = new Map());
+        const aspect = r.aspect || '';
+        if (!byAspect.has(aspect)) byAspect.set(aspect, r.remark_text);
+    });
+
     const getScholasticScore = (subjectName: string, componentName: string, termName: string) => {
-        return reportData.scholastic?.find((s: any) =>
-            s.subject_name === subjectName &&
-            s.component_name === componentName &&
-            s.term_name === termName
-        );
+        return scholasticIndex.get(subjectName)?.get(componentName)?.get(termName);
     };
 
     const renderScoreCell = (subject: string, component: string, term: string) => {
@@ -71,26 +109,47 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
         return <td className="input-cell" key={`${subject}-${component}-${term}`}>{score?.marks ?? ''}</td>;
     };
 
-    const months = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar'];
-    const getAttendance = (month: string) => reportData.attendance?.find((a: any) => a.month_name?.startsWith(month));
-
-    const getCoScholastic = (subSkill: string, term: string) => {
-        return reportData.co_scholastic?.find((cs: any) => cs.sub_skill_name === subSkill && cs.term_name === term);
+    // Term totals, grand total and percentage are precomputed in
+    // student_term_results; without a stored row (table not migrated yet)
+    // the four components are summed here
+    const termResults = reportData.term_results;
+    const SCHOLASTIC_COMPONENTS = ['Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment'];
+    const getTermTotal = (sub: any, term: string) => {
+        const key = term === 'Term I' ? 'term1' : 'term2';
+        if (termResults) {
+            const stored = termResults.subject_totals?.[sub.id];
+            return { total: stored?.[key] ?? 0, hasMarks: !!stored?.[`has_${key}`] };
+        }
+        let total = 0;
+        SCHOLASTIC_COMPONENTS.forEach(comp => {
+            const s = getScholasticScore(sub.subject_name, comp, term);
+            const num = s?.marks ? parseFloat(s.marks) : 0;
+            if (!isNaN(num)) total += num;
+        });
+        const hasMarks = !!(getScholasticScore(sub.subject_name, 'Periodic Assessment', term) ||
+            getScholasticScore(sub.subject_name, 'Terminal Assessment', term));
+        return { total, hasMarks };
     };
 
-    const getPersonality = (subSkill: string, term: string) => {
-        return reportData.co_scholastic?.find((cs: any) => cs.sub_skill_name === subSkill && cs.term_name === term);
+    const months = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar'];
+    const getAttendance = (month: string) => attendanceIndex.get(month);
+
+    // Grades of one table row by term; the table bodies are generated by skill_tables.py
+    const getSkillGrades = (domain: string, subSkill: string) => {
+        return skillIndex.get(domain)?.get(subSkill);
     };
 
     const getRemark = (type: string, aspect?: string) => {
-        return reportData.remarks?.find((r: any) =>
-            r.type_name === type &&
-            (aspect ? r.aspect === aspect : !r.aspect)
-        )?.remark_text || '';
+        return remarkIndex.get(type)?.get(aspect || '') || '';
     };
 
+    // Print-page layout by subject count, written by paginate.py
+    const PAGE_BAND_LIMITS = [6, 10, 14];
+    const bandIndex = PAGE_BAND_LIMITS.findIndex(limit => (reportData.subjects?.length ?? 0) <= limit);
+    const pageBand = bandIndex === -1 ? PAGE_BAND_LIMITS.length - 1 : bandIndex;
+
     return (
-        <div className="foundational-page content" style={{ fontFamily: "'Nunito', 'Segoe UI', Arial, sans-serif", fontSize: 13, color: C.text, background: '#dde8f5', padding: '24px 12px' }}>
+        <div className="foundational-page content hpc-iii-viii" style={{ fontFamily: "'Nunito', 'Segoe UI', Arial, sans-serif", fontSize: 13, color: C.text, background: '#dde8f5', padding: '24px 12px' }}>
             <div className="print-page" style={{
                 width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
                 borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
@@ -192,10 +251,12 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                         </div>
                     </div>
 
-
                 </div>
             </div>
 
+            {/* ---> PAGE BAND 4-6 <--- */}
+            {pageBand === 0 && (<>
+
             {/* ---> PAGE BREAK <--- */}
             <div className="print-page page-break" style={{
                 width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
@@ -243,45 +304,26 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                                         const rows = reportData.subjects?.map((sub: any) => {
                                             const subject = sub.subject_name;
 
-                                            const getVal = (comp: string, term: string) => {
-                                                const s = getScholasticScore(subject, comp, term);
-                                                if (!s || !s.marks) return 0;
-                                                const num = parseFloat(s.marks);
-                                                return isNaN(num) ? 0 : num;
-                                            };
-
-                                            const hasMarks = (term: string) => {
-                                                return getScholasticScore(subject, 'Periodic Assessment', term) ||
-                                                    getScholasticScore(subject, 'Terminal Assessment', term);
-                                            };
-
-                                            const total1 = getVal('Periodic Assessment', 'Term I') +
-                                                getVal('Subject Enrichment Activities', 'Term I') +
-                                                getVal('Internal Assessment', 'Term I') +
-                                                getVal('Terminal Assessment', 'Term I');
-
-                                            const total2 = getVal('Periodic Assessment', 'Term II') +
-                                                getVal('Subject Enrichment Activities', 'Term II') +
-                                                getVal('Internal Assessment', 'Term II') +
-                                                getVal('Terminal Assessment', 'Term II');
-
-                                            if (hasMarks('Term I')) {
+                                            const { total: total1, hasMarks: has1 } = getTermTotal(sub, 'Term I');
+                                            const { total: total2, hasMarks: has2 } = getTermTotal(sub, 'Term II');
+
+                                            if (has1) {
                                                 grandTotal1 += total1;
                                                 subjectCount1++;
                                             }
-                                            if (hasMarks('Term II')) {
+                                            if (has2) {
                                                 grandTotal2 += total2;
                                                 subjectCount2++;
                                             }
 
                                             const avg = (total1 + total2) / 2;
-                                            if (hasMarks('Term I') || hasMarks('Term II')) {
+                                            if (has1 || has2) {
                                                 grandTotalAvg += avg;
                                             }
 
-                                            const displayTotal1 = hasMarks('Term I') ? parseFloat(total1.toFixed(2)) : '';
-                                            const displayTotal2 = hasMarks('Term II') ? parseFloat(total2.toFixed(2)) : '';
-                                            const displayAvg = (hasMarks('Term I') || hasMarks('Term II')) ? parseFloat(avg.toFixed(2)) : '';
+                                            const displayTotal1 = has1 ? parseFloat(total1.toFixed(2)) : '';
+                                            const displayTotal2 = has2 ? parseFloat(total2.toFixed(2)) : '';
+                                            const displayAvg = (has1 || has2) ? parseFloat(avg.toFixed(2)) : '';
 
                                             return (
                                                 <tr key={subject}>
@@ -301,13 +343,23 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                                             );
                                         });
 
+                                        if (termResults) {
+                                            grandTotal1 = termResults.term1_total;
+                                            grandTotal2 = termResults.term2_total;
+                                            grandTotalAvg = termResults.grand_total;
+                                            subjectCount1 = termResults.term1_subjects;
+                                            subjectCount2 = termResults.term2_subjects;
+                                        }
+
                                         const max1 = subjectCount1 * 100;
                                         const max2 = subjectCount2 * 100;
-                                        const maxAvg = Math.max(subjectCount1, subjectCount2) * 100;
+                                        const maxAvg = termResults ? termResults.max_marks : Math.max(subjectCount1, subjectCount2) * 100;
 
                                         const p1 = max1 > 0 ? ((grandTotal1 / max1) * 100).toFixed(2) : '';
                                         const p2 = max2 > 0 ? ((grandTotal2 / max2) * 100).toFixed(2) : '';
-                                        const pAvg = maxAvg > 0 ? ((grandTotalAvg / maxAvg) * 100).toFixed(2) : '';
+                                        const pAvg = termResults
+                                            ? (termResults.percentage != null ? termResults.percentage.toFixed(2) : '')
+                                            : (maxAvg > 0 ? ((grandTotalAvg / maxAvg) * 100).toFixed(2) : '');
 
                                         return (
                                             <>
@@ -348,26 +400,48 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Physical Education</td>
                                     </tr>
-                                    {['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'].map(skill => {
+                                        const grades = getSkillGrades('Physical Education', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                                 <tbody style={{ pageBreakInside: 'avoid' }}>
                                     {/* Visual Art */}
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Visual Art</td>
                                     </tr>
-                                    {['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'].map(skill => {
+                                        const grades = getSkillGrades('Visual Art', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Performing Art - Dance */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Dance</td>
+                                    </tr>
+                                    {['Posture', 'Expression', 'Rhythm', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Dance', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                             </table>
                         </div>
@@ -389,36 +463,31 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                     <div className="section" style={{ marginTop: 0 }}>
                         <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden', borderTop: 'none' }}>
                             <table className="foundational-table">
-                                <tbody style={{ pageBreakInside: 'avoid' }}>
-                                    <tr style={{ visibility: 'collapse' }}>
-                                        <th style={{ width: '50%' }}></th>
-                                        <th style={{ width: '25%' }}></th>
-                                        <th style={{ width: '25%' }}></th>
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
                                     </tr>
-                                    {/* Performing Art - Dance */}
-                                    <tr className="domain-header">
-                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Dance</td>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
                                     </tr>
-                                    {['Posture', 'Expression', 'Rhythm', 'Overall Performance'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
-                                </tbody>
+                                </thead>
                                 <tbody style={{ pageBreakInside: 'avoid' }}>
                                     {/* Performing Art - Music */}
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Music</td>
                                     </tr>
-                                    {['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Music', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                             </table>
                         </div>
@@ -444,60 +513,75 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Social Skills</td>
                                     </tr>
-                                    {['Maintains cordial relationship with peers and adults', 'Demonstrates teamwork and cooperation', 'Respects school property and personal belongings'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getPersonality(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getPersonality(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Maintains cordial relationship with peers and adults', 'Demonstrates teamwork and cooperation', 'Respects school property and personal belongings'].map(skill => {
+                                        const grades = getSkillGrades('Social Skills', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                                 <tbody style={{ pageBreakInside: 'avoid' }}>
                                     {/* Emotional Skills */}
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Emotional Skills</td>
                                     </tr>
-                                    {['Shows sensitivity towards rules and norms', 'Demonstrates self-regulation of emotions and behaviour', 'Displays empathy and concern for others'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getPersonality(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getPersonality(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Shows sensitivity towards rules and norms', 'Demonstrates self-regulation of emotions and behaviour', 'Displays empathy and concern for others'].map(skill => {
+                                        const grades = getSkillGrades('Emotional Skill', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                                 <tbody style={{ pageBreakInside: 'avoid' }}>
                                     {/* Work Habit */}
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Work Habit</td>
                                     </tr>
-                                    {['Maintains regularity and punctuality', 'Demonstrates responsible citizenship', 'Shows care and concern for the environment'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getPersonality(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getPersonality(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Maintains regularity and punctuality', 'Demonstrates responsible citizenship', 'Shows care and concern for the environment'].map(skill => {
+                                        const grades = getSkillGrades('Work Habit', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                                 <tbody style={{ pageBreakInside: 'avoid' }}>
                                     {/* Health & Wellness */}
                                     <tr className="domain-header">
                                         <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Health & Wellness</td>
                                     </tr>
-                                    {['Follows good hygiene practices', 'Maintains cleanliness of self and surroundings', 'Demonstrates resilience and positive coping skills'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getPersonality(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getPersonality(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
+                                    {['Follows good hygiene practices', 'Maintains cleanliness of self and surroundings', 'Demonstrates resilience and positive coping skills'].map(skill => {
+                                        const grades = getSkillGrades('Health & Wellness', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                             </table>
                         </div>
                     </div>
 
-
                 </div>
             </div>
+            </>)}
+
+            {/* ---> PAGE BAND 7-10 <--- */}
+            {pageBand === 1 && (<>
 
             {/* ---> PAGE BREAK <--- */}
             <div className="print-page page-break" style={{
@@ -507,66 +591,744 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
             }}>
                 <SchoolHeader />
                 <div style={{ padding: '22px 28px 28px' }}>
-                    {/* FEEDBACK SECTIONS */}
-                    <div className="section">
-                        <div className="feedback-grid">
-                            <div className="feedback-card">
-                                <h3>Learner's Profile by the Teacher</h3>
-                                <div className="feedback-input" style={{ minHeight: '120px' }}>
-                                    {getRemark('Learner’s Profile by the teacher')}
-                                </div>
-                            </div>
+                    {/* SCHOLASTIC DOMAINS */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Scholastic Domains</SectionHeading>
+                        <div style={{ overflowX: 'auto', borderRadius: '4px', border: `1px solid ${C.navy}` }}>
+                            <table className="foundational-table scholastic-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ width: '15%' }}>Subjects</th>
+                                        <th colSpan={2}>Periodic Assessment</th>
+                                        <th colSpan={2}>Subject Enrichment Activities</th>
+                                        <th colSpan={2}>Internal Assessment</th>
+                                        <th colSpan={2}>Terminal Assessment</th>
+                                        <th colSpan={2} className="gold-bg">Total</th>
+                                        <th rowSpan={2} className="gold-bg">Final Result<br />(Avg)</th>
+                                    </tr>
+                                    <tr>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th className="gold-bg">Term I</th>
+                                        <th className="gold-bg">Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody>
+                                    {(() => {
+                                        let grandTotal1 = 0;
+                                        let grandTotal2 = 0;
+                                        let grandTotalAvg = 0;
+                                        let subjectCount1 = 0;
+                                        let subjectCount2 = 0;
 
-                            <div className="feedback-card">
-                                <h3>Parent's Feedback</h3>
-                                {['My child enjoys participating in...', 'My child can be supported for...', 'Any additional observations'].map(label => (
-                                    <div className="feedback-row" key={label}>
-                                        <div className="feedback-label">{label}</div>
-                                        <div className="feedback-input">{getRemark("Parent’s Feedback", label)}</div>
-                                    </div>
-                                ))}
-                            </div>
+                                        const rows = reportData.subjects?.map((sub: any) => {
+                                            const subject = sub.subject_name;
 
-                            {/* Self Assessment */}
-                            <div className="feedback-card">
-                                <h3>Self-Assessment</h3>
-                                {['Activities I enjoy the most', 'Activities I find challenging', 'Activities I enjoy doing with my friends'].map(label => (
-                                    <div className="feedback-row" key={label}>
-                                        <div className="feedback-label">{label}</div>
-                                        <div className="feedback-input">{getRemark("Self-Assessment", label)}</div>
-                                    </div>
-                                ))}
-                            </div>
+                                            const { total: total1, hasMarks: has1 } = getTermTotal(sub, 'Term I');
+                                            const { total: total2, hasMarks: has2 } = getTermTotal(sub, 'Term II');
+
+                                            if (has1) {
+                                                grandTotal1 += total1;
+                                                subjectCount1++;
+                                            }
+                                            if (has2) {
+                                                grandTotal2 += total2;
+                                                subjectCount2++;
+                                            }
+
+                                            const avg = (total1 + total2) / 2;
+                                            if (has1 || has2) {
+                                                grandTotalAvg += avg;
+                                            }
+
+                                            const displayTotal1 = has1 ? parseFloat(total1.toFixed(2)) : '';
+                                            const displayTotal2 = has2 ? parseFloat(total2.toFixed(2)) : '';
+                                            const displayAvg = (has1 || has2) ? parseFloat(avg.toFixed(2)) : '';
 
+                                            return (
+                                                <tr key={subject}>
+                                                    <td className="text-left" style={{ paddingLeft: '12px' }}>{subject}</td>
+                                                    {renderScoreCell(subject, 'Periodic Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Periodic Assessment', 'Term II')}
+                                                    {renderScoreCell(subject, 'Subject Enrichment Activities', 'Term I')}
+                                                    {renderScoreCell(subject, 'Subject Enrichment Activities', 'Term II')}
+                                                    {renderScoreCell(subject, 'Internal Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Internal Assessment', 'Term II')}
+                                                    {renderScoreCell(subject, 'Terminal Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Terminal Assessment', 'Term II')}
+                                                    <td style={{ fontWeight: 700 }}>{displayTotal1}</td>
+                                                    <td style={{ fontWeight: 700 }}>{displayTotal2}</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{displayAvg}</td>
+                                                </tr>
+                                            );
+                                        });
+
+                                        if (termResults) {
+                                            grandTotal1 = termResults.term1_total;
+                                            grandTotal2 = termResults.term2_total;
+                                            grandTotalAvg = termResults.grand_total;
+                                            subjectCount1 = termResults.term1_subjects;
+                                            subjectCount2 = termResults.term2_subjects;
+                                        }
+
+                                        const max1 = subjectCount1 * 100;
+                                        const max2 = subjectCount2 * 100;
+                                        const maxAvg = termResults ? termResults.max_marks : Math.max(subjectCount1, subjectCount2) * 100;
+
+                                        const p1 = max1 > 0 ? ((grandTotal1 / max1) * 100).toFixed(2) : '';
+                                        const p2 = max2 > 0 ? ((grandTotal2 / max2) * 100).toFixed(2) : '';
+                                        const pAvg = termResults
+                                            ? (termResults.percentage != null ? termResults.percentage.toFixed(2) : '')
+                                            : (maxAvg > 0 ? ((grandTotalAvg / maxAvg) * 100).toFixed(2) : '');
 
+                                        return (
+                                            <>
+                                                {rows}
+                                                <tr className="domain-header">
+                                                    <td colSpan={11} style={{ textAlign: 'right', paddingRight: '15px' }}>Total Marks Obtained</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{maxAvg > 0 ? `${grandTotalAvg.toFixed(1)} / ${maxAvg}` : ''}</td>
+                                                </tr>
+                                                <tr className="domain-header" style={{ background: '#d1e0f7' }}>
+                                                    <td colSpan={11} style={{ textAlign: 'right', paddingRight: '15px' }}>Overall Percentage</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{pAvg ? `${pAvg}%` : ''}</td>
+                                                </tr>
+                                            </>
+                                        );
+                                    })()}
+                                </tbody>
+                            </table>
                         </div>
                     </div>
 
-                    {/* SIGNATURE SECTION */}
+                    {/* CO-SCHOLASTIC DOMAINS */}
                     <div className="section" style={{ marginTop: 16 }}>
-                        <SectionHeading>Signature With Date</SectionHeading>
+                        <SectionHeading>Co-Scholastic Domains</SectionHeading>
                         <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden' }}>
-                            <table className="foundational-table" style={{ tableLayout: 'fixed' }}>
+                            <table className="foundational-table">
                                 <thead>
                                     <tr>
-                                        <th style={{ width: '25%' }}>Parent / Guardian</th>
-                                        <th style={{ width: '25%' }}>Class Teacher</th>
-                                        <th style={{ width: '25%' }}>Block Incharge</th>
-                                        <th style={{ width: '25%' }}>Principal</th>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
                                     </tr>
                                 </thead>
-                                <tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Physical Education */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Physical Education</td>
+                                    </tr>
+                                    {['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'].map(skill => {
+                                        const grades = getSkillGrades('Physical Education', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Visual Art */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Visual Art</td>
+                                    </tr>
+                                    {['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'].map(skill => {
+                                        const grades = getSkillGrades('Visual Art', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                </div>
+            </div>
+
+            {/* ---> PAGE BREAK <--- */}
+            <div className="print-page page-break" style={{
+                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
+                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
+                boxSizing: 'border-box', position: 'relative'
+            }}>
+                <SchoolHeader />
+                <div style={{ padding: '22px 28px 28px' }}>
+
+                    {/* CO-SCHOLASTIC DOMAINS (Continued) */}
+                    <div className="section" style={{ marginTop: 0 }}>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden', borderTop: 'none' }}>
+                            <table className="foundational-table">
+                                <thead>
                                     <tr>
-                                        <td style={{ padding: '30px 6px !important' }}></td>
-                                        <td style={{ padding: '30px 6px !important' }}></td>
-                                        <td style={{ padding: '30px 6px !important' }}></td>
-                                        <td style={{ padding: '30px 6px !important' }}></td>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Performing Art - Dance */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Dance</td>
+                                    </tr>
+                                    {['Posture', 'Expression', 'Rhythm', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Dance', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Performing Art - Music */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Music</td>
                                     </tr>
+                                    {['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Music', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
                                 </tbody>
                             </table>
                         </div>
                     </div>
 
+                    {/* PERSONALITY DEVELOPMENT SKILLS */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Personality Development Skills</SectionHeading>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden' }}>
+                            <table className="foundational-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Social Skills */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Social Skills</td>
+                                    </tr>
+                                    {['Maintains cordial relationship with peers and adults', 'Demonstrates teamwork and cooperation', 'Respects school property and personal belongings'].map(skill => {
+                                        const grades = getSkillGrades('Social Skills', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Emotional Skills */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Emotional Skills</td>
+                                    </tr>
+                                    {['Shows sensitivity towards rules and norms', 'Demonstrates self-regulation of emotions and behaviour', 'Displays empathy and concern for others'].map(skill => {
+                                        const grades = getSkillGrades('Emotional Skill', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Work Habit */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Work Habit</td>
+                                    </tr>
+                                    {['Maintains regularity and punctuality', 'Demonstrates responsible citizenship', 'Shows care and concern for the environment'].map(skill => {
+                                        const grades = getSkillGrades('Work Habit', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Health & Wellness */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Health & Wellness</td>
+                                    </tr>
+                                    {['Follows good hygiene practices', 'Maintains cleanliness of self and surroundings', 'Demonstrates resilience and positive coping skills'].map(skill => {
+                                        const grades = getSkillGrades('Health & Wellness', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                </div>
+            </div>
+            </>)}
+
+            {/* ---> PAGE BAND 11-14 <--- */}
+            {pageBand === 2 && (<>
+
+            {/* ---> PAGE BREAK <--- */}
+            <div className="print-page page-break" style={{
+                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
+                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
+                boxSizing: 'border-box', position: 'relative'
+            }}>
+                <SchoolHeader />
+                <div style={{ padding: '22px 28px 28px' }}>
+                    {/* SCHOLASTIC DOMAINS */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Scholastic Domains</SectionHeading>
+                        <div style={{ overflowX: 'auto', borderRadius: '4px', border: `1px solid ${C.navy}` }}>
+                            <table className="foundational-table scholastic-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ width: '15%' }}>Subjects</th>
+                                        <th colSpan={2}>Periodic Assessment</th>
+                                        <th colSpan={2}>Subject Enrichment Activities</th>
+                                        <th colSpan={2}>Internal Assessment</th>
+                                        <th colSpan={2}>Terminal Assessment</th>
+                                        <th colSpan={2} className="gold-bg">Total</th>
+                                        <th rowSpan={2} className="gold-bg">Final Result<br />(Avg)</th>
+                                    </tr>
+                                    <tr>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th>Term I</th>
+                                        <th>Term II</th>
+                                        <th className="gold-bg">Term I</th>
+                                        <th className="gold-bg">Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody>
+                                    {(() => {
+                                        let grandTotal1 = 0;
+                                        let grandTotal2 = 0;
+                                        let grandTotalAvg = 0;
+                                        let subjectCount1 = 0;
+                                        let subjectCount2 = 0;
+
+                                        const rows = reportData.subjects?.map((sub: any) => {
+                                            const subject = sub.subject_name;
+
+                                            const { total: total1, hasMarks: has1 } = getTermTotal(sub, 'Term I');
+                                            const { total: total2, hasMarks: has2 } = getTermTotal(sub, 'Term II');
+
+                                            if (has1) {
+                                                grandTotal1 += total1;
+                                                subjectCount1++;
+                                            }
+                                            if (has2) {
+                                                grandTotal2 += total2;
+                                                subjectCount2++;
+                                            }
+
+                                            const avg = (total1 + total2) / 2;
+                                            if (has1 || has2) {
+                                                grandTotalAvg += avg;
+                                            }
+
+                                            const displayTotal1 = has1 ? parseFloat(total1.toFixed(2)) : '';
+                                            const displayTotal2 = has2 ? parseFloat(total2.toFixed(2)) : '';
+                                            const displayAvg = (has1 || has2) ? parseFloat(avg.toFixed(2)) : '';
+
+                                            return (
+                                                <tr key={subject}>
+                                                    <td className="text-left" style={{ paddingLeft: '12px' }}>{subject}</td>
+                                                    {renderScoreCell(subject, 'Periodic Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Periodic Assessment', 'Term II')}
+                                                    {renderScoreCell(subject, 'Subject Enrichment Activities', 'Term I')}
+                                                    {renderScoreCell(subject, 'Subject Enrichment Activities', 'Term II')}
+                                                    {renderScoreCell(subject, 'Internal Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Internal Assessment', 'Term II')}
+                                                    {renderScoreCell(subject, 'Terminal Assessment', 'Term I')}
+                                                    {renderScoreCell(subject, 'Terminal Assessment', 'Term II')}
+                                                    <td style={{ fontWeight: 700 }}>{displayTotal1}</td>
+                                                    <td style={{ fontWeight: 700 }}>{displayTotal2}</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{displayAvg}</td>
+                                                </tr>
+                                            );
+                                        });
+
+                                        if (termResults) {
+                                            grandTotal1 = termResults.term1_total;
+                                            grandTotal2 = termResults.term2_total;
+                                            grandTotalAvg = termResults.grand_total;
+                                            subjectCount1 = termResults.term1_subjects;
+                                            subjectCount2 = termResults.term2_subjects;
+                                        }
+
+                                        const max1 = subjectCount1 * 100;
+                                        const max2 = subjectCount2 * 100;
+                                        const maxAvg = termResults ? termResults.max_marks : Math.max(subjectCount1, subjectCount2) * 100;
+
+                                        const p1 = max1 > 0 ? ((grandTotal1 / max1) * 100).toFixed(2) : '';
+                                        const p2 = max2 > 0 ? ((grandTotal2 / max2) * 100).toFixed(2) : '';
+                                        const pAvg = termResults
+                                            ? (termResults.percentage != null ? termResults.percentage.toFixed(2) : '')
+                                            : (maxAvg > 0 ? ((grandTotalAvg / maxAvg) * 100).toFixed(2) : '');
+
+                                        return (
+                                            <>
+                                                {rows}
+                                                <tr className="domain-header">
+                                                    <td colSpan={11} style={{ textAlign: 'right', paddingRight: '15px' }}>Total Marks Obtained</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{maxAvg > 0 ? `${grandTotalAvg.toFixed(1)} / ${maxAvg}` : ''}</td>
+                                                </tr>
+                                                <tr className="domain-header" style={{ background: '#d1e0f7' }}>
+                                                    <td colSpan={11} style={{ textAlign: 'right', paddingRight: '15px' }}>Overall Percentage</td>
+                                                    <td style={{ fontWeight: 800, color: C.navy }}>{pAvg ? `${pAvg}%` : ''}</td>
+                                                </tr>
+                                            </>
+                                        );
+                                    })()}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                    {/* CO-SCHOLASTIC DOMAINS */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Co-Scholastic Domains</SectionHeading>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden' }}>
+                            <table className="foundational-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Physical Education */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Physical Education</td>
+                                    </tr>
+                                    {['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'].map(skill => {
+                                        const grades = getSkillGrades('Physical Education', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                </div>
+            </div>
+
+            {/* ---> PAGE BREAK <--- */}
+            <div className="print-page page-break" style={{
+                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
+                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
+                boxSizing: 'border-box', position: 'relative'
+            }}>
+                <SchoolHeader />
+                <div style={{ padding: '22px 28px 28px' }}>
+
+                    {/* CO-SCHOLASTIC DOMAINS (Continued) */}
+                    <div className="section" style={{ marginTop: 0 }}>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden', borderTop: 'none' }}>
+                            <table className="foundational-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Visual Art */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Visual Art</td>
+                                    </tr>
+                                    {['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'].map(skill => {
+                                        const grades = getSkillGrades('Visual Art', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Performing Art - Dance */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Dance</td>
+                                    </tr>
+                                    {['Posture', 'Expression', 'Rhythm', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Dance', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Performing Art - Music */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Music</td>
+                                    </tr>
+                                    {['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'].map(skill => {
+                                        const grades = getSkillGrades('Performing Art - Music', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                    {/* PERSONALITY DEVELOPMENT SKILLS */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Personality Development Skills</SectionHeading>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden' }}>
+                            <table className="foundational-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Social Skills */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Social Skills</td>
+                                    </tr>
+                                    {['Maintains cordial relationship with peers and adults', 'Demonstrates teamwork and cooperation', 'Respects school property and personal belongings'].map(skill => {
+                                        const grades = getSkillGrades('Social Skills', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Emotional Skills */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Emotional Skills</td>
+                                    </tr>
+                                    {['Shows sensitivity towards rules and norms', 'Demonstrates self-regulation of emotions and behaviour', 'Displays empathy and concern for others'].map(skill => {
+                                        const grades = getSkillGrades('Emotional Skill', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Work Habit */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Work Habit</td>
+                                    </tr>
+                                    {['Maintains regularity and punctuality', 'Demonstrates responsible citizenship', 'Shows care and concern for the environment'].map(skill => {
+                                        const grades = getSkillGrades('Work Habit', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                </div>
+            </div>
+
+            {/* ---> PAGE BREAK <--- */}
+            <div className="print-page page-break" style={{
+                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
+                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
+                boxSizing: 'border-box', position: 'relative'
+            }}>
+                <SchoolHeader />
+                <div style={{ padding: '22px 28px 28px' }}>
+
+                    {/* PERSONALITY DEVELOPMENT SKILLS (Continued) */}
+                    <div className="section" style={{ marginTop: 0 }}>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden', borderTop: 'none' }}>
+                            <table className="foundational-table">
+                                <thead>
+                                    <tr>
+                                        <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
+                                        <th colSpan={2}>Grades</th>
+                                    </tr>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Term I</th>
+                                        <th style={{ width: '25%' }}>Term II</th>
+                                    </tr>
+                                </thead>
+                                <tbody style={{ pageBreakInside: 'avoid' }}>
+                                    {/* Health & Wellness */}
+                                    <tr className="domain-header">
+                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Health & Wellness</td>
+                                    </tr>
+                                    {['Follows good hygiene practices', 'Maintains cleanliness of self and surroundings', 'Demonstrates resilience and positive coping skills'].map(skill => {
+                                        const grades = getSkillGrades('Health & Wellness', skill);
+                                        return (
+                                            <tr key={skill}>
+                                                <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
+                                                <td>{grades?.get('Term I')?.grade || ''}</td>
+                                                <td>{grades?.get('Term II')?.grade || ''}</td>
+                                            </tr>
+                                        );
+                                    })}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+
+                </div>
+            </div>
+            </>)}
+
+            {/* ---> PAGE BREAK <--- */}
+            <div className="print-page page-break" style={{
+                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
+                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
+                boxSizing: 'border-box', position: 'relative'
+            }}>
+                <SchoolHeader />
+                <div style={{ padding: '22px 28px 28px' }}>
+                    {/* FEEDBACK SECTIONS */}
+                    <div className="section">
+                        <div className="feedback-grid">
+                            <div className="feedback-card">
+                                <h3>Learner's Profile by the Teacher</h3>
+                                <div className="feedback-input" style={{ minHeight: '120px' }}>
+                                    {getRemark('Learner’s Profile by the teacher')}
+                                </div>
+                            </div>
+
+                            <div className="feedback-card">
+                                <h3>Parent's Feedback</h3>
+                                {['My child enjoys participating in...', 'My child can be supported for...', 'Any additional observations'].map(label => (
+                                    <div className="feedback-row" key={label}>
+                                        <div className="feedback-label">{label}</div>
+                                        <div className="feedback-input">{getRemark("Parent’s Feedback", label)}</div>
+                                    </div>
+                                ))}
+                            </div>
+
+                            {/* Self Assessment */}
+                            <div className="feedback-card">
+                                <h3>Self-Assessment</h3>
+                                {['Activities I enjoy the most', 'Activities I find challenging', 'Activities I enjoy doing with my friends'].map(label => (
+                                    <div className="feedback-row" key={label}>
+                                        <div className="feedback-label">{label}</div>
+                                        <div className="feedback-input">{getRemark("Self-Assessment", label)}</div>
+                                    </div>
+                                ))}
+                            </div>
+
+
+                        </div>
+                    </div>
+
+                    {/* SIGNATURE SECTION */}
+                    <div className="section" style={{ marginTop: 16 }}>
+                        <SectionHeading>Signature With Date</SectionHeading>
+                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden' }}>
+                            <table className="foundational-table" style={{ tableLayout: 'fixed' }}>
+                                <thead>
+                                    <tr>
+                                        <th style={{ width: '25%' }}>Parent / Guardian</th>
+                                        <th style={{ width: '25%' }}>Class Teacher</th>
+                                        <th style={{ width: '25%' }}>Block Incharge</th>
+                                        <th style={{ width: '25%' }}>Principal</th>
+                                    </tr>
+                                </thead>
+                                <tbody>
+                                    <tr>
+                                        <td style={{ padding: '30px 6px !important' }}></td>
+                                        <td style={{ padding: '30px 6px !important' }}></td>
+                                        <td style={{ padding: '30px 6px !important' }}></td>
+                                        <td style={{ padding: '30px 6px !important' }}></td>
+                                    </tr>
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
 
                 </div>
             </div>
@@ -664,8 +1426,8 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
                 </div>
             </div>
 
-            {/* Local Styles for Matching Foundational */}
-            <style>{`
+            {/* Local Styles for Matching Foundational (built into the shared stylesheet by build_print_css.py) */}
+            {INLINE_PRINT_STYLES ? <style>{`
         @import url('https://fonts.googleapis.com/css2?family=Nunito:wght@400;600;700;800&display=swap');
         
         /* Foundational specifics overrides */
@@ -828,7 +1590,7 @@ export default function ReportTemplate_III_VIII({ reportData }: { reportData: Re
             padding-top: 10px !important;
             padding-bottom: 10px !important;
         }
-        `}</style>
+        `}</style> : <PrintStyles />}
         </div>
     );
 }
@@ -1,13 +1,124 @@
-import { Pool } from 'pg';
+import { Pool, PoolClient } from 'pg';
+import { getMetrics, recordPoolWait } from '@/app/lib/metrics';
 
-// Using environment variables for connection
-// In a real scenario, ensure these are set in .env
-const pool = new Pool({
-    connectionString: process.env.DATABASE_URL,
-    ssl: process.env.NODE_ENV === 'production' ? { rejectUnauthorized: false } : undefined,
-});
+function envInt(name: string, fallback: number) {
+    const value = parseInt(process.env[name] ?? '', 10);
+    return Number.isFinite(value) && value >= 0 ? value : fallback;
+}
+
+// Every serverless instance opens its own pool, so on Vercel each one keeps
+// only a few connections and lets them go quickly; a long-lived server can
+// hold more. PG_POOLER=transaction (or pgbouncer) is for running behind a
+// PgBouncer-style pooler in transaction mode: consecutive queries may land on
+// different server connections there, so named statements are turned off,
+// and statement_timeout is left to the role (ALTER ROLE ... SET
+// statement_timeout) since such poolers refuse it as a startup parameter.
+const pooler = ['transaction', 'pgbouncer'].includes((process.env.PG_POOLER || '').toLowerCase());
+
+export const dbConfig = {
+    max: envInt('PG_POOL_MAX', process.env.VERCEL ? 3 : 10),
+    idleTimeoutMillis: envInt('PG_IDLE_TIMEOUT_MS', process.env.VERCEL ? 5_000 : 30_000),
+    connectionTimeoutMillis: envInt('PG_CONNECT_TIMEOUT_MS', 10_000),
+    // Below the 60 s function limit in vercel.json, so a runaway query fails
+    // the request instead of holding its connection after the function is gone
+    statementTimeoutMillis: envInt('PG_STATEMENT_TIMEOUT_MS', 30_000),
+    pooler,
+    namedStatements: !pooler,
+};
+
+// One pool per server process, including across dev hot reloads
+const globalForDb = globalThis as unknown as {
+    hpcPool?: Pool;
+    hpcDbStats?: { connectionsOpened: number; coalescedReads: Map<string, number> };
+};
+const stats = globalForDb.hpcDbStats ?? (globalForDb.hpcDbStats = { connectionsOpened: 0, coalescedReads: new Map() });
+
+function createPool() {
+    const pool = new Pool({
+        connectionString: process.env.DATABASE_URL,
+        ssl: process.env.NODE_ENV === 'production' ? { rejectUnauthorized: false } : undefined,
+        max: dbConfig.max,
+        idleTimeoutMillis: dbConfig.idleTimeoutMillis,
+        connectionTimeoutMillis: dbConfig.connectionTimeoutMillis,
+        statement_timeout: dbConfig.pooler || !dbConfig.statementTimeoutMillis ? undefined : dbConfig.statementTimeoutMillis,
+    });
+
+    pool.on('connect', () => { stats.connectionsOpened++; });
+    // An idle client dropped by the server or the pooler must not take the process down
+    pool.on('error', (err) => {
+        console.error('Idle pg client error:', err.message);
+    });
+
+    // Time every checkout, including the ones pool.query makes internally (it
+    // calls connect with a callback)
+    const checkout = pool.connect.bind(pool) as (callback?: any) => any;
+    pool.connect = ((callback?: (err: Error | undefined, client: PoolClient | undefined, done: (release?: any) => void) => void) => {
+        const start = performance.now();
+        if (callback) {
+            return checkout((err: Error | undefined, client: PoolClient | undefined, done: (release?: any) => void) => {
+                recordPoolWait(performance.now() - start);
+                callback(err, client, done);
+            });
+        }
+        return checkout().then((client: PoolClient) => {
+            recordPoolWait(performance.now() - start);
+            return client;
+        });
+    }) as typeof pool.connect;
+
+    return pool;
+}
+
+const pool = globalForDb.hpcPool ?? (globalForDb.hpcPool = createPool());
+
+getMetrics().registerGauge('hpc_pg_pool_clients', 'Clients of the pg pool by state.', () => [
+    { labels: { state: 'total' }, value: pool.totalCount },
+    { labels: { state: 'idle' }, value: pool.idleCount },
+    { labels: { state: 'waiting' }, value: pool.waitingCount },
+    { labels: { state: 'max' }, value: dbConfig.max },
+]);
+getMetrics().registerGauge('hpc_pg_connections_opened', 'Server connections the pg pool has opened since start.', () => [
+    { labels: {}, value: stats.connectionsOpened },
+]);
+getMetrics().registerGauge('hpc_pg_coalesced_reads', 'Lookups answered by a read already started in the same tick.', () =>
+    Array.from(stats.coalescedReads, ([reader, value]) => ({ labels: { reader }, value }))
+);
+
+/**
+ * Shares one read between the lookups of the same (student_id,
+ * academic_year_id) made in the same tick of the event loop, e.g. a report
+ * page and its PDF requested together, or a burst of parents opening the
+ * same card. The key is dropped once the tick is over, so a lookup that
+ * starts after a write still reads it.
+ */
+export function batchReads<T>(
+    name: string,
+    load: (student_id: number, academic_year_id: number) => Promise<T>
+): (student_id: number, academic_year_id: number) => Promise<T> {
+    const pending = new Map<string, Promise<T>>();
+    stats.coalescedReads.set(name, stats.coalescedReads.get(name) ?? 0);
+    return (student_id, academic_year_id) => {
+        const key = `${student_id}:${academic_year_id}`;
+        const shared = pending.get(key);
+        if (shared) {
+            stats.coalescedReads.set(name, stats.coalescedReads.get(name)! + 1);
+            return shared;
+        }
+        const read = load(student_id, academic_year_id);
+        pending.set(key, read);
+        setImmediate(() => pending.delete(key));
+        return read;
+    };
+}
 
 export const db = {
     query: (text: string, params?: any[]) => pool.query(text, params),
+    // Hot fixed queries: a named statement is parsed and planned once per
+    // connection and then only bound and executed. The name must always go
+    // with the same text; behind a transaction pooler it runs unnamed. List
+    // the columns explicitly: with SELECT * a column added at runtime breaks
+    // the statement on every connection that already prepared it.
+    prepared: (name: string, text: string, params?: any[]) =>
+        pool.query(dbConfig.namedStatements ? { name, text, values: params } : { text, values: params }),
     pool,
 };
@@ -0,0 +1,190 @@
+import { db } from '@/app/lib/db';
+
+type Queryable = { query: (text: string, params?: any[]) => Promise<any> };
+
+// The SQL below is kept in step with scripts/rebuild-fee-ledger.js, which
+// rebuilds the rollups from student_fee_payments for historical data.
+
+// A payment is attributed to the class and section the student is enrolled
+// in for the payment's academic year. 0 stands for "unknown" (no enrollment,
+// no fee structure) so every dimension can be part of the primary key.
+const RECORD_SQL = `
+    INSERT INTO fee_ledger_daily
+        (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id, amount, payment_count, updated_at)
+    SELECT fp.payment_date, COALESCE(fp.payment_mode, 'UNKNOWN'), COALESCE(fp.academic_year_id, 0),
+        COALESCE(se.class_id, 0), COALESCE(se.section_id, 0), COALESCE(fs.fee_head_id, 0),
+        SUM(fp.amount_paid), COUNT(*), NOW()
+    FROM student_fee_payments fp
+    LEFT JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+    LEFT JOIN student_enrollments se ON se.student_id = fp.student_id AND se.academic_year_id = fp.academic_year_id
+    WHERE fp.id = ANY($1)
+    GROUP BY 1, 2, 3, 4, 5, 6
+    ON CONFLICT (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id) DO UPDATE SET
+        amount = fee_ledger_daily.amount + EXCLUDED.amount,
+        payment_count = fee_ledger_daily.payment_count + EXCLUDED.payment_count,
+        updated_at = NOW()
+`;
+
+// Postgres' undefined_table: fee_ledger_daily has not been migrated yet
+export const UNDEFINED_TABLE = '42P01';
+
+/**
+ * Add freshly inserted payments to the daily rollups. Runs inside the
+ * payment transaction so the ledger never disagrees with the payments: any
+ * failure fails the payment. Only a missing table (not migrated yet) is
+ * rolled back to a savepoint and logged; scripts/rebuild-fee-ledger.js
+ * catches up once it exists.
+ */
+export async function recordPayments(client: Queryable, paymentIds: number[]): Promise<void> {
+    if (paymentIds.length === 0) return;
+    await client.query('SAVEPOINT fee_ledger');
+    try {
+        await client.query(RECORD_SQL, [paymentIds]);
+        await client.query('RELEASE SAVEPOINT fee_ledger');
+    } catch (e: any) {
+        if (e.code !== UNDEFINED_TABLE) throw e;
+        await client.query('ROLLBACK TO SAVEPOINT fee_ledger');
+        console.warn('Could not update fee_ledger_daily:', e.message);
+    }
+}
+
+export interface CollectionRange {
+    from: string;
+    to: string;
+    academic_year_id?: number;
+}
+
+export interface CollectionSummary {
+    from: string;
+    to: string;
+    totalCollection: number;
+    transactionCount: number;
+    summaryByMode: Record<string, number>;
+    byDay: { date: string; amount: number; count: number }[];
+    byClass: { class_id: number; section_id: number; class_name: string | null; section_name: string | null; amount: number; count: number }[];
+    byHead: { fee_head_id: number; head_name: string | null; amount: number; count: number }[];
+}
+
+// Every breakdown in one pass over the range: the primary key leads with
+// payment_date, so a month is a few hundred rollup rows at most
+const SUMMARY_SQL = `
+    WITH g AS (
+        SELECT
+            CASE
+                WHEN GROUPING(payment_mode) = 0 THEN 'mode'
+                WHEN GROUPING(payment_date) = 0 THEN 'day'
+                WHEN GROUPING(class_id) = 0 THEN 'class'
+                WHEN GROUPING(fee_head_id) = 0 THEN 'head'
+                ELSE 'total'
+            END AS dimension,
+            payment_mode, to_char(payment_date, 'YYYY-MM-DD') AS payment_date, class_id, section_id, fee_head_id,
+            SUM(amount)::float8 AS amount, SUM(payment_count)::int AS count
+        FROM fee_ledger_daily
+        WHERE payment_date BETWEEN $1 AND $2
+          AND ($3::int IS NULL OR academic_year_id = $3)
+        GROUP BY GROUPING SETS ((), (payment_mode), (payment_date), (class_id, section_id), (fee_head_id))
+    )
+    SELECT g.*, c.class_name, sec.section_name, fh.head_name
+    FROM g
+    LEFT JOIN classes c ON c.id = g.class_id
+    LEFT JOIN sections sec ON sec.id = g.section_id
+    LEFT JOIN fee_heads fh ON fh.id = g.fee_head_id
+    ORDER BY g.dimension, g.payment_date, g.amount DESC
+`;
+
+/** Collection totals for an inclusive date range, read from the rollups only. */
+export async function getCollectionSummary(range: CollectionRange): Promise<CollectionSummary> {
+    const { rows } = await db.query(SUMMARY_SQL, [range.from, range.to, range.academic_year_id ?? null]);
+
+    const summary: CollectionSummary = {
+        from: range.from,
+        to: range.to,
+        totalCollection: 0,
+        transactionCount: 0,
+        summaryByMode: {},
+        byDay: [],
+        byClass: [],
+        byHead: [],
+    };
+    for (const row of rows) {
+        switch (row.dimension) {
+            case 'total':
+                summary.totalCollection = row.amount ?? 0;
+                summary.transactionCount = row.count ?? 0;
+                break;
+            case 'mode':
+                summary.summaryByMode[row.payment_mode] = row.amount;
+                break;
+            case 'day':
+                summary.byDay.push({ date: row.payment_date, amount: row.amount, count: row.count });
+                break;
+            case 'class':
+                summary.byClass.push({
+                    class_id: row.class_id, section_id: row.section_id,
+                    class_name: row.class_name, section_name: row.section_name,
+                    amount: row.amount, count: row.count,
+                });
+                break;
+            case 'head':
+                summary.byHead.push({ fee_head_id: row.fee_head_id, head_name: row.head_name, amount: row.amount, count: row.count });
+                break;
+        }
+    }
+    return summary;
+}
+
+/**
+ * The same summary computed from payment rows already fetched (amount_paid,
+ * payment_mode, class_id, section_id, class_name, section_name, fee_head_id,
+ * head_name). Used by the daily report when the ledger is missing or
+ * disagrees with the day's transactions.
+ */
+export function summarizeTransactions(from: string, to: string, rows: any[]): CollectionSummary {
+    const summary: CollectionSummary = {
+        from,
+        to,
+        totalCollection: 0,
+        transactionCount: rows.length,
+        summaryByMode: {},
+        byDay: [],
+        byClass: [],
+        byHead: [],
+    };
+    const days = new Map<string, CollectionSummary['byDay'][number]>();
+    const classes = new Map<string, CollectionSummary['byClass'][number]>();
+    const heads = new Map<number, CollectionSummary['byHead'][number]>();
+    for (const row of rows) {
+        const amount = Number(row.amount_paid);
+        const mode = row.payment_mode || 'UNKNOWN';
+        summary.totalCollection += amount;
+        summary.summaryByMode[mode] = (summary.summaryByMode[mode] ?? 0) + amount;
+
+        // pg parses DATE as local midnight
+        const date = row.payment_date instanceof Date
+            ? row.payment_date.toLocaleDateString('en-CA')
+            : String(row.payment_date);
+        const day = days.get(date) ?? { date, amount: 0, count: 0 };
+        day.amount += amount;
+        day.count++;
+        days.set(date, day);
+
+        const classKey = `${row.class_id ?? 0}:${row.section_id ?? 0}`;
+        const cls = classes.get(classKey) ?? {
+            class_id: row.class_id ?? 0, section_id: row.section_id ?? 0,
+            class_name: row.class_name ?? null, section_name: row.section_name ?? null,
+            amount: 0, count: 0,
+        };
+        cls.amount += amount;
+        cls.count++;
+        classes.set(classKey, cls);
+
+        const head = heads.get(row.fee_head_id ?? 0) ?? { fee_head_id: row.fee_head_id ?? 0, head_name: row.head_name ?? null, amount: 0, count: 0 };
+        head.amount += amount;
+        head.count++;
+        heads.set(head.fee_head_id, head);
+    }
+    summary.byDay = Array.from(days.values()).sort((a, b) => a.date.localeCompare(b.date));
+    summary.byClass = Array.from(classes.values()).sort((a, b) => b.amount - a.amount);
+    summary.byHead = Array.from(heads.values()).sort((a, b) => b.amount - a.amount);
+    return summary;
+}
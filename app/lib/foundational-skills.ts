@@ -159,6 +159,9 @@ export const FOUNDATIONAL_DOMAINS: FoundationalDomain[] = [
     },
 ];
 
+// Domains by key, so a card looks each domain's table up once instead of scanning the list
+export const FOUNDATIONAL_DOMAIN_INDEX = new Map(FOUNDATIONAL_DOMAINS.map(d => [d.key, d]));
+
 // Self-Assessment prompts (text fields)
 export const SELF_ASSESS_FIELDS = [
     { key: 'sa_01', label: '1. Activities that I enjoy the most' },
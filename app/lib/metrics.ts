@@ -0,0 +1,168 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+
+// Upper bounds in seconds: from a 1 ms indexed query to a cold browser launch
+const BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30];
+
+type Labels = Record<string, string>;
+
+interface Series {
+    labels: Labels;
+    buckets: number[];
+    sum: number;
+    count: number;
+}
+
+interface HistogramFamily {
+    help: string;
+    series: Map<string, Series>;
+}
+
+interface GaugeFamily {
+    help: string;
+    collect: () => { labels: Labels; value: number }[];
+}
+
+function labelString(labels: Labels, extra: Labels = {}) {
+    const pairs = Object.entries({ ...labels, ...extra })
+        .map(([k, v]) => `${k}="${v.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`);
+    return pairs.length ? `{${pairs.join(',')}}` : '';
+}
+
+/**
+ * In-process histograms and gauges, rendered in the Prometheus text format
+ * by GET /api/health?format=prometheus.
+ */
+class MetricsRegistry {
+    private histograms = new Map<string, HistogramFamily>();
+    private gauges = new Map<string, GaugeFamily>();
+
+    observe(name: string, help: string, labels: Labels, seconds: number) {
+        let family = this.histograms.get(name);
+        if (!family) {
+            family = { help, series: new Map() };
+            this.histograms.set(name, family);
+        }
+        const key = labelString(labels);
+        let series = family.series.get(key);
+        if (!series) {
+            series = { labels, buckets: BUCKETS.map(() => 0), sum: 0, count: 0 };
+            family.series.set(key, series);
+        }
+        for (let i = 0; i < BUCKETS.length; i++) {
+            if (seconds <= BUCKETS[i]) series.buckets[i]++;
+        }
+        series.sum += seconds;
+        series.count++;
+    }
+
+    // Gauges are read when scraped; registering a name again replaces it
+    registerGauge(name: string, help: string, collect: GaugeFamily['collect']) {
+        this.gauges.set(name, { help, collect });
+    }
+
+    render(): string {
+        const lines: string[] = [];
+        for (const [name, family] of this.histograms) {
+            lines.push(`# HELP ${name} ${family.help}`, `# TYPE ${name} histogram`);
+            for (const series of family.series.values()) {
+                BUCKETS.forEach((le, i) => {
+                    lines.push(`${name}_bucket${labelString(series.labels, { le: String(le) })} ${series.buckets[i]}`);
+                });
+                lines.push(`${name}_bucket${labelString(series.labels, { le: '+Inf' })} ${series.count}`);
+                lines.push(`${name}_sum${labelString(series.labels)} ${series.sum}`);
+                lines.push(`${name}_count${labelString(series.labels)} ${series.count}`);
+            }
+        }
+        for (const [name, family] of this.gauges) {
+            lines.push(`# HELP ${name} ${family.help}`, `# TYPE ${name} gauge`);
+            for (const { labels, value } of family.collect()) {
+                lines.push(`${name}${labelString(labels)} ${value}`);
+            }
+        }
+        return lines.join('\n') + '\n';
+    }
+}
+
+interface RequestTrace {
+    spans: { name: string; ms: number }[];
+    pool_wait_ms: number;
+}
+
+// One registry and trace store per server process, including across dev hot reloads
+const globalForMetrics = globalThis as unknown as {
+    hpcMetrics?: MetricsRegistry;
+    hpcTraces?: AsyncLocalStorage<RequestTrace>;
+};
+
+export function getMetrics(): MetricsRegistry {
+    if (!globalForMetrics.hpcMetrics) {
+        globalForMetrics.hpcMetrics = new MetricsRegistry();
+    }
+    return globalForMetrics.hpcMetrics;
+}
+
+function traces(): AsyncLocalStorage<RequestTrace> {
+    if (!globalForMetrics.hpcTraces) {
+        globalForMetrics.hpcTraces = new AsyncLocalStorage<RequestTrace>();
+    }
+    return globalForMetrics.hpcTraces;
+}
+
+const round = (ms: number) => Math.round(ms * 100) / 100;
+
+/** Record a span measured elsewhere (e.g. the PDF pool's own timings). */
+export function recordSpan(name: string, ms: number) {
+    getMetrics().observe('hpc_span_seconds', 'Duration of instrumented spans: report queries, PDF phases, exports.', { span: name }, ms / 1000);
+    traces().getStore()?.spans.push({ name, ms: round(ms) });
+}
+
+/** Time `fn` as span `name`, whether it resolves or throws. */
+export async function timed<T>(name: string, fn: () => Promise<T>): Promise<T> {
+    const start = performance.now();
+    try {
+        return await fn();
+    } finally {
+        recordSpan(name, performance.now() - start);
+    }
+}
+
+/** Time spent waiting for a pg client; called by app/lib/db.ts on every checkout. */
+export function recordPoolWait(ms: number) {
+    getMetrics().observe('hpc_pg_pool_wait_seconds', 'Time spent waiting for a free client from the pg pool.', {}, ms / 1000);
+    const trace = traces().getStore();
+    if (trace) trace.pool_wait_ms += ms;
+}
+
+/**
+ * Run a route handler with span collection. When it finishes, the request
+ * duration goes to the hpc_request_seconds histogram and one JSON line is
+ * logged:
+ *
+ *   {"ts":"...","event":"timings","name":"GET /api/...","status":200,
+ *    "duration_ms":812.4,"pool_wait_ms":0.3,"spans":[{"name":"report.scholastic","ms":4.1},...]}
+ *
+ * The template codemods (template_pipeline.SpanLog) log their stages in the
+ * same shape, so build and render timings land on the same dashboard.
+ */
+export async function traceRequest<T>(name: string, handler: () => Promise<T>): Promise<T> {
+    const trace: RequestTrace = { spans: [], pool_wait_ms: 0 };
+    const start = performance.now();
+    let status: number | string = 'error';
+    try {
+        const result = await traces().run(trace, handler);
+        status = result instanceof Response ? result.status : 'ok';
+        return result;
+    } finally {
+        const ms = performance.now() - start;
+        getMetrics().observe('hpc_request_seconds', 'Duration of traced API requests.', { route: name }, ms / 1000);
+        console.log(JSON.stringify({
+            ts: new Date().toISOString(),
+            event: 'timings',
+            name,
+            status,
+            duration_ms: round(ms),
+            pool_wait_ms: round(trace.pool_wait_ms),
+            spans: trace.spans,
+        }));
+    }
+}
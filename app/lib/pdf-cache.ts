@@ -0,0 +1,226 @@
+import { createHash, randomBytes } from 'crypto';
+import { promises as fs, readdirSync, readFileSync, statSync } from 'fs';
+import os from 'os';
+import path from 'path';
+import { db } from '@/app/lib/db';
+
+const CACHE_DIR = process.env.PDF_CACHE_DIR || path.join(os.tmpdir(), 'hpc-pdf-cache');
+const MAX_BYTES = parseInt(process.env.PDF_CACHE_MAX_MB || '512', 10) * 1024 * 1024;
+
+// What a printed page is rendered from: the report and receipt components,
+// the print pages and the shared print stylesheet
+const TEMPLATE_SOURCES = ['app/components/reports', 'app/print', 'app/lib/print-styles.ts', 'public/styles'];
+
+function hashSources(hash: ReturnType<typeof createHash>, file: string): number {
+    if (!statSync(file).isDirectory()) {
+        hash.update(file).update(readFileSync(file));
+        return 1;
+    }
+    return readdirSync(file).sort()
+        .reduce((count, name) => count + hashSources(hash, path.join(file, name)), 0);
+}
+
+function templateVersion(): string {
+    const explicit = process.env.PDF_TEMPLATE_VERSION || process.env.VERCEL_GIT_COMMIT_SHA;
+    if (explicit) return explicit;
+    // A production build has its own id; under next dev an old one may be
+    // left in .next, so the sources are hashed instead
+    if (process.env.NODE_ENV === 'production') {
+        try {
+            return readFileSync(path.join(process.cwd(), '.next', 'BUILD_ID'), 'utf8').trim();
+        } catch {}
+    }
+    try {
+        const hash = createHash('sha256');
+        const files = TEMPLATE_SOURCES.reduce((count, source) => count + hashSources(hash, path.join(process.cwd(), source)), 0);
+        if (files > 0) return hash.digest('hex').slice(0, 16);
+    } catch {}
+    // Nothing to tell templates apart: never reuse files from another process
+    return randomBytes(8).toString('hex');
+}
+
+// Part of every cache key: a build or template change gets a fresh key space
+// instead of serving cards rendered with the old layout from disk
+export const PDF_TEMPLATE_VERSION = templateVersion();
+
+interface CacheEntry {
+    size: number;
+}
+
+/**
+ * Size-bounded, content-addressed PDF store on local disk.
+ *
+ * Files are named by their key. The in-memory index is a Map in LRU order
+ * (oldest first): a hit moves the entry to the end, and inserts evict from
+ * the front until the store is back under PDF_CACHE_MAX_MB.
+ */
+class PdfCache {
+    private entries = new Map<string, CacheEntry>();
+    private bytes = 0;
+    // Keys being written; concurrent renders of one key store it only once
+    private writing = new Set<string>();
+    private loading: Promise<void> | null = null;
+    private counters = { hits: 0, misses: 0, writes: 0, evictions: 0 };
+
+    // Pick up files left by an earlier process, oldest first
+    private load(): Promise<void> {
+        if (!this.loading) {
+            this.loading = (async () => {
+                await fs.mkdir(CACHE_DIR, { recursive: true });
+                const files = await fs.readdir(CACHE_DIR);
+                const stats = await Promise.all(files.filter(f => f.endsWith('.pdf')).map(async f => {
+                    const stat = await fs.stat(path.join(CACHE_DIR, f)).catch(() => null);
+                    return stat && { key: f.slice(0, -4), size: stat.size, atime: stat.atimeMs };
+                }));
+                for (const s of stats.filter(Boolean).sort((a, b) => a!.atime - b!.atime)) {
+                    this.entries.set(s!.key, { size: s!.size });
+                    this.bytes += s!.size;
+                }
+            })();
+        }
+        return this.loading;
+    }
+
+    private fileFor(key: string) {
+        return path.join(CACHE_DIR, `${key}.pdf`);
+    }
+
+    async get(key: string): Promise<Buffer | null> {
+        await this.load();
+        const entry = this.entries.get(key);
+        if (entry) {
+            try {
+                const buffer = await fs.readFile(this.fileFor(key));
+                this.entries.delete(key);
+                this.entries.set(key, entry);
+                this.counters.hits++;
+                return buffer;
+            } catch {
+                // File removed behind our back: treat as a miss
+                this.entries.delete(key);
+                this.bytes -= entry.size;
+            }
+        }
+        this.counters.misses++;
+        return null;
+    }
+
+    async set(key: string, buffer: Buffer): Promise<void> {
+        await this.load();
+        if (buffer.length > MAX_BYTES || this.entries.has(key) || this.writing.has(key)) return;
+
+        // Write then rename so a concurrent reader never sees a partial file;
+        // the random suffix keeps writers in other processes apart
+        const file = this.fileFor(key);
+        const tmp = `${file}.${process.pid}.${randomBytes(6).toString('hex')}.tmp`;
+        this.writing.add(key);
+        try {
+            await fs.writeFile(tmp, buffer);
+            await fs.rename(tmp, file);
+        } catch (error) {
+            await fs.unlink(tmp).catch(() => {});
+            throw error;
+        } finally {
+            this.writing.delete(key);
+        }
+        if (this.entries.has(key)) return;
+
+        this.entries.set(key, { size: buffer.length });
+        this.bytes += buffer.length;
+        this.counters.writes++;
+
+        for (const [oldKey, entry] of this.entries) {
+            if (this.bytes <= MAX_BYTES) break;
+            this.entries.delete(oldKey);
+            this.bytes -= entry.size;
+            this.counters.evictions++;
+            await fs.unlink(this.fileFor(oldKey)).catch(() => {});
+        }
+    }
+
+    stats() {
+        const lookups = this.counters.hits + this.counters.misses;
+        return {
+            ...this.counters,
+            hit_ratio: lookups ? Number((this.counters.hits / lookups).toFixed(3)) : 0,
+            entries: this.entries.size,
+            bytes: this.bytes,
+            max_bytes: MAX_BYTES,
+            template_version: PDF_TEMPLATE_VERSION,
+        };
+    }
+}
+
+// One index per server process, including across dev hot reloads
+const globalForCache = globalThis as unknown as { pdfCache?: PdfCache };
+
+export function getPdfCache(): PdfCache {
+    if (!globalForCache.pdfCache) {
+        globalForCache.pdfCache = new PdfCache();
+    }
+    return globalForCache.pdfCache;
+}
+
+export function pdfCacheKey(kind: string, payload: unknown): string {
+    return createHash('sha256')
+        .update(JSON.stringify({ kind, template: PDF_TEMPLATE_VERSION, payload }))
+        .digest('hex');
+}
+
+// ─── Per-student report versions ─────────────────────────────────────────────
+
+/**
+ * Current report version of a student. Part of the report card cache key, so
+ * data that is not in the report payload (e.g. foundational ratings) still
+ * invalidates cached cards.
+ *
+ * Returns null when the versions table is unavailable; callers must then
+ * bypass the cache since invalidation cannot be guaranteed.
+ */
+export async function getReportVersion(studentId: number, academicYearId: number): Promise<number | null> {
+    try {
+        const { rows } = await db.query(
+            'SELECT version FROM report_card_versions WHERE student_id = $1 AND academic_year_id = $2',
+            [studentId, academicYearId]
+        );
+        return rows[0]?.version ?? 0;
+    } catch (e: any) {
+        console.warn('report_card_versions unavailable, PDF cache bypassed:', e.message);
+        return null;
+    }
+}
+
+/**
+ * Bump the report version of every given student after a write that changes
+ * their report card. Call it after COMMIT: a failure here is logged and never
+ * fails the write itself.
+ */
+export async function bumpReportVersions(studentIds: number[], academicYearId: number): Promise<void> {
+    const ids = Array.from(new Set(studentIds));
+    if (ids.length === 0) return;
+    try {
+        await db.query(`
+            INSERT INTO report_card_versions (student_id, academic_year_id, version, updated_at)
+            SELECT UNNEST($1::int[]), $2, 1, NOW()
+            ON CONFLICT (student_id, academic_year_id)
+            DO UPDATE SET version = report_card_versions.version + 1, updated_at = NOW()
+        `, [ids, academicYearId]);
+    } catch (e: any) {
+        console.warn('Could not bump report_card_versions:', e.message);
+    }
+}
+
+// Profile edits show on the card of every year the student was enrolled in
+export async function bumpAllReportVersions(studentId: number): Promise<void> {
+    try {
+        await db.query(`
+            INSERT INTO report_card_versions (student_id, academic_year_id, version, updated_at)
+            SELECT student_id, academic_year_id, 1, NOW()
+            FROM student_enrollments WHERE student_id = $1
+            ON CONFLICT (student_id, academic_year_id)
+            DO UPDATE SET version = report_card_versions.version + 1, updated_at = NOW()
+        `, [studentId]);
+    } catch (e: any) {
+        console.warn('Could not bump report_card_versions:', e.message);
+    }
+}
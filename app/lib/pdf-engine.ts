@@ -1,51 +1,170 @@
+import { getPdfPool, PdfJobResult, PdfJobTimings } from '@/app/lib/pdf-pool';
+import { getPdfCache, getReportVersion, pdfCacheKey } from '@/app/lib/pdf-cache';
+import { getStudentReportData } from '@/app/lib/report-service';
+import { getReceiptData } from '@/app/lib/receipt-service';
+import { recordSpan, timed } from '@/app/lib/metrics';
 
-import puppeteer from 'puppeteer-core';
-
+export interface PdfRenderResult extends PdfJobResult {
+    cache_hit: boolean;
+}
 
-export async function generatePagePdf(targetUrl: string): Promise<Buffer> {
-    let browser;
+export async function renderPagePdf(targetUrl: string): Promise<PdfJobResult> {
     try {
-        if (process.env.NODE_ENV === 'production') {
-            const chromium = require('@sparticuz/chromium');
-            browser = await puppeteer.launch({
-                args: chromium.args,
-                defaultViewport: chromium.defaultViewport,
-                executablePath: await chromium.executablePath(),
-                headless: chromium.headless,
-                ignoreHTTPSErrors: true,
-            } as any);
-        } else {
-            const localPuppeteer = require('puppeteer');
-            browser = await localPuppeteer.launch({
-                headless: true,
-                args: ['--no-sandbox', '--disable-setuid-sandbox']
-            });
-        }
-
-        const page = await browser.newPage();
-        console.log(`Generating PDF for URL: ${targetUrl}`);
-
-        await page.goto(targetUrl, { waitUntil: 'networkidle0', timeout: 60000 });
-
-        const pdfBuffer = await page.pdf({
-            format: 'A4',
-            printBackground: true,
-            margin: { top: '0mm', right: '0mm', bottom: '0mm', left: '0mm' }
-        });
-
-        return Buffer.from(pdfBuffer);
+        const result = await getPdfPool().render(targetUrl);
+        // The pool times each phase itself; queue is the wait for a free page,
+        // navigate is page.goto until network idle and fonts, render is page.pdf
+        const { timings } = result;
+        recordSpan('pdf.queue', timings.queue_ms);
+        recordSpan('pdf.navigate', timings.navigate_ms);
+        recordSpan('pdf.render', timings.render_ms);
+        recordSpan('pdf.total', timings.total_ms);
+        return result;
     } catch (error) {
         console.error("PDF Engine Error Detail:", error);
         throw error;
-    } finally {
-        if (browser) await browser.close();
     }
 }
 
-export async function generatePdf(studentId: number, academicYearId: number): Promise<Buffer> {
+export async function generatePagePdf(targetUrl: string): Promise<Buffer> {
+    return (await renderPagePdf(targetUrl)).buffer;
+}
+
+// Server-Timing header value so per-job timings show up in browser dev tools
+export function serverTimingHeader(timings: PdfJobTimings, cacheHit: boolean = false): string {
+    const cache = `cache;desc=${cacheHit ? 'hit' : 'miss'}`;
+    return `${cache}, queue;dur=${timings.queue_ms}, load;dur=${timings.navigate_ms}, pdf;dur=${timings.render_ms}, total;dur=${timings.total_ms}`;
+}
+
+/**
+ * Serve the PDF stored under `key`, or render `targetUrl` and store it.
+ * `key` must be computed before rendering so a write that lands mid-render
+ * changes the key and the stale result is never served again. Only a
+ * successful render is stored: the pool throws when the print page answers
+ * with an error or not-found page.
+ */
+async function renderCached(key: string, targetUrl: string): Promise<PdfRenderResult> {
+    const start = Date.now();
+    const cache = getPdfCache();
+    const cached = await timed('pdf.cache_lookup', () => cache.get(key));
+    if (cached) {
+        const total_ms = Date.now() - start;
+        return {
+            buffer: cached,
+            timings: { queue_ms: 0, navigate_ms: 0, render_ms: 0, total_ms, page_jobs: 0 },
+            cache_hit: true,
+        };
+    }
+
+    const result = await renderPagePdf(targetUrl);
+    await cache.set(key, result.buffer).catch((e: any) => console.warn('PDF cache write failed:', e.message));
+    return { ...result, cache_hit: false };
+}
+
+function printUrl(pathAndQuery: string) {
     const token = process.env.PDF_INTERNAL_TOKEN || 'default_secret';
     const baseUrl = process.env.NEXT_PUBLIC_APP_URL || 'http://localhost:3000';
-    const url = `${baseUrl}/print/student/${studentId}?token=${token}&academic_year_id=${academicYearId}`;
-    return generatePagePdf(url);
+    const separator = pathAndQuery.includes('?') ? '&' : '?';
+    return `${baseUrl}${pathAndQuery}${separator}token=${token}`;
+}
+
+function studentReportUrl(studentId: number, academicYearId: number) {
+    return printUrl(`/print/student/${studentId}?academic_year_id=${academicYearId}`);
+}
+
+/**
+ * Report card PDF, served from the cache when neither the report data nor
+ * the student's report version changed since it was last rendered.
+ */
+export async function renderStudentPdf(studentId: number, academicYearId: number): Promise<PdfRenderResult> {
+    // Read the version before the data so a concurrent write can only make
+    // the key newer than the content, never older
+    const version = await timed('pdf.report_version', () => getReportVersion(studentId, academicYearId));
+    const reportData = await getStudentReportData(studentId, academicYearId);
+    const url = studentReportUrl(studentId, academicYearId);
+    if (!reportData || version === null) {
+        return { ...(await renderPagePdf(url)), cache_hit: false };
+    }
+
+    const { generated_at, ...payload } = reportData;
+    const key = pdfCacheKey('report', { student_id: studentId, academic_year_id: academicYearId, version, payload });
+    return renderCached(key, url);
+}
+
+/**
+ * Receipt PDF, or null when there is no such payment. The receipt also
+ * prints the student's name and current class, so the key is the whole
+ * printed payload, not just the id.
+ */
+export async function renderReceiptPdf(receiptId: string): Promise<PdfRenderResult | null> {
+    const receipt = await getReceiptData(receiptId);
+    if (!receipt) return null;
+    const key = pdfCacheKey('receipt', { receipt_id: receiptId, payload: receipt });
+    return renderCached(key, printUrl(`/print/receipt/${receiptId}`));
+}
+
+export async function generatePdf(studentId: number, academicYearId: number): Promise<Buffer> {
+    return (await renderStudentPdf(studentId, academicYearId)).buffer;
+}
+
+export interface StudentPdfResult {
+    student_id: number;
+    buffer?: Buffer;
+    timings?: PdfJobTimings;
+    cache_hit?: boolean;
+    error?: string;
 }
 
+/**
+ * Render report cards for a batch of students of one academic year.
+ *
+ * Cached cards are served from the PDF cache; up to `concurrency` jobs run
+ * at once on the shared page pool (which bounds the real parallelism).
+ * Results are yielded in input order as soon as each one is ready, so callers
+ * can stream them; a failed student yields an `error` instead of aborting
+ * the batch.
+ */
+export async function* generateStudentPdfs(
+    studentIds: number[],
+    academicYearId: number,
+    concurrency: number = getPdfPool().capacity
+): AsyncGenerator<StudentPdfResult> {
+    const render = (student_id: number): Promise<StudentPdfResult> =>
+        renderStudentPdf(student_id, academicYearId).then(
+            ({ buffer, timings, cache_hit }) => ({ student_id, buffer, timings, cache_hit }),
+            (error: any) => ({ student_id, error: error.message })
+        );
+
+    const inFlight: Promise<StudentPdfResult>[] = [];
+    let next = 0;
+    while (next < studentIds.length && inFlight.length < concurrency) {
+        inFlight.push(render(studentIds[next++]));
+    }
+    while (inFlight.length > 0) {
+        const result = await inFlight.shift()!;
+        if (next < studentIds.length) inFlight.push(render(studentIds[next++]));
+        yield result;
+    }
+}
+
+// Chromium holds the whole merged document in memory and only starts
+// streaming once it is laid out, so a merged PDF is capped at this many cards
+export const BUNDLE_PDF_MAX_CARDS = parseInt(process.env.BUNDLE_PDF_MAX_CARDS || '40', 10);
+
+/**
+ * One merged PDF for up to BUNDLE_PDF_MAX_CARDS students, streamed straight
+ * from Chromium. All cards are laid out on a single print page, so shared
+ * fonts and the school logo are embedded once.
+ */
+export async function renderBundlePdfStream(filter: {
+    academic_year_id: number;
+    student_ids: number[];
+}): Promise<ReadableStream<Uint8Array>> {
+    if (filter.student_ids.length > BUNDLE_PDF_MAX_CARDS) {
+        throw new Error(`A merged PDF holds at most ${BUNDLE_PDF_MAX_CARDS} report cards`);
+    }
+    const query = new URLSearchParams({
+        academic_year_id: String(filter.academic_year_id),
+        student_ids: filter.student_ids.join(','),
+    });
+    return getPdfPool().renderStream(printUrl(`/print/bundle?${query}`));
+}
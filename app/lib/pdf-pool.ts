@@ -0,0 +1,257 @@
+import puppeteer from 'puppeteer-core';
+import type { Browser, Page } from 'puppeteer-core';
+import { timed } from '@/app/lib/metrics';
+
+// Pool sizing; every value can be overridden from the environment
+const POOL_CONFIG = {
+    browsers: parseInt(process.env.PDF_POOL_BROWSERS || '1', 10),
+    pagesPerBrowser: parseInt(process.env.PDF_POOL_PAGES_PER_BROWSER || '4', 10),
+    // A page is closed and replaced after this many renders to cap memory
+    maxJobsPerPage: parseInt(process.env.PDF_POOL_MAX_JOBS_PER_PAGE || '50', 10),
+    navigationTimeoutMs: parseInt(process.env.PDF_RENDER_TIMEOUT_MS || '30000', 10),
+};
+
+const PDF_OPTIONS = {
+    format: 'A4' as const,
+    printBackground: true,
+    margin: { top: '0mm', right: '0mm', bottom: '0mm', left: '0mm' }
+};
+
+export interface PdfJobTimings {
+    queue_ms: number;     // waiting for a free page
+    navigate_ms: number;  // page load + fonts (and browser launch / new page when cold)
+    render_ms: number;    // page.pdf()
+    total_ms: number;
+    page_jobs: number;    // renders served by this page, including this one
+}
+
+export interface PdfJobResult {
+    buffer: Buffer;
+    timings: PdfJobTimings;
+}
+
+/** The print page answered with a non-2xx status, e.g. Next's 404 page. */
+export class PrintPageError extends Error {
+    constructor(readonly status: number, targetUrl: string) {
+        // The path only: the query carries the internal print token
+        super(`Print page ${new URL(targetUrl).pathname} returned HTTP ${status}`);
+        this.name = 'PrintPageError';
+    }
+}
+
+// Never print an error or not-found page as if it were the document
+async function open(page: Page, targetUrl: string) {
+    const response = await page.goto(targetUrl, { waitUntil: 'networkidle0' });
+    if (!response?.ok()) throw new PrintPageError(response?.status() ?? 0, targetUrl);
+    await page.evaluate(() => document.fonts.ready);
+}
+
+interface PageSlot {
+    index: number;        // which browser of the pool this page belongs to
+    browser: Browser;
+    page: Page | null;
+    jobs: number;
+}
+
+async function launchBrowser(): Promise<Browser> {
+    if (process.env.NODE_ENV === 'production') {
+        const chromium = require('@sparticuz/chromium');
+        return puppeteer.launch({
+            args: chromium.args,
+            defaultViewport: chromium.defaultViewport,
+            executablePath: await chromium.executablePath(),
+            headless: chromium.headless,
+            ignoreHTTPSErrors: true,
+        } as any);
+    }
+    const localPuppeteer = require('puppeteer');
+    return localPuppeteer.launch({
+        headless: true,
+        args: ['--no-sandbox', '--disable-setuid-sandbox']
+    });
+}
+
+/**
+ * Bounded pool of warm Chromium pages.
+ *
+ * Browsers are launched lazily on first use and kept alive between requests.
+ * At most `browsers * pagesPerBrowser` renders run at once; further jobs wait
+ * in FIFO order for a page to be released.
+ */
+class PdfRendererPool {
+    private browsers: Promise<Browser>[] = [];
+    private idle: PageSlot[] = [];
+    private waiters: { resolve: (slot: PageSlot) => void; reject: (error: Error) => void }[] = [];
+    private created = 0;
+
+    constructor(private config = POOL_CONFIG) {}
+
+    get capacity() {
+        return this.config.browsers * this.config.pagesPerBrowser;
+    }
+
+    private async browserFor(index: number): Promise<Browser> {
+        const existing = this.browsers[index];
+        if (existing) {
+            const browser = await existing.catch(() => null);
+            if (browser && browser.connected) return browser;
+            // Another job may already be relaunching it
+            if (this.browsers[index] !== existing) return this.browserFor(index);
+        }
+        // First use, failed launch or crashed browser: (re)launch it
+        const launching = timed('pdf.browser_launch', launchBrowser);
+        this.browsers[index] = launching;
+        return launching;
+    }
+
+    private async acquire(): Promise<PageSlot> {
+        const slot = this.idle.pop();
+        if (slot) return slot;
+
+        if (this.created < this.capacity) {
+            const index = this.created % this.config.browsers;
+            this.created++;
+            try {
+                return { index, browser: await this.browserFor(index), page: null, jobs: 0 };
+            } catch (error) {
+                this.created--;
+                throw error;
+            }
+        }
+
+        return new Promise((resolve, reject) => this.waiters.push({ resolve, reject }));
+    }
+
+    private release(slot: PageSlot) {
+        const waiter = this.waiters.shift();
+        if (waiter) waiter.resolve(slot);
+        else this.idle.push(slot);
+    }
+
+    private async preparePage(slot: PageSlot): Promise<Page> {
+        if (slot.page && (slot.jobs >= this.config.maxJobsPerPage || slot.page.isClosed() || !slot.browser.connected)) {
+            await slot.page.close().catch(() => {});
+            slot.page = null;
+        }
+        if (!slot.browser.connected) {
+            slot.browser = await this.browserFor(slot.index);
+        }
+        if (!slot.page) {
+            slot.page = await timed('pdf.new_page', () => slot.browser.newPage());
+            slot.page.setDefaultNavigationTimeout(this.config.navigationTimeoutMs);
+            slot.jobs = 0;
+        }
+        return slot.page;
+    }
+
+    async render(targetUrl: string): Promise<PdfJobResult> {
+        const queuedAt = Date.now();
+        const slot = await this.acquire();
+        const startedAt = Date.now();
+
+        try {
+            const page = await this.preparePage(slot);
+            slot.jobs++;
+
+            // networkidle0: the foundational card fetches its data client-side
+            await open(page, targetUrl);
+            const loadedAt = Date.now();
+
+            const pdfBuffer = await page.pdf(PDF_OPTIONS);
+            const finishedAt = Date.now();
+
+            return {
+                buffer: Buffer.from(pdfBuffer),
+                timings: {
+                    queue_ms: startedAt - queuedAt,
+                    navigate_ms: loadedAt - startedAt,
+                    render_ms: finishedAt - loadedAt,
+                    total_ms: finishedAt - queuedAt,
+                    page_jobs: slot.jobs,
+                },
+            };
+        } catch (error) {
+            // Don't hand a page in an unknown state to the next job; one that
+            // loaded an error page is fine
+            if (slot.page && !(error instanceof PrintPageError)) {
+                await slot.page.close().catch(() => {});
+                slot.page = null;
+            }
+            throw error;
+        } finally {
+            this.release(slot);
+        }
+    }
+
+    /**
+     * Render one (possibly very long) page and hand the PDF back as a stream.
+     * The page stays checked out until the stream is fully read or cancelled,
+     * so Node never holds the whole document.
+     */
+    async renderStream(targetUrl: string): Promise<ReadableStream<Uint8Array>> {
+        const slot = await this.acquire();
+        let released = false;
+        const finish = (failed: boolean) => {
+            if (released) return;
+            released = true;
+            if (failed && slot.page) {
+                slot.page.close().catch(() => {});
+                slot.page = null;
+            }
+            this.release(slot);
+        };
+
+        try {
+            const page = await this.preparePage(slot);
+            slot.jobs++;
+            await timed('pdf.navigate', () => open(page, targetUrl));
+            const reader = (await page.createPDFStream(PDF_OPTIONS)).getReader();
+
+            return new ReadableStream<Uint8Array>({
+                async pull(controller) {
+                    try {
+                        const { done, value } = await reader.read();
+                        if (done) {
+                            controller.close();
+                            finish(false);
+                        } else {
+                            controller.enqueue(value);
+                        }
+                    } catch (error) {
+                        finish(true);
+                        controller.error(error);
+                    }
+                },
+                async cancel(reason) {
+                    await reader.cancel(reason).catch(() => {});
+                    finish(true);
+                },
+            });
+        } catch (error) {
+            finish(!(error instanceof PrintPageError));
+            throw error;
+        }
+    }
+
+    async close() {
+        const browsers = this.browsers;
+        const waiters = this.waiters;
+        this.browsers = [];
+        this.idle = [];
+        this.waiters = [];
+        this.created = 0;
+        // Jobs still queued for a page would otherwise never settle
+        for (const waiter of waiters) waiter.reject(new Error('PDF renderer pool closed'));
+        await Promise.all(browsers.map(b => b.then(browser => browser.close()).catch(() => {})));
+    }
+}
+
+// Keep a single pool per server process, including across dev hot reloads
+const globalForPdf = globalThis as unknown as { pdfRendererPool?: PdfRendererPool };
+
+export function getPdfPool(): PdfRendererPool {
+    if (!globalForPdf.pdfRendererPool) {
+        globalForPdf.pdfRendererPool = new PdfRendererPool();
+    }
+    return globalForPdf.pdfRendererPool;
+}
@@ -356,3 +356,8 @@ td.subject-name {
     }
 }
 `;
+
+// Report pages link the shared stylesheet generated from PRINT_STYLES and the
+// templates' <style> blocks by build_print_css.py instead of inlining them.
+// Set NEXT_PUBLIC_PRINT_CSS_INLINE=1 to inline them again (e.g. to compare).
+export const INLINE_PRINT_STYLES = process.env.NEXT_PUBLIC_PRINT_CSS_INLINE === '1';
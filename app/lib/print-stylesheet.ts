@@ -0,0 +1,4 @@
+// Generated by build_print_css.py - do not edit by hand.
+// Content-hashed, so the file can be cached forever; rebuild after changing
+// PRINT_STYLES or the <style> blocks of the report templates.
+export const PRINT_STYLESHEET_HREF = '/styles/hpc-print.b3195ee89a95.css';
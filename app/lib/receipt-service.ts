@@ -0,0 +1,58 @@
+import { db } from '@/app/lib/db';
+
+/**
+ * A payment receipt as printed: the payment (or every payment of its batch)
+ * with the student's current class and section. Also what the receipt PDF
+ * is cached under, so a change to any of it renders a new PDF.
+ */
+export async function getReceiptData(id: string) {
+    // Get anchor payment with student info
+    const anchorRes = await db.query(`
+        SELECT
+            fp.id, fp.amount_paid, fp.payment_date, fp.payment_mode,
+            fp.transaction_reference, fp.remarks, fp.batch_id,
+            s.student_name, s.admission_no, s.father_name, s.mother_name,
+            s.id AS student_code,
+            c.class_name, sec.section_name,
+            ay.year_name AS session
+        FROM student_fee_payments fp
+        JOIN students s ON fp.student_id = s.id
+        LEFT JOIN student_enrollments se ON s.id = se.student_id
+             AND se.academic_year_id = (SELECT id FROM academic_years WHERE is_active = true LIMIT 1)
+        LEFT JOIN classes c ON se.class_id = c.id
+        LEFT JOIN sections sec ON se.section_id = sec.id
+        LEFT JOIN academic_years ay ON se.academic_year_id = ay.id
+        WHERE fp.id = $1
+    `, [id]);
+
+    const anchor = anchorRes.rows[0];
+    if (!anchor) return null;
+
+    let items: any[] = [];
+
+    if (anchor.batch_id) {
+        // Multi-month: fetch all rows in batch
+        const batchRes = await db.query(`
+            SELECT sfp.id, sfp.amount_paid, sfp.fee_structure_id,
+                   fh.head_name, fs.due_date
+            FROM student_fee_payments sfp
+            LEFT JOIN fee_structures fs ON sfp.fee_structure_id = fs.id
+            LEFT JOIN fee_heads fh ON fs.fee_head_id = fh.id
+            WHERE sfp.batch_id = $1
+            ORDER BY fs.due_date ASC NULLS LAST
+        `, [anchor.batch_id]);
+        items = batchRes.rows;
+    } else if (anchor.fee_structure_id ?? null !== null) {
+        const fsRes = await db.query(`
+            SELECT fh.head_name, fs.due_date
+            FROM fee_structures fs
+            JOIN fee_heads fh ON fs.fee_head_id = fh.id
+            WHERE fs.id = $1
+        `, [(anchor as any).fee_structure_id]);
+        items = [{ id: anchor.id, amount_paid: anchor.amount_paid, head_name: fsRes.rows[0]?.head_name || 'Fee Payment', due_date: fsRes.rows[0]?.due_date }];
+    } else {
+        items = [{ id: anchor.id, amount_paid: anchor.amount_paid, head_name: anchor.remarks || 'Fee Payment', due_date: null }];
+    }
+
+    return { ...anchor, items };
+}
@@ -1,9 +1,38 @@
-import { db } from '@/app/lib/db';
+import { db, batchReads } from '@/app/lib/db';
+import { getTermResults } from '@/app/lib/term-results';
+import { timed } from '@/app/lib/metrics';
 
-export async function getStudentReportData(student_id: number, academic_year_id: number) {
+// The columns the report card reads, shared by the single and the bulk
+// loaders so both payloads have the same shape. They are listed rather than
+// selected as s.*, ss.*, ...: a named statement caches its result columns
+// per connection, so a whole-row select would fail on every pooled
+// connection with "cached plan must not change result type" once
+// /api/setup/migrate adds a column.
+const STUDENT_COLUMNS = `
+    s.id, s.admission_no, s.student_name, s.father_name, s.mother_name, s.dob, s.address, s.phone_no,
+    c.class_name, sec.section_name, ay.year_name, se.roll_no, se.class_id
+`;
+const SCHOLASTIC_COLUMNS = `
+    ss.id, ss.student_id, ss.subject_id, ss.component_id, ss.term_id, ss.marks,
+    sub.subject_name, ac.component_name, t.term_name
+`;
+const CO_SCHOLASTIC_COLUMNS = `
+    css.id, css.student_id, css.sub_skill_id, css.term_id, css.grade,
+    ss.sub_skill_name, d.domain_name, t.term_name
+`;
+const ATTENDANCE_COLUMNS = `
+    ar.id, ar.student_id, ar.month_id, ar.working_days, ar.days_present, ar.reason_for_low_attendance,
+    m.month_name
+`;
+const REMARK_COLUMNS = `
+    r.id, r.student_id, r.remark_type_id, r.aspect, r.remark_text,
+    rt.type_name
+`;
+
+async function loadStudentReportData(student_id: number, academic_year_id: number) {
   // 1. Student Info
   const studentQuery = `
-    SELECT s.*, c.class_name, sec.section_name, ay.year_name, se.roll_no, se.class_id
+    SELECT ${STUDENT_COLUMNS}
     FROM students s
     JOIN student_enrollments se ON s.id = se.student_id
     JOIN classes c ON se.class_id = c.id
@@ -11,7 +40,7 @@ export async function getStudentReportData(student_id: number, academic_year_id:
     JOIN academic_years ay ON se.academic_year_id = ay.id
     WHERE s.id = $1 AND se.academic_year_id = $2
   `;
-  const studentRes = await db.query(studentQuery, [student_id, academic_year_id]);
+  const studentRes = await timed('report.student', () => db.prepared('report.student', studentQuery, [student_id, academic_year_id]));
 
   if (studentRes.rows.length === 0) {
     return null;
@@ -20,44 +49,44 @@ export async function getStudentReportData(student_id: number, academic_year_id:
 
   // 2. Scholastic Scores
   const scholasticQuery = `
-    SELECT ss.*, sub.subject_name, ac.component_name, t.term_name
+    SELECT ${SCHOLASTIC_COLUMNS}
     FROM scholastic_scores ss
     JOIN subjects sub ON ss.subject_id = sub.id
     JOIN assessment_components ac ON ss.component_id = ac.id
     JOIN terms t ON ss.term_id = t.id
     WHERE ss.student_id = $1 AND ss.academic_year_id = $2
   `;
-  const scholasticRes = await db.query(scholasticQuery, [student_id, academic_year_id]);
+  const scholasticRes = await timed('report.scholastic', () => db.prepared('report.scholastic', scholasticQuery, [student_id, academic_year_id]));
 
   // 3. Co-Scholastic Scores
   const coScholasticQuery = `
-    SELECT css.*, ss.sub_skill_name, d.domain_name, t.term_name
+    SELECT ${CO_SCHOLASTIC_COLUMNS}
     FROM co_scholastic_scores css
     JOIN sub_skills ss ON css.sub_skill_id = ss.id
     JOIN domains d ON ss.domain_id = d.id
     JOIN terms t ON css.term_id = t.id
     WHERE css.student_id = $1 AND css.academic_year_id = $2
   `;
-  const coScholasticRes = await db.query(coScholasticQuery, [student_id, academic_year_id]);
+  const coScholasticRes = await timed('report.co_scholastic', () => db.prepared('report.co_scholastic', coScholasticQuery, [student_id, academic_year_id]));
 
   // 4. Attendance
   const attendanceQuery = `
-    SELECT ar.*, m.month_name
+    SELECT ${ATTENDANCE_COLUMNS}
     FROM attendance_records ar
     JOIN months m ON ar.month_id = m.id
     WHERE ar.student_id = $1 AND ar.academic_year_id = $2
     ORDER BY m.display_order ASC
   `;
-  const attendanceRes = await db.query(attendanceQuery, [student_id, academic_year_id]);
+  const attendanceRes = await timed('report.attendance', () => db.prepared('report.attendance', attendanceQuery, [student_id, academic_year_id]));
 
   // 5. Remarks
   const remarksQuery = `
-    SELECT r.*, rt.type_name
+    SELECT ${REMARK_COLUMNS}
     FROM remarks r
     JOIN remark_types rt ON r.remark_type_id = rt.id
     WHERE r.student_id = $1 AND r.academic_year_id = $2
   `;
-  const remarksRes = await db.query(remarksQuery, [student_id, academic_year_id]);
+  const remarksRes = await timed('report.remarks', () => db.prepared('report.remarks', remarksQuery, [student_id, academic_year_id]));
 
   // 6. Class Subjects
   const subjectsQuery = `
@@ -68,7 +97,10 @@ export async function getStudentReportData(student_id: number, academic_year_id:
         ORDER BY cs.display_order ASC, sub.subject_name ASC
     `;
   // student.class_id is now available from query 1
-  const subjectsRes = await db.query(subjectsQuery, [student.class_id, academic_year_id]);
+  const subjectsRes = await timed('report.subjects', () => db.prepared('report.subjects', subjectsQuery, [student.class_id, academic_year_id]));
+
+  // 7. Precomputed totals (student_term_results); null until aggregated
+  const termResults = await timed('report.term_results', () => getTermResults([student_id], academic_year_id));
 
   return {
     student,
@@ -77,6 +109,151 @@ export async function getStudentReportData(student_id: number, academic_year_id:
     attendance: attendanceRes.rows,
     remarks: remarksRes.rows,
     subjects: subjectsRes.rows,
+    term_results: termResults.get(student_id) ?? null,
     generated_at: new Date().toISOString(),
   };
 }
+
+// Lookups of the same card in the same tick share one set of queries
+export const getStudentReportData = batchReads('report', loadStudentReportData);
+
+export type StudentReportData = NonNullable<Awaited<ReturnType<typeof getStudentReportData>>>;
+
+export interface ClassReportFilter {
+  academic_year_id: number;
+  class_id?: number;
+  section_id?: number;
+  // Explicit list of students; class_id / section_id still narrow it when given
+  student_ids?: number[];
+}
+
+// Students per round of bulk queries; keeps memory flat for whole-school runs
+const BULK_BATCH_SIZE = 200;
+
+function groupByStudent(rows: any[]) {
+  const grouped = new Map<number, any[]>();
+  for (const row of rows) {
+    const list = grouped.get(row.student_id);
+    if (list) list.push(row);
+    else grouped.set(row.student_id, [row]);
+  }
+  return grouped;
+}
+
+/**
+ * Set-based counterpart of getStudentReportData for a whole class or section.
+ *
+ * One query lists the students and one fetches the subjects of every class
+ * involved; scores, attendance and remarks are then loaded in batches of
+ * BULK_BATCH_SIZE students with five student_id = ANY($1) queries per batch.
+ * A 40-student section costs 7 queries instead of 280. Payloads have the same shape as
+ * getStudentReportData and are yielded in roll-number order.
+ */
+export async function* streamClassReportData(
+  filter: ClassReportFilter,
+  batchSize: number = BULK_BATCH_SIZE
+): AsyncGenerator<StudentReportData> {
+  const { academic_year_id } = filter;
+
+  // 1. Student Info for every enrolled student matching the filter
+  const studentQuery = `
+    SELECT ${STUDENT_COLUMNS}
+    FROM students s
+    JOIN student_enrollments se ON s.id = se.student_id
+    JOIN classes c ON se.class_id = c.id
+    JOIN sections sec ON se.section_id = sec.id
+    JOIN academic_years ay ON se.academic_year_id = ay.id
+    WHERE se.academic_year_id = $1
+      AND ($2::int IS NULL OR se.class_id = $2)
+      AND ($3::int IS NULL OR se.section_id = $3)
+      AND ($4::int[] IS NULL OR s.id = ANY($4))
+    ORDER BY c.display_order, sec.section_name, se.roll_no, s.student_name
+  `;
+  const studentRes = await timed('report.bulk.students', () => db.query(studentQuery, [
+    academic_year_id,
+    filter.class_id ?? null,
+    filter.section_id ?? null,
+    filter.student_ids ?? null,
+  ]));
+
+  // Class subjects are identical for every student of a class: fetch once per class
+  const subjectsByClass = new Map<number, any[]>();
+  const subjectsQuery = `
+    SELECT cs.class_id, sub.id, sub.subject_name, cs.max_marks
+    FROM class_subjects cs
+    JOIN subjects sub ON cs.subject_id = sub.id
+    WHERE cs.class_id = ANY($1) AND cs.academic_year_id = $2
+    ORDER BY cs.display_order ASC, sub.subject_name ASC
+  `;
+  const classIds = Array.from(new Set<number>(studentRes.rows.map((s: any) => s.class_id)));
+  if (classIds.length > 0) {
+    const subjectsRes = await timed('report.bulk.subjects', () => db.query(subjectsQuery, [classIds, academic_year_id]));
+    for (const classId of classIds) subjectsByClass.set(classId, []);
+    for (const { class_id, ...subject } of subjectsRes.rows) {
+      subjectsByClass.get(class_id)!.push(subject);
+    }
+  }
+
+  const scholasticQuery = `
+    SELECT ${SCHOLASTIC_COLUMNS}
+    FROM scholastic_scores ss
+    JOIN subjects sub ON ss.subject_id = sub.id
+    JOIN assessment_components ac ON ss.component_id = ac.id
+    JOIN terms t ON ss.term_id = t.id
+    WHERE ss.student_id = ANY($1) AND ss.academic_year_id = $2
+  `;
+  const coScholasticQuery = `
+    SELECT ${CO_SCHOLASTIC_COLUMNS}
+    FROM co_scholastic_scores css
+    JOIN sub_skills ss ON css.sub_skill_id = ss.id
+    JOIN domains d ON ss.domain_id = d.id
+    JOIN terms t ON css.term_id = t.id
+    WHERE css.student_id = ANY($1) AND css.academic_year_id = $2
+  `;
+  const attendanceQuery = `
+    SELECT ${ATTENDANCE_COLUMNS}
+    FROM attendance_records ar
+    JOIN months m ON ar.month_id = m.id
+    WHERE ar.student_id = ANY($1) AND ar.academic_year_id = $2
+    ORDER BY ar.student_id, m.display_order ASC
+  `;
+  const remarksQuery = `
+    SELECT ${REMARK_COLUMNS}
+    FROM remarks r
+    JOIN remark_types rt ON r.remark_type_id = rt.id
+    WHERE r.student_id = ANY($1) AND r.academic_year_id = $2
+  `;
+
+  for (let i = 0; i < studentRes.rows.length; i += batchSize) {
+    const students = studentRes.rows.slice(i, i + batchSize);
+    const params = [students.map((s: any) => s.id), academic_year_id];
+
+    const [scholasticRes, coScholasticRes, attendanceRes, remarksRes, termResults] = await Promise.all([
+      timed('report.bulk.scholastic', () => db.query(scholasticQuery, params)),
+      timed('report.bulk.co_scholastic', () => db.query(coScholasticQuery, params)),
+      timed('report.bulk.attendance', () => db.query(attendanceQuery, params)),
+      timed('report.bulk.remarks', () => db.query(remarksQuery, params)),
+      timed('report.bulk.term_results', () => getTermResults(students.map((s: any) => s.id), academic_year_id)),
+    ]);
+
+    // One pass over each result set, then an O(1) pick per student
+    const scholastic = groupByStudent(scholasticRes.rows);
+    const coScholastic = groupByStudent(coScholasticRes.rows);
+    const attendance = groupByStudent(attendanceRes.rows);
+    const remarks = groupByStudent(remarksRes.rows);
+    const generated_at = new Date().toISOString();
+
+    for (const student of students) {
+      yield {
+        student,
+        scholastic: scholastic.get(student.id) ?? [],
+        co_scholastic: coScholastic.get(student.id) ?? [],
+        attendance: attendance.get(student.id) ?? [],
+        remarks: remarks.get(student.id) ?? [],
+        subjects: subjectsByClass.get(student.class_id) ?? [],
+        term_results: termResults.get(student.id) ?? null,
+        generated_at,
+      };
+    }
+  }
+}
@@ -0,0 +1,73 @@
+// report-skills.ts
+// Sub-skills of the Co-Scholastic and Personality Development tables on the
+// Classes III-VIII card, in card order. The table bodies in
+// ReportTemplate_III_VIII.tsx are generated from this file by skill_tables.py:
+// after adding a skill or domain here run `python build_report_template.py`.
+
+export interface ReportSkillDomain {
+    domain: string;    // domains.domain_name the grades are stored under
+    label: string;     // domain-header row on the card
+    skills: string[];  // sub_skills.sub_skill_name
+}
+
+export const CO_SCHOLASTIC_DOMAINS: ReportSkillDomain[] = [
+    {
+        domain: 'Physical Education',
+        label: 'Physical Education',
+        skills: ['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'],
+    },
+    {
+        domain: 'Visual Art',
+        label: 'Visual Art',
+        skills: ['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'],
+    },
+    {
+        domain: 'Performing Art - Dance',
+        label: 'Performing Art - Dance',
+        skills: ['Posture', 'Expression', 'Rhythm', 'Overall Performance'],
+    },
+    {
+        domain: 'Performing Art - Music',
+        label: 'Performing Art - Music',
+        skills: ['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'],
+    },
+];
+
+export const PERSONALITY_DOMAINS: ReportSkillDomain[] = [
+    {
+        domain: 'Social Skills',
+        label: 'Social Skills',
+        skills: [
+            'Maintains cordial relationship with peers and adults',
+            'Demonstrates teamwork and cooperation',
+            'Respects school property and personal belongings',
+        ],
+    },
+    {
+        domain: 'Emotional Skill',
+        label: 'Emotional Skills',
+        skills: [
+            'Shows sensitivity towards rules and norms',
+            'Demonstrates self-regulation of emotions and behaviour',
+            'Displays empathy and concern for others',
+        ],
+    },
+    {
+        domain: 'Work Habit',
+        label: 'Work Habit',
+        skills: [
+            'Maintains regularity and punctuality',
+            'Demonstrates responsible citizenship',
+            'Shows care and concern for the environment',
+        ],
+    },
+    {
+        domain: 'Health & Wellness',
+        label: 'Health & Wellness',
+        skills: [
+            'Follows good hygiene practices',
+            'Maintains cleanliness of self and surroundings',
+            'Demonstrates resilience and positive coping skills',
+        ],
+    },
+];
@@ -0,0 +1,184 @@
+import { db } from '@/app/lib/db';
+import { bumpReportVersions } from '@/app/lib/pdf-cache';
+
+type Queryable = { query: (text: string, params?: any[]) => Promise<any> };
+
+export interface ScholasticScoreInput {
+    student_id: number;
+    subject_id: number;
+    component_id: number;
+    term_id: number;
+    marks?: number | null;
+    academic_year_id: number;
+}
+
+export interface CoScholasticScoreInput {
+    student_id: number;
+    sub_skill_id: number;
+    term_id: number;
+    grade: string;
+    academic_year_id: number;
+}
+
+export interface FoundationalRatingInput {
+    student_id: number;
+    academic_year_id: number;
+    term: string;
+    domain: string;
+    skill_key: string;
+    rating?: string | null;
+}
+
+/**
+ * Keep the last entry per conflict key. A multi-row ON CONFLICT DO UPDATE
+ * fails if it touches the same row twice, and the last write is what the
+ * old one-statement-per-cell loop ended up storing.
+ */
+function lastPerKey<T>(rows: T[], key: (row: T) => string): T[] {
+    return Array.from(new Map(rows.map(row => [key(row), row])).values());
+}
+
+// Same bands as calculateGrade; marks are out of the component's max_marks
+// (100 when unset) and a blank cell is 'AB'
+const GRADE_SQL = `
+    CASE
+        WHEN v.marks IS NULL THEN 'AB'
+        WHEN p.pct >= 91 THEN 'A1'
+        WHEN p.pct >= 81 THEN 'A2'
+        WHEN p.pct >= 71 THEN 'B1'
+        WHEN p.pct >= 61 THEN 'B2'
+        WHEN p.pct >= 51 THEN 'C1'
+        WHEN p.pct >= 41 THEN 'C2'
+        WHEN p.pct >= 33 THEN 'D'
+        ELSE 'E'
+    END
+`;
+
+const SCHOLASTIC_WITH_GRADE_SQL = `
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
+    SELECT v.student_id, v.subject_id, v.component_id, v.term_id, v.marks, ${GRADE_SQL}, v.academic_year_id
+    FROM UNNEST($1::int[], $2::int[], $3::int[], $4::int[], $5::numeric[], $6::int[])
+        AS v(student_id, subject_id, component_id, term_id, marks, academic_year_id)
+    LEFT JOIN assessment_components ac ON ac.id = v.component_id
+    CROSS JOIN LATERAL (SELECT v.marks * 100 / COALESCE(NULLIF(ac.max_marks, 0), 100) AS pct) p
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
+    RETURNING id
+`;
+
+// Without assessment_components.max_marks (only scripts/update-components.js
+// adds it) there is nothing to grade against: 'NA', as the old route stored
+const SCHOLASTIC_WITH_NA_GRADE_SQL = `
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
+    SELECT v.student_id, v.subject_id, v.component_id, v.term_id, v.marks,
+        CASE WHEN v.marks IS NULL THEN 'AB' ELSE 'NA' END, v.academic_year_id
+    FROM UNNEST($1::int[], $2::int[], $3::int[], $4::int[], $5::numeric[], $6::int[])
+        AS v(student_id, subject_id, component_id, term_id, marks, academic_year_id)
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
+    RETURNING id
+`;
+
+const SCHOLASTIC_SQL = `
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, academic_year_id)
+    SELECT * FROM UNNEST($1::int[], $2::int[], $3::int[], $4::int[], $5::numeric[], $6::int[])
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks
+    RETURNING id
+`;
+
+// Databases that ran scripts/migrate_drop_grade.js have no grade column;
+// the others still require one, and only some have max_marks to compute it
+// from. Each column is checked once per process.
+const columns = new Map<string, Promise<boolean>>();
+
+function hasColumn(table: string, column: string): Promise<boolean> {
+    const key = `${table}.${column}`;
+    let exists = columns.get(key);
+    if (!exists) {
+        exists = db.query(`
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = $1 AND column_name = $2
+        `, [table, column]).then(res => res.rows.length > 0).catch(err => {
+            columns.delete(key);
+            throw err;
+        });
+        columns.set(key, exists);
+    }
+    return exists;
+}
+
+async function scholasticSql(): Promise<string> {
+    if (!(await hasColumn('scholastic_scores', 'grade'))) return SCHOLASTIC_SQL;
+    return (await hasColumn('assessment_components', 'max_marks')) ? SCHOLASTIC_WITH_GRADE_SQL : SCHOLASTIC_WITH_NA_GRADE_SQL;
+}
+
+/** Upsert any number of scholastic cells in one statement; returns their ids. */
+export async function upsertScholasticScores(client: Queryable, scores: ScholasticScoreInput[]): Promise<number[]> {
+    const rows = lastPerKey(scores, s => `${s.student_id}:${s.subject_id}:${s.component_id}:${s.term_id}:${s.academic_year_id}`);
+    if (rows.length === 0) return [];
+    const res = await client.query(await scholasticSql(), [
+        rows.map(s => s.student_id),
+        rows.map(s => s.subject_id),
+        rows.map(s => s.component_id),
+        rows.map(s => s.term_id),
+        rows.map(s => s.marks ?? null),
+        rows.map(s => s.academic_year_id),
+    ]);
+    return res.rows.map((r: any) => r.id);
+}
+
+/** Upsert any number of co-scholastic grades in one statement; returns their ids. */
+export async function upsertCoScholasticScores(client: Queryable, scores: CoScholasticScoreInput[]): Promise<number[]> {
+    const rows = lastPerKey(scores, s => `${s.student_id}:${s.sub_skill_id}:${s.term_id}:${s.academic_year_id}`);
+    if (rows.length === 0) return [];
+    const res = await client.query(`
+        INSERT INTO co_scholastic_scores (student_id, sub_skill_id, term_id, grade, academic_year_id)
+        SELECT * FROM UNNEST($1::int[], $2::int[], $3::int[], $4::text[], $5::int[])
+        ON CONFLICT (student_id, sub_skill_id, term_id, academic_year_id)
+        DO UPDATE SET grade = EXCLUDED.grade
+        RETURNING id
+    `, [
+        rows.map(s => s.student_id),
+        rows.map(s => s.sub_skill_id),
+        rows.map(s => s.term_id),
+        rows.map(s => s.grade),
+        rows.map(s => s.academic_year_id),
+    ]);
+    return res.rows.map((r: any) => r.id);
+}
+
+/** Upsert any number of foundational skill ratings in one statement. */
+export async function upsertFoundationalRatings(client: Queryable, ratings: FoundationalRatingInput[]): Promise<{ id: number; rating: string | null }[]> {
+    const rows = lastPerKey(ratings, r => `${r.student_id}:${r.academic_year_id}:${r.term}:${r.domain}:${r.skill_key}`);
+    if (rows.length === 0) return [];
+    const res = await client.query(`
+        INSERT INTO foundational_skill_ratings (student_id, academic_year_id, term, domain, skill_key, rating, updated_at)
+        SELECT v.*, NOW() FROM UNNEST($1::int[], $2::int[], $3::text[], $4::text[], $5::text[], $6::text[])
+            AS v(student_id, academic_year_id, term, domain, skill_key, rating)
+        ON CONFLICT (student_id, academic_year_id, term, domain, skill_key)
+        DO UPDATE SET rating = EXCLUDED.rating, updated_at = NOW()
+        RETURNING id, rating
+    `, [
+        rows.map(r => r.student_id),
+        rows.map(r => r.academic_year_id),
+        rows.map(r => r.term),
+        rows.map(r => r.domain),
+        rows.map(r => r.skill_key),
+        rows.map(r => r.rating || null),
+    ]);
+    return res.rows;
+}
+
+/** Invalidate cached report cards of every student touched by a save. */
+export async function bumpTouchedReports(rows: { student_id: number; academic_year_id: number }[]) {
+    const studentsByYear = new Map<number, number[]>();
+    for (const row of rows) {
+        const ids = studentsByYear.get(row.academic_year_id) ?? [];
+        ids.push(row.student_id);
+        studentsByYear.set(row.academic_year_id, ids);
+    }
+    for (const [academicYearId, studentIds] of studentsByYear) {
+        await bumpReportVersions(studentIds, academicYearId);
+    }
+}
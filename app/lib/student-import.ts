@@ -0,0 +1,133 @@
+import type { PoolClient } from 'pg';
+
+// Columns of the staging table, in the order rows are loaded. Must stay in
+// step with STAGING_COLUMNS in scripts/import_students.py, which fills the
+// same table with COPY.
+export const STAGING_COLUMNS = [
+    'admission_no', 'student_name', 'father_name', 'mother_name', 'dob', 'class_name', 'section_name',
+    'admission_date', 'gender', 'blood_group', 'address', 'phone_no', 'emergency_no', 'category',
+    'aadhar_no', 'ppp_id', 'apaar_id', 'srn_no', 'board_roll_x', 'board_roll_xii', 'education_reg_no',
+    'student_code', 'stream',
+] as const;
+
+export interface ImportError {
+    index: number;
+    admission_no: string;
+    error: string;
+}
+
+export interface ResolvedRow {
+    index: number;
+    class_id: number | null;
+    section_id: number | null;
+    error: string | null;
+}
+
+const CREATE_STAGING_SQL = `
+    CREATE TEMP TABLE student_import_staging (
+        idx INT PRIMARY KEY,
+        ${STAGING_COLUMNS.map(c => `${c} TEXT`).join(',\n        ')},
+        subject_count INT,
+        class_id INT,
+        section_id INT,
+        error TEXT
+    ) ON COMMIT DROP
+`;
+
+// One pass over the staging table: class and section are matched by name
+// (case-insensitive, last id wins as in the old per-row lookup maps) and
+// admission numbers are checked against students and against earlier rows
+// of the same file. The CASE keeps the old precedence: an existing admission
+// number overrides every other error, then DOB, class, section.
+const RESOLVE_SQL = `
+    UPDATE student_import_staging st
+    SET class_id = r.class_id, section_id = r.section_id, error = r.error
+    FROM (
+        SELECT st.idx, c.id AS class_id, sec.id AS section_id,
+            CASE
+                WHEN dup.id IS NOT NULL THEN 'Admission number already exists'
+                WHEN st.idx > MIN(st.idx) OVER (PARTITION BY st.admission_no) THEN 'Admission number repeated in file'
+                WHEN st.dob !~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}$' THEN 'Invalid DOB Format (YYYY-MM-DD)'
+                WHEN c.id IS NULL THEN 'Class ''' || st.class_name || ''' not found'
+                WHEN sec.id IS NULL THEN 'Section ''' || st.section_name || ''' not found in Class ''' || st.class_name || ''''
+            END AS error
+        FROM student_import_staging st
+        LEFT JOIN (
+            SELECT DISTINCT ON (LOWER(class_name)) id, LOWER(class_name) AS name_key
+            FROM classes
+            ORDER BY LOWER(class_name), id DESC
+        ) c ON c.name_key = LOWER(st.class_name)
+        LEFT JOIN (
+            SELECT DISTINCT ON (class_id, LOWER(section_name)) id, class_id, LOWER(section_name) AS name_key
+            FROM sections
+            ORDER BY class_id, LOWER(section_name), id DESC
+        ) sec ON sec.class_id = c.id AND sec.name_key = LOWER(st.section_name)
+        LEFT JOIN students dup ON dup.admission_no = st.admission_no
+    ) r
+    WHERE st.idx = r.idx
+    RETURNING st.idx, st.class_id, st.section_id, st.error
+`;
+
+// Students and their enrollments in one statement; defaults match the old
+// per-row insert (empty strings count as missing)
+const INSERT_SQL = `
+    WITH inserted AS (
+        INSERT INTO students
+        (admission_no, student_name, father_name, mother_name, dob, admission_date,
+         blood_group, gender, address, phone_no, emergency_no, category,
+         aadhar_no, ppp_id, apaar_id, srn_no, board_roll_x, board_roll_xii, education_reg_no, student_code, stream, subject_count)
+        SELECT admission_no, student_name, father_name, COALESCE(mother_name, ''), dob::date,
+            COALESCE(NULLIF(admission_date, '')::date, CURRENT_DATE),
+            COALESCE(blood_group, ''), COALESCE(NULLIF(gender, ''), 'Male'), COALESCE(address, ''),
+            COALESCE(phone_no, ''), COALESCE(emergency_no, ''), COALESCE(NULLIF(category, ''), 'General'),
+            COALESCE(aadhar_no, ''), COALESCE(ppp_id, ''), COALESCE(apaar_id, ''), COALESCE(srn_no, ''),
+            COALESCE(board_roll_x, ''), COALESCE(board_roll_xii, ''), COALESCE(education_reg_no, ''),
+            COALESCE(student_code, ''), NULLIF(stream, ''), COALESCE(NULLIF(subject_count, 0), 5)
+        FROM student_import_staging
+        WHERE error IS NULL
+        ORDER BY idx
+        RETURNING id, admission_no
+    )
+    INSERT INTO student_enrollments (student_id, class_id, section_id, academic_year_id)
+    SELECT i.id, st.class_id, st.section_id, $1
+    FROM inserted i
+    JOIN student_import_staging st ON st.admission_no = i.admission_no AND st.error IS NULL
+`;
+
+/**
+ * Set-based student import.
+ *
+ * Rows go into a temporary staging table (dropped at commit), are validated
+ * with one joined query and inserted with one INSERT ... SELECT, so the cost
+ * is a handful of statements whatever the file size. Must run inside a
+ * transaction on `client`; roll back after a preview to discard the staging
+ * table.
+ */
+export async function stageStudents(client: PoolClient, rows: Record<string, any>[]) {
+    await client.query(CREATE_STAGING_SQL);
+    // One round trip for the whole file: the rows travel as a single jsonb
+    // parameter and are expanded server-side
+    await client.query(`
+        INSERT INTO student_import_staging (idx, ${STAGING_COLUMNS.join(', ')}, subject_count)
+        SELECT idx, ${STAGING_COLUMNS.join(', ')}, subject_count
+        FROM jsonb_to_recordset($1::jsonb) AS r(
+            idx INT, ${STAGING_COLUMNS.map(c => `${c} TEXT`).join(', ')}, subject_count INT
+        )
+    `, [JSON.stringify(rows.map((row, idx) => ({ ...row, idx })))]);
+    // Temp tables are never auto-analyzed; without stats the resolve query
+    // is planned for a near-empty table
+    await client.query('ANALYZE student_import_staging');
+}
+
+export async function resolveStaged(client: PoolClient): Promise<ResolvedRow[]> {
+    const { rows } = await client.query(RESOLVE_SQL);
+    return rows
+        .map(r => ({ index: r.idx, class_id: r.class_id, section_id: r.section_id, error: r.error }))
+        .sort((a, b) => a.index - b.index);
+}
+
+/** Insert every staged row without an error; returns the number of students. */
+export async function insertStaged(client: PoolClient, academicYearId: number): Promise<number> {
+    const { rowCount } = await client.query(INSERT_SQL, [academicYearId]);
+    return rowCount ?? 0;
+}
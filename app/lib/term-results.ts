@@ -0,0 +1,282 @@
+import { db } from '@/app/lib/db';
+
+// The SQL below is kept in step with scripts/rebuild-term-results.js, which
+// runs the same refresh for every enrolled student as a backfill.
+
+export interface TermResultsFilter {
+    academic_year_id: number;
+    student_ids?: number[];
+    class_id?: number;
+}
+
+// Ranks are recomputed per class, so concurrent refreshes of one class are
+// serialised; locks are taken in class order to rule out deadlocks. The
+// classes the stored rows still name are locked too, for students who moved.
+const LOCK_SQL = `
+    SELECT pg_advisory_xact_lock(hashtext('student_term_results'), c.class_id)
+    FROM (
+        SELECT se.class_id
+        FROM student_enrollments se
+        WHERE se.academic_year_id = $1
+          AND ($2::int[] IS NULL OR se.student_id = ANY($2))
+          AND ($3::int IS NULL OR se.class_id = $3)
+        UNION
+        SELECT r.class_id
+        FROM student_term_results r
+        WHERE r.academic_year_id = $1
+          AND ($2::int[] IS NULL OR r.student_id = ANY($2))
+          AND ($3::int IS NULL OR r.class_id = $3)
+        ORDER BY class_id
+    ) c
+`;
+
+// Rows whose student left the year, or moved to another class or section,
+// are dropped: the refresh writes the current enrollment back, and the
+// class they left is re-ranked without them
+const PRUNE_SQL = `
+    DELETE FROM student_term_results r
+    WHERE r.academic_year_id = $1
+      AND ($2::int[] IS NULL OR r.student_id = ANY($2))
+      AND ($3::int IS NULL OR r.class_id = $3)
+      AND NOT EXISTS (
+          SELECT 1 FROM student_enrollments se
+          WHERE se.student_id = r.student_id AND se.academic_year_id = r.academic_year_id
+            AND se.class_id = r.class_id AND se.section_id = r.section_id
+      )
+    RETURNING class_id
+`;
+
+// Same arithmetic as the III-VIII card: a subject's term total is the sum of
+// its four components, a term "has marks" when PA or TA was entered, the
+// grand total adds up the per-subject term averages and every subject is
+// out of 100
+const REFRESH_SQL = `
+    WITH targets AS (
+        SELECT se.student_id, se.class_id, se.section_id
+        FROM student_enrollments se
+        WHERE se.academic_year_id = $1
+          AND ($2::int[] IS NULL OR se.student_id = ANY($2))
+          AND ($3::int IS NULL OR se.class_id = $3)
+    ),
+    subject_terms AS (
+        SELECT t.student_id, cs.subject_id,
+            SUM(ss.marks) FILTER (WHERE tm.term_name = 'Term I') AS term1,
+            SUM(ss.marks) FILTER (WHERE tm.term_name = 'Term II') AS term2,
+            COALESCE(BOOL_OR(tm.term_name = 'Term I' AND ac.component_name IN ('Periodic Assessment', 'Terminal Assessment')), FALSE) AS has_term1,
+            COALESCE(BOOL_OR(tm.term_name = 'Term II' AND ac.component_name IN ('Periodic Assessment', 'Terminal Assessment')), FALSE) AS has_term2
+        FROM targets t
+        JOIN (SELECT DISTINCT class_id, subject_id FROM class_subjects WHERE academic_year_id = $1) cs
+            ON cs.class_id = t.class_id
+        LEFT JOIN (
+            scholastic_scores ss
+            JOIN assessment_components ac ON ac.id = ss.component_id AND ac.component_name IN
+                ('Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment')
+            JOIN terms tm ON tm.id = ss.term_id
+        ) ON ss.student_id = t.student_id AND ss.subject_id = cs.subject_id AND ss.academic_year_id = $1
+        GROUP BY t.student_id, cs.subject_id
+    ),
+    per_student AS (
+        SELECT student_id,
+            jsonb_object_agg(subject_id, jsonb_build_object(
+                'term1', COALESCE(term1, 0), 'term2', COALESCE(term2, 0),
+                'has_term1', has_term1, 'has_term2', has_term2
+            )) AS subject_totals,
+            COALESCE(SUM(term1) FILTER (WHERE has_term1), 0) AS term1_total,
+            COUNT(*) FILTER (WHERE has_term1) AS term1_subjects,
+            COALESCE(SUM(term2) FILTER (WHERE has_term2), 0) AS term2_total,
+            COUNT(*) FILTER (WHERE has_term2) AS term2_subjects,
+            COALESCE(SUM((COALESCE(term1, 0) + COALESCE(term2, 0)) / 2) FILTER (WHERE has_term1 OR has_term2), 0) AS grand_total
+        FROM subject_terms
+        GROUP BY student_id
+    ),
+    results AS (
+        SELECT t.student_id, t.class_id, t.section_id,
+            COALESCE(p.subject_totals, '{}'::jsonb) AS subject_totals,
+            COALESCE(p.term1_total, 0) AS term1_total, COALESCE(p.term1_subjects, 0) AS term1_subjects,
+            COALESCE(p.term2_total, 0) AS term2_total, COALESCE(p.term2_subjects, 0) AS term2_subjects,
+            COALESCE(p.grand_total, 0) AS grand_total,
+            GREATEST(COALESCE(p.term1_subjects, 0), COALESCE(p.term2_subjects, 0)) * 100 AS max_marks
+        FROM targets t
+        LEFT JOIN per_student p ON p.student_id = t.student_id
+    )
+    INSERT INTO student_term_results
+        (student_id, academic_year_id, class_id, section_id, subject_totals,
+         term1_total, term1_subjects, term2_total, term2_subjects, grand_total, max_marks, percentage, updated_at)
+    SELECT student_id, $1, class_id, section_id, subject_totals,
+        term1_total, term1_subjects, term2_total, term2_subjects, grand_total, max_marks,
+        CASE WHEN max_marks > 0 THEN ROUND(grand_total * 100 / max_marks, 2) END,
+        NOW()
+    FROM results
+    ON CONFLICT (student_id, academic_year_id) DO UPDATE SET
+        class_id = EXCLUDED.class_id,
+        section_id = EXCLUDED.section_id,
+        subject_totals = EXCLUDED.subject_totals,
+        term1_total = EXCLUDED.term1_total,
+        term1_subjects = EXCLUDED.term1_subjects,
+        term2_total = EXCLUDED.term2_total,
+        term2_subjects = EXCLUDED.term2_subjects,
+        grand_total = EXCLUDED.grand_total,
+        max_marks = EXCLUDED.max_marks,
+        percentage = EXCLUDED.percentage,
+        updated_at = NOW()
+    RETURNING class_id
+`;
+
+// Only rows whose rank actually moved are rewritten
+const RANK_SQL = `
+    UPDATE student_term_results r
+    SET section_rank = x.section_rank, class_rank = x.class_rank
+    FROM (
+        SELECT student_id,
+            CASE WHEN percentage IS NOT NULL THEN RANK() OVER (PARTITION BY section_id ORDER BY percentage DESC NULLS LAST) END AS section_rank,
+            CASE WHEN percentage IS NOT NULL THEN RANK() OVER (PARTITION BY class_id ORDER BY percentage DESC NULLS LAST) END AS class_rank
+        FROM student_term_results
+        WHERE academic_year_id = $1 AND class_id = ANY($2)
+    ) x
+    WHERE r.student_id = x.student_id AND r.academic_year_id = $1
+      AND (r.section_rank IS DISTINCT FROM x.section_rank OR r.class_rank IS DISTINCT FROM x.class_rank)
+`;
+
+/**
+ * Recompute student_term_results for the students matching the filter, then
+ * the section and class ranks of every class they are in or have left.
+ *
+ * Called after every scholastic score write with just the students touched,
+ * so a save costs one aggregate over those students' scores plus a rank
+ * pass over their classes. scripts/rebuild-term-results.js runs the same
+ * refresh for a whole year.
+ */
+export async function refreshTermResults(filter: TermResultsFilter): Promise<void> {
+    const params = [filter.academic_year_id, filter.student_ids ?? null, filter.class_id ?? null];
+    const client = await db.pool.connect();
+    try {
+        await client.query('BEGIN');
+        await client.query(LOCK_SQL, params);
+        const pruned = await client.query(PRUNE_SQL, params);
+        const { rows } = await client.query(REFRESH_SQL, params);
+        const classIds = Array.from(new Set<number>([...pruned.rows, ...rows].map(r => r.class_id)));
+        if (classIds.length > 0) {
+            await client.query(RANK_SQL, [filter.academic_year_id, classIds]);
+        }
+        await client.query('COMMIT');
+    } catch (e) {
+        await client.query('ROLLBACK');
+        throw e;
+    } finally {
+        client.release();
+    }
+}
+
+/**
+ * refreshTermResults for the students of a score save, grouped by year.
+ * A failure is logged and swallowed, as with the report version bump: the
+ * scores are already saved and the next save or a rebuild catches up.
+ */
+export async function refreshTouchedResults(rows: { student_id: number; academic_year_id: number }[]) {
+    const studentsByYear = new Map<number, Set<number>>();
+    for (const row of rows) {
+        const ids = studentsByYear.get(row.academic_year_id) ?? new Set<number>();
+        ids.add(row.student_id);
+        studentsByYear.set(row.academic_year_id, ids);
+    }
+    for (const [academicYearId, studentIds] of studentsByYear) {
+        try {
+            await refreshTermResults({ academic_year_id: academicYearId, student_ids: Array.from(studentIds) });
+        } catch (e: any) {
+            console.warn('Could not refresh student_term_results:', e.message);
+        }
+    }
+}
+
+/**
+ * refreshTermResults after an enrollment write (a new enrollment, or a move
+ * to another section or class), so ranks and toppers follow the student at
+ * once. A failure is logged and swallowed like refreshTouchedResults.
+ */
+export async function refreshEnrollmentResults(studentIds: number[], academicYearId: number) {
+    try {
+        await refreshTermResults({ academic_year_id: academicYearId, student_ids: studentIds });
+    } catch (e: any) {
+        console.warn('Could not refresh student_term_results:', e.message);
+    }
+}
+
+export interface TermResultSummary {
+    subject_totals: Record<string, { term1: number; term2: number; has_term1: boolean; has_term2: boolean }>;
+    term1_total: number;
+    term1_subjects: number;
+    term2_total: number;
+    term2_subjects: number;
+    grand_total: number;
+    max_marks: number;
+    percentage: number | null;
+}
+
+// Ranks are left out on purpose: they change whenever a classmate's marks
+// do, and the report payload (and so the PDF cache key) should not
+const SUMMARY_COLUMNS = `
+    student_id, subject_totals,
+    term1_total::float8 AS term1_total, term1_subjects,
+    term2_total::float8 AS term2_total, term2_subjects,
+    grand_total::float8 AS grand_total, max_marks, percentage::float8 AS percentage
+`;
+
+/**
+ * Stored results for the given students, keyed by student id. Returns an
+ * empty map when the table does not exist yet, so the card falls back to
+ * summing the raw scores.
+ */
+export async function getTermResults(studentIds: number[], academicYearId: number): Promise<Map<number, TermResultSummary>> {
+    const results = new Map<number, TermResultSummary>();
+    if (studentIds.length === 0) return results;
+    try {
+        const { rows } = await db.prepared('term_results.summary', `
+            SELECT ${SUMMARY_COLUMNS}
+            FROM student_term_results
+            WHERE student_id = ANY($1) AND academic_year_id = $2
+        `, [studentIds, academicYearId]);
+        for (const { student_id, ...summary } of rows) results.set(student_id, summary);
+    } catch (e: any) {
+        console.warn('Could not read student_term_results:', e.message);
+    }
+    return results;
+}
+
+export interface Topper {
+    student_id: number;
+    admission_no: string;
+    student_name: string;
+    roll_no: number | null;
+    section_name: string;
+    grand_total: number;
+    max_marks: number;
+    percentage: number;
+    rank: number;
+}
+
+/**
+ * The top `limit` ranks of a section (or of a whole class when no section is
+ * given). Ties share a rank, so more than `limit` students can come back.
+ * A range scan on the (academic_year_id, section_id, section_rank) or
+ * (academic_year_id, class_id, class_rank) index.
+ */
+export async function getToppers(
+    filter: { academic_year_id: number; class_id?: number; section_id?: number },
+    limit: number
+): Promise<Topper[]> {
+    const bySection = filter.section_id !== undefined;
+    const { rows } = await db.query(`
+        SELECT r.student_id, s.admission_no, s.student_name, se.roll_no, sec.section_name,
+            r.grand_total::float8 AS grand_total, r.max_marks, r.percentage::float8 AS percentage,
+            r.${bySection ? 'section_rank' : 'class_rank'} AS rank
+        FROM student_term_results r
+        JOIN students s ON s.id = r.student_id
+        JOIN sections sec ON sec.id = r.section_id
+        LEFT JOIN student_enrollments se ON se.student_id = r.student_id AND se.academic_year_id = r.academic_year_id
+        WHERE r.academic_year_id = $1
+          AND r.${bySection ? 'section_id' : 'class_id'} = $2
+          AND r.${bySection ? 'section_rank' : 'class_rank'} <= $3
+        ORDER BY r.${bySection ? 'section_rank' : 'class_rank'}, s.student_name
+    `, [filter.academic_year_id, bySection ? filter.section_id : filter.class_id, limit]);
+    return rows;
+}
@@ -0,0 +1,83 @@
+// Minimal streaming ZIP writer (STORE method, no compression: PDFs are
+// already deflated). Each file is emitted as soon as it is added, so only the
+// current file and the small central directory are ever held in memory.
+
+const CRC_TABLE = (() => {
+    const table = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+        let c = n;
+        for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+        table[n] = c >>> 0;
+    }
+    return table;
+})();
+
+function crc32(data: Buffer): number {
+    let crc = 0xffffffff;
+    for (let i = 0; i < data.length; i++) crc = CRC_TABLE[(crc ^ data[i]) & 0xff] ^ (crc >>> 8);
+    return (crc ^ 0xffffffff) >>> 0;
+}
+
+function dosDateTime(date: Date) {
+    const time = (date.getHours() << 11) | (date.getMinutes() << 5) | (date.getSeconds() >> 1);
+    const day = ((date.getFullYear() - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate();
+    return { time, day };
+}
+
+export class ZipStream {
+    private central: Buffer[] = [];
+    private offset = 0;
+    private count = 0;
+
+    /** Returns the bytes to write for one file (local header + data). */
+    file(name: string, data: Buffer, date: Date = new Date()): Buffer[] {
+        const nameBytes = Buffer.from(name, 'utf8');
+        const crc = crc32(data);
+        const { time, day } = dosDateTime(date);
+
+        const local = Buffer.alloc(30);
+        local.writeUInt32LE(0x04034b50, 0);   // local file header signature
+        local.writeUInt16LE(20, 4);            // version needed to extract
+        local.writeUInt16LE(0x0800, 6);        // flags: UTF-8 file name
+        local.writeUInt16LE(0, 8);             // method: store
+        local.writeUInt16LE(time, 10);
+        local.writeUInt16LE(day, 12);
+        local.writeUInt32LE(crc, 14);
+        local.writeUInt32LE(data.length, 18);  // compressed size
+        local.writeUInt32LE(data.length, 22);  // uncompressed size
+        local.writeUInt16LE(nameBytes.length, 26);
+        local.writeUInt16LE(0, 28);            // extra field length
+
+        const entry = Buffer.alloc(46);
+        entry.writeUInt32LE(0x02014b50, 0);   // central directory signature
+        entry.writeUInt16LE(20, 4);            // version made by
+        entry.writeUInt16LE(20, 6);            // version needed to extract
+        entry.writeUInt16LE(0x0800, 8);
+        entry.writeUInt16LE(0, 10);
+        entry.writeUInt16LE(time, 12);
+        entry.writeUInt16LE(day, 14);
+        entry.writeUInt32LE(crc, 16);
+        entry.writeUInt32LE(data.length, 20);
+        entry.writeUInt32LE(data.length, 24);
+        entry.writeUInt16LE(nameBytes.length, 28);
+        // extra, comment, disk number, internal/external attributes stay 0
+        entry.writeUInt32LE(this.offset, 42);  // offset of the local header
+        this.central.push(entry, nameBytes);
+
+        this.offset += local.length + nameBytes.length + data.length;
+        this.count++;
+        return [local, nameBytes, data];
+    }
+
+    /** Returns the central directory and end record; call once, last. */
+    end(): Buffer {
+        const directory = Buffer.concat(this.central);
+        const record = Buffer.alloc(22);
+        record.writeUInt32LE(0x06054b50, 0);  // end of central directory signature
+        record.writeUInt16LE(this.count, 8);   // entries on this disk
+        record.writeUInt16LE(this.count, 10);  // total entries
+        record.writeUInt32LE(directory.length, 12);
+        record.writeUInt32LE(this.offset, 16);
+        return Buffer.concat([directory, record]);
+    }
+}
@@ -2,7 +2,7 @@
 
 import React, { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
-import { PRINT_STYLES } from '@/app/lib/print-styles';
+import PrintStyles from '@/app/components/reports/PrintStyles';
 import { getTemplateForClass, ReportTemplate } from '@/app/lib/report-mapping';
 import ReportTemplate_III_VIII from '@/app/components/reports/ReportTemplate_III_VIII';
 
@@ -90,7 +90,7 @@ export default function ParentReportPage() {
 
     return (
         <div className="bg-white min-h-screen py-8 px-4 sm:px-8">
-            <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />
+            <PrintStyles />
 
             <div className="max-w-6xl mx-auto mb-8 bg-white shadow-lg rounded-xl overflow-hidden">
                 {/* Back Button */}
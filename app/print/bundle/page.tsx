@@ -0,0 +1,57 @@
+import React from 'react';
+import { streamClassReportData, StudentReportData } from '@/app/lib/report-service';
+import PrintStyles from '@/app/components/reports/PrintStyles';
+import { getTemplateForClass, ReportTemplate } from '@/app/lib/report-mapping';
+import { BUNDLE_PDF_MAX_CARDS } from '@/app/lib/pdf-engine';
+
+import ReportTemplate_III_VIII from '@/app/components/reports/ReportTemplate_III_VIII';
+
+export const dynamic = 'force-dynamic';
+
+interface BundlePrintPageProps {
+    searchParams: {
+        token?: string;
+        academic_year_id?: string;
+        student_ids?: string;
+    };
+}
+
+// The report cards of one part of a class bundle on one page, so the merged
+// PDF is a single document: fonts and the school logo are embedded once, not
+// per card. The whole page is held in memory while Chromium lays it out, so it
+// never renders more than BUNDLE_PDF_MAX_CARDS cards.
+export default async function BundlePrintPage({ searchParams }: BundlePrintPageProps) {
+    const internalToken = process.env.PDF_INTERNAL_TOKEN || 'default_secret';
+    if (searchParams.token !== internalToken) {
+        return <div style={{ color: 'red', padding: 20 }}>Unauthorized Print Request</div>;
+    }
+
+    const academicYearId = searchParams.academic_year_id ? parseInt(searchParams.academic_year_id, 10) : 1;
+    const studentIds = (searchParams.student_ids || '').split(',').map(id => parseInt(id, 10)).filter(Number.isFinite);
+    if (studentIds.length === 0 || studentIds.length > BUNDLE_PDF_MAX_CARDS) {
+        return <div style={{ color: 'red', padding: 20 }}>Between 1 and {BUNDLE_PDF_MAX_CARDS} students per merged PDF</div>;
+    }
+
+    const cards: StudentReportData[] = [];
+    for await (const reportData of streamClassReportData({ academic_year_id: academicYearId, student_ids: studentIds })) {
+        // The bundle route only sends III-VIII classes here; skip anything else
+        if (getTemplateForClass(reportData.student?.class_name) === ReportTemplate.III_VIII) {
+            cards.push(reportData);
+        }
+    }
+
+    return (
+        <html>
+            <head>
+                <PrintStyles />
+            </head>
+            <body className="print-mode bg-white">
+                {cards.map((reportData, i) => (
+                    <div key={reportData.student.id} className={i > 0 ? 'page-break' : undefined}>
+                        <ReportTemplate_III_VIII reportData={reportData} />
+                    </div>
+                ))}
+            </body>
+        </html>
+    );
+}
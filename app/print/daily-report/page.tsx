@@ -36,19 +36,17 @@ function PrintDailyReportContent() {
     if (error) return <div style={{ padding: 40, color: '#dc2626', textAlign: 'center', fontFamily: 'Arial' }}>{error}</div>;
     if (!data) return <div style={{ padding: 40, color: '#6b7280', textAlign: 'center', fontFamily: 'Arial' }}>Loading report…</div>;
 
-    const { totalCollection, summaryByMode, transactions } = data;
+    const { totalCollection, transactionCount, summaryByMode, byClass, transactions } = data;
 
     const displayDate = new Date(date + 'T00:00:00').toLocaleDateString('en-IN', {
         weekday: 'long', day: 'numeric', month: 'long', year: 'numeric',
     });
 
-    // Class-wise breakdown
-    const byClass: Record<string, number> = {};
-    transactions.forEach((t: any) => {
-        const k = t.class_name ? `${t.class_name}${t.section_name ? ' - ' + t.section_name : ''}` : 'Unknown';
-        byClass[k] = (byClass[k] || 0) + Number(t.amount_paid);
-    });
-    const classEntries = Object.entries(byClass).sort((a, b) => b[1] - a[1]);
+    // Class-wise breakdown, pre-aggregated by the fee ledger (largest first)
+    const classEntries: [string, number][] = (byClass || []).map((c: any) => [
+        c.class_name ? `${c.class_name}${c.section_name ? ' - ' + c.section_name : ''}` : 'Unknown',
+        c.amount,
+    ]);
 
     const modeEntries = Object.entries(summaryByMode);
 
@@ -77,7 +75,7 @@ function PrintDailyReportContent() {
                 <div style={{ flex: '1 1 160px', background: 'linear-gradient(135deg,#4f46e5,#6366f1)', borderRadius: 10, padding: '16px 18px', color: '#fff', boxShadow: '0 4px 14px rgba(79,70,229,0.3)' }}>
                     <div style={{ fontSize: 10, opacity: 0.85, textTransform: 'uppercase', letterSpacing: 1, marginBottom: 6 }}>Total Collected</div>
                     <div style={{ fontSize: 22, fontWeight: 800 }}>{fmt(totalCollection)}</div>
-                    <div style={{ fontSize: 10, opacity: 0.75, marginTop: 4 }}>{transactions.length} transaction{transactions.length !== 1 ? 's' : ''}</div>
+                    <div style={{ fontSize: 10, opacity: 0.75, marginTop: 4 }}>{transactionCount} transaction{transactionCount !== 1 ? 's' : ''}</div>
                 </div>
                 {/* Per-mode cards */}
                 {modeEntries.map(([mode, amount]: any) => {
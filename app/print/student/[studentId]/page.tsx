@@ -1,7 +1,7 @@
 import React from 'react';
 import { notFound } from 'next/navigation';
 import { getStudentReportData } from '@/app/lib/report-service';
-import { PRINT_STYLES } from '@/app/lib/print-styles';
+import PrintStyles from '@/app/components/reports/PrintStyles';
 import { getTemplateForClass, ReportTemplate } from '@/app/lib/report-mapping';
 
 import ReportTemplate_III_VIII from '@/app/components/reports/ReportTemplate_III_VIII';
@@ -46,7 +46,7 @@ export default async function PrintReportPage({ params, searchParams }: PrintPag
         return (
             <html>
                 <head>
-                    <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />
+                    <PrintStyles />
                 </head>
                 <body className="print-mode bg-white">
                     <ReportTemplate_III_VIII reportData={reportData} />
@@ -57,7 +57,7 @@ export default async function PrintReportPage({ params, searchParams }: PrintPag
         return (
             <html>
                 <head>
-                    <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />
+                    <PrintStyles />
                 </head>
                 <body className="print-mode bg-white">
                     <div className="bg-transparent" style={{ marginLeft: '-16px', marginRight: '-16px' }}>
@@ -71,7 +71,7 @@ export default async function PrintReportPage({ params, searchParams }: PrintPag
     return (
         <html>
             <head>
-                <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />
+                <PrintStyles />
             </head>
             <body className="print-mode bg-white">
                 <div style={{ padding: '40px', textAlign: 'center' }}>
@@ -4,7 +4,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { ApiClient } from '@/app/lib/api-client';
-import { PRINT_STYLES } from '@/app/lib/print-styles';
+import PrintStyles from '@/app/components/reports/PrintStyles';
 import { getTemplateForClass, ReportTemplate } from '@/app/lib/report-mapping';
 import ReportTemplate_III_VIII from '@/app/components/reports/ReportTemplate_III_VIII';
 import { FoundationalReportContent } from '@/app/components/reports/FoundationalReportContent';
@@ -80,7 +80,7 @@ export default function ReportPreviewPage() {
 
     return (
         <div className="bg-white min-h-screen p-8">
-            <style dangerouslySetInnerHTML={{ __html: PRINT_STYLES }} />
+            <PrintStyles />
 
             <div className="max-w-6xl mx-auto mb-8">
                 <button
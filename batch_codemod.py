@@ -0,0 +1,121 @@
+"""Apply a named set of codemod stages to one or more report templates.
+
+Each target file is read once, the stages run in memory and the result is
+written back only when it changed.
+
+    python batch_codemod.py                          # full III-VIII set on its template
+    python batch_codemod.py --set pagination a.tsx b.tsx
+    python batch_codemod.py --dry-run                # print unified diffs, write nothing
+
+The stages all anchor on the III-VIII card, so other targets are copies of
+that template. A per-file timing summary is printed at the end; the exit
+status is 1 when any file failed (e.g. a missing anchor) so the runner can
+gate CI.
+"""
+import argparse
+import difflib
+import sys
+import time
+
+import expand_sch
+import fix_css2
+import fix_sch
+import index_scores
+import paginate
+import skill_tables
+from build_report_template import STAGES
+from template_pipeline import SpanLog, StageError, run_stages, write_if_changed, write_timings
+
+REPORT_III_VIII = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+# name -> stages. Every stage anchors on the III-VIII card's markup, so that
+# template is the default target; the other layouts have no transforms yet.
+TRANSFORM_SETS = {
+    'report-iii-viii': STAGES,
+    'scholastic': [fix_sch.STAGE, fix_css2.STAGE, expand_sch.STAGE, index_scores.STAGE],
+    'skill-tables': [skill_tables.STAGE, paginate.STAGE],
+    'pagination': [paginate.STAGE],
+}
+
+
+def run_target(filepath, set_name, dry_run):
+    """Run the set on one file and return what happened to it."""
+    start = time.perf_counter()
+    spans = SpanLog(f'batch_codemod {set_name} {filepath}')
+    result = {
+        'filepath': filepath,
+        'applied': [],
+        'skipped': [],
+        'changed': False,
+        'written': False,
+        'diff': '',
+        'error': None,
+    }
+    try:
+        with spans.span('read'):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                original = f.read()
+
+        content, result['applied'], result['skipped'] = run_stages(original, TRANSFORM_SETS[set_name], spans)
+        result['changed'] = content != original
+
+        if result['changed'] and dry_run:
+            result['diff'] = ''.join(difflib.unified_diff(
+                original.splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f'a/{filepath}',
+                tofile=f'b/{filepath}',
+            ))
+        elif result['changed']:
+            with spans.span('write'):
+                result['written'] = write_if_changed(filepath, original, content)
+    except (OSError, StageError) as e:
+        result['error'] = str(e)
+        spans.status = 'error'
+
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    result['timings'] = spans.line()
+    return result
+
+
+def print_summary(results, wall_ms):
+    width = max(len(r['filepath']) for r in results)
+    print(f"\n{'File'.ljust(width)}  {'Time':>9}  Status")
+    for r in results:
+        if r['error']:
+            status = f"FAILED: {r['error']}"
+        elif r['written']:
+            status = f"updated ({', '.join(r['applied'])})"
+        elif r['changed']:
+            status = f"would update ({', '.join(r['applied'])})"
+        else:
+            status = 'up to date'
+        print(f"{r['filepath'].ljust(width)}  {r['elapsed_ms']:>7.1f}ms  {status}")
+    print(f"\n{len(results)} file(s) in {wall_ms:.1f}ms wall time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply codemod stages to report templates.')
+    parser.add_argument('targets', nargs='*', help=f'files to transform (default: {REPORT_III_VIII})')
+    parser.add_argument('--set', dest='set_name', default='report-iii-viii', choices=sorted(TRANSFORM_SETS))
+    parser.add_argument('--dry-run', action='store_true', help='print unified diffs instead of writing')
+    args = parser.parse_args()
+
+    targets = args.targets or [REPORT_III_VIII]
+
+    start = time.perf_counter()
+    results = [run_target(filepath, args.set_name, args.dry_run) for filepath in targets]
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    for r in results:
+        if r['diff']:
+            sys.stdout.write(r['diff'])
+        write_timings(r['timings'])
+
+    print_summary(results, wall_ms)
+    if any(r['error'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,444 @@
+"""Build the shared, content-hashed print stylesheet for the report cards.
+
+Print pages used to inline the same CSS several times: PRINT_STYLES in the
+page head, again inside FoundationalReportContent, plus the template's own
+<style> block. The bundle page inlined the III-VIII block once per card.
+This step collects those blocks and writes a single minified stylesheet to
+public/styles/. Print pages reference it with a <link>, so Chromium downloads
+and parses it once per pooled page instead of once per card.
+
+The blocks stay in the TSX files as the source of truth, because the template
+codemods (fix_css2, expand_sch, paginate) edit them there. Rebuild after
+changing any of them:
+
+    python build_print_css.py          # write the stylesheet and manifest
+    python build_print_css.py --check  # exit 1 if they are out of date
+
+While merging:
+  * declarations that a later rule for the same selector overrides are
+    dropped, taking !important into account
+  * duplicate selectors are merged when no rule in between sets the same
+    properties, so the cascade is unchanged
+  * @import rules are de-duplicated and hoisted to the top (an @import after
+    other rules is ignored by browsers)
+  * each template's block is scoped to its root class with :where(), which
+    keeps specificity unchanged, so the III-VIII and foundational rules
+    cannot leak into each other; the foundational @page becomes a named page
+"""
+import glob
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from template_anchors import AnchorError, index_for
+from template_pipeline import SpanLog, content_hash
+
+PRINT_STYLES_FILE = 'app/lib/print-styles.ts'
+OUTPUT_DIR = os.path.join('public', 'styles')
+OUTPUT_URL = '/styles'
+OUTPUT_PREFIX = 'hpc-print'
+MANIFEST_FILE = 'app/lib/print-stylesheet.ts'
+
+# Card count used for the bundle page in the size report
+BUNDLE_CARDS = 40
+
+
+class Template(NamedTuple):
+    name: str
+    path: str
+    scope: str        # class added to the template's root element
+    root_class: str   # class the root element already carries
+
+
+TEMPLATES = [
+    Template('III-VIII', 'app/components/reports/ReportTemplate_III_VIII.tsx', 'hpc-iii-viii', 'foundational-page'),
+    Template('Foundational', 'app/components/reports/FoundationalReportContent.tsx', 'hpc-foundational', 'foundational-page'),
+]
+
+
+# ─── Parsing ─────────────────────────────────────────────────────────────────
+
+class Decl(NamedTuple):
+    prop: str
+    value: str
+    important: bool
+
+
+class Rule(NamedTuple):
+    selectors: Tuple[str, ...]
+    decls: List[Decl]
+
+
+class Block(NamedTuple):
+    # @media / @supports and similar: a nested list of rules
+    # @page / @font-face: declarations only (children is None)
+    prelude: str
+    children: Optional[list]
+    decls: List[Decl]
+
+
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+WS_RE = re.compile(r'\s+')
+INTERPOLATION_RE = re.compile(r'\$\{\s*([\w.]+)\s*\}')
+CONST_C_RE = re.compile(r'const C = \{(.*?)\};', re.DOTALL)
+CONST_ENTRY_RE = re.compile(r"(\w+):\s*'([^']*)'")
+PRINT_STYLES_RE = re.compile(r'export const PRINT_STYLES = `(.*?)`;', re.DOTALL)
+
+
+def _scan_to(css: str, pos: int, stops: str) -> int:
+    """Offset of the first stop character outside strings and parentheses."""
+    depth = 0
+    quote = None
+    while pos < len(css):
+        ch = css[pos]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and ch in stops:
+            return pos
+        pos += 1
+    return pos
+
+
+def _norm(text: str) -> str:
+    return WS_RE.sub(' ', text).strip()
+
+
+def parse_decls(body: str) -> List[Decl]:
+    decls = []
+    pos = 0
+    while pos < len(body):
+        end = _scan_to(body, pos, ';')
+        item = body[pos:end].strip()
+        pos = end + 1
+        if ':' not in item:
+            continue
+        prop, value = item.split(':', 1)
+        value = _norm(value)
+        important = value.lower().endswith('!important')
+        if important:
+            value = value[:-len('!important')].rstrip()
+        decls.append(Decl(prop.strip().lower(), value, important))
+    return decls
+
+
+def parse(css: str, pos: int = 0, nested: bool = False):
+    """Parse CSS into (imports, items); returns (imports, items, end_offset)."""
+    imports: List[str] = []
+    items: list = []
+    while True:
+        end = _scan_to(css, pos, '{};')
+        head = css[pos:end].strip()
+        if end >= len(css):
+            if head:
+                raise AnchorError(f"Unterminated CSS near: {head[:60]}")
+            return imports, items, end
+        ch = css[end]
+        if ch == '}':
+            if not nested:
+                raise AnchorError(f"Unbalanced '}}' in CSS near: {css[max(0, end - 60):end]}")
+            return imports, items, end + 1
+        if ch == ';':
+            if head.lower().startswith('@import'):
+                imports.append(_norm(head))
+            pos = end + 1
+            continue
+
+        # '{': a rule or an at-rule block
+        if head.startswith('@') and head.split()[0].lower() in ('@media', '@supports', '@document', '@layer'):
+            inner_imports, children, pos = parse(css, end + 1, nested=True)
+            imports.extend(inner_imports)
+            items.append(Block(_norm(head), children, []))
+            continue
+        close = _scan_to(css, end + 1, '}')
+        decls = parse_decls(css[end + 1:close])
+        pos = close + 1
+        if head.startswith('@'):
+            items.append(Block(_norm(head), None, decls))
+        else:
+            selectors = tuple(_norm(s) for s in head.split(',') if s.strip())
+            items.append(Rule(selectors, decls))
+
+
+# ─── Merging ─────────────────────────────────────────────────────────────────
+
+def drop_overridden(items: list) -> list:
+    """Drop declarations a later rule for the same selector overrides.
+
+    For every (selector, property) the winner is the last !important
+    declaration if there is one, else the last declaration. A declaration
+    survives while it wins for at least one selector of its rule. Repeats
+    inside one rule are kept: they are usually deliberate fallbacks.
+    """
+    winners: Dict[Tuple[str, str], Tuple[int, bool]] = {}
+    for i, item in enumerate(items):
+        if not isinstance(item, Rule):
+            continue
+        for decl in item.decls:
+            for selector in item.selectors:
+                key = (selector, decl.prop)
+                current = winners.get(key)
+                if current is None or decl.important or not current[1]:
+                    winners[key] = (i, decl.important)
+
+    result = []
+    for i, item in enumerate(items):
+        if isinstance(item, Block) and item.children is not None:
+            item = Block(item.prelude, drop_overridden(item.children), [])
+        elif isinstance(item, Rule):
+            decls = [d for d in item.decls
+                     if any(winners[(s, d.prop)] == (i, d.important) for s in item.selectors)]
+            item = Rule(item.selectors, decls)
+        result.append(item)
+    return result
+
+
+def merge_duplicates(items: list) -> list:
+    """Fold a rule into a later rule with the same selectors when it is safe.
+
+    Safe means no rule in between sets any of the moved properties, so
+    moving the declarations later cannot change which value wins.
+    """
+    items = [Block(i.prelude, merge_duplicates(i.children), []) if isinstance(i, Block) and i.children is not None else i
+             for i in items]
+    merged = list(items)
+    for i, item in enumerate(merged):
+        if not isinstance(item, Rule) or not item.decls:
+            continue
+        props = {d.prop for d in item.decls}
+        for j in range(i + 1, len(merged)):
+            other = merged[j]
+            if isinstance(other, Rule) and other.selectors == item.selectors:
+                other_props = {d.prop for d in other.decls}
+                moved = [d for d in item.decls if d.prop not in other_props]
+                merged[j] = Rule(other.selectors, moved + other.decls)
+                merged[i] = Rule(item.selectors, [])
+                break
+            if isinstance(other, Block) or (isinstance(other, Rule) and props & {d.prop for d in other.decls}):
+                break
+
+    # Adjacent blocks with the same prelude (e.g. two @media print) become one
+    result: list = []
+    for item in merged:
+        if (isinstance(item, Block) and item.children is not None and result
+                and isinstance(result[-1], Block) and result[-1].prelude == item.prelude):
+            result[-1] = Block(item.prelude, merge_duplicates(result[-1].children + item.children), [])
+        else:
+            result.append(item)
+    return result
+
+
+def prune(items: list) -> list:
+    result = []
+    for item in items:
+        if isinstance(item, Rule) and not item.decls:
+            continue
+        if isinstance(item, Block) and item.children is not None:
+            item = Block(item.prelude, prune(item.children), [])
+            if not item.children:
+                continue
+        result.append(item)
+    return result
+
+
+# ─── Scoping ─────────────────────────────────────────────────────────────────
+
+COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+
+
+def scope_selector(selector: str, template: Template) -> str:
+    """Restrict a selector to one template without changing its specificity."""
+    scope = f'.{template.scope}'
+    first = COMBINATOR_RE.split(selector, 1)[0]
+    rest = selector[len(first):]
+    if first in ('html', 'body'):
+        return f'{first}:where(:has({scope})){rest}'
+    if first == '*':
+        return f':where(html:has({scope})) {selector}'
+    if f'.{template.root_class}' in re.findall(r'\.[\w-]+', first):
+        return f'{first}:where({scope}){rest}'
+    return f':where({scope}) {selector}'
+
+
+def scope_items(items: list, template: Template) -> list:
+    result = []
+    for item in items:
+        if isinstance(item, Rule):
+            result.append(Rule(tuple(scope_selector(s, template) for s in item.selectors), item.decls))
+        elif item.children is not None:
+            result.append(Block(item.prelude, scope_items(item.children, template), []))
+        elif item.prelude.lower().startswith('@page'):
+            # @page cannot take a selector: give the template its own named page
+            result.append(Block(f'@page {template.scope}', None, item.decls))
+            result.append(Rule((f'.{template.scope}',), [Decl('page', template.scope, False)]))
+        else:
+            result.append(item)
+    return result
+
+
+# ─── Output ──────────────────────────────────────────────────────────────────
+
+def serialize(items: list) -> str:
+    out = []
+    for item in items:
+        if isinstance(item, Rule):
+            body = ';'.join(f"{d.prop}:{d.value}{'!important' if d.important else ''}" for d in item.decls)
+            out.append(f"{','.join(item.selectors)}{{{body}}}")
+        elif item.children is not None:
+            out.append(f'{item.prelude}{{{serialize(item.children)}}}')
+        else:
+            body = ';'.join(f"{d.prop}:{d.value}{'!important' if d.important else ''}" for d in item.decls)
+            out.append(f'{item.prelude}{{{body}}}')
+    return '\n'.join(out)
+
+
+def optimize(css: str) -> Tuple[List[str], list]:
+    imports, items, _ = parse(COMMENT_RE.sub('', css))
+    return imports, prune(merge_duplicates(drop_overridden(items)))
+
+
+# ─── Sources ─────────────────────────────────────────────────────────────────
+
+def _read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _resolve(css: str, path: str, constants: Dict[str, str]) -> str:
+    def replace(m):
+        name = m.group(1)
+        if name == 'PRINT_STYLES':
+            # Shipped once as the base layer, not again per template
+            return ''
+        if name.startswith('C.') and name[2:] in constants:
+            return constants[name[2:]]
+        raise AnchorError(f"Cannot resolve ${{{name}}} in the <style> block of {path}")
+    return INTERPOLATION_RE.sub(replace, css)
+
+
+def print_styles_source() -> str:
+    match = PRINT_STYLES_RE.search(_read(PRINT_STYLES_FILE))
+    if not match:
+        raise AnchorError(f"PRINT_STYLES template literal not found in {PRINT_STYLES_FILE}")
+    return match.group(1)
+
+
+def style_css(content: str, path: str) -> str:
+    """The <style>{`...`}</style> block of content with ${C.*} constants filled in."""
+    style = index_for(content).first('style')
+    inner = content[style.inner_start:style.inner_end].strip()
+    if not (inner.startswith('{`') and inner.endswith('`}')):
+        raise AnchorError(f"<style> in {path} is not a template literal")
+    match = CONST_C_RE.search(content)
+    constants = dict(CONST_ENTRY_RE.findall(match.group(1))) if match else {}
+    return _resolve(inner[2:-2], path, constants)
+
+
+def template_css(template: Template) -> str:
+    content = _read(template.path)
+    # Every rule is scoped to this class: a card without it would render
+    # with none of its own styles
+    if not re.search(rf'className="[^"]*\b{re.escape(template.scope)}\b', content):
+        raise AnchorError(f"{template.path} has no element with class {template.scope} "
+                          f"(python build_report_template.py adds it to the III-VIII card)")
+    return style_css(content, template.path)
+
+
+def build() -> Tuple[str, Dict[str, int]]:
+    """Return the stylesheet and the inline byte counts it replaces."""
+    base = print_styles_source()
+    imports, items = optimize(base)
+    inline = {'base': len(base.encode('utf-8'))}
+
+    for template in TEMPLATES:
+        css = template_css(template)
+        inline[template.name] = len(css.encode('utf-8'))
+        template_imports, template_items = optimize(css)
+        imports += template_imports
+        items += scope_items(template_items, template)
+
+    unique_imports = list(dict.fromkeys(f'{i};' for i in imports))
+    header = '/* Generated by build_print_css.py - do not edit */'
+    return '\n'.join([header] + unique_imports + [serialize(items)]) + '\n', inline
+
+
+def manifest_for(href: str) -> str:
+    return (
+        "// Generated by build_print_css.py - do not edit by hand.\n"
+        "// Content-hashed, so the file can be cached forever; rebuild after changing\n"
+        "// PRINT_STYLES or the <style> blocks of the report templates.\n"
+        f"export const PRINT_STYLESHEET_HREF = '{href}';\n"
+    )
+
+
+def report(css: str, href: str, inline: Dict[str, int]):
+    link = len(f'<link rel="stylesheet" href="{href}"/>')
+    sheet = len(css.encode('utf-8'))
+    # Inline CSS each page used to carry; FoundationalReportContent repeats PRINT_STYLES
+    pages = [
+        ('III-VIII card', inline['base'] + inline['III-VIII'], 2),
+        ('Foundational card', 2 * inline['base'] + inline['Foundational'], 2),
+        (f'Bundle ({BUNDLE_CARDS} cards)', inline['base'] + BUNDLE_CARDS * inline['III-VIII'], 1 + BUNDLE_CARDS),
+    ]
+    print(f"📦 {href}: {sheet / 1024:.1f} KB (sources: {sum(inline.values()) / 1024:.1f} KB)")
+    print(f"   {'page':<22} {'inline CSS':>11} {'linked':>9}")
+    for name, inline_bytes, links in pages:
+        print(f"   {name:<22} {inline_bytes / 1024:>8.1f} KB {links * link:>7} B")
+    print("   (the linked sheet is fetched once per Chromium page and then served from cache)")
+
+
+def main():
+    check = '--check' in sys.argv[1:]
+    spans = SpanLog('build_print_css')
+    try:
+        with spans.span('build'):
+            css, inline = build()
+    except AnchorError as e:
+        print(f"❌ {e}")
+        spans.status = 'error'
+        spans.emit()
+        sys.exit(1)
+
+    name = f'{OUTPUT_PREFIX}.{content_hash(css)[:12]}.css'
+    href = f'{OUTPUT_URL}/{name}'
+    path = os.path.join(OUTPUT_DIR, name)
+    manifest = manifest_for(href)
+
+    current_manifest = _read(MANIFEST_FILE) if os.path.exists(MANIFEST_FILE) else ''
+    up_to_date = os.path.exists(path) and current_manifest == manifest
+
+    if check:
+        spans.emit()
+        if not up_to_date:
+            print(f"{MANIFEST_FILE} is out of date: run python build_print_css.py")
+            sys.exit(1)
+        print(f"{href} is up to date")
+        return
+
+    report(css, href, inline)
+    if up_to_date:
+        spans.emit()
+        print(f"{href} is up to date")
+        return
+
+    with spans.span('write'):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        for stale in glob.glob(os.path.join(OUTPUT_DIR, f'{OUTPUT_PREFIX}.*.css')):
+            os.remove(stale)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(css)
+        with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            f.write(manifest)
+    spans.emit()
+    print(f"Wrote {path} and {MANIFEST_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Rebuild ReportTemplate_III_VIII.tsx by running every codemod in one pass.
+
+The template is read once, each stage runs in memory in the order below and
+the file is written back only when its content hash changed. Stages skip
+themselves when their output is already present, so this is safe to run
+repeatedly from CI or a pre-commit hook:
+
+    python build_report_template.py          # apply pending stages
+    python build_report_template.py --check  # exit 1 if the template is stale
+"""
+import expand_sch
+import fix_css2
+import fix_rt2
+import fix_sch
+import index_scores
+import paginate
+import print_scope
+import skill_tables
+import term_results
+from template_pipeline import main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+# Order matters: fix_css2 / expand_sch adjust the styles fix_sch introduced
+# and index_scores rewrites the per-subject totals fix_sch injected, which
+# term_results then points at the stored student_term_results values.
+# skill_tables regenerates the tables fix_rt2 merged and swaps the lookup map
+# index_scores wrote. print_scope scopes the card for the shared print
+# stylesheet; paginate goes last because it plans the breaks from the
+# finished content.
+STAGES = [
+    fix_rt2.STAGE,
+    fix_sch.STAGE,
+    fix_css2.STAGE,
+    expand_sch.STAGE,
+    index_scores.STAGE,
+    term_results.STAGE,
+    skill_tables.STAGE,
+    print_scope.STAGE,
+    paginate.STAGE,
+]
+
+if __name__ == '__main__':
+    main_for(FILEPATH, STAGES)
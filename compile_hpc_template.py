@@ -0,0 +1,619 @@
+"""Compiled fill-in renderer for the static HPC layouts.
+
+hpc_format.html (classes III-VIII) and HPC_Foundational_Stage_v2.html are
+blank cards: every value goes into an empty element (an info box, a table
+cell, an achievement box, a write line). Compiling a layout scans it once
+and splits it at those elements into a slot table:
+
+    fragments  the static HTML between slots (len(slots) + 1 strings)
+    slots      one key per slot, e.g. 'scholastic|English|Periodic Assessment|Term I'
+               or 'foundational|well_being|wb_01|TERM1'
+
+Rendering a card is then one pass that turns the report payload into a
+{key: value} dict and a single ''.join over the fragments; no parsing or
+DOM work per card. Foundational skill keys come from FOUNDATIONAL_DOMAINS
+in app/lib/foundational-skills.ts, so the compiled table matches what the
+teacher UI stores.
+
+Compiled tables are cached in memory and on disk under .cache/hpc-templates,
+keyed by the hash of the layout, the skills config and COMPILER_VERSION, so
+a layout is only rescanned after it changes.
+
+    python compile_hpc_template.py compile hpc_format.html
+    python compile_hpc_template.py render hpc_format.html cards.jsonl -o out/ --workers 8
+
+cards.jsonl holds one payload per line: the getStudentReportData() object
+for III-VIII, or the `data` object of /api/reports/foundational/[studentId]
+for the foundational card.
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional
+
+from template_pipeline import SpanLog, StageError, content_hash
+
+CACHE_DIR = os.path.join('.cache', 'hpc-templates')
+SKILLS_CONFIG = os.path.join('app', 'lib', 'foundational-skills.ts')
+
+# Bump when slot keys or the cache layout change so stale tables are ignored
+COMPILER_VERSION = 1
+
+III_VIII = 'III_VIII'
+FOUNDATIONAL = 'FOUNDATIONAL'
+
+# Empty elements of these kinds are data slots; other empty elements
+# (gold bars, bullet dots, photo boxes) are decoration and stay static
+SLOT_TAGS = ('td', 'span')
+SLOT_CLASSES = {'info-input', 'info-value', 'input-cell', 'achievement-box',
+                'feedback-input', 'write-line', 'write-box'}
+HEADING_TAGS = ('h2', 'h3', 'h4')
+
+MONTHS = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar']
+SCHOLASTIC_COMPONENTS = ['Periodic Assessment', 'Subject Enrichment Activities',
+                         'Internal Assessment', 'Terminal Assessment']
+TERMS = ['Term I', 'Term II']
+FOUNDATIONAL_TERMS = ['TERM1', 'TERM2']
+
+# Info-box label (without the colon) -> student field slot
+INFO_FIELDS = {
+    'student name': 'student_name',
+    'roll no.': 'roll_no',
+    'adm no.': 'admission_no',
+    'class / section': 'class_section',
+    'date of birth': 'dob',
+    'address': 'address',
+    'phone': 'phone',
+    'mother/guardian name': 'mother_name',
+    "mother's occupation": 'mother_occupation',
+    'father/guardian name': 'father_name',
+    "father's occupation": 'father_occupation',
+}
+
+# Attendance row label -> attendance slot; both layouts, matched lower-case
+ATTENDANCE_ROWS = {
+    'no. of working days': 'working_days',
+    'no. of days present': 'days_present',
+    '% of attendance': 'percentage',
+    'if attendance is low then reason': 'reason',
+    'if attendance is low, reason': 'reason',
+}
+
+# Feedback card heading -> remark_types.type_name (the seed data uses curly quotes)
+REMARK_TYPES = {
+    "learner's profile by the teacher": 'Learner’s Profile by the teacher',
+    "parent's feedback": 'Parent’s Feedback',
+    'self-assessment': 'Self-Assessment',
+}
+
+# Foundational free-text areas -> foundational_text_fields.field_key
+FOUNDATIONAL_TEXT_AREAS = {
+    'my best friends': 'gi_best_friend',
+    "learner's profile by the teacher": 'learner_profile',
+}
+
+
+class TemplateError(StageError):
+    """Raised when a layout or the skills config cannot be compiled."""
+
+
+class RawSlot(NamedTuple):
+    offset: int     # where the value is inserted (just after the opening tag)
+    heading: str    # text of the nearest preceding h2/h3/h4
+    label: str      # nearest preceding text (row label, info label, skill name)
+    index: int      # slots seen since that label: column, term or line number
+    row: int        # <tr> counter, 0 outside tables
+
+
+class CompiledTemplate(NamedTuple):
+    kind: str
+    source_hash: str
+    fragments: List[str]
+    slots: List[str]
+
+
+# ─── Skills config ───────────────────────────────────────────────────────────
+
+DOMAIN_RE = re.compile(r"key:\s*'(?P<key>\w+)',\s*label:\s*'[^']*',\s*currGoal:")
+SKILL_RE = re.compile(r"\{\s*key:\s*'(?P<key>\w+)',\s*label:\s*'(?P<label>[^']*)'\s*\}")
+RATING_RE = re.compile(r"value:\s*'(?P<value>\w)',.*?stars:\s*'(?P<stars>[^']*)'")
+
+
+def _block(source: str, name: str) -> str:
+    start = source.find(f'export const {name}')
+    if start < 0:
+        raise TemplateError(f"{name} not found in {SKILLS_CONFIG}")
+    end = source.find('export ', start + 1)
+    return source[start:end if end > 0 else len(source)]
+
+
+def load_skills_config(source: str) -> dict:
+    """Read the foundational skills, text fields and rating stars from the TS config.
+
+    Skills are returned in card order as (domain_key, skill_key, label), so
+    labels shared by two domains ('Expresses ideas clearly') resolve by position.
+    """
+    domains_src = _block(source, 'FOUNDATIONAL_DOMAINS')
+    tokens = sorted(
+        [(m.start(), 'domain', m.group('key'), '') for m in DOMAIN_RE.finditer(domains_src)]
+        + [(m.start(), 'skill', m.group('key'), m.group('label')) for m in SKILL_RE.finditer(domains_src)]
+    )
+    skills = []
+    domain = None
+    for _, kind, key, label in tokens:
+        if kind == 'domain':
+            domain = key
+        elif domain is None:
+            raise TemplateError(f"Skill {key} appears before any domain in {SKILLS_CONFIG}")
+        else:
+            skills.append((domain, key, label))
+    if not skills:
+        raise TemplateError(f"No skills found in FOUNDATIONAL_DOMAINS ({SKILLS_CONFIG})")
+
+    text_fields = {}
+    for name in ('SELF_ASSESS_FIELDS', 'PARENT_FEEDBACK_FIELDS'):
+        for m in SKILL_RE.finditer(_block(source, name)):
+            text_fields[m.group('label')] = m.group('key')
+
+    ratings = {m.group('value'): m.group('stars') for m in RATING_RE.finditer(_block(source, 'RATINGS'))}
+    return {'skills': skills, 'text_fields': text_fields, 'ratings': ratings}
+
+
+# ─── Compiling ───────────────────────────────────────────────────────────────
+
+class _SlotScanner(HTMLParser):
+    """Single pass over a layout recording every empty slot element with its context."""
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_offsets = [0]
+        for line in source.split('\n'):
+            self.line_offsets.append(self.line_offsets[-1] + len(line) + 1)
+        self.slots: List[RawSlot] = []
+        self.heading = ''
+        self.label = ''
+        self.index = 0
+        self.row = 0
+        self.in_row = False
+        self.candidate = None   # (tag, offset just after its opening tag)
+        self.heading_tag = None
+        self.heading_text = []
+        self.raw_text = False
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self.line_offsets[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('style', 'script'):
+            self.raw_text = True
+            return
+        end = self._offset() + len(self.get_starttag_text())
+        if tag in HEADING_TAGS:
+            self.heading_tag = tag
+            self.heading_text = []
+        elif tag == 'tr':
+            self.row += 1
+            self.in_row = True
+            self.label = ''
+            self.index = 0
+
+        classes = set((dict(attrs).get('class') or '').split())
+        if tag in SLOT_TAGS or (tag == 'div' and classes & SLOT_CLASSES):
+            self.candidate = (tag, end)
+        else:
+            self.candidate = None
+
+    def handle_endtag(self, tag):
+        if tag in ('style', 'script'):
+            self.raw_text = False
+            return
+        if tag == 'tr':
+            self.in_row = False
+        if tag == self.heading_tag:
+            self.heading = ' '.join(self.heading_text).strip()
+            self.heading_tag = None
+        if self.candidate and self.candidate[0] == tag:
+            start = self.candidate[1]
+            if not self.source[start:self._offset()].strip():
+                self.slots.append(RawSlot(start, self.heading, self.label, self.index, self.row if self.in_row else 0))
+                self.index += 1
+        self.candidate = None
+
+    def handle_data(self, data):
+        if self.raw_text:
+            return
+        text = ' '.join(data.split())
+        if not text:
+            return
+        if self.heading_tag:
+            self.heading_text.append(text)
+        self.label = text
+        self.index = 0
+        self.candidate = None
+
+
+def _norm(label: str) -> str:
+    return label.strip().rstrip(':').strip().lower()
+
+
+def _common_key(raw: RawSlot) -> Optional[str]:
+    """Keys shared by both layouts: student info and attendance."""
+    label = _norm(raw.label)
+    if label in INFO_FIELDS and raw.index == 0:
+        return f'student|{INFO_FIELDS[label]}'
+    if _norm(raw.heading) == 'attendance record' and label in ATTENDANCE_ROWS:
+        field = ATTENDANCE_ROWS[label]
+        if field == 'reason':
+            return 'attendance|reason' if raw.index == 0 else None
+        if raw.index < len(MONTHS):
+            return f'attendance|{field}|{MONTHS[raw.index]}'
+        if raw.index == len(MONTHS):
+            return f'attendance|{field}|total'
+    return None
+
+
+def _iii_viii_keys(raw_slots: List[RawSlot], config: dict) -> List[Optional[str]]:
+    keys = []
+    subjects_section = False
+    for raw in raw_slots:
+        key = _common_key(raw)
+        heading = _norm(raw.heading)
+        if key is None and raw.row and heading == 'scholastic domains':
+            if raw.index < len(SCHOLASTIC_COMPONENTS) * len(TERMS):
+                component = SCHOLASTIC_COMPONENTS[raw.index // len(TERMS)]
+                key = f'scholastic|{raw.label}|{component}|{TERMS[raw.index % len(TERMS)]}'
+        elif key is None and heading in REMARK_TYPES:
+            # Learner's profile has no aspect; the other cards are one row per aspect,
+            # stored with the labels the teacher UI uses ('...' rather than '…')
+            aspect = '' if _norm(raw.label) == heading else raw.label.replace('…', '...')
+            key = f'remarks|{REMARK_TYPES[heading]}|{aspect}' if raw.index == 0 else None
+        elif key is None and not raw.row and raw.index < len(TERMS) and raw.label != raw.heading:
+            # Achievement boxes: heading is the domain, label the sub-skill
+            key = f'co_scholastic|{raw.heading}|{raw.label}|{TERMS[raw.index]}'
+        subjects_section = subjects_section or key is not None and key.startswith('scholastic|')
+        keys.append(key)
+    if not subjects_section:
+        raise TemplateError('No scholastic rows found: is this the III-VIII layout?')
+    return keys
+
+
+def _foundational_keys(raw_slots: List[RawSlot], config: dict) -> List[Optional[str]]:
+    skills = config['skills']
+    text_fields = config['text_fields']
+    keys = []
+    cursor = 0
+    resolved_row = (None, None)   # (row, skill) so both term cells share one lookup
+    matched = 0
+    for raw in raw_slots:
+        key = _common_key(raw)
+        label = _norm(raw.label)
+        if key is None and label == 'i am' and raw.index == 0:
+            key = 'student|age'
+        elif key is None and label in FOUNDATIONAL_TEXT_AREAS:
+            field = FOUNDATIONAL_TEXT_AREAS[label]
+            key = f'text|{field}|{raw.index}' if field == 'gi_best_friend' else f'text|{field}'
+        elif key is None and raw.row and raw.index < len(FOUNDATIONAL_TERMS):
+            term = FOUNDATIONAL_TERMS[raw.index]
+            if raw.label in text_fields:
+                key = f'text|{text_fields[raw.label]}|{term}'
+            else:
+                if resolved_row[0] != raw.row:
+                    # Walk forward through the config so repeated labels map to
+                    # the domain whose table we are in
+                    skill = None
+                    for i in range(cursor, len(skills)):
+                        if skills[i][2] == raw.label:
+                            skill, cursor = skills[i], i + 1
+                            break
+                    resolved_row = (raw.row, skill)
+                skill = resolved_row[1]
+                if skill:
+                    key = f'foundational|{skill[0]}|{skill[1]}|{term}'
+                    matched += raw.index == 0
+        keys.append(key)
+    if matched == 0:
+        raise TemplateError('No FOUNDATIONAL_DOMAINS skills found: is this the foundational layout?')
+    return keys
+
+
+def detect_kind(source: str) -> str:
+    return FOUNDATIONAL if 'class="info-value"' in source else III_VIII
+
+
+def compile_source(source: str, config: dict, kind: Optional[str] = None) -> CompiledTemplate:
+    kind = kind or detect_kind(source)
+    scanner = _SlotScanner(source)
+    scanner.feed(source)
+    scanner.close()
+
+    keys = (_foundational_keys if kind == FOUNDATIONAL else _iii_viii_keys)(scanner.slots, config)
+
+    fragments = []
+    slots = []
+    last = 0
+    for raw, key in zip(scanner.slots, keys):
+        if key is None:
+            continue
+        fragments.append(source[last:raw.offset])
+        slots.append(key)
+        last = raw.offset
+    fragments.append(source[last:])
+    return CompiledTemplate(kind, content_hash(source), fragments, slots)
+
+
+_memory_cache: Dict[str, CompiledTemplate] = {}
+
+
+def load_template(path: str, config_path: str = SKILLS_CONFIG) -> CompiledTemplate:
+    """Return the compiled table for a layout, compiling only when it changed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_source = f.read()
+
+    cache_key = content_hash(f'{COMPILER_VERSION}\0{source}\0{config_source}')
+    if cache_key in _memory_cache:
+        return _memory_cache[cache_key]
+
+    cache_file = os.path.join(CACHE_DIR, f'{cache_key}.json')
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            compiled = CompiledTemplate(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        compiled = compile_source(source, load_skills_config(config_source))
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(compiled._asdict(), f, ensure_ascii=False)
+        os.replace(tmp, cache_file)
+
+    _memory_cache[cache_key] = compiled
+    return compiled
+
+
+# ─── Payload -> slot values ──────────────────────────────────────────────────
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _date_en_gb(value) -> str:
+    # Matches toLocaleDateString('en-GB') on the ISO dates pg serialises
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})', _text(value))
+    return f'{match.group(3)}/{match.group(2)}/{match.group(1)}' if match else _text(value)
+
+
+def _age(value) -> str:
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})', _text(value))
+    if not match:
+        return ''
+    today = time.localtime()
+    year, month, day = (int(g) for g in match.groups())
+    age = today.tm_year - year - ((today.tm_mon, today.tm_mday) < (month, day))
+    return str(age)
+
+
+def _student_values(student: dict, dob, phone) -> Dict[str, str]:
+    section = student.get('section_name')
+    return {
+        'student|student_name': _text(student.get('student_name')),
+        'student|roll_no': _text(student.get('roll_no')),
+        'student|admission_no': _text(student.get('admission_no')),
+        'student|class_section': f"{_text(student.get('class_name'))} {'— ' + section if section else ''}",
+        'student|dob': _date_en_gb(dob),
+        'student|address': _text(student.get('address')),
+        'student|phone': _text(phone),
+        'student|mother_name': _text(student.get('mother_name')),
+        'student|mother_occupation': _text(student.get('mother_occupation')),
+        'student|father_name': _text(student.get('father_name')),
+        'student|father_occupation': _text(student.get('father_occupation')),
+    }
+
+
+def _attendance_values(rows, month_of, working_of, present_of) -> Dict[str, str]:
+    values = {}
+    total_working = total_present = 0
+    for row in rows:
+        month = _text(month_of(row))[:3]
+        key = f'attendance|working_days|{month}'
+        if month not in MONTHS or key in values:
+            continue
+        working = int(working_of(row) or 0)
+        present = int(present_of(row) or 0)
+        total_working += working
+        total_present += present
+        values[key] = _text(working or '')
+        values[f'attendance|days_present|{month}'] = _text(present or '')
+        values[f'attendance|percentage|{month}'] = str(round(present / working * 100)) if working else ''
+    values['attendance|working_days|total'] = str(total_working)
+    values['attendance|days_present|total'] = str(total_present)
+    values['attendance|percentage|total'] = f'{round(total_present / total_working * 100)}%' if total_working else ''
+    return values
+
+
+def iii_viii_values(data: dict) -> Dict[str, str]:
+    """Slot values for hpc_format.html from a getStudentReportData() payload."""
+    student = data.get('student') or {}
+    attendance = data.get('attendance') or []
+    values = _student_values(student, student.get('dob'), student.get('phone_no'))
+    values.update(_attendance_values(
+        attendance, lambda a: a.get('month_name'), lambda a: a.get('working_days'), lambda a: a.get('days_present')
+    ))
+    values['attendance|reason'] = _text(attendance[0].get('reason_for_low_attendance')) if attendance else ''
+
+    for s in data.get('scholastic') or []:
+        key = f"scholastic|{s.get('subject_name')}|{s.get('component_name')}|{s.get('term_name')}"
+        values.setdefault(key, _text(s.get('marks')))
+    for c in data.get('co_scholastic') or []:
+        key = f"co_scholastic|{c.get('domain_name')}|{c.get('sub_skill_name')}|{c.get('term_name')}"
+        values.setdefault(key, _text(c.get('grade')))
+    for r in data.get('remarks') or []:
+        values.setdefault(f"remarks|{r.get('type_name')}|{r.get('aspect') or ''}", _text(r.get('remark_text')))
+    return values
+
+
+def foundational_values(data: dict, ratings: Dict[str, str]) -> Dict[str, str]:
+    """Slot values for the foundational layout from an /api/reports/foundational payload."""
+    student = data.get('student') or {}
+    values = _student_values(student, student.get('date_of_birth'), student.get('phone'))
+    values['student|age'] = _age(student.get('date_of_birth'))
+    values.update(_attendance_values(
+        data.get('attendance') or [], lambda a: a.get('month'), lambda a: a.get('total'), lambda a: a.get('present')
+    ))
+
+    for r in data.get('ratings') or []:
+        key = f"foundational|{r.get('domain')}|{r.get('skill_key')}|{r.get('term')}"
+        values[key] = ratings.get(r.get('rating'), _text(r.get('rating')))
+
+    texts = {}
+    for t in data.get('textFields') or []:
+        texts[(t.get('term'), t.get('field_key'))] = _text(t.get('field_value'))
+        values[f"text|{t.get('field_key')}|{t.get('term')}"] = _text(t.get('field_value'))
+
+    # Single-value fields show Term II when filled, else Term I, as on the print page
+    def any_term(field):
+        return texts.get(('TERM2', field)) or texts.get(('TERM1', field)) or ''
+
+    values['attendance|reason'] = any_term('gi_attendance_reason')
+    values['text|learner_profile'] = texts.get(('TERM1', 'learner_profile')) or texts.get(('TERM2', 'learner_profile')) or ''
+    for i, line in enumerate(any_term('gi_best_friend').split('\n')):
+        values[f'text|gi_best_friend|{i}'] = line
+    return values
+
+
+# ─── Rendering ───────────────────────────────────────────────────────────────
+
+def render(compiled: CompiledTemplate, values: Dict[str, str]) -> str:
+    """Fill the slots: one dict lookup per slot and a single join."""
+    parts = [''] * (2 * len(compiled.slots) + 1)
+    parts[0::2] = compiled.fragments
+    escape = html.escape
+    parts[1::2] = [escape(values.get(key, ''), quote=False) for key in compiled.slots]
+    return ''.join(parts)
+
+
+def payload_values(compiled: CompiledTemplate, data: dict, config: dict) -> Dict[str, str]:
+    if compiled.kind == FOUNDATIONAL:
+        return foundational_values(data, config['ratings'])
+    return iii_viii_values(data)
+
+
+def output_name(data: dict, position: int) -> str:
+    student = data.get('student') or {}
+    stem = _text(student.get('admission_no') or student.get('id') or position)
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', stem).strip('_') + '.html'
+
+
+# Worker state: set once per process by _init_worker, never per card
+_worker = {}
+
+
+def _init_worker(compiled: CompiledTemplate, config: dict, out_dir: str):
+    _worker.update(compiled=compiled, config=config, out_dir=out_dir)
+
+
+def _render_line(job) -> int:
+    position, line = job
+    data = json.loads(line)
+    compiled = _worker['compiled']
+    page = render(compiled, payload_values(compiled, data, _worker['config']))
+    with open(os.path.join(_worker['out_dir'], output_name(data, position)), 'w', encoding='utf-8') as f:
+        f.write(page)
+    return len(page)
+
+
+def _read_jobs(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for position, line in enumerate(f, 1):
+            if line.strip():
+                yield position, line
+
+
+def render_batch(template: str, payloads: str, out_dir: str, workers: int, chunksize: int = 64,
+                 spans: Optional[SpanLog] = None):
+    spans = spans or SpanLog('render_batch')
+    with spans.span('compile'):
+        compiled = load_template(template)
+        with open(SKILLS_CONFIG, 'r', encoding='utf-8') as f:
+            config = load_skills_config(f.read())
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    count = 0
+    total_bytes = 0
+    with spans.span('render'):
+        if workers <= 1:
+            _init_worker(compiled, config, out_dir)
+            for job in _read_jobs(payloads):
+                total_bytes += _render_line(job)
+                count += 1
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(compiled, config, out_dir)) as pool:
+                for size in pool.map(_render_line, _read_jobs(payloads), chunksize=chunksize):
+                    total_bytes += size
+                    count += 1
+    return count, total_bytes, time.perf_counter() - start
+
+
+def print_summary(path: str, compiled: CompiledTemplate):
+    groups: Dict[str, int] = {}
+    for key in compiled.slots:
+        group = key.split('|', 1)[0]
+        groups[group] = groups.get(group, 0) + 1
+    static_bytes = sum(len(f) for f in compiled.fragments)
+    print(f"📄 {path} ({compiled.kind}): {len(compiled.slots)} slots, {static_bytes / 1024:.1f} KB static")
+    for group, n in sorted(groups.items()):
+        print(f"   {group:<14} {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the HPC layouts into slot tables and render cards from payloads.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    compile_cmd = sub.add_parser('compile', help='compile (or load from cache) and list the slots')
+    compile_cmd.add_argument('templates', nargs='+')
+    compile_cmd.add_argument('--keys', action='store_true', help='print every slot key')
+
+    render_cmd = sub.add_parser('render', help='render one HTML file per payload line')
+    render_cmd.add_argument('template')
+    render_cmd.add_argument('payloads', help='JSONL file, one report payload per line')
+    render_cmd.add_argument('-o', '--out', default='hpc-cards')
+    render_cmd.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    spans = SpanLog(f'compile_hpc_template {args.command}')
+    try:
+        if args.command == 'compile':
+            for path in args.templates:
+                with spans.span(f'compile {path}'):
+                    compiled = load_template(path)
+                print_summary(path, compiled)
+                if args.keys:
+                    for key in compiled.slots:
+                        print(f'     {key}')
+            spans.emit()
+            return
+
+        count, total_bytes, elapsed = render_batch(args.template, args.payloads, args.out, args.workers, spans=spans)
+    except StageError as e:
+        print(f"❌ {e}")
+        spans.status = 'error'
+        spans.emit()
+        sys.exit(1)
+    spans.emit()
+
+    rate = count / elapsed * 60 if elapsed else 0
+    print(f"✅ Rendered {count} cards ({total_bytes / 1024 / 1024:.1f} MB) to {args.out} "
+          f"in {elapsed:.2f}s — {rate:,.0f} cards/min with {args.workers} worker(s)")
+
+
+if __name__ == '__main__':
+    main()
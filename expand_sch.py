@@ -1,47 +1,64 @@
-import re
+from template_anchors import index_for, splice
+from template_pipeline import Stage, main_for
 
-def expand_scholastic():
-    filepath = 'app/components/reports/ReportTemplate_III_VIII.tsx'
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
 
-    # 1. Expand the row height of Scholastic table cells
-    # The current scholastic-table CSS is:
-    #         .scholastic-table th, .scholastic-table td {
-    #             padding-left: 2px !important;
-    #             padding-right: 2px !important;
-    #         }
-    # We want to increase the TOP and BOTTOM padding to make the rows taller.
-    old_css = r"""        .scholastic-table th, .scholastic-table td {
+# The current scholastic-table CSS is:
+#         .scholastic-table th, .scholastic-table td {
+#             padding-left: 2px !important;
+#             padding-right: 2px !important;
+#         }
+# We want to increase the TOP and BOTTOM padding to make the rows taller.
+OLD_CSS = r"""        .scholastic-table th, .scholastic-table td {
             padding-left: 2px !important;
             padding-right: 2px !important;
         }"""
-        
-    new_css = r"""        .scholastic-table th, .scholastic-table td {
+
+NEW_CSS = r"""        .scholastic-table th, .scholastic-table td {
             padding-left: 2px !important;
             padding-right: 2px !important;
             padding-top: 10px !important;
             padding-bottom: 10px !important;
         }"""
-    
-    content = content.replace(old_css, new_css)
+
+
+def is_applied(content):
+    return NEW_CSS in content
+
+
+def apply(content):
+    index = index_for(content)
+    style = index.first('style')
+    table = index.after('table', index.comment('SCHOLASTIC DOMAINS').start)
+    thead = index.child('thead', table)
+
+    # 1. Expand the row height of Scholastic table cells
+    css = content[style.inner_start:style.inner_end].replace(OLD_CSS, NEW_CSS)
     
 
     # 2. Make the "Final Result" header column gold again.
-    content = content.replace(
+    head = content[thead.start:thead.end]
+    head = head.replace(
         '<th rowSpan={2}>Final Result<br/>(Avg)</th>', 
         '<th rowSpan={2} className="gold-bg">Final Result<br/>(Avg)</th>'
     )
     
-    content = content.replace(
+    head = head.replace(
         '<th rowSpan={2}>Final Result<br />(Avg)</th>', 
         '<th rowSpan={2} className="gold-bg">Final Result<br />(Avg)</th>'
     )
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-        
-    print("Expanded Scholastic Rows successfully.")
+    return splice(content, [
+        (thead.start, thead.end, head),
+        (style.inner_start, style.inner_end, css),
+    ])
+
+
+STAGE = Stage('expand_sch', is_applied, apply)
+
+
+def expand_scholastic():
+    main_for(FILEPATH, [STAGE])
 
 if __name__ == '__main__':
     expand_scholastic()
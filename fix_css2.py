@@ -1,42 +1,39 @@
 import re
 
-def fix_css_and_footer():
-    filepath = 'app/components/reports/ReportTemplate_III_VIII.tsx'
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+from template_anchors import AnchorError, index_for, splice
+from template_pipeline import Stage, main_for
 
-    # 1. Restore the core foundational CSS to the previous standard
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+# Each pattern restores one core foundational-table value changed by fix_sch.py
+RESTORE_RULES = [
     # font-size from 10px back to 11px
-    content = re.sub(
-        r'(\.foundational-table td\s*\{[^}]*font-size:\s*)10px',
-        r'\g<1>11px',
-        content
-    )
+    (re.compile(r'(\.foundational-table td\s*\{[^}]*font-size:\s*)10px'), r'\g<1>11px'),
     # th font-size from 9.5px back to 10.5px
-    content = re.sub(
-        r'(\.foundational-table th\s*\{[^}]*font-size:\s*)9\.5px',
-        r'\g<1>10.5px',
-        content
-    )
-    
+    (re.compile(r'(\.foundational-table th\s*\{[^}]*font-size:\s*)9\.5px'), r'\g<1>10.5px'),
     # td padding back to 6px 10px
-    content = re.sub(
-        r'(\.foundational-table td\s*\{[^}]*padding:\s*)4px 4px\s*!important',
-        r'\g<1>6px 10px !important',
-        content
-    )
+    (re.compile(r'(\.foundational-table td\s*\{[^}]*padding:\s*)4px 4px\s*!important'), r'\g<1>6px 10px !important'),
     # th padding back to 9px 14px
-    content = re.sub(
-        r'(\.foundational-table th\s*\{[^}]*padding:\s*)6px 4px\s*!important',
-        r'\g<1>9px 14px !important',
-        content
-    )
+    (re.compile(r'(\.foundational-table th\s*\{[^}]*padding:\s*)6px 4px\s*!important'), r'\g<1>9px 14px !important'),
     # tr.domain-header td padding back to 10px 14px
-    content = re.sub(
-        r'(\.foundational-table tr\.domain-header td\s*\{[^}]*padding:\s*)6px 14px\s*!important',
-        r'\g<1>10px 14px !important',
-        content
-    )
+    (re.compile(r'(\.foundational-table tr\.domain-header td\s*\{[^}]*padding:\s*)6px 14px\s*!important'), r'\g<1>10px 14px !important'),
+]
+
+
+def is_applied(content):
+    return '.scholastic-table' in content
+
+
+def apply(content):
+    index = index_for(content)
+    style = index.first('style')
+    table = index.after('table', index.comment('SCHOLASTIC DOMAINS').start)
+    tbody = index.child('tbody', table)
+
+    # 1. Restore the core foundational CSS to the previous standard
+    css = content[style.inner_start:style.inner_end]
+    for pattern, replacement in RESTORE_RULES:
+        css = pattern.sub(replacement, css)
 
     # 2. Target ONLY the scholastic table for horizontal compression
     # We will inject a new CSS rule just before the closing </style>
@@ -46,11 +43,13 @@ def fix_css_and_footer():
             padding-right: 2px !important;
         }
     """
-    if '.scholastic-table' not in content:
-        content = content.replace('    `}</style>', scholastic_css + '    `}</style>')
+    body, close, rest = css.rpartition('    `}')
+    if not close:
+        raise AnchorError("<style> block does not end with a template literal")
+    css = body + scholastic_css + close + rest
 
-    # Apply the scholastic-table class to the first table
-    content = content.replace('<table className="foundational-table">', '<table className="foundational-table scholastic-table">', 1)
+    # Apply the scholastic-table class to the scholastic table
+    open_tag = content[table.start:table.inner_start].replace('className="foundational-table"', 'className="foundational-table scholastic-table"')
 
 
     # 3. Fix the footer logic to ONLY display under Final Result
@@ -76,13 +75,20 @@ def fix_css_and_footer():
                                                     <td style={{ fontWeight: 800, color: C.navy }}>{pAvg ? `${pAvg}%` : ''}</td>
                                                 </tr>"""
     
-    content = content.replace(old_footer, new_footer)
+    rows = content[tbody.start:tbody.end].replace(old_footer, new_footer)
+
+    return splice(content, [
+        (table.start, table.inner_start, open_tag),
+        (tbody.start, tbody.end, rows),
+        (style.inner_start, style.inner_end, css),
+    ])
 
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-        
-    print("Fixed CSS and Scholastic Layout successfully.")
+STAGE = Stage('fix_css2', is_applied, apply)
+
+
+def fix_css_and_footer():
+    main_for(FILEPATH, [STAGE])
 
 if __name__ == '__main__':
     fix_css_and_footer()
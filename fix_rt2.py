@@ -1,17 +1,33 @@
-import sys
-import re
+import skill_tables
+from template_anchors import index_for, line_start, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+SPLIT_MARKER = 'PHYSICAL EDUCATION (Split from Co-Scholastic)'
+PERSONALITY_MARKER = 'PERSONALITY DEVELOPMENT SKILLS'
+
+
+def _personality_thead(index):
+    table = index.after('table', index.comment(PERSONALITY_MARKER).end)
+    return index.child('thead', table)
 
-def main():
-    file_path = 'app/components/reports/ReportTemplate_III_VIII.tsx'
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    # Part 1: Co-Scholastic Merge
-    co_scholastic_pattern = re.compile(
-        r'([ \t]*\{\/\* PHYSICAL EDUCATION \(Split from Co-Scholastic\) \*\/}.*?)\{\/\* PERSONALITY DEVELOPMENT SKILLS \*\/}',
-        re.DOTALL
-    )
+def is_applied(content):
+    index = index_for(content)
+    if index.has_comment(SPLIT_MARKER):
+        return False
+    thead = _personality_thead(index)
+    return 'Sub-Skills' in content[thead.start:thead.end]
 
+
+def apply(content):
+    index = index_for(content)
+    personality = index.comment(PERSONALITY_MARKER)
+    edits = []
+
+    # Part 1: Co-Scholastic Merge, with the table body generated from the skills config
+    co_scholastic_body = skill_tables.table_body(skill_tables.read_config()['CO_SCHOLASTIC_DOMAINS'], ' ' * 32)
     merged_co_scholastic = """                    {/* CO-SCHOLASTIC DOMAINS */}
                     <div className="section" style={{ marginTop: 16 }}>
                         <SectionHeading>Co-Scholastic Domains</SectionHeading>
@@ -27,74 +43,20 @@ def main():
                                         <th style={{ width: '25%' }}>Term II</th>
                                     </tr>
                                 </thead>
-                                <tbody>
-                                    {/* Physical Education */}
-                                    <tr className="domain-header">
-                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Physical Education</td>
-                                    </tr>
-                                    {['Physical Fitness', 'Muscular Strength', 'Agility & Balance', 'Stamina'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
-
-                                    {/* Visual Art */}
-                                    <tr className="domain-header">
-                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Visual Art</td>
-                                    </tr>
-                                    {['Creative Expression', 'Fine Motor Skills', 'Reflecting, Responding and Analyzing', 'Use of Technique'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
-
-                                    {/* Performing Art - Dance */}
-                                    <tr className="domain-header">
-                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Dance</td>
-                                    </tr>
-                                    {['Posture', 'Expression', 'Rhythm', 'Overall Performance'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
-
-                                    {/* Performing Art - Music */}
-                                    <tr className="domain-header">
-                                        <td colSpan={3} className="text-left" style={{ textAlign: 'center' }}>Performing Art - Music</td>
-                                    </tr>
-                                    {['Rhythm', 'Pitch', 'Melody (Sings in Tune)', 'Overall Performance'].map(skill => (
-                                        <tr key={skill}>
-                                            <td className="text-left" style={{ paddingLeft: '15px' }}>{skill}</td>
-                                            <td>{getCoScholastic(skill, 'Term I')?.grade || ''}</td>
-                                            <td>{getCoScholastic(skill, 'Term II')?.grade || ''}</td>
-                                        </tr>
-                                    ))}
-                                </tbody>
+""" + co_scholastic_body + """
                             </table>
                         </div>
                     </div>
 
                 {/* PERSONALITY DEVELOPMENT SKILLS */}"""
 
-    if not co_scholastic_pattern.search(content):
-        print("Co-Scholastic pattern not found!")
-        sys.exit(1)
-
-    content = co_scholastic_pattern.sub(merged_co_scholastic, content)
+    # Skipped when the table was merged on an earlier run and only the header is stale
+    if index.has_comment(SPLIT_MARKER):
+        split = line_start(content, index.comment(SPLIT_MARKER).start)
+        edits.append((split, personality.end, merged_co_scholastic))
 
     # Part 2: Personality Development Header
-    personality_header_pattern = re.compile(
-        r'\{\/\* PERSONALITY DEVELOPMENT SKILLS \*\/\}(.*?<table className="foundational-table">[\s\n]*)<thead>(.*?)<\/thead>',
-        re.DOTALL
-    )
-
-    merged_personality_header = r"""{/* PERSONALITY DEVELOPMENT SKILLS */}\g<1><thead>
+    merged_personality_header = """<thead>
                                 <tr>
                                     <th rowSpan={2} style={{ textAlign: 'left', width: '50%' }}>Sub-Skills</th>
                                     <th colSpan={2}>Grades</th>
@@ -105,15 +67,17 @@ def main():
                                 </tr>
                             </thead>"""
 
-    if not personality_header_pattern.search(content):
-        print("Personality header pattern not found!")
-        sys.exit(1)
+    thead = _personality_thead(index)
+    edits.append((thead.start, thead.end, merged_personality_header))
 
-    content = personality_header_pattern.sub(merged_personality_header, content)
+    return splice(content, edits)
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print("Code successfully replaced!")
+
+STAGE = Stage('fix_rt2', is_applied, apply)
+
+
+def main():
+    main_for(FILEPATH, [STAGE])
 
 if __name__ == '__main__':
     main()
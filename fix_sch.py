@@ -1,73 +1,67 @@
 import re
 
-def modify_scholastic():
-    filepath = 'app/components/reports/ReportTemplate_III_VIII.tsx'
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+from template_anchors import AnchorError, index_for, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+TD_FONT_RE = re.compile(r'(\.foundational-table td\s*\{[^}]*font-size:\s*)11px')
+TH_FONT_RE = re.compile(r'(\.foundational-table th\s*\{[^}]*font-size:\s*)10\.5px')
+
+
+def is_applied(content):
+    # The injected tbody is the only place that accumulates grand totals
+    return 'grandTotalAvg' in content
+
+
+def apply(content):
+    index = index_for(content)
+    style = index.first('style')
+    table = index.after('table', index.comment('SCHOLASTIC DOMAINS').start)
+    thead = index.child('thead', table)
+    tbody = index.child('tbody', table)
+
+    if 'reportData.subjects?.map' not in content[tbody.inner_start:tbody.inner_end]:
+        raise AnchorError("Scholastic <tbody> does not map reportData.subjects")
 
     # 1. Modify Final Result header to not be gold
-    content = content.replace(
+    head = content[thead.start:thead.end]
+    head = head.replace(
         '<th rowSpan={2} className="gold-bg">Final Result<br />(Avg)</th>',
         '<th rowSpan={2}>Final Result<br />(Avg)</th>'
     )
     
     # Also fix the previous version just in case no space in <br/>
-    content = content.replace(
+    head = head.replace(
         '<th rowSpan={2} className="gold-bg">Final Result<br/>(Avg)</th>',
         '<th rowSpan={2}>Final Result<br/>(Avg)</th>'
     )
 
+    # Also adjust the "Subjects" column width back to auto or 15% instead of 18% so data columns expand
+    head = head.replace("<th rowSpan={2} style={{ width: '18%' }}>Subjects</th>", "<th rowSpan={2} style={{ width: '15%' }}>Subjects</th>")
+
     # 2. Modify the CSS padding via replace
+    css = content[style.inner_start:style.inner_end]
     # We want padding in th to be smaller
-    content = content.replace(
+    css = css.replace(
         'padding: 9px 14px !important;',
         'padding: 6px 4px !important;'
     )
     # We want padding in td to be smaller (was 6px 10px or 8px 10px)
-    content = content.replace(
+    css = css.replace(
         'padding: 6px 10px !important;',
         'padding: 4px 4px !important;'
     )
     
     # Lower td font-size slightly to 10px to fit everything seamlessly
-    content = re.sub(
-        r'(\.foundational-table td\s*\{[^}]*font-size:\s*)11px',
-        r'\g<1>' + '10px',
-        content
-    )
+    css = TD_FONT_RE.sub(r'\g<1>' + '10px', css)
     
     # Lower th font-size slightly to 9.5px to fit everything seamlessly
-    content = re.sub(
-        r'(\.foundational-table th\s*\{[^}]*font-size:\s*)10\.5px',
-        r'\g<1>' + '9.5px',
-        content
-    )
+    css = TH_FONT_RE.sub(r'\g<1>' + '9.5px', css)
 
 
     # 3. Add total and percentage footer to the scholastic table
     # We will replace the entire <tbody> mapping for scholastic and compute vars before map
-    
-    # We need to find the tbody of Scholastic
-    sch_start = content.find('<tbody>\n                                    {reportData.subjects?.map((sub: any) => {')
-    if sch_start == -1:
-        print("Could not find start of scholastic mapping.")
-        return
-        
-    sch_end = content.find('</tbody>\n                            </table>\n                        </div>\n                    </div>\n\n                    {/* ---> PAGE BREAK <--- */}')
-    if sch_end == -1:
-        # Fallback to general
-        sch_end = content.find('</tbody>\n                            </table>\n                        </div>\n                    </div>\n\n                    {/* CO-SCHOLASTIC DOMAINS */}')
-        
-    if sch_end == -1:
-        # Try finding just table close
-        s = content[sch_start:]
-        end_idx = s.find('</tbody>')
-        if end_idx != -1:
-            sch_end = sch_start + end_idx
-        else:
-            print("Could not find end of scholastic table.")
-            return
-
     new_tbody = """<tbody>
                                     {(() => {
                                         let grandTotal1 = 0;
@@ -165,15 +159,18 @@ def modify_scholastic():
                                     })()}
                                 """
 
-    content = content[:sch_start] + new_tbody + content[sch_end:]
-    
-    # Also adjust the "Subjects" column width back to auto or 15% instead of 18% so data columns expand
-    content = content.replace("<th rowSpan={2} style={{ width: '18%' }}>Subjects</th>", "<th rowSpan={2} style={{ width: '15%' }}>Subjects</th>")
+    return splice(content, [
+        (thead.start, thead.end, head),
+        (tbody.start, tbody.inner_end, new_tbody),
+        (style.inner_start, style.inner_end, css),
+    ])
+
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+STAGE = Stage('fix_sch', is_applied, apply)
 
-    print("Updated scholastic tables and computations!")
+
+def modify_scholastic():
+    main_for(FILEPATH, [STAGE])
 
 if __name__ == "__main__":
     modify_scholastic()
@@ -0,0 +1,146 @@
+from template_anchors import AnchorError, index_for, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+HELPERS_START = '    // --- Helpers ---\n'
+HELPERS_END = '\n    return (\n'
+
+# Replaces the .find()-based helpers: every lookup map is built once per render
+# and the scholastic / co-scholastic / remark helpers become O(1) Map reads.
+# .find() returned the first match, so the maps keep the first row per key.
+INDEXED_HELPERS = """    // --- Helpers ---
+    // Lookup maps are built once per render so every table cell is an O(1) read.
+    // Maps are nested and keyed by the row strings themselves, so a lookup never
+    // has to build a composite key.
+    const scholasticIndex = new Map<string, Map<string, Map<string, any>>>();
+    reportData.scholastic?.forEach((s: any) => {
+        let byComponent = scholasticIndex.get(s.subject_name);
+        if (!byComponent) scholasticIndex.set(s.subject_name, byComponent = new Map());
+        let byTerm = byComponent.get(s.component_name);
+        if (!byTerm) byComponent.set(s.component_name, byTerm = new Map());
+        if (!byTerm.has(s.term_name)) byTerm.set(s.term_name, s);
+    });
+
+    const coScholasticIndex = new Map<string, Map<string, any>>();
+    reportData.co_scholastic?.forEach((cs: any) => {
+        let byTerm = coScholasticIndex.get(cs.sub_skill_name);
+        if (!byTerm) coScholasticIndex.set(cs.sub_skill_name, byTerm = new Map());
+        if (!byTerm.has(cs.term_name)) byTerm.set(cs.term_name, cs);
+    });
+
+    // Months are looked up by their three-letter prefix ('Jun' -> 'June')
+    const attendanceIndex = new Map<string, any>();
+    reportData.attendance?.forEach((a: any) => {
+        const key = a.month_name?.slice(0, 3);
+        if (key && !attendanceIndex.has(key)) attendanceIndex.set(key, a);
+    });
+
+    const remarkIndex = new Map<string, Map<string, string>>();
+    reportData.remarks?.forEach((r: any) => {
+        let byAspect = remarkIndex.get(r.type_name);
+        if (!byAspect) remarkIndex.set(r.type_name, byAspect = new Map());
+        const aspect = r.aspect || '';
+        if (!byAspect.has(aspect)) byAspect.set(aspect, r.remark_text);
+    });
+
+    const getScholasticScore = (subjectName: string, componentName: string, termName: string) => {
+        return scholasticIndex.get(subjectName)?.get(componentName)?.get(termName);
+    };
+
+    const renderScoreCell = (subject: string, component: string, term: string) => {
+        const score = getScholasticScore(subject, component, term);
+        return <td className="input-cell" key={`${subject}-${component}-${term}`}>{score?.marks ?? ''}</td>;
+    };
+
+    // Sum of the four components for one term, computed once per subject row
+    const SCHOLASTIC_COMPONENTS = ['Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment'];
+    const getTermTotal = (subject: string, term: string) => {
+        let total = 0;
+        SCHOLASTIC_COMPONENTS.forEach(comp => {
+            const s = getScholasticScore(subject, comp, term);
+            const num = s?.marks ? parseFloat(s.marks) : 0;
+            if (!isNaN(num)) total += num;
+        });
+        const hasMarks = !!(getScholasticScore(subject, 'Periodic Assessment', term) ||
+            getScholasticScore(subject, 'Terminal Assessment', term));
+        return { total, hasMarks };
+    };
+
+    const months = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar'];
+    const getAttendance = (month: string) => attendanceIndex.get(month);
+
+    const getCoScholastic = (subSkill: string, term: string) => {
+        return coScholasticIndex.get(subSkill)?.get(term);
+    };
+
+    const getPersonality = getCoScholastic;
+
+    const getRemark = (type: string, aspect?: string) => {
+        return remarkIndex.get(type)?.get(aspect || '') || '';
+    };
+"""
+
+# Per-subject block inside the scholastic tbody injected by fix_sch.py
+ROW_TOTALS_START = '                                            const getVal = '
+ROW_TOTALS_END = '                                            return (\n'
+
+INDEXED_ROW_TOTALS = """                                            const { total: total1, hasMarks: has1 } = getTermTotal(subject, 'Term I');
+                                            const { total: total2, hasMarks: has2 } = getTermTotal(subject, 'Term II');
+
+                                            if (has1) {
+                                                grandTotal1 += total1;
+                                                subjectCount1++;
+                                            }
+                                            if (has2) {
+                                                grandTotal2 += total2;
+                                                subjectCount2++;
+                                            }
+
+                                            const avg = (total1 + total2) / 2;
+                                            if (has1 || has2) {
+                                                grandTotalAvg += avg;
+                                            }
+
+                                            const displayTotal1 = has1 ? parseFloat(total1.toFixed(2)) : '';
+                                            const displayTotal2 = has2 ? parseFloat(total2.toFixed(2)) : '';
+                                            const displayAvg = (has1 || has2) ? parseFloat(avg.toFixed(2)) : '';
+
+"""
+
+
+def is_applied(content):
+    return 'scholasticIndex' in content
+
+
+def apply(content):
+    index = index_for(content)
+    table = index.after('table', index.comment('SCHOLASTIC DOMAINS').start)
+    tbody = index.child('tbody', table)
+
+    helpers_start = content.find(HELPERS_START)
+    if helpers_start == -1:
+        raise AnchorError("Missing '// --- Helpers ---' block")
+    helpers_end = content.find(HELPERS_END, helpers_start)
+    if helpers_end == -1:
+        raise AnchorError("Missing component return after the helpers block")
+
+    rows_start = content.find(ROW_TOTALS_START, tbody.inner_start, tbody.inner_end)
+    rows_end = content.find(ROW_TOTALS_END, rows_start, tbody.inner_end) if rows_start != -1 else -1
+    if rows_end == -1:
+        raise AnchorError("Scholastic <tbody> has no per-subject totals block (run fix_sch.py first)")
+
+    return splice(content, [
+        (helpers_start, helpers_end, INDEXED_HELPERS),
+        (rows_start, rows_end, INDEXED_ROW_TOTALS),
+    ])
+
+
+STAGE = Stage('index_scores', is_applied, apply)
+
+
+def main():
+    main_for(FILEPATH, [STAGE])
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,16 @@ const nextConfig = {
     experimental: {
         serverComponentsExternalPackages: ['puppeteer-core', '@sparticuz/chromium'],
     },
+    // Print stylesheets are content-hashed by build_print_css.py, so they
+    // never change under the same URL
+    async headers() {
+        return [
+            {
+                source: '/styles/:file*',
+                headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+            },
+        ];
+    },
 };
 
 export default nextConfig;
@@ -0,0 +1,751 @@
+"""Static pagination planner for the III-VIII report card.
+
+The printed card is a stack of A4 print-pages, each opening with the school
+header. Where the page breaks go used to be hand-picked in paginate.py, so
+a class with more subjects than the one the breaks were tuned for pushed
+the co-scholastic table onto an extra sheet, and nobody noticed until the
+PDFs came back. This planner estimates the height of every section from the
+template itself:
+
+  * row counts and skill lists, read from the JSX ({[...].map(...)} lists,
+    <tbody> groups, info rows, feedback cards, grading rows)
+  * cell padding, font sizes and margins, resolved from PRINT_STYLES and the
+    template's own <style> block with the usual cascade (!important, then
+    specificity, then source order)
+  * the number of scholastic subjects, which is the only part of the layout
+    that changes between classes
+
+and packs the sections onto pages greedily. Breaks may go before a section
+or before a skill group of a co-scholastic / personality table; a table
+broken at a group repeats its <thead> on the next page. A section that does
+not fit on a page of its own is reported as overflow before any card is
+printed.
+
+Text wrapping is estimated from average glyph widths, so heights are
+approximations that err on the tall side; the point is to get the same
+answer as the browser for realistic cards, not pixel-exact layout.
+
+Plans are cached in memory and on disk under .cache/page-plans, keyed by
+the template, the base print styles and the subject count. Subject counts
+in SUBJECT_RANGE are grouped into bands that break at the same places, and
+paginate.py writes one set of page wrappers per band; the card picks its
+band from the number of subjects when it renders.
+
+    python page_planner.py                     # bands for 4-14 subjects
+    python page_planner.py --subjects 6-12
+    python page_planner.py --dsn $DATABASE_URL # subject counts of real classes
+    python page_planner.py --check             # exit 1 when a card would not print as planned
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from build_print_css import COMMENT_RE, Block as CssBlock, parse, print_styles_source, style_css
+from template_anchors import index_for
+from template_pipeline import SpanLog, StageError, content_hash, write_timings
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+CACHE_DIR = os.path.join('.cache', 'page-plans')
+
+# Bump when the height model changes so stale plans are ignored
+PLAN_VERSION = 1
+
+# Subject counts the template's page bands are planned for. A card with
+# fewer subjects uses the first band and one with more the last; --check
+# fails when such a card needs other breaks than its band's.
+SUBJECT_RANGE = (4, 14)
+
+# ── page geometry (CSS px at 96 dpi) ──
+# A4 with the zero margins of PDF_OPTIONS in app/lib/pdf-pool.ts
+PAGE_HEIGHT = 297 / 25.4 * 96
+PAGE_WIDTH = 210 / 25.4 * 96
+# SchoolHeader: 14px padding around the 56px logo, plus the 4px gold rule
+HEADER_HEIGHT = 14 + 56 + 14 + 4
+# The inner <div style={{ padding: '22px 28px 28px' }}> of every page wrapper
+PAGE_PADDING = (22, 28, 28, 28)
+CONTENT_WIDTH = PAGE_WIDTH - PAGE_PADDING[1] - PAGE_PADDING[3]
+AVAILABLE = PAGE_HEIGHT - HEADER_HEIGHT - PAGE_PADDING[0] - PAGE_PADDING[2]
+
+# Root font size of the card (inline fontSize: 13 on .foundational-page)
+ROOT_FONT = 13.0
+# Average advance of a Nunito glyph, as a fraction of the font size
+CHAR_WIDTH = 0.52
+BOLD_CHAR_WIDTH = 0.57
+UPPERCASE_FACTOR = 1.2
+# SectionHeading: the 22px gold bar is taller than the 14px heading text
+SECTION_HEADING = 22
+SECTION_HEADING_MARGIN = (22, 6)
+
+# Section markers in document order; paginate.py breaks before these
+SECTIONS = (
+    'GENERAL INFORMATION',
+    'ATTENDANCE RECORD',
+    'SCHOLASTIC DOMAINS',
+    'CO-SCHOLASTIC DOMAINS',
+    'PERSONALITY DEVELOPMENT SKILLS',
+    'FEEDBACK SECTIONS',
+    'SIGNATURE SECTION',
+    'GRADING FRAMEWORK',
+)
+
+MARGIN_TOP_RE = re.compile(r'style=\{\{\s*marginTop:\s*(\d+)')
+HEADING_RE = re.compile(r'<SectionHeading(?:\s+mt=\{(\d+)\})?>')
+MIN_HEIGHT_RE = re.compile(r"minHeight:\s*'(\d+)px'")
+WIDTH_RE = re.compile(r"width:\s*'(\d+)%'")
+LIST_RE = re.compile(r'\{\[(.*?)\]\.map\(')
+STRING_RE = re.compile(r"'((?:[^'\\]|\\.)*)'|\"([^\"]*)\"")
+TAG_TEXT_RE = re.compile(r'>([^<>{}]+)<')
+
+
+class PlanError(StageError):
+    """Raised when the template no longer has the structure the planner measures."""
+
+
+class Unit(NamedTuple):
+    # anchor: section marker, or the group's comment for a table group
+    # kind: 'section' (break before the section) or 'group' (split the table)
+    # close: added to the previous page when a break lands before this unit
+    # reopen: added to the new page in that case (the repeated <thead>)
+    anchor: str
+    kind: str
+    margin_top: float
+    height: float
+    margin_bottom: float
+    close: float = 0.0
+    reopen: float = 0.0
+
+
+class Page(NamedTuple):
+    anchors: List[str]
+    height: float
+
+
+class Plan(NamedTuple):
+    subjects: int
+    available: float
+    pages: List[Page]
+    breaks: List[Tuple[str, str]]   # (anchor, kind) of the first unit of every page but the first
+    overflow: List[str]             # anchors of units taller than a page
+
+
+# ─── Styles ──────────────────────────────────────────────────────────────────
+
+SPECIFICITY_RE = (
+    re.compile(r'#[\w-]+'),
+    re.compile(r'\.[\w-]+|\[[^\]]*\]|(?<!:):(?!:)[\w-]+'),
+    re.compile(r'(?:^|[\s>+~])[a-z][\w-]*|::[\w-]+'),
+)
+
+
+def specificity(selector: str) -> Tuple[int, int, int]:
+    plain = re.sub(r':where\([^)]*\)', '', selector)
+    return tuple(len(pattern.findall(plain)) for pattern in SPECIFICITY_RE)
+
+
+def px(value: Optional[str], base: float = ROOT_FONT) -> Optional[float]:
+    """A length in px; em is taken relative to base. None for anything else."""
+    if value is None:
+        return None
+    m = re.fullmatch(r'(-?[\d.]+)(px|em|)', value.strip())
+    if not m:
+        return None
+    number = float(m.group(1))
+    return number * base if m.group(2) == 'em' else number
+
+
+class Styles:
+    """Cascade lookups over the print stylesheets.
+
+    Callers pass every selector that matches the element they measure, as it
+    is written in the stylesheet; the winning declaration is picked the way
+    the browser would among those.
+    """
+
+    def __init__(self, css: str):
+        self.decls: Dict[str, List[Tuple[bool, Tuple[int, int, int], int, str, str]]] = {}
+        order = 0
+        stack = list(reversed(parse(COMMENT_RE.sub('', css))[1]))
+        while stack:
+            item = stack.pop()
+            if isinstance(item, CssBlock):
+                # Screen-only @media blocks never apply to the PDF
+                if item.children is not None and item.prelude.startswith('@media') and 'print' in item.prelude:
+                    stack.extend(reversed(item.children))
+                continue
+            for selector in item.selectors:
+                for decl in item.decls:
+                    order += 1
+                    entry = (decl.important, specificity(selector), order, selector, decl.value)
+                    self.decls.setdefault(decl.prop, []).append(entry)
+
+    def value(self, selectors: Sequence[str], *props: str) -> Optional[str]:
+        """Winning value among props (e.g. 'padding-top' and its 'padding' shorthand)."""
+        best = None
+        for prop in props:
+            for entry in self.decls.get(prop, ()):
+                if entry[3] in selectors and (best is None or entry[:3] > best[0][:3]):
+                    best = (entry, prop)
+        if best is None:
+            return None
+        (_, _, _, _, value), prop = best
+        if prop in ('padding', 'margin'):
+            return _side(value, props[0].rsplit('-', 1)[-1])
+        return value
+
+    def length(self, selectors: Sequence[str], prop: str, default: float = 0.0, base: float = ROOT_FONT) -> float:
+        props = (prop, prop.rsplit('-', 1)[0]) if prop.startswith(('padding-', 'margin-')) else (prop,)
+        value = px(self.value(selectors, *props), base)
+        return default if value is None else value
+
+    def font(self, selectors: Sequence[str], base: float = ROOT_FONT) -> float:
+        return self.length(selectors, 'font-size', base, base)
+
+    def vertical(self, selectors: Sequence[str], prop: str = 'padding') -> float:
+        return self.length(selectors, prop + '-top') + self.length(selectors, prop + '-bottom')
+
+    def line_height(self) -> float:
+        return float(self.value(['body'], 'line-height') or 1.2)
+
+    def is_bold(self, selectors: Sequence[str]) -> bool:
+        return (self.value(selectors, 'font-weight') or '400') in ('600', '700', '800', 'bold')
+
+    def is_upper(self, selectors: Sequence[str]) -> bool:
+        return self.value(selectors, 'text-transform') == 'uppercase'
+
+
+def _side(shorthand: str, side: str) -> str:
+    parts = shorthand.split()
+    top, right = parts[0], parts[1] if len(parts) > 1 else parts[0]
+    bottom = parts[2] if len(parts) > 2 else top
+    left = parts[3] if len(parts) > 3 else right
+    return {'top': top, 'right': right, 'bottom': bottom, 'left': left}.get(side, top)
+
+
+def text_lines(text: str, width: float, font: float, bold: bool = False, upper: bool = False,
+               spacing: float = 0.0) -> int:
+    """Lines text wraps to in a box of the given width (greedy, by words)."""
+    glyph = font * (BOLD_CHAR_WIDTH if bold else CHAR_WIDTH) * (UPPERCASE_FACTOR if upper else 1) + spacing
+    per_line = max(1, int(width // glyph))
+    lines, used = 1, 0
+    for word in text.split():
+        if used and used + 1 + len(word) > per_line:
+            lines += 1
+            used = len(word)
+        else:
+            used += len(word) + (1 if used else 0)
+    return lines
+
+
+# ─── Measuring ───────────────────────────────────────────────────────────────
+
+TH = ['th', '.foundational-table th']
+TD = ['td', '.foundational-table td']
+TD_FIRST = TD + ['.foundational-table tr td:first-child']
+DOMAIN_TD = TD + ['.foundational-table tr.domain-header td']
+SCHOLASTIC_TH = TH + ['.scholastic-table th']
+SCHOLASTIC_TD = TD + ['.scholastic-table td']
+SCHOLASTIC_DOMAIN_TD = DOMAIN_TD + ['.scholastic-table td']
+ATTENDANCE_TH = ['th', '.attendance-table th', '.foundational-attendance th']
+ATTENDANCE_TD = ['td', '.attendance-table td', '.foundational-attendance td']
+INFO_LABEL = ['.info-label', '.foundational-label']
+INFO_INPUT = ['.info-input', '.foundational-input']
+BORDER = 1.0
+
+
+class Measure:
+    def __init__(self, styles: Styles, content: str):
+        self.styles = styles
+        self.content = content
+        self.lh = styles.line_height()
+        self.table_margin = styles.length(['table'], 'margin-bottom')
+        self.section_margin = styles.length(['.section'], 'margin-bottom')
+
+    def row(self, selectors: Sequence[str], lines: int = 1, border: float = BORDER) -> float:
+        return lines * self.styles.font(selectors) * self.lh + self.styles.vertical(selectors) + border
+
+    def cell_lines(self, text: str, selectors: Sequence[str], width: float, bold: Optional[bool] = None) -> int:
+        s = self.styles
+        font = s.font(selectors)
+        inner = width - s.length(selectors, 'padding-left') - s.length(selectors, 'padding-right')
+        spacing = px(s.value(selectors, 'letter-spacing')) or 0.0
+        return text_lines(text, inner, font, s.is_bold(selectors) if bold is None else bold,
+                          s.is_upper(selectors), spacing)
+
+    def heading(self, region: str) -> Tuple[float, float]:
+        """(margin_top, height) of the section wrapper and its SectionHeading."""
+        own = MARGIN_TOP_RE.search(region[:300])
+        margin_top = float(own.group(1)) if own else 0.0
+        heading = HEADING_RE.search(region)
+        if not heading:
+            return margin_top, 0.0
+        mt = float(heading.group(1)) if heading.group(1) else SECTION_HEADING_MARGIN[0]
+        # The heading's top margin collapses with the section's
+        return max(margin_top, mt), SECTION_HEADING + SECTION_HEADING_MARGIN[1]
+
+    def thead(self, region: str, selectors: Sequence[str], widths: Sequence[float]) -> float:
+        thead = re.search(r'<thead>(.*?)</thead>', region, re.DOTALL)
+        if not thead:
+            return 0.0
+        height = 0.0
+        for tr in re.findall(r'<tr>(.*?)</tr>', thead.group(1), re.DOTALL):
+            lines = 1
+            for i, (attrs, text) in enumerate(re.findall(r'<th([^>]*)>(.*?)</th>', tr, re.DOTALL)):
+                if 'rowSpan' in attrs:
+                    continue
+                span = int(re.search(r'colSpan=\{(\d+)\}', attrs).group(1)) if 'colSpan' in attrs else 1
+                width = widths[min(i, len(widths) - 1)] * span
+                lines = max(lines, self.cell_lines(re.sub(r'<[^>]*>', ' ', text), selectors, width))
+            height += self.row(selectors, lines)
+        return height
+
+
+def _info(m: Measure, region: str, subjects: int) -> List[Unit]:
+    margin_top, heading = m.heading(region)
+    s = m.styles
+    border = 2 * BORDER
+    row = max(m.row(INFO_LABEL, border=0), m.row(INFO_INPUT, border=0)) + BORDER
+    height = heading + border
+    for kind, body in re.findall(r'className="(info-row|info-row-split)">(.*?)(?=className="info-row"|className="info-row-split"|$)',
+                                 region, re.DOTALL):
+        min_height = MIN_HEIGHT_RE.search(body)
+        if min_height:
+            row_height = float(min_height.group(1)) + s.vertical(INFO_INPUT) + BORDER
+            height += max(row, row_height)
+        else:
+            height += row
+    return [Unit('GENERAL INFORMATION', 'section', margin_top, height, m.section_margin)]
+
+
+def _attendance(m: Measure, region: str, subjects: int) -> List[Unit]:
+    margin_top, heading = m.heading(region)
+    height = heading + m.row(ATTENDANCE_TH)
+    first_width = CONTENT_WIDTH * 0.15
+    for label in re.findall(r'<td style=\{\{ fontWeight: 600[^>]*>([^<{]+)</td>', region):
+        height += m.row(ATTENDANCE_TD, m.cell_lines(label, ATTENDANCE_TD, first_width, bold=True))
+    # The table's bottom margin collapses into the section's (no border in between)
+    return [Unit('ATTENDANCE RECORD', 'section', margin_top, height, max(m.section_margin, m.table_margin))]
+
+
+def _scholastic(m: Measure, region: str, subjects: int) -> List[Unit]:
+    margin_top, heading = m.heading(region)
+    # 15% subject column, the other eleven share the rest
+    widths = [CONTENT_WIDTH * 0.15] + [CONTENT_WIDTH * 0.85 / 11] * 11
+    thead = m.thead(region, SCHOLASTIC_TH, widths[1:])
+    totals = region.count('className="domain-header"')
+    body = subjects * m.row(SCHOLASTIC_TD) + totals * m.row(SCHOLASTIC_DOMAIN_TD, border=0)
+    height = heading + 2 * BORDER + thead + body + m.table_margin
+    return [Unit('SCHOLASTIC DOMAINS', 'section', margin_top, height, m.section_margin)]
+
+
+def _skills(anchor: str):
+    """A co-scholastic style table: a head, then one <tbody> per skill group.
+
+    The head (heading and <thead>) is kept with the first group; a break
+    before any later group closes the table and repeats the <thead>.
+    """
+    def measure(m: Measure, region: str, subjects: int) -> List[Unit]:
+        margin_top, heading = m.heading(region)
+        widths = [CONTENT_WIDTH * float(w) / 100 for w in WIDTH_RE.findall(region.split('</thead>')[0])] or [CONTENT_WIDTH]
+        thead = m.thead(region, TH, widths[1:] or widths)
+        skill_width = widths[0]
+        close = BORDER + m.table_margin
+        groups = []
+        for body in re.findall(r'<tbody[^>]*>(.*?)</tbody>', region, re.DOTALL):
+            names = [c for c in re.findall(r'\{/\*\s*(.*?)\s*\*/\}', body) if not c.endswith('(Continued)')]
+            skills = LIST_RE.search(body)
+            if not names or not skills:
+                raise PlanError(f"Cannot read the skill group in {anchor}: {body.strip()[:80]}")
+            height = m.row(DOMAIN_TD, border=0)
+            for a, b in STRING_RE.findall(skills.group(1)):
+                height += m.row(TD_FIRST, m.cell_lines(a or b, TD_FIRST, skill_width))
+            groups.append((names[0], height))
+        if not groups:
+            raise PlanError(f"No skill groups found in {anchor}")
+        units = []
+        for i, (name, height) in enumerate(groups):
+            last = i == len(groups) - 1
+            tail = close if last else 0.0
+            if i == 0:
+                units.append(Unit(anchor, 'section', margin_top, heading + BORDER + thead + height + tail,
+                                  m.section_margin if last else 0.0))
+            else:
+                units.append(Unit(name, 'group', 0.0, height + tail, m.section_margin if last else 0.0,
+                                  close=close, reopen=thead))
+        return units
+    return measure
+
+
+def _feedback(m: Measure, region: str, subjects: int) -> List[Unit]:
+    margin_top, heading = m.heading(region)
+    s = m.styles
+    card_box = s.vertical(['.feedback-card']) + 2 * BORDER
+    title_font = s.font(['.feedback-card h3'], ROOT_FONT * 1.17)
+    title = (title_font * m.lh + s.vertical(['.feedback-card h3']) + BORDER
+             + s.vertical(['.feedback-card h3'], 'margin'))
+    input_box = s.vertical(['.feedback-input']) + 2 * BORDER
+    input_min = s.length(['.feedback-input'], 'min-height')
+    row_gap = s.length(['.feedback-row'], 'margin-bottom')
+    grid_gap = s.length(['.feedback-grid'], 'gap')
+    cards = region.split('className="feedback-card"')[1:]
+    height = heading
+    for i, card in enumerate(cards):
+        labels = LIST_RE.search(card)
+        if labels:
+            rows = len(STRING_RE.findall(labels.group(1)))
+            body = rows * (max(input_min, ROOT_FONT * m.lh) + input_box + row_gap)
+        else:
+            min_height = MIN_HEIGHT_RE.search(card)
+            body = (float(min_height.group(1)) if min_height else input_min) + input_box
+        height += card_box + title + body + (grid_gap if i else 0.0)
+    return [Unit('FEEDBACK SECTIONS', 'section', margin_top, height, m.section_margin)]
+
+
+def _signature(m: Measure, region: str, subjects: int) -> List[Unit]:
+    margin_top, heading = m.heading(region)
+    thead = m.thead(region, TH, [CONTENT_WIDTH / 4] * 4)
+    # The cells ask for padding: '30px 6px !important' inline, which React
+    # drops (!important is not valid in a style object), so they get the
+    # stylesheet padding
+    rows = len(re.findall(r'<tr>', region.split('<tbody>', 1)[-1]))
+    height = heading + 2 * BORDER + thead + rows * m.row(TD) + m.table_margin
+    return [Unit('SIGNATURE SECTION', 'section', margin_top, height, m.section_margin)]
+
+
+def _grading(m: Measure, region: str, subjects: int) -> List[Unit]:
+    s = m.styles
+    inner = CONTENT_WIDTH - s.length(['.grading-section'], 'padding-left') * 2 - 2 * BORDER
+    title_sel = ['.grading-section h3', '.grading-section .section-title']
+    title_font = s.font(title_sel)
+
+    def title(text: str) -> float:
+        lines = text_lines(text, inner, title_font, bold=True, upper=True)
+        return lines * title_font * m.lh + s.vertical(title_sel, 'margin')
+
+    height = s.vertical(['.grading-section']) + 2 * BORDER
+    h3 = re.search(r'<h3>(.*?)</h3>', region)
+    height += title(h3.group(1)) if h3 else 0.0
+
+    grid_font = s.font(['.grading-grid'])
+    cell_pad = s.vertical(['.grading-cell'])
+    columns = [60.0, 120.0, inner - 180.0]
+    cells = re.findall(r'<div className="grading-cell[^"]*">(.*?)</div>', region)
+    for i in range(0, len(cells), 3):
+        lines = max(text_lines(text, columns[j] - 16, grid_font) for j, text in enumerate(cells[i:i + 3]))
+        height += lines * grid_font * m.lh + cell_pad + BORDER
+    height += BORDER + s.length(['.grading-grid'], 'margin-bottom')
+
+    compact_font = s.font(['.grading-section .compact-table'])
+    compact_td = ['td', '.compact-table td', '.grading-section .compact-table td']
+    for section in region.split('className="section compact-section"')[1:]:
+        heading = re.search(r'<h2 className="section-title">(.*?)</h2>', section)
+        height += title(heading.group(1)) if heading else 0.0
+        for text in re.findall(r"<td style=\{\{ textAlign: 'left' \}\}>(.*?)</td>", section):
+            lines = text_lines(text, inner - 50 - 16, compact_font)
+            height += lines * compact_font * m.lh + s.vertical(compact_td) + BORDER
+        height += s.length(['.grading-section .compact-table'], 'margin-bottom') + s.length(['.grading-section .section'], 'margin-bottom')
+    return [Unit('GRADING FRAMEWORK', 'section', 0.0, height, 0.0)]
+
+
+MEASURES = {
+    'GENERAL INFORMATION': _info,
+    'ATTENDANCE RECORD': _attendance,
+    'SCHOLASTIC DOMAINS': _scholastic,
+    'CO-SCHOLASTIC DOMAINS': _skills('CO-SCHOLASTIC DOMAINS'),
+    'PERSONALITY DEVELOPMENT SKILLS': _skills('PERSONALITY DEVELOPMENT SKILLS'),
+    'FEEDBACK SECTIONS': _feedback,
+    'SIGNATURE SECTION': _signature,
+    'GRADING FRAMEWORK': _grading,
+}
+
+
+def units_for(content: str, subjects: int, path: str = FILEPATH) -> List[Unit]:
+    """Every breakable unit of the card, in document order."""
+    index = index_for(content)
+    css = print_styles_source() + style_css(content, path)
+    m = Measure(Styles(css), content)
+    starts = [index.comment(name).start for name in SECTIONS] + [index.first('style').start]
+    if starts != sorted(starts):
+        raise PlanError("Section markers are out of document order: " + ', '.join(SECTIONS))
+    units = []
+    for name, start, end in zip(SECTIONS, starts, starts[1:]):
+        units.extend(MEASURES[name](m, content[start:end], subjects))
+    return units
+
+
+# ─── Packing ─────────────────────────────────────────────────────────────────
+
+def pack(units: List[Unit], available: float = AVAILABLE) -> Tuple[List[Page], List[Tuple[str, str]], List[str]]:
+    """Greedy first fit: a unit goes on the current page unless it does not fit.
+
+    Margins between units collapse; the margin after the last unit of a page
+    is truncated at the break, as the browser does.
+    """
+    pages: List[Page] = []
+    breaks: List[Tuple[str, str]] = []
+    overflow: List[str] = []
+    anchors: List[str] = []
+    used = 0.0
+    prev: Optional[Unit] = None
+    for i, unit in enumerate(units):
+        # Ending the page after this unit would add the next group's close cost
+        nxt = units[i + 1] if i + 1 < len(units) else None
+        tail = nxt.close if nxt is not None and nxt.kind == 'group' else 0.0
+        if prev is not None:
+            cost = max(prev.margin_bottom, unit.margin_top) + unit.height
+            if used + cost + tail <= available:
+                anchors.append(unit.anchor)
+                used += cost
+                prev = unit
+                continue
+            pages.append(Page(anchors, round(used + unit.close, 1)))
+            breaks.append((unit.anchor, unit.kind))
+        fresh = unit.margin_top + unit.height + unit.reopen
+        if fresh + tail > available:
+            overflow.append(unit.anchor)
+        anchors = [unit.anchor]
+        used = fresh
+        prev = unit
+    if anchors:
+        pages.append(Page(anchors, round(used, 1)))
+    return pages, breaks, overflow
+
+
+_memory_cache: Dict[str, Plan] = {}
+
+
+def _plan_to_json(plan: Plan) -> dict:
+    return {
+        'version': PLAN_VERSION,
+        'subjects': plan.subjects,
+        'available': plan.available,
+        'pages': [list(p) for p in plan.pages],
+        'breaks': [list(b) for b in plan.breaks],
+        'overflow': plan.overflow,
+    }
+
+
+def _plan_from_json(data: dict) -> Plan:
+    return Plan(
+        data['subjects'], data['available'],
+        [Page(*p) for p in data['pages']],
+        [tuple(b) for b in data['breaks']],
+        data['overflow'],
+    )
+
+
+def plan_for(content: str, subjects: int, path: str = FILEPATH) -> Plan:
+    """The page plan for a card with this many subjects, computed once per template."""
+    key = f'{content_hash(content + print_styles_source())}-{subjects}'
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(CACHE_DIR, f'{key}.json')
+    plan = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == PLAN_VERSION:
+            plan = _plan_from_json(data)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if plan is None:
+        pages, breaks, overflow = pack(units_for(content, subjects, path))
+        plan = Plan(subjects, round(AVAILABLE, 1), pages, breaks, overflow)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(_plan_to_json(plan), f)
+        except OSError:
+            pass
+
+    _memory_cache[key] = plan
+    return plan
+
+
+class Band(NamedTuple):
+    low: int
+    high: int
+    plan: Plan   # the plan for `high`, the tallest card of the band
+
+
+def bands(content: str, counts: Sequence[int], path: str = FILEPATH) -> List[Band]:
+    """Group subject counts whose cards break at the same places."""
+    result: List[Band] = []
+    for n in sorted(set(counts)):
+        plan = plan_for(content, n, path)
+        if result and result[-1].plan.breaks == plan.breaks and result[-1].high == n - 1:
+            result[-1] = Band(result[-1].low, n, plan)
+        else:
+            result.append(Band(n, n, plan))
+    return result
+
+
+def layout(content: str, path: str = FILEPATH) -> List[Band]:
+    """The page bands paginate.py writes for SUBJECT_RANGE."""
+    low, high = SUBJECT_RANGE
+    return bands(content, range(low, high + 1), path)
+
+
+BREAK_MARKER = '{/* ---> PAGE BREAK <--- */}'
+
+# The per-band page wrappers paginate.py writes: one fragment per band, shown
+# by the card when its subject count falls in the band
+BAND_RE = re.compile(
+    r"\n[ \t]*\{/\* ---> PAGE BAND (?P<low>\d+)-(?P<high>\d+) <--- \*/\}\n"
+    r"[ \t]*\{pageBand === (?P<index>\d+) && \(<>\n(?P<body>.*?)[ \t]*</>\)\}\n",
+    re.DOTALL
+)
+
+
+def template_breaks(content: str) -> List[Tuple[str, str]]:
+    """The breaks written into (part of) the template, in document order."""
+    breaks = []
+    pos = content.find(BREAK_MARKER)
+    while pos != -1:
+        after = re.search(r'\{/\*\s*(.*?)\s*\*/\}', content[pos + len(BREAK_MARKER):])
+        name = after.group(1) if after else ''
+        if name.endswith(' (Continued)'):
+            group = re.search(r'<tbody[^>]*>.*?\{/\*\s*(.*?)\s*\*/\}', content[pos:], re.DOTALL)
+            breaks.append((group.group(1) if group else name, 'group'))
+        else:
+            breaks.append((name, 'section'))
+        pos = content.find(BREAK_MARKER, pos + len(BREAK_MARKER))
+    return breaks
+
+
+def template_layout(content: str) -> List[Tuple[Optional[int], List[Tuple[str, str]]]]:
+    """(highest subject count, breaks) of every band written into the template.
+
+    A template with a single band has no band fragments; its count is None.
+    """
+    found = list(BAND_RE.finditer(content))
+    if not found:
+        return [(None, template_breaks(content))]
+    head = template_breaks(content[:found[0].start()])
+    tail = template_breaks(content[found[-1].end():])
+    return [(int(m['high']), head + template_breaks(m['body']) + tail) for m in found]
+
+
+def planned_layout(content: str, path: str = FILEPATH) -> List[Tuple[Optional[int], List[Tuple[str, str]]]]:
+    """What template_layout should return once paginate.py has run."""
+    planned = layout(content, path)
+    if len(planned) == 1:
+        return [(None, planned[0].plan.breaks)]
+    return [(band.high, band.plan.breaks) for band in planned]
+
+
+def breaks_for(template: List[Tuple[Optional[int], List[Tuple[str, str]]]], subjects: int) -> List[Tuple[str, str]]:
+    """The breaks a card of this many subjects prints with."""
+    for high, breaks in template:
+        if high is None or subjects <= high:
+            return breaks
+    return template[-1][1]
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def _parse_range(text: str) -> List[int]:
+    counts = []
+    for part in text.split(','):
+        low, _, high = part.partition('-')
+        counts.extend(range(int(low), int(high or low) + 1))
+    return counts
+
+
+def class_subject_counts(dsn: str) -> Dict[str, int]:
+    """Subjects per class and year from class_subjects."""
+    try:
+        import psycopg
+    except ImportError:
+        sys.exit('psycopg 3 is required for --dsn: pip install "psycopg[binary]"')
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute("""
+            SELECT c.class_name, cs.academic_year_id, COUNT(*)
+            FROM class_subjects cs
+            JOIN classes c ON c.id = cs.class_id
+            GROUP BY c.class_name, c.display_order, cs.academic_year_id
+            ORDER BY cs.academic_year_id, c.display_order
+        """).fetchall()
+    return {f'{name} ({year})': count for name, year, count in rows}
+
+
+def print_band(band: Band, classes: List[str]):
+    plan = band.plan
+    label = f'{band.low}' if band.low == band.high else f'{band.low}-{band.high}'
+    fill = ', '.join(f'{p.height / plan.available:.0%}' for p in plan.pages)
+    print(f"{label:>7} subjects  {len(plan.pages)} pages  fill {fill}")
+    for anchor, kind in plan.breaks:
+        print(f"{'':>18}break before {anchor}" + (' (table continues)' if kind == 'group' else ''))
+    for anchor in plan.overflow:
+        print(f"{'':>18}⚠️  {anchor} does not fit on one page")
+    if classes:
+        print(f"{'':>18}classes: {', '.join(classes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan the page breaks of the III-VIII report card.')
+    parser.add_argument('--file', default=FILEPATH)
+    parser.add_argument('--subjects', default='4-14', help='subject counts to plan, e.g. 6-12 or 5,8,10')
+    parser.add_argument('--dsn', help='plan for the subject counts of the classes in this database')
+    parser.add_argument('--check', action='store_true',
+                        help='exit 1 if a planned or real subject count needs other breaks than the template '
+                             'gives it, overflows a page, or the page bands are stale')
+    args = parser.parse_args()
+
+    spans = SpanLog('page_planner')
+    with open(args.file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    by_count: Dict[int, List[str]] = {}
+    if args.dsn:
+        with spans.span('db.class_subjects'):
+            for name, count in class_subject_counts(args.dsn).items():
+                by_count.setdefault(count, []).append(name)
+        counts = sorted(by_count)
+    else:
+        counts = _parse_range(args.subjects)
+    if args.check:
+        counts = sorted(set(counts) | set(range(SUBJECT_RANGE[0], SUBJECT_RANGE[1] + 1)))
+
+    # Page wrappers are measured away; the planner sees the bare card
+    from paginate import strip_pages
+    bare = strip_pages(content)
+    with spans.span('plan'):
+        planned = bands(bare, counts, args.file)
+
+    print(f"📄 {args.file}: {AVAILABLE:.0f}px of content per page")
+    for band in planned:
+        print_band(band, [c for n in range(band.low, band.high + 1) for c in by_count.get(n, [])])
+
+    failed = False
+    if args.check:
+        template = template_layout(content)
+        if template != planned_layout(bare, args.file):
+            print("❌ Template page bands differ from the plan: run python build_report_template.py")
+            failed = True
+        for n in counts:
+            plan = plan_for(bare, n, args.file)
+            classes = f" ({', '.join(by_count[n])})" if by_count.get(n) else ''
+            if plan.overflow:
+                print(f"❌ {n} subjects{classes}: {', '.join(plan.overflow)} taller than a page")
+                failed = True
+            elif plan.breaks != breaks_for(template, n):
+                print(f"❌ {n} subjects{classes}: the template breaks do not fit; "
+                      f"widen SUBJECT_RANGE {SUBJECT_RANGE} and rebuild")
+                failed = True
+        if not failed:
+            print("✅ Every card prints with the breaks planned for it")
+
+    spans.status = 'check_failed' if failed else 'ok'
+    write_timings(spans.line())
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,38 @@
-import re
+"""Split the III-VIII report card into A4 print-pages.
 
-def slice_report():
-    filepath = 'app/components/reports/ReportTemplate_III_VIII.tsx'
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # The user wants explicitly:
-    # Page 1 - General Information and Attendance
-    # Page 2- Scholastic Areas and 2 Skills of Coscholastic Area (Physical Ed, Visual Art)
-    # Page 3 - Remaining 2 skills of Coscholastis (Performing Dance, Music) and Personality Development
-    # Page 4 - Learner's Profile, Self Assessment, parent Feedback and signature box
-    # Page 5 - Assessment tables
-
-    # Let's break the monolithic <div className="print-page"> inner contents into pieces.
-    # To do this safely and precisely via script in this massive file:
-    
-    # Define a helper to replace a target with a page break enclosed version
-    page_break = """
-                </div>
-            </div>
+Where the breaks go is decided by page_planner.py, which estimates section
+heights from the template and its print styles and packs them onto pages
+for every subject count in SUBJECT_RANGE. This stage only writes the page
+wrappers for that plan:
 
-            {/* ---> PAGE BREAK <--- */}
-            <div className="print-page" style={{
-                width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
-                borderRadius: 4, boxShadow: '0 4px 24px rgba(0,0,0,0.12)', overflow: 'hidden',
-                boxSizing: 'border-box', position: 'relative', pageBreakBefore: 'always'
-            }}>
-                <div style={{ padding: '22px 28px 28px' }}>
+  * before a section: close the current print-page and open a new one with
+    the school header
+  * before a skill group: additionally close the table and reopen it on the
+    next page as "<SECTION> (Continued)", with the section's <thead> repeated
+    so the columns line up and the reader still sees what they are
+  * where the bands of subject counts break differently: the pages between
+    the breaks they share are written once per band, each in a fragment
+    shown when the card's subject count falls in that band
+
+Re-running after the template changes removes the old wrappers and writes
+the new ones, so the breaks follow the content instead of being fixed by
+hand.
 """
+import re
+
+from page_planner import BAND_RE, SECTIONS, layout, planned_layout, template_layout
+from template_anchors import AnchorError, index_for, line_start, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
 
-    header_break = """
-                </div>
+PAGE_BREAK_MARKER = '{/* ---> PAGE BREAK <--- */}'
+
+PAGE_CLOSE = """                </div>
             </div>
+"""
 
+PAGE_OPEN = """
             {/* ---> PAGE BREAK <--- */}
             <div className="print-page page-break" style={{
                 width: '210mm', minHeight: '293mm', margin: '0 auto 36px', background: C.white,
@@ -42,66 +42,187 @@ def slice_report():
                 <SchoolHeader />
                 <div style={{ padding: '22px 28px 28px' }}>
 """
-    
-    # 1. Page Break BEFORE Scholastic Domains
-    q1 = r'(\{\/\* SCHOLASTIC DOMAINS \*\/\})'
-    content = re.sub(q1, header_break + r'\1', content)
-
-    # 2. Page Break INSIDE Co-Scholastic? The user asked for 2 skills on pg 2, 2 on pg 3.
-    # Let's physically split the Co-Scholastic table.
-    
-    # The Co-Scholastic table has Visual Art ending, then Dance.
-    visual_art_end = r'(\{\/\* Performing Art - Dance \*\/\})'
-    
-    split_table = r"""                                </tbody>
-                            </table>
-                        </div>
-                    </div>
-""" + header_break + r"""
-                    {/* CO-SCHOLASTIC DOMAINS (Continued) */}
-                    <div className="section" style={{ marginTop: 0 }}>
-                        <div style={{ borderRadius: '4px', border: `1px solid ${C.navy}`, overflow: 'hidden', borderTop: 'none' }}>
-                            <table className="foundational-table">
-                                <tbody>
-                                    \1"""
-    
-    content = re.sub(visual_art_end, split_table, content)
-
-    # Note: we need to ensure the columns align for the continued table. 
-    # Let's inject a visually hidden header so column widths match perfectly.
-    hidden_header = r"""                                <tbody>
-                                    <tr style={{ visibility: 'collapse' }}>
-                                        <th style={{ width: '50%' }}></th>
-                                        <th style={{ width: '25%' }}></th>
-                                        <th style={{ width: '25%' }}></th>
-                                    </tr>
-                                    {/* Performing"""
-                                    
-    content = content.replace('<tbody>\n                                    {/* Performing', hidden_header)
-
-
-    # 3. Page Break BEFORE Feedback (which brings Feedback + Signatures to Page 4)
-    q3 = r'(\{\/\* FEEDBACK SECTIONS \*\/\})'
-    content = re.sub(q3, header_break + r'\1', content)
-
-    # 4. Page Break BEFORE Grading Framework (brings Grading to Page 5)
-    q4 = r'(\{\/\* GRADING FRAMEWORK \*\/\})'
-    content = re.sub(q4, header_break + r'\1', content)
-    
-    # CSS rule injection for page-break
-    css_break = r"""        @media print {
+
+PAGE_BREAK = PAGE_CLOSE + PAGE_OPEN
+
+BAND_HELPER_RE = re.compile(
+    r"    // Print-page layout by subject count, written by paginate\.py\n.*?    const pageBand = [^\n]*\n\n",
+    re.DOTALL
+)
+
+CSS_BREAK = """        @media print {
             .page-break {
                 page-break-before: always;
                 break-before: page;
             }"""
-            
-    content = content.replace("        @media print {", css_break)
 
+_WRAPPER = (
+    r"\{/\* ---> PAGE BREAK <--- \*/\}\s*"
+    r"<div className=\"print-page[^\"]*\" style=\{\{[^{}]*\}\}>\s*"
+    r"(?:<SchoolHeader />\s*)?"
+    r"<div style=\{\{ padding: '22px 28px 28px' \}\}>"
+)
+
+# A table split before a group, including the older layout that reopened the
+# table with a hidden row of <th>s instead of the real header
+CONTINUATION_RE = re.compile(
+    r"(?P<indent>[ \t]*)</tbody>\s*</table>\s*</div>\s*</div>\s*</div>\s*</div>\s*"
+    + _WRAPPER +
+    r"\s*\{/\* [^\n]*? \(Continued\) \*/\}\s*"
+    r"<div className=\"section\" style=\{\{ marginTop: 0 \}\}>\s*<div style=\{\{[^\n]*\}\}>\s*"
+    r"<table[^>]*>\s*(?:<thead>.*?</thead>\s*)?"
+    r"<tbody(?P<attrs>[^>]*)>\s*"
+    r"(?:<tr style=\{\{ visibility: 'collapse' \}\}>.*?</tr>\s*)?",
+    re.DOTALL
+)
+
+SECTION_BREAK_RE = re.compile(
+    r"\n(?:[ \t]*\n)*[ \t]*</div>\s*</div>\s*" + _WRAPPER + r"[ \t]*\n(?:[ \t]*\n)*",
+    re.DOTALL
+)
+
+
+def strip_pages(content):
+    """Remove every page wrapper this stage (or its older versions) wrote."""
+    # Keep the first band's pages, which leaves plain page breaks behind
+    content = BAND_HELPER_RE.sub('', content)
+    content = BAND_RE.sub(lambda m: m['body'] if m['index'] == '0' else '', content)
+    content = CONTINUATION_RE.sub(
+        lambda m: f"{m['indent']}</tbody>\n{m['indent']}<tbody{m['attrs']}>\n{m['indent']}    ", content)
+    return SECTION_BREAK_RE.sub('\n\n', content)
+
+
+def is_applied(content):
+    # Up to date when every band's wrappers sit exactly where the planner puts them
+    return (PAGE_BREAK_MARKER in content
+            and "visibility: 'collapse'" not in content
+            and template_layout(content) == planned_layout(strip_pages(content)))
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-        
-    print("Code paginated successfully.")
+
+def _continuation(content, index, anchor):
+    """Close the table before the group's <tbody> and reopen it on a new page."""
+    group = index.comment(anchor)
+    tbody = next((t for t in index.elements['tbody'] if t.start < group.start < t.end), None)
+    if tbody is None:
+        raise AnchorError(f"Skill group {anchor} is not inside a <tbody>")
+    section = max((name for name in SECTIONS if index.comment(name).start < group.start),
+                  key=lambda name: index.comment(name).start)
+    table = index.after('table', index.comment(section).start)
+    thead = index.child('thead', table)
+
+    wrapper_start = content.rfind('<div style={{', 0, table.start)
+    wrapper = content[wrapper_start:content.index('\n', wrapper_start)]
+    if not wrapper.endswith(' }}>'):
+        raise AnchorError(f"Unexpected table wrapper in {section}: {wrapper}")
+    wrapper = wrapper[:-len(' }}>')] + ", borderTop: 'none' }}>"
+
+    start = line_start(content, tbody.start)
+    indent = content[start:tbody.start]
+    table_indent = indent[:-4]
+    text = (
+        f"{table_indent}</table>\n"
+        f"{table_indent[:-4]}</div>\n"
+        f"{table_indent[:-8]}</div>\n\n"
+        + PAGE_BREAK + "\n"
+        f"{table_indent[:-8]}{{/* {section} (Continued) */}}\n"
+        f"{table_indent[:-8]}<div className=\"section\" style={{{{ marginTop: 0 }}}}>\n"
+        f"{table_indent[:-4]}{wrapper}\n"
+        f"{table_indent}{content[table.start:table.inner_start]}\n"
+        f"{content[line_start(content, thead.start):thead.end]}\n"
+    )
+    return start, text
+
+
+def _break_edits(content, index, breaks):
+    edits = []
+    for anchor, kind in breaks:
+        if kind == 'group':
+            start, text = _continuation(content, index, anchor)
+        else:
+            start = line_start(content, index.comment(anchor).start)
+            text = PAGE_BREAK
+        edits.append((start, start, text))
+    return edits
+
+
+def _band_helper(bands):
+    limits = ', '.join(str(band.high) for band in bands)
+    return (
+        "    // Print-page layout by subject count, written by paginate.py\n"
+        f"    const PAGE_BAND_LIMITS = [{limits}];\n"
+        "    const bandIndex = PAGE_BAND_LIMITS.findIndex(limit => (reportData.subjects?.length ?? 0) <= limit);\n"
+        "    const pageBand = bandIndex === -1 ? PAGE_BAND_LIMITS.length - 1 : bandIndex;\n\n"
+    )
+
+
+def _band_edits(content, index, bands):
+    """Write the pages the bands disagree on once per band."""
+    plans = [band.plan.breaks for band in bands]
+    lead = 0
+    while all(len(b) > lead and b[lead] == plans[0][lead] for b in plans):
+        lead += 1
+    trail = 0
+    while all(len(b) - trail > lead and b[len(b) - 1 - trail] == plans[0][len(plans[0]) - 1 - trail]
+              for b in plans):
+        trail += 1
+    # The varying pages must start and end at a section break all bands share
+    while lead and plans[0][lead - 1][1] != 'section':
+        lead -= 1
+    while trail and plans[0][len(plans[0]) - trail][1] != 'section':
+        trail -= 1
+    if not lead or not trail:
+        raise AnchorError("Page bands share no section break before and after the pages they "
+                          "differ on; narrow SUBJECT_RANGE in page_planner.py")
+
+    first = index.comment(plans[0][lead - 1][0]).start
+    last = index.comment(plans[0][len(plans[0]) - trail][0]).start
+    start, end = line_start(content, first), line_start(content, last)
+
+    text = PAGE_CLOSE
+    for i, band in enumerate(bands):
+        edits = _break_edits(content, index, band.plan.breaks[lead:len(band.plan.breaks) - trail])
+        added = sum(len(t) for _, _, t in edits)
+        body = splice(content, edits)[start:end + added]
+        text += (
+            f"\n            {{/* ---> PAGE BAND {band.low}-{band.high} <--- */}}\n"
+            f"            {{pageBand === {i} && (<>\n"
+            + PAGE_OPEN + body + PAGE_CLOSE +
+            "            </>)}\n"
+        )
+    text += PAGE_OPEN
+
+    ret = content.index('    return (\n        <div className="foundational-page')
+    edits = _break_edits(content, index, plans[0][:lead - 1] + plans[0][len(plans[0]) - trail + 1:])
+    return edits + [(start, end, text), (ret, ret, _band_helper(bands))]
+
+
+def apply(content):
+    content = strip_pages(content)
+    bands = layout(content)
+    overflow = [f"{band.low}-{band.high}: {', '.join(band.plan.overflow)}" for band in bands if band.plan.overflow]
+    if overflow:
+        raise AnchorError(f"Sections taller than a page at {'; '.join(overflow)} subjects")
+
+    index = index_for(content)
+    if len(bands) == 1:
+        edits = _break_edits(content, index, bands[0].plan.breaks)
+    else:
+        edits = _band_edits(content, index, bands)
+
+    # Chromium only breaks before .page-break in print when told to
+    style = index.first('style')
+    css = content[style.inner_start:style.inner_end]
+    if '.page-break {' not in css:
+        edits.append((style.inner_start, style.inner_end, css.replace("        @media print {", CSS_BREAK, 1)))
+
+    return splice(content, edits)
+
+
+STAGE = Stage('paginate', is_applied, apply)
+
+
+def slice_report():
+    main_for(FILEPATH, [STAGE])
 
 if __name__ == '__main__':
     slice_report()
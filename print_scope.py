@@ -0,0 +1,70 @@
+"""Hook the III-VIII card up to the shared print stylesheet.
+
+build_print_css.py copies the card's <style> block into one content-hashed
+stylesheet and scopes every rule with :where(.hpc-iii-viii). This stage makes
+the template match:
+
+  * the root element gets the hpc-iii-viii class the scoped rules select
+  * the <style> block is only rendered inline when INLINE_PRINT_STYLES is
+    set; otherwise the card links the shared sheet through <PrintStyles />
+"""
+from build_print_css import TEMPLATES
+from template_anchors import AnchorError, index_for, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+TEMPLATE = next(t for t in TEMPLATES if t.path == FILEPATH)
+
+IMPORTS = (
+    "import { INLINE_PRINT_STYLES } from '@/app/lib/print-styles';\n"
+    "import PrintStyles from '@/app/components/reports/PrintStyles';\n"
+)
+
+ROOT_CLASS = f'className="{TEMPLATE.root_class} content"'
+SCOPED_CLASS = f'className="{TEMPLATE.root_class} content {TEMPLATE.scope}"'
+
+STYLE_COMMENT = '{/* Local Styles for Matching Foundational */}'
+SHARED_COMMENT = '{/* Local Styles for Matching Foundational (built into the shared stylesheet by build_print_css.py) */}'
+
+
+def is_applied(content):
+    return SCOPED_CLASS in content and '{INLINE_PRINT_STYLES ? <style>' in content
+
+
+def apply(content):
+    index = index_for(content)
+    style = index.first('style')
+    edits = []
+
+    if 'INLINE_PRINT_STYLES' not in content[:content.index('export default')]:
+        react = "import React from 'react';\n"
+        if not content.startswith(react):
+            raise AnchorError(f"Expected the template to start with {react.strip()}")
+        edits.append((len(react), len(react), IMPORTS))
+
+    if SCOPED_CLASS not in content:
+        root = content.find(f'<div {ROOT_CLASS}')
+        if root == -1:
+            raise AnchorError(f"Root element with {ROOT_CLASS} not found")
+        start = root + len('<div ')
+        edits.append((start, start + len(ROOT_CLASS), SCOPED_CLASS))
+
+    if '{INLINE_PRINT_STYLES ? <style>' not in content:
+        comment = content.rfind(STYLE_COMMENT, 0, style.start)
+        if comment != -1 and not content[comment + len(STYLE_COMMENT):style.start].strip():
+            edits.append((comment, comment + len(STYLE_COMMENT), SHARED_COMMENT))
+        edits.append((style.start, style.start, '{INLINE_PRINT_STYLES ? '))
+        edits.append((style.end, style.end, ' : <PrintStyles />}'))
+
+    return splice(content, edits)
+
+
+STAGE = Stage('print_scope', is_applied, apply)
+
+
+def scope_print_styles():
+    main_for(FILEPATH, [STAGE])
+
+if __name__ == '__main__':
+    scope_print_styles()
@@ -0,0 +1,91 @@
+// Measures what the print CSS costs per rendered report page.
+//
+// Loads a print URL repeatedly in one warm Chromium page (as the PDF pool
+// does) and reports the HTML and CSS bytes transferred, the inline <style>
+// bytes in the document and Chromium's style-recalc / layout time, plus the
+// page.pdf() time. Run it once against a server started with
+// NEXT_PUBLIC_PRINT_CSS_INLINE=1 and once without to compare inline CSS with
+// the shared stylesheet from build_print_css.py.
+//
+// Usage: node scripts/bench-print-css.js <print-url> [runs=10]
+//   e.g. node scripts/bench-print-css.js "http://localhost:3000/print/bundle?token=...&student_ids=12,13,14" 5
+
+const puppeteer = require('puppeteer');
+
+const URL_TO_TEST = process.argv[2];
+const RUNS = parseInt(process.argv[3] || '10', 10);
+
+if (!URL_TO_TEST) {
+    console.error('Usage: node scripts/bench-print-css.js <print-url> [runs=10]');
+    process.exit(1);
+}
+
+const median = values => {
+    const sorted = [...values].sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+};
+
+async function measure(page, client) {
+    const bytes = { html: 0, css: 0 };
+    const onResponse = async response => {
+        const type = response.request().resourceType();
+        if (type !== 'document' && type !== 'stylesheet') return;
+        const body = await response.buffer().catch(() => null);
+        // Served from the memory cache: nothing transferred
+        if (!body || response.fromCache()) return;
+        bytes[type === 'document' ? 'html' : 'css'] += body.length;
+    };
+    page.on('response', onResponse);
+
+    const before = Object.fromEntries((await client.send('Performance.getMetrics')).metrics.map(m => [m.name, m.value]));
+    const start = Date.now();
+    await page.goto(URL_TO_TEST, { waitUntil: 'networkidle0' });
+    const loadMs = Date.now() - start;
+    const pdfStart = Date.now();
+    await page.pdf({ format: 'A4', printBackground: true });
+    const pdfMs = Date.now() - pdfStart;
+    const after = Object.fromEntries((await client.send('Performance.getMetrics')).metrics.map(m => [m.name, m.value]));
+
+    page.off('response', onResponse);
+    const inlineCss = await page.$$eval('style', els => els.reduce((n, el) => n + el.textContent.length, 0));
+
+    return {
+        html_kb: bytes.html / 1024,
+        css_kb: bytes.css / 1024,
+        inline_css_kb: inlineCss / 1024,
+        recalc_ms: (after.RecalcStyleDuration - before.RecalcStyleDuration) * 1000,
+        recalc_count: after.RecalcStyleCount - before.RecalcStyleCount,
+        layout_ms: (after.LayoutDuration - before.LayoutDuration) * 1000,
+        load_ms: loadMs,
+        pdf_ms: pdfMs,
+    };
+}
+
+async function main() {
+    const browser = await puppeteer.launch({ args: ['--no-sandbox'] });
+    try {
+        const page = await browser.newPage();
+        const client = await page.target().createCDPSession();
+        await client.send('Performance.enable');
+
+        const results = [];
+        for (let i = 0; i < RUNS; i++) {
+            results.push(await measure(page, client));
+        }
+
+        console.log(`📄 ${URL_TO_TEST}`);
+        console.log(`   ${RUNS} runs in one warm page (first run: cold cache)\n`);
+        const first = results[0];
+        for (const key of Object.keys(first)) {
+            const warm = results.length > 1 ? median(results.slice(1).map(r => r[key])) : first[key];
+            console.log(`   ${key.padEnd(14)} first ${first[key].toFixed(1).padStart(9)}   warm p50 ${warm.toFixed(1).padStart(9)}`);
+        }
+    } finally {
+        await browser.close();
+    }
+}
+
+main().catch(err => {
+    console.error('❌ Benchmark failed:', err);
+    process.exit(1);
+});
@@ -0,0 +1,203 @@
+// Benchmarks the data lookups ReportTemplate_III_VIII performs for one card.
+//
+// "before" replays the card as it was: a linear .find() per cell, and the
+// subject row body summing getVal per component and calling hasMarks for the
+// grand totals and each displayed total. "after" replays the shipped helpers:
+// nested maps built once (index_scores.py), getTermTotal per subject and term
+// (term_results.py, without stored results) and one getSkillGrades lookup per
+// skill row (skill_tables.py).
+//
+// Usage: node scripts/bench-report-lookups.js [subjects=12] [iterations=20000]
+
+const fs = require('fs');
+const path = require('path');
+
+const SUBJECTS = parseInt(process.argv[2] || '12', 10);
+const ITERATIONS = parseInt(process.argv[3] || '20000', 10);
+
+const COMPONENTS = ['Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment'];
+const TERMS = ['Term I', 'Term II'];
+const MONTHS = ['Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar'];
+const MONTH_NAMES = ['April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December', 'January', 'February', 'March'];
+// Skill tables as generated from app/lib/report-skills.ts
+function readSkillDomains() {
+    const source = fs.readFileSync(path.join(__dirname, '..', 'app', 'lib', 'report-skills.ts'), 'utf8');
+    const domains = [];
+    const re = /domain:\s*'([^']*)',\s*label:\s*'[^']*',\s*skills:\s*\[([^\]]*)\]/g;
+    for (const m of source.matchAll(re)) {
+        domains.push({ domain: m[1], skills: Array.from(m[2].matchAll(/'([^']*)'/g), s => s[1]) });
+    }
+    return domains;
+}
+const SKILL_DOMAINS = readSkillDomains();
+const REMARKS = [
+    ['Learner’s Profile by the teacher', null],
+    ["Parent’s Feedback", 'My child enjoys participating in...'],
+    ["Parent’s Feedback", 'My child can be supported for...'],
+    ["Parent’s Feedback", 'Any additional observations'],
+    ['Self-Assessment', 'Activities I enjoy the most'],
+    ['Self-Assessment', 'Activities I find challenging'],
+    ['Self-Assessment', 'Activities I enjoy doing with my friends'],
+];
+
+function buildReportData() {
+    const subjects = [];
+    const scholastic = [];
+    for (let i = 0; i < SUBJECTS; i++) {
+        const subject_name = `Subject ${i + 1}`;
+        subjects.push({ id: i + 1, subject_name });
+        COMPONENTS.forEach(component_name => TERMS.forEach(term_name => {
+            scholastic.push({ subject_name, component_name, term_name, marks: String(5 + (i % 5)) });
+        }));
+    }
+    const co_scholastic = [];
+    SKILL_DOMAINS.forEach(({ domain, skills }) => skills.forEach(sub_skill_name => TERMS.forEach(term_name =>
+        co_scholastic.push({ domain_name: domain, sub_skill_name, term_name, grade: 'A' }))));
+    const attendance = MONTH_NAMES.map(month_name => ({ month_name, working_days: 24, days_present: 22 }));
+    const remarks = REMARKS.map(([type_name, aspect]) => ({ type_name, aspect, remark_text: 'Good' }));
+    // Round-trip through JSON so strings are fresh heap copies, as in an API response
+    return JSON.parse(JSON.stringify({ subjects, scholastic, co_scholastic, attendance, remarks }));
+}
+
+// Every lookup the card makes, in render order; returns a checksum so the
+// work can't be optimised away.
+function renderCard(reportData, h) {
+    let sink = 0;
+    MONTHS.forEach(m => { sink += (h.getAttendance(m)?.working_days || 0) + (h.getAttendance(m)?.days_present || 0); });
+    MONTHS.forEach(m => { const a = h.getAttendance(m); if (a) sink += a.days_present / a.working_days; });
+
+    reportData.subjects.forEach(sub => {
+        COMPONENTS.forEach(comp => TERMS.forEach(term => { sink += h.getScholasticScore(sub.subject_name, comp, term) ? 1 : 0; }));
+        sink += h.subjectRow(sub);
+    });
+
+    SKILL_DOMAINS.forEach(({ domain, skills }) => skills.forEach(skill => { sink += h.skillRow(domain, skill); }));
+    REMARKS.forEach(([type, aspect]) => { sink += h.getRemark(type, aspect || undefined).length; });
+    return sink;
+}
+
+function linearHelpers(reportData) {
+    const getScholasticScore = (subjectName, componentName, termName) => reportData.scholastic?.find(s =>
+        s.subject_name === subjectName && s.component_name === componentName && s.term_name === termName);
+    const getCoScholastic = (subSkill, term) => reportData.co_scholastic?.find(cs => cs.sub_skill_name === subSkill && cs.term_name === term);
+    return {
+        getScholasticScore,
+        getAttendance: month => reportData.attendance?.find(a => a.month_name?.startsWith(month)),
+        getRemark: (type, aspect) => reportData.remarks?.find(r => r.type_name === type && (aspect ? r.aspect === aspect : !r.aspect))?.remark_text || '',
+        // The old subject row body, call for call
+        subjectRow: sub => {
+            const subject = sub.subject_name;
+            const getVal = (comp, term) => {
+                const s = getScholasticScore(subject, comp, term);
+                if (!s || !s.marks) return 0;
+                const num = parseFloat(s.marks);
+                return isNaN(num) ? 0 : num;
+            };
+            const hasMarks = term => getScholasticScore(subject, 'Periodic Assessment', term) ||
+                getScholasticScore(subject, 'Terminal Assessment', term);
+            const total1 = getVal('Periodic Assessment', 'Term I') + getVal('Subject Enrichment Activities', 'Term I') +
+                getVal('Internal Assessment', 'Term I') + getVal('Terminal Assessment', 'Term I');
+            const total2 = getVal('Periodic Assessment', 'Term II') + getVal('Subject Enrichment Activities', 'Term II') +
+                getVal('Internal Assessment', 'Term II') + getVal('Terminal Assessment', 'Term II');
+            let sink = 0;
+            if (hasMarks('Term I')) sink += total1;
+            if (hasMarks('Term II')) sink += total2;
+            const avg = (total1 + total2) / 2;
+            if (hasMarks('Term I') || hasMarks('Term II')) sink += avg;
+            sink += hasMarks('Term I') ? total1 : 0;
+            sink += hasMarks('Term II') ? total2 : 0;
+            sink += (hasMarks('Term I') || hasMarks('Term II')) ? avg : 0;
+            return sink;
+        },
+        skillRow: (domain, skill) => (getCoScholastic(skill, 'Term I')?.grade ? 1 : 0) + (getCoScholastic(skill, 'Term II')?.grade ? 1 : 0),
+    };
+}
+
+function indexedHelpers(reportData) {
+    // Nested maps keyed by the row strings themselves: no key building per lookup
+    const scholasticIndex = new Map();
+    reportData.scholastic?.forEach(s => {
+        let byComponent = scholasticIndex.get(s.subject_name);
+        if (!byComponent) scholasticIndex.set(s.subject_name, byComponent = new Map());
+        let byTerm = byComponent.get(s.component_name);
+        if (!byTerm) byComponent.set(s.component_name, byTerm = new Map());
+        if (!byTerm.has(s.term_name)) byTerm.set(s.term_name, s);
+    });
+    const skillIndex = new Map();
+    reportData.co_scholastic?.forEach(cs => {
+        let bySkill = skillIndex.get(cs.domain_name);
+        if (!bySkill) skillIndex.set(cs.domain_name, bySkill = new Map());
+        let byTerm = bySkill.get(cs.sub_skill_name);
+        if (!byTerm) bySkill.set(cs.sub_skill_name, byTerm = new Map());
+        if (!byTerm.has(cs.term_name)) byTerm.set(cs.term_name, cs);
+    });
+    const attendanceIndex = new Map();
+    reportData.attendance?.forEach(a => {
+        const key = a.month_name?.slice(0, 3);
+        if (key && !attendanceIndex.has(key)) attendanceIndex.set(key, a);
+    });
+    const remarkIndex = new Map();
+    reportData.remarks?.forEach(r => {
+        let byAspect = remarkIndex.get(r.type_name);
+        if (!byAspect) remarkIndex.set(r.type_name, byAspect = new Map());
+        const aspect = r.aspect || '';
+        if (!byAspect.has(aspect)) byAspect.set(aspect, r.remark_text);
+    });
+
+    const getScholasticScore = (subjectName, componentName, termName) => scholasticIndex.get(subjectName)?.get(componentName)?.get(termName);
+    const getTermTotal = (subject, term) => {
+        let total = 0;
+        COMPONENTS.forEach(comp => {
+            const s = getScholasticScore(subject, comp, term);
+            const num = s?.marks ? parseFloat(s.marks) : 0;
+            if (!isNaN(num)) total += num;
+        });
+        const hasMarks = !!(getScholasticScore(subject, 'Periodic Assessment', term) ||
+            getScholasticScore(subject, 'Terminal Assessment', term));
+        return { total, hasMarks };
+    };
+    const getSkillGrades = (domain, subSkill) => skillIndex.get(domain)?.get(subSkill);
+    return {
+        getScholasticScore,
+        getAttendance: month => attendanceIndex.get(month),
+        getRemark: (type, aspect) => remarkIndex.get(type)?.get(aspect || '') || '',
+        subjectRow: sub => {
+            const { total: total1, hasMarks: has1 } = getTermTotal(sub.subject_name, 'Term I');
+            const { total: total2, hasMarks: has2 } = getTermTotal(sub.subject_name, 'Term II');
+            let sink = 0;
+            if (has1) sink += total1;
+            if (has2) sink += total2;
+            const avg = (total1 + total2) / 2;
+            if (has1 || has2) sink += avg;
+            sink += has1 ? total1 : 0;
+            sink += has2 ? total2 : 0;
+            sink += (has1 || has2) ? avg : 0;
+            return sink;
+        },
+        skillRow: (domain, skill) => {
+            const grades = getSkillGrades(domain, skill);
+            return (grades?.get('Term I')?.grade ? 1 : 0) + (grades?.get('Term II')?.grade ? 1 : 0);
+        },
+    };
+}
+
+function bench(label, makeHelpers, reportData) {
+    // Warm up the JIT before timing
+    for (let i = 0; i < 500; i++) renderCard(reportData, makeHelpers(reportData));
+
+    let checksum = 0;
+    const start = process.hrtime.bigint();
+    for (let i = 0; i < ITERATIONS; i++) {
+        checksum += renderCard(reportData, makeHelpers(reportData));
+    }
+    const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+    const perCardUs = (elapsedMs * 1000) / ITERATIONS;
+    console.log(`${label.padEnd(8)} ${perCardUs.toFixed(2).padStart(9)} µs/card  (${ITERATIONS} cards in ${elapsedMs.toFixed(0)} ms, checksum ${checksum.toFixed(0)})`);
+    return perCardUs;
+}
+
+const reportData = buildReportData();
+console.log(`📊 Report card lookups: ${SUBJECTS} subjects, ${reportData.scholastic.length} scholastic rows, ${reportData.co_scholastic.length} co-scholastic rows`);
+const before = bench('before', linearHelpers, reportData);
+const after = bench('after', indexedHelpers, reportData);
+console.log(`✅ Speed-up: ${(before / after).toFixed(1)}x`);
@@ -0,0 +1,640 @@
+"""Results-week load test for the report, mark-entry and fee endpoints.
+
+Seeds a scratch schema (default "hpc_load") from step2_database_schema_v1.sql
+and step3_extend_student_schema.sql with a school of the given size, plus the
+tables app/api/setup/migrate adds (fees, term results, report versions), then
+drives concurrent traffic at a running app:
+
+  report                    GET  /api/reports/student/[student_id]
+  pdf                       POST /api/reports/student/[student_id]/pdf
+  scores-bulk               POST /api/teacher/scholastic-scores/bulk (a section's grid, one term)
+  cumulative-scholastic     GET  /api/reports/cumulative/scholastic
+  cumulative-co-scholastic  GET  /api/reports/cumulative/co-scholastic
+  parent-fees               GET  /api/parent/fees
+  mixed                     all of the above, weighted like results week
+
+Every scenario runs for --duration seconds with --concurrency workers after a
+short warm-up. While it runs, /api/health?format=prometheus is sampled for
+the pg pool gauges, wait histogram, opened connections and coalesced report
+reads (app/lib/db.ts, app/lib/metrics.ts) and pg_stat_activity for
+server-side connections. The result is one JSON file with throughput,
+p50/p95/p99 latency and pool saturation per scenario, tagged with the git
+commit; --compare flags regressions against an earlier file. Pool size and
+timeouts are the app's PG_* settings (app/lib/db.ts), so runs with different
+PG_POOL_MAX values, or behind PgBouncer with PG_POOLER=transaction, can be
+compared directly.
+
+The app has to run against the seeded schema, e.g.
+
+    python scripts/bench_load.py --seed-only --students 40
+    DATABASE_URL='postgresql://localhost/postgres?options=-csearch_path%3Dhpc_load' npm run start
+    python scripts/bench_load.py --concurrency 32 --duration 30
+    python scripts/bench_load.py --compare load_test_1a2b3c4.json
+
+Tokens are signed locally with JWT_SECRET (the app's default when unset), so
+no users need to exist. Requires psycopg 3 and aiohttp
+(pip install "psycopg[binary]" aiohttp).
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import psycopg
+except ImportError:
+    sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+try:
+    import aiohttp
+except ImportError:
+    sys.exit('aiohttp is required: pip install aiohttp')
+
+import bench_score_save
+import bench_section_reports
+from bench_section_reports import ROOT, percentile
+
+SCENARIOS = ['report', 'pdf', 'scores-bulk', 'cumulative-scholastic', 'cumulative-co-scholastic', 'parent-fees', 'mixed']
+
+# Share of requests per endpoint in the mixed scenario: parents and teachers
+# reading cards dominate, exports and PDFs are rarer but heavy
+MIXED_WEIGHTS = {
+    'report': 35,
+    'parent-fees': 25,
+    'scores-bulk': 20,
+    'cumulative-scholastic': 8,
+    'cumulative-co-scholastic': 7,
+    'pdf': 5,
+}
+
+# ── seeding (kept in step with app/api/setup/migrate) ──
+
+APP_DDL = """
+ALTER TABLE students
+    ADD COLUMN IF NOT EXISTS stream VARCHAR(50),
+    ADD COLUMN IF NOT EXISTS subject_count INT,
+    ADD COLUMN IF NOT EXISTS admission_date DATE,
+    ADD COLUMN IF NOT EXISTS is_new_student BOOLEAN DEFAULT FALSE;
+ALTER TABLE academic_years
+    ADD COLUMN IF NOT EXISTS start_date DATE,
+    ADD COLUMN IF NOT EXISTS end_date DATE;
+
+CREATE TABLE IF NOT EXISTS fee_heads (
+    id SERIAL PRIMARY KEY,
+    head_name VARCHAR(100) NOT NULL UNIQUE,
+    applies_to_new_students_only BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS fee_structures (
+    id SERIAL PRIMARY KEY,
+    class_id INT NOT NULL REFERENCES classes(id),
+    academic_year_id INT NOT NULL REFERENCES academic_years(id),
+    fee_head_id INT NOT NULL REFERENCES fee_heads(id),
+    amount NUMERIC(10, 2) NOT NULL,
+    due_date DATE,
+    stream VARCHAR(50),
+    subject_count INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS student_fee_payments (
+    id SERIAL PRIMARY KEY,
+    student_id INT NOT NULL REFERENCES students(id),
+    fee_structure_id INT REFERENCES fee_structures(id),
+    amount_paid NUMERIC(10, 2) NOT NULL,
+    payment_date DATE DEFAULT CURRENT_DATE,
+    payment_mode VARCHAR(50) CHECK (payment_mode IN ('CASH', 'UPI', 'CHEQUE', 'ONLINE', 'BANK_TRANSFER')),
+    transaction_reference VARCHAR(100),
+    remarks TEXT,
+    academic_year_id INT REFERENCES academic_years(id),
+    batch_id VARCHAR(36),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_fee_payments_payment_date ON student_fee_payments (payment_date);
+
+CREATE TABLE IF NOT EXISTS report_card_versions (
+    student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    academic_year_id INT NOT NULL,
+    version          INT NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (student_id, academic_year_id)
+);
+CREATE TABLE IF NOT EXISTS student_term_results (
+    student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    academic_year_id INT NOT NULL,
+    class_id         INT NOT NULL,
+    section_id       INT NOT NULL,
+    subject_totals   JSONB NOT NULL DEFAULT '{}',
+    term1_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+    term1_subjects   INT NOT NULL DEFAULT 0,
+    term2_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+    term2_subjects   INT NOT NULL DEFAULT 0,
+    grand_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+    max_marks        INT NOT NULL DEFAULT 0,
+    percentage       NUMERIC(5,2),
+    section_rank     INT,
+    class_rank       INT,
+    updated_at       TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (student_id, academic_year_id)
+);
+CREATE INDEX IF NOT EXISTS idx_term_results_section_rank
+    ON student_term_results (academic_year_id, section_id, section_rank);
+CREATE INDEX IF NOT EXISTS idx_term_results_class_rank
+    ON student_term_results (academic_year_id, class_id, class_rank);
+CREATE TABLE IF NOT EXISTS fee_ledger_daily (
+    payment_date     DATE NOT NULL,
+    payment_mode     VARCHAR(50) NOT NULL,
+    academic_year_id INT NOT NULL DEFAULT 0,
+    class_id         INT NOT NULL DEFAULT 0,
+    section_id       INT NOT NULL DEFAULT 0,
+    fee_head_id      INT NOT NULL DEFAULT 0,
+    amount           NUMERIC(14,2) NOT NULL DEFAULT 0,
+    payment_count    INT NOT NULL DEFAULT 0,
+    updated_at       TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id)
+);
+"""
+
+# Monthly tuition due on the 10th from April, an exam fee per term and
+# --paid-months of tuition paid by every student, spread over modes and days;
+# the ledger is rolled up as scripts/rebuild-fee-ledger.js does
+FEE_SEED_SQL = """
+UPDATE academic_years SET start_date = DATE '2025-04-01', end_date = DATE '2026-03-31';
+
+INSERT INTO fee_heads (head_name) VALUES ('Tuition Fee'), ('Exam Fee');
+
+INSERT INTO fee_structures (class_id, academic_year_id, fee_head_id, amount, due_date)
+SELECT c.id, 1, fh.id, 1500 + 100 * c.display_order, DATE '2025-04-10' + make_interval(months => m)
+FROM classes c, fee_heads fh, generate_series(0, 11) m
+WHERE fh.head_name = 'Tuition Fee';
+
+INSERT INTO fee_structures (class_id, academic_year_id, fee_head_id, amount, due_date)
+SELECT c.id, 1, fh.id, 800, d
+FROM classes c, fee_heads fh, (VALUES (DATE '2025-09-15'), (DATE '2026-02-15')) t(d)
+WHERE fh.head_name = 'Exam Fee';
+
+INSERT INTO student_fee_payments
+    (student_id, fee_structure_id, amount_paid, payment_date, payment_mode, academic_year_id, batch_id)
+SELECT se.student_id, fs.id, fs.amount, fs.due_date - (se.student_id %% 7),
+    (ARRAY['CASH', 'UPI', 'CHEQUE', 'ONLINE', 'BANK_TRANSFER'])[1 + se.student_id %% 5], 1,
+    md5(se.student_id || '-' || fs.due_date)
+FROM student_enrollments se
+JOIN fee_structures fs ON fs.class_id = se.class_id AND fs.academic_year_id = se.academic_year_id
+JOIN fee_heads fh ON fh.id = fs.fee_head_id AND fh.head_name = 'Tuition Fee'
+WHERE fs.due_date < DATE '2025-04-10' + make_interval(months => %(paid_months)s);
+
+INSERT INTO fee_ledger_daily
+    (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id, amount, payment_count)
+SELECT fp.payment_date, fp.payment_mode, fp.academic_year_id, se.class_id, se.section_id, fs.fee_head_id,
+    SUM(fp.amount_paid), COUNT(*)
+FROM student_fee_payments fp
+JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+JOIN student_enrollments se ON se.student_id = fp.student_id AND se.academic_year_id = fp.academic_year_id
+GROUP BY 1, 2, 3, 4, 5, 6;
+
+ANALYZE;
+"""
+
+
+def seed(conn, args):
+    seed_args = argparse.Namespace(classes=args.classes, sections=args.sections,
+                                   students=args.students, subjects=args.subjects)
+    bench_section_reports.seed(conn, args.schema, seed_args)
+    with psycopg.ClientCursor(conn) as cur:
+        cur.execute(f'SET search_path TO {args.schema}')
+        cur.execute(bench_score_save.EXTRA_DDL)
+        cur.execute(APP_DDL)
+        cur.execute(FEE_SEED_SQL, {'paid_months': args.paid_months})
+    conn.commit()
+    total = args.classes * args.sections * args.students
+    print(f'✅ Seeded {args.classes} classes x {args.sections} sections x {args.students} students '
+          f'({total} students, {args.subjects} subjects)')
+
+
+def fixtures(conn, schema, academic_year_id):
+    """Ids the request generators pick from."""
+    with conn.cursor() as cur:
+        cur.execute(f'SET search_path TO {schema}')
+        cur.execute("""
+            SELECT se.section_id, se.class_id, array_agg(se.student_id ORDER BY se.roll_no)
+            FROM student_enrollments se
+            WHERE se.academic_year_id = %s
+            GROUP BY se.section_id, se.class_id
+            ORDER BY se.section_id
+        """, (academic_year_id,))
+        sections = [{'id': r[0], 'class_id': r[1], 'students': r[2]} for r in cur.fetchall()]
+        if not sections:
+            sys.exit(f'❌ No enrollments in schema "{schema}" (run with --seed?)')
+        cur.execute('SELECT class_id, array_agg(subject_id ORDER BY subject_id) FROM class_subjects '
+                    'WHERE academic_year_id = %s GROUP BY class_id', (academic_year_id,))
+        subjects = dict(cur.fetchall())
+        cur.execute("SELECT id FROM assessment_components WHERE component_name IN "
+                    "('Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment') "
+                    "ORDER BY id")
+        components = [r[0] for r in cur.fetchall()]
+        cur.execute('SELECT id, term_name FROM terms ORDER BY id')
+        terms = cur.fetchall()
+    return {'sections': sections, 'subjects': subjects, 'components': components, 'terms': terms}
+
+
+# ── requests ──
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def sign_token(secret, user_id, role, ttl=4 * 3600):
+    """An HS256 JWT shaped like the one app/api/auth/login issues."""
+    now = int(time.time())
+    header = _b64(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = _b64(json.dumps({'user_id': str(user_id), 'role': role, 'iat': now, 'exp': now + ttl},
+                              separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode(), f'{header}.{payload}'.encode(), hashlib.sha256).digest()
+    return f'{header}.{payload}.{_b64(signature)}'
+
+
+class Traffic:
+    """Builds (method, path, json body, token) for each scenario from the seeded ids."""
+
+    def __init__(self, data, academic_year_id, secret, seed_value):
+        self.data = data
+        self.year = academic_year_id
+        self.secret = secret
+        self.rng = random.Random(seed_value)
+        self.teacher = sign_token(secret, 1, 'TEACHER')
+        self.admin = sign_token(secret, 1, 'ADMIN')
+        self.parents = {}
+
+    def _student(self):
+        section = self.rng.choice(self.data['sections'])
+        return self.rng.choice(section['students'])
+
+    def _parent(self, student_id):
+        # Parent logins carry the student's id as user_id
+        if student_id not in self.parents:
+            self.parents[student_id] = sign_token(self.secret, student_id, 'PARENT')
+        return self.parents[student_id]
+
+    def report(self):
+        student_id = self._student()
+        return 'GET', f'/api/reports/student/{student_id}?academic_year_id={self.year}', None, self._parent(student_id)
+
+    def pdf(self):
+        student_id = self._student()
+        return 'POST', f'/api/reports/student/{student_id}/pdf', {'academic_year_id': self.year}, self._parent(student_id)
+
+    def scores_bulk(self):
+        section = self.rng.choice(self.data['sections'])
+        term_id, _ = self.rng.choice(self.data['terms'])
+        cells = [
+            {'student_id': student_id, 'subject_id': subject_id, 'component_id': component_id,
+             'term_id': term_id, 'marks': self.rng.randint(0, 5), 'academic_year_id': self.year}
+            for student_id in section['students']
+            for subject_id in self.data['subjects'].get(section['class_id'], [])
+            for component_id in self.data['components']
+        ]
+        return 'POST', '/api/teacher/scholastic-scores/bulk', cells, self.teacher
+
+    def _cumulative(self, kind):
+        section = self.rng.choice(self.data['sections'])
+        path = (f'/api/reports/cumulative/{kind}?academic_year_id={self.year}'
+                f'&class_id={section["class_id"]}&section_id={section["id"]}')
+        return 'GET', path, None, self.admin
+
+    def cumulative_scholastic(self):
+        return self._cumulative('scholastic')
+
+    def cumulative_co_scholastic(self):
+        return self._cumulative('co-scholastic')
+
+    def parent_fees(self):
+        student_id = self._student()
+        return 'GET', '/api/parent/fees', None, self._parent(student_id)
+
+    def mixed(self):
+        names = list(MIXED_WEIGHTS)
+        name = self.rng.choices(names, weights=[MIXED_WEIGHTS[n] for n in names])[0]
+        return self.build(name)
+
+    def build(self, scenario):
+        return getattr(self, scenario.replace('-', '_'))()
+
+
+# ── pool sampling ──
+
+METRIC_LINE = re.compile(r'^(\w+)(?:\{([^}]*)\})?\s+(\S+)$')
+
+
+def parse_prometheus(text):
+    """{(name, frozenset(labels)): value} for the metrics app/lib/metrics.ts renders."""
+    values = {}
+    for line in text.splitlines():
+        match = METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        pairs = frozenset(re.findall(r'(\w+)="([^"]*)"', labels or ''))
+        try:
+            values[(name, pairs)] = float(value)
+        except ValueError:
+            pass
+    return values
+
+
+class PoolSampler:
+    """Samples the app's pg pool gauges and Postgres' connection count while a scenario runs."""
+
+    def __init__(self, session, base_url, dsn, interval):
+        self.session = session
+        self.url = f'{base_url}/api/health?format=prometheus'
+        self.dsn = dsn
+        self.interval = interval
+        self.samples = []
+        self.server = []
+        self.first = self.last = None
+
+    async def _scrape(self):
+        try:
+            async with self.session.get(self.url) as resp:
+                if resp.status != 200:
+                    return None
+                return parse_prometheus(await resp.text())
+        except aiohttp.ClientError:
+            return None
+
+    def _server_connections(self, conn):
+        row = conn.execute("SELECT COUNT(*), COUNT(*) FILTER (WHERE state = 'active') FROM pg_stat_activity "
+                           "WHERE datname = current_database() AND pid <> pg_backend_pid()").fetchone()
+        return {'total': row[0], 'active': row[1]}
+
+    async def run(self, stop):
+        conn = await asyncio.to_thread(psycopg.connect, self.dsn, autocommit=True)
+        try:
+            while True:
+                metrics, server = await asyncio.gather(self._scrape(),
+                                                       asyncio.to_thread(self._server_connections, conn))
+                self.server.append(server)
+                if metrics is not None:
+                    if self.first is None:
+                        self.first = metrics
+                    self.last = metrics
+                    gauge = lambda state: metrics.get(('hpc_pg_pool_clients', frozenset({('state', state)})), 0)
+                    self.samples.append({'total': gauge('total'), 'idle': gauge('idle'), 'waiting': gauge('waiting')})
+                try:
+                    await asyncio.wait_for(stop.wait(), self.interval)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await asyncio.to_thread(conn.close)
+
+    def summary(self):
+        result = {
+            'server_connections_max': max((s['total'] for s in self.server), default=0),
+            'server_active_max': max((s['active'] for s in self.server), default=0),
+        }
+        if not self.samples:
+            result['app_metrics'] = 'unavailable'
+            return result
+
+        waiting = [s['waiting'] for s in self.samples]
+        result.update({
+            'samples': len(self.samples),
+            'clients_max': max(s['total'] for s in self.samples),
+            'waiting_max': max(waiting),
+            'waiting_mean': round(sum(waiting) / len(waiting), 2),
+            # Share of samples with requests queued for a client
+            'saturated_share': round(sum(1 for w in waiting if w > 0) / len(waiting), 3),
+        })
+        # Checkout waits over the scenario, from the histogram's deltas
+        key = lambda name, labels=frozenset(): (name, labels)
+        count = self.last.get(key('hpc_pg_pool_wait_seconds_count'), 0) - self.first.get(key('hpc_pg_pool_wait_seconds_count'), 0)
+        total = self.last.get(key('hpc_pg_pool_wait_seconds_sum'), 0) - self.first.get(key('hpc_pg_pool_wait_seconds_sum'), 0)
+        fast_key = key('hpc_pg_pool_wait_seconds_bucket', frozenset({('le', '0.001')}))
+        fast = self.last.get(fast_key, 0) - self.first.get(fast_key, 0)
+        result.update({
+            'checkouts': int(count),
+            'checkout_wait_mean_ms': round(total / count * 1000, 3) if count else 0,
+            'checkouts_waited_over_1ms': round((count - fast) / count, 3) if count else 0,
+        })
+        # Pool size from app/lib/db.ts (PG_POOL_MAX), connection churn and
+        # card lookups that shared a read already in flight
+        pool_max = self.last.get(key('hpc_pg_pool_clients', frozenset({('state', 'max')})))
+        coalesced = sum(value - self.first.get(name, 0) for name, value in self.last.items()
+                        if name[0] == 'hpc_pg_coalesced_reads')
+        result.update({
+            'pool_max': int(pool_max) if pool_max is not None else None,
+            'pool_utilisation_max': round(result['clients_max'] / pool_max, 3) if pool_max else None,
+            'connections_opened': int(self.last.get(key('hpc_pg_connections_opened'), 0)
+                                      - self.first.get(key('hpc_pg_connections_opened'), 0)),
+            'reads_coalesced': int(coalesced),
+        })
+        return result
+
+
+# ── driving ──
+
+async def worker(session, base_url, traffic, scenario, deadline, timings, statuses, errors):
+    while time.perf_counter() < deadline:
+        method, path, body, token = traffic.build(scenario)
+        start = time.perf_counter()
+        try:
+            async with session.request(method, base_url + path, json=body,
+                                       headers={'Authorization': f'Bearer {token}'}) as resp:
+                # Exports and PDFs stream; the request ends with the last byte
+                async for _ in resp.content.iter_chunked(64 * 1024):
+                    pass
+                status = resp.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = type(e).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        if isinstance(status, int) and status < 400:
+            timings.append(elapsed)
+        else:
+            errors.append(elapsed)
+
+
+async def run_scenario(session, args, traffic, scenario):
+    # Warm-up: compiles the route in dev mode, fills the plan and PDF caches
+    warm_timings, warm_statuses, warm_errors = [], {}, []
+    await asyncio.gather(*(worker(session, args.base_url, traffic, scenario, time.perf_counter() + args.warmup,
+                                  warm_timings, warm_statuses, warm_errors)
+                           for _ in range(min(args.concurrency, 4))))
+
+    sampler = PoolSampler(session, args.base_url, args.app_dsn, args.sample_interval)
+    stop = asyncio.Event()
+    sampling = asyncio.create_task(sampler.run(stop))
+
+    timings, statuses, errors = [], {}, []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(worker(session, args.base_url, traffic, scenario, deadline, timings, statuses, errors)
+                           for _ in range(args.concurrency)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await sampling
+
+    requests = len(timings) + len(errors)
+    result = {
+        'requests': requests,
+        'errors': len(errors),
+        'error_rate': round(len(errors) / requests, 4) if requests else 0,
+        'statuses': statuses,
+        'throughput_rps': round(len(timings) / wall, 2),
+        'latency_ms': {
+            'p50': round(percentile(timings, 50), 2),
+            'p95': round(percentile(timings, 95), 2),
+            'p99': round(percentile(timings, 99), 2),
+            'mean': round(sum(timings) / len(timings), 2),
+            'max': round(max(timings), 2),
+        } if timings else None,
+        'pool': sampler.summary(),
+    }
+    return result
+
+
+def git_revision():
+    def git(*cmd):
+        return subprocess.run(['git', *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    try:
+        return {'commit': git('rev-parse', 'HEAD'), 'subject': git('log', '-1', '--format=%s'),
+                'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+    except OSError:
+        return {'commit': None, 'subject': None, 'dirty': None}
+
+
+async def drive(args, traffic):
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=args.concurrency + 2)
+    results = {}
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        for scenario in args.scenarios:
+            print(f'🚀 {scenario}: {args.concurrency} workers for {args.duration}s...')
+            result = await run_scenario(session, args, traffic, scenario)
+            results[scenario] = result
+            latency = result['latency_ms'] or {}
+            pool = result['pool']
+            print(f"   {result['throughput_rps']:>8.1f} req/s  p50 {latency.get('p50', 0):>8.1f}  "
+                  f"p95 {latency.get('p95', 0):>8.1f}  p99 {latency.get('p99', 0):>8.1f} ms  "
+                  f"errors {result['errors']}/{result['requests']}  "
+                  f"pool {pool.get('clients_max', '-')}/{pool.get('pool_max') or '-'} "
+                  f"waiting max {pool.get('waiting_max', '-')}")
+    return results
+
+
+# ── comparison ──
+
+def compare(baseline, current, tolerance):
+    """Print per-scenario deltas; returns the scenarios that regressed."""
+    regressions = []
+    for key in ('school', 'concurrency', 'duration'):
+        if baseline['config'].get(key) != current['config'].get(key):
+            print(f"⚠️  {key} differs: {baseline['config'].get(key)} → {current['config'].get(key)}")
+    print(f"\nvs {baseline['git']['commit'] and baseline['git']['commit'][:10]} ({baseline['git'].get('subject')})")
+    print(f"{'Scenario':>26} {'req/s':>16} {'p95 ms':>20} {'p99 ms':>20} {'errors':>14}")
+    for scenario, now in current['scenarios'].items():
+        before = baseline['scenarios'].get(scenario)
+        if not before or not before['latency_ms'] or not now['latency_ms']:
+            continue
+        def delta(a, b):
+            return f'{b:.1f} ({(b - a) / a * 100:+.0f}%)' if a else f'{b:.1f}'
+        p95_a, p95_b = before['latency_ms']['p95'], now['latency_ms']['p95']
+        rps_a, rps_b = before['throughput_rps'], now['throughput_rps']
+        regressed = (p95_b > p95_a * (1 + tolerance) or rps_b < rps_a * (1 - tolerance)
+                     or now['error_rate'] > before['error_rate'] + 0.01)
+        if regressed:
+            regressions.append(scenario)
+        print(f"{scenario:>26} {delta(rps_a, rps_b):>16} {delta(p95_a, p95_b):>20} "
+              f"{delta(before['latency_ms']['p99'], now['latency_ms']['p99']):>20} "
+              f"{before['error_rate']:>6.1%}→{now['error_rate']:<6.1%}{'  ❌' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the report, mark-entry and fee endpoints.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'),
+                        help='database to seed (without the search_path option)')
+    parser.add_argument('--schema', default='hpc_load', help='scratch schema the app is pointed at')
+    parser.add_argument('--base-url', default='http://localhost:3000')
+    parser.add_argument('--seed', action='store_true', help='(re)create the schema before the run')
+    parser.add_argument('--seed-only', action='store_true', help='seed, print the DATABASE_URL for the app and exit')
+    parser.add_argument('--classes', type=int, default=12)
+    parser.add_argument('--sections', type=int, default=4, help='sections per class')
+    parser.add_argument('--students', type=int, default=40, help='students per section')
+    parser.add_argument('--subjects', type=int, default=8)
+    parser.add_argument('--paid-months', type=int, default=6, help='months of tuition already paid')
+    parser.add_argument('--academic-year-id', type=int, default=1)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f'comma-separated subset of: {", ".join(SCENARIOS)}')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20, help='seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds of warm-up per scenario')
+    parser.add_argument('--timeout', type=float, default=60, help='per-request timeout in seconds')
+    parser.add_argument('--sample-interval', type=float, default=0.25, help='seconds between pool samples')
+    parser.add_argument('--jwt-secret', default=os.environ.get('JWT_SECRET', 'default-secret-key-change-me'))
+    parser.add_argument('--random-seed', type=int, default=42, help='same seed, same request sequence')
+    parser.add_argument('-o', '--output', help='default: load_test_<commit>.json')
+    parser.add_argument('--compare', help='earlier result file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed p95 increase / throughput drop before a scenario counts as regressed')
+    args = parser.parse_args()
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        sys.exit(f'❌ Unknown scenario(s): {", ".join(unknown)}')
+    separator = '&' if '?' in args.dsn else '?'
+    args.app_dsn = f'{args.dsn}{separator}options=-csearch_path%3D{args.schema}'
+
+    with psycopg.connect(args.dsn) as conn:
+        if args.seed or args.seed_only:
+            seed(conn, args)
+        if args.seed_only:
+            print(f"\nStart the app with DATABASE_URL='{args.app_dsn}'")
+            return
+        data = fixtures(conn, args.schema, args.academic_year_id)
+
+    traffic = Traffic(data, args.academic_year_id, args.jwt_secret, args.random_seed)
+    scenarios = asyncio.run(drive(args, traffic))
+
+    students = sum(len(s['students']) for s in data['sections'])
+    report = {
+        'git': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config': {
+            'base_url': args.base_url,
+            'school': {'sections': len(data['sections']), 'students': students,
+                       'subjects_per_class': max((len(s) for s in data['subjects'].values()), default=0)},
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'random_seed': args.random_seed,
+        },
+        'scenarios': scenarios,
+    }
+    output = args.output or f"load_test_{(report['git']['commit'] or 'unknown')[:7]}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'\n✅ Results written to {output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            sys.exit(f'\n❌ Regressed: {", ".join(regressions)}')
+        print('\n✅ No regressions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""Save latency of a teacher's mark grid: one upsert per cell vs. one UNNEST upsert.
+
+  per-cell  the old routes: one INSERT ... ON CONFLICT per cell inside a
+            transaction (plus a max_marks lookup per scholastic cell)
+  unnest    app/lib/score-upsert.ts: one multi-row upsert per request, with
+            the scholastic grade computed from assessment_components.max_marks
+            ('NA' on a schema without it, as the app does)
+
+Grids (each saved as one request, with fresh marks every run):
+
+  scholastic     students x subjects x 4 components, one term (40x12x4)
+  co-scholastic  students x every sub-skill, one term
+  foundational   students x --skills ratings, one term
+
+The schema is seeded into a scratch schema (default "hpc_bench") with
+scripts/bench_section_reports.py's seed, so existing scores make every save
+take the ON CONFLICT path, as a re-save from the mark-entry screen does.
+The seed has no assessment_components.max_marks; --max-marks adds it as
+scripts/update-components.js does.
+
+    python scripts/bench_score_save.py
+    python scripts/bench_score_save.py --max-marks
+    python scripts/bench_score_save.py --students 40 --subjects 12 --runs 30
+
+Requires psycopg 3 (pip install "psycopg[binary]").
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+try:
+    import psycopg
+except ImportError:
+    sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+
+import bench_section_reports
+from bench_section_reports import percentile
+
+# Added by scripts/update-components.js, and only with --max-marks
+MAX_MARKS_DDL = """
+ALTER TABLE assessment_components ADD COLUMN IF NOT EXISTS max_marks INTEGER DEFAULT 100;
+UPDATE assessment_components SET max_marks = CASE component_name
+    WHEN 'Periodic Assessment' THEN 30
+    WHEN 'Subject Enrichment Activities' THEN 5
+    WHEN 'Internal Assessment' THEN 5
+    WHEN 'Terminal Assessment' THEN 60
+END;
+"""
+
+# Added by app/api/setup/migrate
+EXTRA_DDL = """
+CREATE TABLE IF NOT EXISTS foundational_skill_ratings (
+    id               SERIAL PRIMARY KEY,
+    student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    academic_year_id INT NOT NULL,
+    term             VARCHAR(10) NOT NULL CHECK (term IN ('TERM1','TERM2')),
+    domain           VARCHAR(80) NOT NULL,
+    skill_key        VARCHAR(120) NOT NULL,
+    rating           VARCHAR(5) CHECK (rating IN ('A','B','C')),
+    created_at       TIMESTAMPTZ DEFAULT NOW(),
+    updated_at       TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (student_id, academic_year_id, term, domain, skill_key)
+);
+"""
+
+# ── statements (kept in step with app/lib/score-upsert.ts) ──
+
+# The seeded schema still has scholastic_scores.grade NOT NULL, so the old
+# path is the single-score route's fallback: look up max_marks, then upsert
+# with the computed grade ('NA' when the column is missing)
+SCHOLASTIC_CELL_SQL = """
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
+"""
+
+SCHOLASTIC_UNNEST_SQL = """
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
+    SELECT v.student_id, v.subject_id, v.component_id, v.term_id, v.marks,
+        CASE
+            WHEN v.marks IS NULL THEN 'AB'
+            WHEN p.pct >= 91 THEN 'A1'
+            WHEN p.pct >= 81 THEN 'A2'
+            WHEN p.pct >= 71 THEN 'B1'
+            WHEN p.pct >= 61 THEN 'B2'
+            WHEN p.pct >= 51 THEN 'C1'
+            WHEN p.pct >= 41 THEN 'C2'
+            WHEN p.pct >= 33 THEN 'D'
+            ELSE 'E'
+        END,
+        v.academic_year_id
+    FROM UNNEST(%s::int[], %s::int[], %s::int[], %s::int[], %s::numeric[], %s::int[])
+        AS v(student_id, subject_id, component_id, term_id, marks, academic_year_id)
+    LEFT JOIN assessment_components ac ON ac.id = v.component_id
+    CROSS JOIN LATERAL (SELECT v.marks * 100 / COALESCE(NULLIF(ac.max_marks, 0), 100) AS pct) p
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
+    RETURNING id
+"""
+
+SCHOLASTIC_NA_UNNEST_SQL = """
+    INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, marks, grade, academic_year_id)
+    SELECT v.student_id, v.subject_id, v.component_id, v.term_id, v.marks,
+        CASE WHEN v.marks IS NULL THEN 'AB' ELSE 'NA' END, v.academic_year_id
+    FROM UNNEST(%s::int[], %s::int[], %s::int[], %s::int[], %s::numeric[], %s::int[])
+        AS v(student_id, subject_id, component_id, term_id, marks, academic_year_id)
+    ON CONFLICT (student_id, subject_id, component_id, term_id, academic_year_id)
+    DO UPDATE SET marks = EXCLUDED.marks, grade = EXCLUDED.grade
+    RETURNING id
+"""
+
+CO_SCHOLASTIC_CELL_SQL = """
+    INSERT INTO co_scholastic_scores (student_id, sub_skill_id, term_id, grade, academic_year_id)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (student_id, sub_skill_id, term_id, academic_year_id)
+    DO UPDATE SET grade = EXCLUDED.grade
+"""
+
+CO_SCHOLASTIC_UNNEST_SQL = """
+    INSERT INTO co_scholastic_scores (student_id, sub_skill_id, term_id, grade, academic_year_id)
+    SELECT * FROM UNNEST(%s::int[], %s::int[], %s::int[], %s::text[], %s::int[])
+    ON CONFLICT (student_id, sub_skill_id, term_id, academic_year_id)
+    DO UPDATE SET grade = EXCLUDED.grade
+    RETURNING id
+"""
+
+FOUNDATIONAL_CELL_SQL = """
+    INSERT INTO foundational_skill_ratings (student_id, academic_year_id, term, domain, skill_key, rating, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, NOW())
+    ON CONFLICT (student_id, academic_year_id, term, domain, skill_key)
+    DO UPDATE SET rating = EXCLUDED.rating, updated_at = NOW()
+"""
+
+FOUNDATIONAL_UNNEST_SQL = """
+    INSERT INTO foundational_skill_ratings (student_id, academic_year_id, term, domain, skill_key, rating, updated_at)
+    SELECT v.*, NOW() FROM UNNEST(%s::int[], %s::int[], %s::text[], %s::text[], %s::text[], %s::text[])
+        AS v(student_id, academic_year_id, term, domain, skill_key, rating)
+    ON CONFLICT (student_id, academic_year_id, term, domain, skill_key)
+    DO UPDATE SET rating = EXCLUDED.rating, updated_at = NOW()
+    RETURNING id, rating
+"""
+
+
+def grids(conn, args):
+    """Per grid: a cell generator (fresh values each call), the per-cell saver and both statements."""
+    students = [r[0] for r in conn.execute(
+        'SELECT student_id FROM student_enrollments WHERE section_id = 1 ORDER BY roll_no')]
+    subjects = [r[0] for r in conn.execute('SELECT subject_id FROM class_subjects WHERE class_id = 1')]
+    max_marks = has_max_marks(conn)
+    if max_marks:
+        components = [r for r in conn.execute('SELECT id, max_marks FROM assessment_components ORDER BY id')]
+    else:
+        components = [(r[0], 100) for r in conn.execute('SELECT id FROM assessment_components ORDER BY id')]
+    sub_skills = [r[0] for r in conn.execute('SELECT id FROM sub_skills ORDER BY id')]
+    term_id = conn.execute('SELECT MIN(id) FROM terms').fetchone()[0]
+    year = args.academic_year_id
+
+    return {
+        'scholastic': (
+            lambda: [(s, sub, c, term_id, random.randint(0, top), year)
+                     for s in students for sub in subjects for c, top in components],
+            save_scholastic_per_cell if max_marks else save_scholastic_per_cell_na, SCHOLASTIC_CELL_SQL,
+            SCHOLASTIC_UNNEST_SQL if max_marks else SCHOLASTIC_NA_UNNEST_SQL,
+        ),
+        'co-scholastic': (
+            lambda: [(s, sk, term_id, random.choice('ABC'), year) for s in students for sk in sub_skills],
+            save_per_cell, CO_SCHOLASTIC_CELL_SQL, CO_SCHOLASTIC_UNNEST_SQL,
+        ),
+        'foundational': (
+            lambda: [(s, year, 'TERM1', f'Domain {k % 6}', f'skill_{k}', random.choice('ABC'))
+                     for s in students for k in range(args.skills)],
+            save_per_cell, FOUNDATIONAL_CELL_SQL, FOUNDATIONAL_UNNEST_SQL,
+        ),
+    }
+
+
+def has_max_marks(conn):
+    return conn.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'assessment_components' AND column_name = 'max_marks'
+    """).fetchone() is not None
+
+
+def calculate_grade(percentage):
+    for floor, grade in ((91, 'A1'), (81, 'A2'), (71, 'B1'), (61, 'B2'), (51, 'C1'), (41, 'C2'), (33, 'D')):
+        if percentage >= floor:
+            return grade
+    return 'E'
+
+
+def save_scholastic_per_cell(conn, sql, cells):
+    with conn.transaction(), conn.cursor() as cur:
+        for student_id, subject_id, component_id, term_id, marks, year in cells:
+            cur.execute('SELECT max_marks FROM assessment_components WHERE id = %s', (component_id,))
+            max_marks = cur.fetchone()[0] or 100
+            grade = calculate_grade(marks / max_marks * 100)
+            cur.execute(sql, (student_id, subject_id, component_id, term_id, marks, grade, year))
+
+
+def save_scholastic_per_cell_na(conn, sql, cells):
+    # The old route's lookup fails without max_marks and it stores 'NA'
+    with conn.transaction(), conn.cursor() as cur:
+        for student_id, subject_id, component_id, term_id, marks, year in cells:
+            grade = 'AB' if marks is None else 'NA'
+            cur.execute(sql, (student_id, subject_id, component_id, term_id, marks, grade, year))
+
+
+def save_per_cell(conn, sql, cells):
+    with conn.transaction(), conn.cursor() as cur:
+        for cell in cells:
+            cur.execute(sql, cell)
+
+
+def save_unnest(conn, sql, cells):
+    # Autocommit: the single statement is its own transaction, as in the route
+    conn.execute(sql, [list(column) for column in zip(*cells)]).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure mark-grid save latency.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--schema', default='hpc_bench', help='scratch schema (dropped and recreated)')
+    parser.add_argument('--students', type=int, default=40)
+    parser.add_argument('--subjects', type=int, default=12)
+    parser.add_argument('--skills', type=int, default=30, help='foundational ratings per student')
+    parser.add_argument('--academic-year-id', type=int, default=1)
+    parser.add_argument('--runs', type=int, default=20, help='timed saves per grid and strategy')
+    parser.add_argument('--max-marks', action='store_true',
+                        help='add assessment_components.max_marks as scripts/update-components.js does')
+    args = parser.parse_args()
+
+    seed_args = argparse.Namespace(classes=1, sections=1, students=args.students, subjects=args.subjects)
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        bench_section_reports.seed(conn, args.schema, seed_args)
+        conn.execute(EXTRA_DDL)
+        if args.max_marks:
+            conn.execute(MAX_MARKS_DDL)
+        conn.execute(f'SET search_path TO {args.schema}')
+
+        print(f'\n📊 {args.runs} saves per grid and strategy\n')
+        print(f"{'Grid':>14} {'Cells':>7} {'Strategy':>9} {'Statements':>11} {'p50 ms':>9} {'p95 ms':>9}")
+        for grid, (make_cells, per_cell, cell_sql, unnest_sql) in grids(conn, args).items():
+            p50 = {}
+            for name, save, sql in (('per-cell', per_cell, cell_sql), ('unnest', save_unnest, unnest_sql)):
+                cells = make_cells()
+                save(conn, sql, cells)  # warm-up: plan cache and shared buffers
+                timings = []
+                for _ in range(args.runs):
+                    cells = make_cells()
+                    start = time.perf_counter()
+                    save(conn, sql, cells)
+                    timings.append((time.perf_counter() - start) * 1000)
+                p50[name] = percentile(timings, 50)
+                statements = 1 if name == 'unnest' else len(cells) * (2 if per_cell is save_scholastic_per_cell else 1)
+                print(f"{grid:>14} {len(cells):>7} {name:>9} {statements:>11} "
+                      f"{p50[name]:>9.1f} {percentile(timings, 95):>9.1f}")
+            print(f"{'':>14} ✅ {p50['per-cell'] / p50['unnest']:.1f}x faster at p50\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""Per-section latency of report-card data loading: per-student vs. bulk.
+
+Replays the queries of app/lib/report-service.ts against a local Postgres:
+
+  per-student  getStudentReportData for every student (6 queries each)
+  bulk         streamClassReportData for the section (2 + 4 per batch)
+
+With --seed the schema from step2_database_schema_v1.sql / step3 is created in
+a scratch schema (default "hpc_bench") and filled with synthetic classes, so
+the harness never touches real data.
+
+    python scripts/bench_section_reports.py --seed
+    python scripts/bench_section_reports.py --dsn postgresql://localhost/hpc --runs 10
+
+Requires psycopg 3 (pip install "psycopg[binary]").
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def require_psycopg():
+    """psycopg, imported when a database is needed so the schema constants
+    below can be imported without it (index_advisor.py --list-queries)."""
+    try:
+        import psycopg
+    except ImportError:
+        sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+    return psycopg
+
+# Must mirror BULK_BATCH_SIZE in app/lib/report-service.ts
+BULK_BATCH_SIZE = 200
+
+# ── queries (kept in step with app/lib/report-service.ts) ──
+
+STUDENT_SQL = """
+    SELECT s.id, s.admission_no, s.student_name, s.father_name, s.mother_name, s.dob, s.address, s.phone_no,
+        c.class_name, sec.section_name, ay.year_name, se.roll_no, se.class_id
+    FROM students s
+    JOIN student_enrollments se ON s.id = se.student_id
+    JOIN classes c ON se.class_id = c.id
+    JOIN sections sec ON se.section_id = sec.id
+    JOIN academic_years ay ON se.academic_year_id = ay.id
+    WHERE s.id = %s AND se.academic_year_id = %s
+"""
+
+SCHOLASTIC_SQL = """
+    SELECT ss.id, ss.student_id, ss.subject_id, ss.component_id, ss.term_id, ss.marks,
+        sub.subject_name, ac.component_name, t.term_name
+    FROM scholastic_scores ss
+    JOIN subjects sub ON ss.subject_id = sub.id
+    JOIN assessment_components ac ON ss.component_id = ac.id
+    JOIN terms t ON ss.term_id = t.id
+    WHERE ss.student_id {cond} AND ss.academic_year_id = %s
+"""
+
+CO_SCHOLASTIC_SQL = """
+    SELECT css.id, css.student_id, css.sub_skill_id, css.term_id, css.grade,
+        ss.sub_skill_name, d.domain_name, t.term_name
+    FROM co_scholastic_scores css
+    JOIN sub_skills ss ON css.sub_skill_id = ss.id
+    JOIN domains d ON ss.domain_id = d.id
+    JOIN terms t ON css.term_id = t.id
+    WHERE css.student_id {cond} AND css.academic_year_id = %s
+"""
+
+ATTENDANCE_SQL = """
+    SELECT ar.id, ar.student_id, ar.month_id, ar.working_days, ar.days_present, ar.reason_for_low_attendance,
+        m.month_name
+    FROM attendance_records ar
+    JOIN months m ON ar.month_id = m.id
+    WHERE ar.student_id {cond} AND ar.academic_year_id = %s
+    ORDER BY ar.student_id, m.display_order ASC
+"""
+
+REMARKS_SQL = """
+    SELECT r.id, r.student_id, r.remark_type_id, r.aspect, r.remark_text,
+        rt.type_name
+    FROM remarks r
+    JOIN remark_types rt ON r.remark_type_id = rt.id
+    WHERE r.student_id {cond} AND r.academic_year_id = %s
+"""
+
+SUBJECTS_SQL = """
+    SELECT cs.class_id, sub.id, sub.subject_name, cs.max_marks
+    FROM class_subjects cs
+    JOIN subjects sub ON cs.subject_id = sub.id
+    WHERE cs.class_id {cond} AND cs.academic_year_id = %s
+    ORDER BY cs.display_order ASC, sub.subject_name ASC
+"""
+
+SECTION_STUDENTS_SQL = """
+    SELECT s.id, s.admission_no, s.student_name, s.father_name, s.mother_name, s.dob, s.address, s.phone_no,
+        c.class_name, sec.section_name, ay.year_name, se.roll_no, se.class_id
+    FROM students s
+    JOIN student_enrollments se ON s.id = se.student_id
+    JOIN classes c ON se.class_id = c.id
+    JOIN sections sec ON se.section_id = sec.id
+    JOIN academic_years ay ON se.academic_year_id = ay.id
+    WHERE se.academic_year_id = %s AND se.section_id = %s
+    ORDER BY c.display_order, sec.section_name, se.roll_no, s.student_name
+"""
+
+PER_STUDENT_SQL = [q.format(cond='= %s') for q in (SCHOLASTIC_SQL, CO_SCHOLASTIC_SQL, ATTENDANCE_SQL, REMARKS_SQL)]
+BULK_SQL = [q.format(cond='= ANY(%s)') for q in (SCHOLASTIC_SQL, CO_SCHOLASTIC_SQL, ATTENDANCE_SQL, REMARKS_SQL)]
+
+
+# ── seeding ──
+
+# users is created by scripts/deploy-users.js; sections reference it
+USERS_DDL = """
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    full_name VARCHAR(100) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Columns added later: display_order by scripts/migrate-add-subject-display-order.js,
+# reason_for_low_attendance by hand (app/api/teacher/attendance writes it)
+MIGRATIONS_DDL = """
+ALTER TABLE class_subjects ADD COLUMN IF NOT EXISTS display_order INTEGER DEFAULT 0;
+ALTER TABLE attendance_records ADD COLUMN IF NOT EXISTS reason_for_low_attendance TEXT;
+"""
+
+SEED_SQL = """
+INSERT INTO academic_years (year_name, is_active) VALUES ('2025-26', TRUE);
+
+INSERT INTO classes (class_name, display_order)
+SELECT 'Class ' || g, g FROM generate_series(1, %(classes)s) g;
+
+INSERT INTO sections (class_id, section_name)
+SELECT c.id, chr(64 + g) FROM classes c, generate_series(1, %(sections)s) g;
+
+INSERT INTO subjects (subject_name)
+SELECT 'Subject ' || g FROM generate_series(1, %(subjects)s) g;
+
+INSERT INTO class_subjects (class_id, subject_id, academic_year_id, display_order)
+SELECT c.id, sub.id, 1, sub.id FROM classes c, subjects sub;
+
+INSERT INTO students (admission_no, student_name, father_name, mother_name, dob)
+SELECT 'ADM' || g, 'Student ' || g, 'Father ' || g, 'Mother ' || g, DATE '2015-01-01' + (g %% 365)
+FROM generate_series(1, %(classes)s * %(sections)s * %(students)s) g;
+
+INSERT INTO student_enrollments (student_id, class_id, section_id, academic_year_id, roll_no)
+SELECT s.id, sec.class_id, sec.id, 1, (s.id - 1) %% %(students)s + 1
+FROM students s
+JOIN sections sec ON sec.id = (s.id - 1) / %(students)s + 1;
+
+INSERT INTO scholastic_scores (student_id, subject_id, component_id, term_id, grade, marks, academic_year_id)
+SELECT se.student_id, cs.subject_id, ac.id, t.id, 'A1', 5 + (se.student_id + ac.id) %% 6, 1
+FROM student_enrollments se
+JOIN class_subjects cs ON cs.class_id = se.class_id
+CROSS JOIN assessment_components ac
+CROSS JOIN terms t;
+
+INSERT INTO co_scholastic_scores (student_id, sub_skill_id, term_id, grade, academic_year_id)
+SELECT se.student_id, sk.id, t.id, 'A', 1
+FROM student_enrollments se CROSS JOIN sub_skills sk CROSS JOIN terms t;
+
+INSERT INTO attendance_records (student_id, month_id, working_days, days_present, academic_year_id)
+SELECT se.student_id, m.id, 24, 20 + se.student_id %% 5, 1
+FROM student_enrollments se CROSS JOIN months m;
+
+INSERT INTO remarks (student_id, remark_type_id, aspect, remark_text, academic_year_id)
+SELECT se.student_id, rt.id, NULL, 'Keeps up the good work.', 1
+FROM student_enrollments se CROSS JOIN remark_types rt;
+
+ANALYZE;
+"""
+
+
+def seed(conn, schema, args):
+    with open(os.path.join(ROOT, 'step2_database_schema_v1.sql'), encoding='utf-8') as f:
+        schema_sql = f.read()
+    with open(os.path.join(ROOT, 'step3_extend_student_schema.sql'), encoding='utf-8') as f:
+        extend_sql = f.read()
+
+    print(f'🌱 Seeding schema "{schema}"...')
+    # Client-side binding: SEED_SQL is several statements with parameters,
+    # which server-side prepared statements reject
+    with require_psycopg().ClientCursor(conn) as cur:
+        cur.execute(f'DROP SCHEMA IF EXISTS {schema} CASCADE')
+        cur.execute(f'CREATE SCHEMA {schema}')
+        cur.execute(f'SET search_path TO {schema}')
+        cur.execute(USERS_DDL)
+        cur.execute(schema_sql)
+        cur.execute(extend_sql)
+        cur.execute(MIGRATIONS_DDL)
+        cur.execute(SEED_SQL, {
+            'classes': args.classes,
+            'sections': args.sections,
+            'students': args.students,
+            'subjects': args.subjects,
+        })
+    conn.commit()
+
+
+# ── strategies ──
+
+def load_per_student(cur, student_ids, academic_year_id):
+    """getStudentReportData for each student; returns the number of queries."""
+    queries = 0
+    for student_id in student_ids:
+        cur.execute(STUDENT_SQL, (student_id, academic_year_id))
+        student = cur.fetchone()
+        for sql in PER_STUDENT_SQL:
+            cur.execute(sql, (student_id, academic_year_id))
+            cur.fetchall()
+        cur.execute(SUBJECTS_SQL.format(cond='= %s'), (student[-1], academic_year_id))
+        cur.fetchall()
+        queries += 6
+    return queries
+
+
+def load_bulk(cur, section_id, academic_year_id):
+    """streamClassReportData for one section; returns the number of queries."""
+    cur.execute(SECTION_STUDENTS_SQL, (academic_year_id, section_id))
+    students = cur.fetchall()
+    class_ids = sorted({s[-1] for s in students})
+    cur.execute(SUBJECTS_SQL.format(cond='= ANY(%s)'), (class_ids, academic_year_id))
+    cur.fetchall()
+    queries = 2
+
+    for i in range(0, len(students), BULK_BATCH_SIZE):
+        ids = [s[0] for s in students[i:i + BULK_BATCH_SIZE]]
+        grouped = {}
+        for sql in BULK_SQL:
+            cur.execute(sql, (ids, academic_year_id))
+            # Group in one pass, as the TS loader does
+            for row in cur.fetchall():
+                grouped.setdefault(row[1], []).append(row)
+            queries += 1
+    return queries
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-section report data latency.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--schema', default='hpc_bench', help='schema to seed and query')
+    parser.add_argument('--seed', action='store_true', help='(re)create the schema with synthetic data')
+    parser.add_argument('--classes', type=int, default=3)
+    parser.add_argument('--sections', type=int, default=2, help='sections per class')
+    parser.add_argument('--students', type=int, default=40, help='students per section')
+    parser.add_argument('--subjects', type=int, default=12)
+    parser.add_argument('--academic-year-id', type=int, default=1)
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per section and strategy')
+    args = parser.parse_args()
+
+    psycopg = require_psycopg()
+    with psycopg.connect(args.dsn) as conn:
+        if args.seed:
+            seed(conn, args.schema, args)
+
+        with conn.cursor() as cur:
+            cur.execute(f'SET search_path TO {args.schema}')
+            cur.execute(
+                'SELECT section_id, array_agg(student_id ORDER BY roll_no) FROM student_enrollments '
+                'WHERE academic_year_id = %s GROUP BY section_id ORDER BY section_id',
+                (args.academic_year_id,)
+            )
+            sections = cur.fetchall()
+            if not sections:
+                sys.exit('❌ No enrollments found (run with --seed?)')
+
+            print(f'📊 {len(sections)} section(s), {args.runs} run(s) each\n')
+            print(f"{'Section':>8} {'Students':>9} {'Strategy':>12} {'Queries':>8} {'p50 ms':>9} {'p95 ms':>9}")
+
+            totals = {'per-student': [], 'bulk': []}
+            for section_id, student_ids in sections:
+                strategies = {
+                    'per-student': lambda: load_per_student(cur, student_ids, args.academic_year_id),
+                    'bulk': lambda: load_bulk(cur, section_id, args.academic_year_id),
+                }
+                for name, run in strategies.items():
+                    run()  # warm-up: plan cache and shared buffers
+                    timings = []
+                    for _ in range(args.runs):
+                        start = time.perf_counter()
+                        queries = run()
+                        timings.append((time.perf_counter() - start) * 1000)
+                    totals[name].extend(timings)
+                    print(f"{section_id:>8} {len(student_ids):>9} {name:>12} {queries:>8} "
+                          f"{percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}")
+
+    print()
+    for name, timings in totals.items():
+        print(f'{name:>12}: median {statistics.median(timings):.1f} ms per section')
+    print(f"✅ Speed-up: {statistics.median(totals['per-student']) / statistics.median(totals['bulk']):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
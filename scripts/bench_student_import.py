@@ -0,0 +1,188 @@
+"""Student import throughput: per-row queries vs. COPY + set-based SQL.
+
+  per-row  the old import route: one duplicate SELECT per row, then two
+           INSERTs per valid row inside one transaction
+  staged   scripts/import_students.py: COPY into a staging table, one
+           resolving UPDATE, one INSERT ... SELECT (also what the route runs)
+
+Each size runs on freshly truncated students/enrollments in a scratch schema
+(default "hpc_import_bench") built from step2_database_schema_v1.sql / step3.
+About 2% of the generated rows carry an unknown section and 1% an admission
+number that already exists, so both paths do real validation work.
+
+    python scripts/bench_student_import.py
+    python scripts/bench_student_import.py --sizes 500 5000 --runs 3
+
+Requires psycopg 3 (pip install "psycopg[binary]").
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+try:
+    import psycopg
+except ImportError:
+    sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+
+from bench_section_reports import ROOT, USERS_DDL
+from import_students import STAGING_COLUMNS, import_rows
+
+# Columns added later by scripts/migrate_stream_subjects.js
+MIGRATIONS_DDL = """
+ALTER TABLE students ADD COLUMN IF NOT EXISTS stream VARCHAR(50);
+ALTER TABLE students ADD COLUMN IF NOT EXISTS subject_count INTEGER DEFAULT 5;
+"""
+
+SEED_SQL = """
+INSERT INTO academic_years (year_name, is_active) VALUES ('2025-26', TRUE);
+
+INSERT INTO classes (class_name, display_order)
+SELECT 'Class ' || g, g FROM generate_series(1, 12) g;
+
+INSERT INTO sections (class_id, section_name)
+SELECT c.id, chr(64 + g) FROM classes c, generate_series(1, 4) g;
+"""
+
+# Admission numbers that exist before every run
+EXISTING = 1000
+
+
+def seed(conn, schema):
+    with open(os.path.join(ROOT, 'step2_database_schema_v1.sql'), encoding='utf-8') as f:
+        schema_sql = f.read()
+    with open(os.path.join(ROOT, 'step3_extend_student_schema.sql'), encoding='utf-8') as f:
+        extend_sql = f.read()
+
+    print(f'🌱 Seeding schema "{schema}"...')
+    with conn.transaction():
+        conn.execute(f'DROP SCHEMA IF EXISTS {schema} CASCADE')
+        conn.execute(f'CREATE SCHEMA {schema}')
+        conn.execute(f'SET search_path TO {schema}')
+        conn.execute(USERS_DDL)
+        conn.execute(schema_sql)
+        conn.execute(extend_sql)
+        conn.execute(MIGRATIONS_DDL)
+        conn.execute(SEED_SQL)
+
+
+def reset(conn):
+    with conn.transaction():
+        conn.execute('TRUNCATE student_enrollments, students RESTART IDENTITY CASCADE')
+        conn.execute("""
+            INSERT INTO students (admission_no, student_name, father_name, mother_name, dob)
+            SELECT 'OLD' || g, 'Existing ' || g, 'Father', 'Mother', DATE '2014-01-01'
+            FROM generate_series(1, %s) g
+        """, (EXISTING,))
+        conn.execute('ANALYZE students')
+
+
+def generate(n):
+    rows = []
+    for i in range(n):
+        row = dict.fromkeys(STAGING_COLUMNS, '')
+        row.update(
+            admission_no=f'OLD{i % EXISTING + 1}' if i % 100 == 50 else f'NEW{i}',
+            student_name=f'Student {i}',
+            father_name=f'Father {i}',
+            mother_name=f'Mother {i}',
+            dob=f'2014-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            class_name=f'class {i % 12 + 1}',
+            section_name='Z' if i % 50 == 7 else 'ABCD'[i % 4],
+            gender='Female' if i % 2 else 'Male',
+            phone_no=f'98{i:08d}',
+            subject_count=5,
+        )
+        rows.append(row)
+    return rows
+
+
+def import_per_row(conn, rows, academic_year_id):
+    """The pre-staging route; returns (errors, imported, queries)."""
+    classes = {name.lower(): id_ for id_, name in conn.execute('SELECT id, class_name FROM classes')}
+    sections = {(class_id, name.lower()): id_
+                for id_, name, class_id in conn.execute('SELECT id, section_name, class_id FROM sections')}
+    queries = 2
+
+    errors, valid = [], []
+    for i, row in enumerate(rows):
+        error = None
+        class_id = classes.get(row['class_name'].lower())
+        section_id = sections.get((class_id, row['section_name'].lower()))
+        if not class_id:
+            error = f"Class '{row['class_name']}' not found"
+        elif not section_id:
+            error = f"Section '{row['section_name']}' not found in Class '{row['class_name']}'"
+        if conn.execute('SELECT id FROM students WHERE admission_no = %s', (row['admission_no'],)).fetchone():
+            error = 'Admission number already exists'
+        queries += 1
+        if error:
+            errors.append({'index': i, 'admission_no': row['admission_no'], 'error': error})
+        else:
+            valid.append((row, class_id, section_id))
+
+    with conn.transaction():
+        for row, class_id, section_id in valid:
+            student_id = conn.execute("""
+                INSERT INTO students (admission_no, student_name, father_name, mother_name, dob, admission_date,
+                    blood_group, gender, address, phone_no, emergency_no, category, subject_count)
+                VALUES (%s, %s, %s, %s, %s, CURRENT_DATE, %s, %s, %s, %s, %s, %s, %s) RETURNING id
+            """, (row['admission_no'], row['student_name'], row['father_name'], row['mother_name'], row['dob'],
+                  row['blood_group'], row['gender'] or 'Male', row['address'], row['phone_no'],
+                  row['emergency_no'], row['category'] or 'General', row['subject_count'])).fetchone()[0]
+            conn.execute(
+                'INSERT INTO student_enrollments (student_id, class_id, section_id, academic_year_id) VALUES (%s, %s, %s, %s)',
+                (student_id, class_id, section_id, academic_year_id)
+            )
+            queries += 2
+    return errors, len(valid), queries
+
+
+def import_staged(conn, rows, academic_year_id):
+    errors, imported = import_rows(conn, rows, academic_year_id)
+    # CREATE, COPY, ANALYZE, UPDATE, INSERT
+    return errors, imported, 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-row and set-based student import.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--schema', default='hpc_import_bench', help='scratch schema (dropped and recreated)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 50000])
+    parser.add_argument('--runs', type=int, default=3, help='timed runs per size and strategy')
+    parser.add_argument('--per-row-max', type=int, default=50000, help='skip per-row above this many rows')
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        seed(conn, args.schema)
+        conn.execute(f'SET search_path TO {args.schema}')
+        academic_year_id = conn.execute('SELECT id FROM academic_years LIMIT 1').fetchone()[0]
+
+        print(f"\n{'Rows':>7} {'Strategy':>9} {'Queries':>8} {'Imported':>9} {'Errors':>7} {'p50 ms':>10} {'rows/s':>9}")
+        speedups = {}
+        for n in args.sizes:
+            rows = generate(n)
+            medians = {}
+            for name, run in (('per-row', import_per_row), ('staged', import_staged)):
+                if name == 'per-row' and n > args.per_row_max:
+                    continue
+                timings = []
+                for _ in range(args.runs):
+                    reset(conn)
+                    start = time.perf_counter()
+                    errors, imported, queries = run(conn, rows, academic_year_id)
+                    timings.append((time.perf_counter() - start) * 1000)
+                medians[name] = statistics.median(timings)
+                print(f"{n:>7} {name:>9} {queries:>8} {imported:>9} {len(errors):>7} "
+                      f"{medians[name]:>10.1f} {n / medians[name] * 1000:>9.0f}")
+            if len(medians) == 2:
+                speedups[n] = medians['per-row'] / medians['staged']
+
+    print()
+    for n, speedup in speedups.items():
+        print(f'✅ {n} rows: staged import {speedup:.1f}x faster')
+
+
+if __name__ == '__main__':
+    main()
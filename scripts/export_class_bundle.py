@@ -0,0 +1,141 @@
+"""Download a class or section's report cards as one ZIP or merged PDF.
+
+Calls GET /api/reports/bundle and writes the response to disk as it arrives,
+so memory stays flat and progress is visible while cards are still rendering.
+
+    python scripts/export_class_bundle.py --section-id 4 --academic-year-id 1
+    python scripts/export_class_bundle.py --class-id 7 --format pdf -o class7.pdf
+
+A merged PDF holds at most the server's BUNDLE_PDF_MAX_CARDS cards; a larger
+class is fetched part by part and saved as <name>_partNofM.pdf.
+
+Authenticates with --token / HPC_TOKEN, or logs in with --username/--password.
+Only the standard library is used.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+CHUNK_SIZE = 64 * 1024
+
+
+def login(base_url, username, password):
+    request = urllib.request.Request(
+        f'{base_url}/api/auth/login',
+        data=json.dumps({'username': username, 'password': password}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request) as response:
+        body = json.load(response)
+    if not body.get('success'):
+        sys.exit(f"❌ Login failed: {body.get('message')}")
+    return body['token']
+
+
+def output_name(response, fmt):
+    disposition = response.headers.get('Content-Disposition', '')
+    if 'filename="' in disposition:
+        return disposition.split('filename="', 1)[1].split('"', 1)[0]
+    return f'report_cards.{fmt}'
+
+
+def part_name(path, part, parts):
+    """class7.pdf -> class7_part2of3.pdf; the server's own names already say so."""
+    if parts == 1 or f'_part{part}of{parts}' in path:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f'{stem}_part{part}of{parts}{ext}'
+
+
+def fetch(base_url, token, params):
+    request = urllib.request.Request(
+        f'{base_url}/api/reports/bundle?{urllib.parse.urlencode(params)}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    try:
+        return urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.load(e).get('message')
+        except ValueError:
+            message = e.reason
+        sys.exit(f'❌ Export failed ({e.code}): {message}')
+
+
+def download(response, path, start):
+    """Write the response to path as it arrives; returns the bytes written."""
+    first_byte = None
+    written = 0
+    with response, open(path, 'wb') as f:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+                print(f'   first bytes after {first_byte:.1f}s')
+            f.write(chunk)
+            written += len(chunk)
+            print(f'\r   {written / 1024 / 1024:.1f} MB received', end='', flush=True)
+    print()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a class/section report card bundle to disk.')
+    parser.add_argument('--url', default=os.environ.get('NEXT_PUBLIC_APP_URL', 'http://localhost:3000'))
+    parser.add_argument('--token', default=os.environ.get('HPC_TOKEN'))
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    parser.add_argument('--academic-year-id', type=int, default=1)
+    parser.add_argument('--class-id', type=int)
+    parser.add_argument('--section-id', type=int)
+    parser.add_argument('--format', choices=['zip', 'pdf'], default='zip')
+    parser.add_argument('--concurrency', type=int, help='parallel renders on the server (zip only)')
+    parser.add_argument('-o', '--output', help='output file (default: name sent by the server)')
+    args = parser.parse_args()
+
+    if not args.class_id and not args.section_id:
+        parser.error('--class-id or --section-id is required')
+
+    base_url = args.url.rstrip('/')
+    token = args.token
+    if not token:
+        if not (args.username and args.password):
+            parser.error('--token (or HPC_TOKEN) or --username/--password is required')
+        token = login(base_url, args.username, args.password)
+
+    params = {'academic_year_id': args.academic_year_id, 'format': args.format}
+    if args.class_id:
+        params['class_id'] = args.class_id
+    if args.section_id:
+        params['section_id'] = args.section_id
+    if args.concurrency:
+        params['concurrency'] = args.concurrency
+
+    print(f"📦 Requesting {args.format.upper()} bundle...")
+    start = time.perf_counter()
+    response = fetch(base_url, token, params)
+    # Only a merged PDF comes in parts; a ZIP is always one download
+    parts = int(response.headers.get('X-Bundle-Parts') or 1)
+    saved = []
+    written = 0
+    for part in range(1, parts + 1):
+        if part > 1:
+            print(f"📦 Requesting part {part} of {parts}...")
+            response = fetch(base_url, token, {**params, 'part': part})
+        path = part_name(args.output or output_name(response, args.format), part, parts)
+        written += download(response, path, start)
+        saved.append(path)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Saved {', '.join(saved)} ({written / 1024 / 1024:.1f} MB in {elapsed:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
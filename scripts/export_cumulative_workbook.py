@@ -0,0 +1,281 @@
+"""Whole-school cumulative scholastic workbook, streamed with flat memory.
+
+Writes one sheet per class and section with the layout of
+GET /api/reports/cumulative/scholastic: Admission No / Roll No / Student Name,
+then per subject and term the PA / SEA / IA / TA marks, then the Result block
+(term totals, final average, % and section rank) when student_term_results
+exists. Header styles and column widths match the route.
+
+Score rows come from one server-side cursor ordered by class, section and
+roll number, and each student's row is written as soon as their last score
+arrives. XlsxWriter runs in constant_memory mode, so finished rows go to a
+temp file: memory holds one student plus the per-section headers, whatever
+the size of the school. Meant for year-end archiving as an offline job.
+
+    python scripts/export_cumulative_workbook.py --academic-year-id 1
+    python scripts/export_cumulative_workbook.py --term "Term I" -o term1.xlsx
+
+Requires psycopg 3 and XlsxWriter (pip install "psycopg[binary]" XlsxWriter).
+"""
+import argparse
+import os
+import re
+import resource
+import sys
+import time
+
+try:
+    import psycopg
+except ImportError:
+    sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+try:
+    import xlsxwriter
+except ImportError:
+    sys.exit('XlsxWriter is required: pip install XlsxWriter')
+
+# ── layout (kept in step with app/api/reports/cumulative/scholastic/route.ts) ──
+
+COMPONENT_ORDER = ['Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment']
+COMPONENT_MAP = {
+    'Periodic Assessment': 'PA',
+    'Subject Enrichment Activities': 'SEA',
+    'Internal Assessment': 'IA',
+    'Terminal Assessment': 'TA',
+}
+
+BORDER = {'top': 1, 'bottom': 1, 'left': 1, 'right': 1}
+HEADER_STYLE = {'bold': True, 'font_size': 11, 'align': 'center', 'valign': 'vcenter',
+                'text_wrap': True, 'bg_color': '#EFEFEF', **BORDER}
+CELL_STYLE = {'align': 'center', 'valign': 'vcenter', **BORDER}
+NAME_STYLE = {'align': 'left', 'valign': 'vcenter', **BORDER}
+
+# ── queries ──
+
+SECTIONS_SQL = """
+    SELECT sec.id, c.class_name, sec.section_name, COUNT(*) AS students
+    FROM student_enrollments se
+    JOIN classes c ON c.id = se.class_id
+    JOIN sections sec ON sec.id = se.section_id
+    WHERE se.academic_year_id = %(year)s
+    GROUP BY c.id, c.display_order, c.class_name, sec.id, sec.section_name
+    ORDER BY c.display_order, c.id, sec.section_name, sec.id
+"""
+
+# Subjects assigned to the class or with marks for a student of the section,
+# as the route picks them for a single section
+SUBJECTS_SQL = """
+    SELECT x.section_id, sub.subject_name
+    FROM (
+        SELECT se.section_id, cs.subject_id
+        FROM student_enrollments se
+        JOIN class_subjects cs ON cs.class_id = se.class_id AND cs.academic_year_id = se.academic_year_id
+        WHERE se.academic_year_id = %(year)s
+        UNION
+        SELECT se.section_id, ss.subject_id
+        FROM student_enrollments se
+        JOIN scholastic_scores ss ON ss.student_id = se.student_id AND ss.academic_year_id = se.academic_year_id
+        WHERE se.academic_year_id = %(year)s
+    ) x
+    JOIN subjects sub ON sub.id = x.subject_id
+    ORDER BY x.section_id, sub.subject_name
+"""
+
+# One row per score (or one empty row for a student without scores), in the
+# order the sheets are written
+ROWS_SQL = """
+    SELECT se.section_id, s.id, s.admission_no, s.student_name, se.roll_no,
+        sub.subject_name, t.term_name, ac.component_name, ss.marks::float8 {result_columns}
+    FROM student_enrollments se
+    JOIN classes c ON c.id = se.class_id
+    JOIN sections sec ON sec.id = se.section_id
+    JOIN students s ON s.id = se.student_id
+    LEFT JOIN scholastic_scores ss ON ss.student_id = se.student_id AND ss.academic_year_id = se.academic_year_id
+    LEFT JOIN subjects sub ON sub.id = ss.subject_id
+    LEFT JOIN terms t ON t.id = ss.term_id
+    LEFT JOIN assessment_components ac ON ac.id = ss.component_id
+    {result_join}
+    WHERE se.academic_year_id = %(year)s
+    ORDER BY c.display_order, c.id, sec.section_name, sec.id, se.roll_no, s.student_name, s.id
+"""
+
+RESULT_COLUMNS = """,
+        r.term1_total::float8, r.term2_total::float8, r.grand_total::float8,
+        r.percentage::float8, r.section_rank"""
+RESULT_JOIN = ('LEFT JOIN student_term_results r '
+               'ON r.student_id = se.student_id AND r.academic_year_id = se.academic_year_id')
+
+
+def sheet_name(class_name, section_name, used):
+    """Excel sheet names: at most 31 characters, no []:*?/\\ and unique."""
+    base = re.sub(r'[\[\]:*?/\\]', '-', f'{class_name} {section_name}')[:31]
+    name, n = base, 2
+    while name.lower() in used:
+        suffix = f' ({n})'
+        name, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(name.lower())
+    return name
+
+
+class SectionSheet:
+    """One class/section sheet, written top to bottom a row at a time."""
+
+    def __init__(self, workbook, formats, name, subjects, terms, with_results, final_avg):
+        self.ws = workbook.add_worksheet(name)
+        self.formats = formats
+        self.subjects = subjects
+        self.terms = terms
+        self.row = 0
+
+        # Same header as the route: subject over term over component, then
+        # the Result block. constant_memory flushes a row once a later one is
+        # written, so the header goes row by row with horizontal merges only;
+        # the labels the route merges down rows 1-2 sit in the top cell here
+        self.result_labels = []
+        if with_results:
+            self.result_labels = list(terms) + (['Final (Avg)'] if final_avg else []) + ['%', 'Rank']
+        width = 3 + len(subjects) * len(terms) * len(COMPONENT_ORDER) + len(self.result_labels)
+        # Per header row: (first column, last column, label)
+        rows = [[(c, c, label) for c, label in enumerate(['Admission No', 'Roll No', 'Student Name'])], [], []]
+
+        col = 3
+        for subject in subjects:
+            rows[0].append((col, col + len(terms) * len(COMPONENT_ORDER) - 1, subject))
+            for term in terms:
+                rows[1].append((col, col + len(COMPONENT_ORDER) - 1, term))
+                for comp in COMPONENT_ORDER:
+                    rows[2].append((col, col, COMPONENT_MAP[comp]))
+                    col += 1
+        self.result_col = col
+        if self.result_labels:
+            rows[0].append((col, col + len(self.result_labels) - 1, 'Result'))
+            for label in self.result_labels:
+                rows[1].append((col, col, label))
+                col += 1
+
+        header = formats['header']
+        for spans in rows:
+            covered = set()
+            for first_col, last_col, label in spans:
+                if first_col == last_col:
+                    self.ws.write(self.row, first_col, label, header)
+                else:
+                    self.ws.merge_range(self.row, first_col, self.row, last_col, label, header)
+                covered.update(range(first_col, last_col + 1))
+            for c in range(width):
+                if c not in covered:
+                    self.ws.write_blank(self.row, c, None, header)
+            self.row += 1
+
+        self.ws.set_column(0, 0, 12)
+        self.ws.set_column(1, 1, 8)
+        self.ws.set_column(2, 2, 30)
+        if self.result_col > 3:
+            self.ws.set_column(3, self.result_col - 1, 6)
+        if self.result_labels:
+            self.ws.set_column(self.result_col, col - 1, 9)
+
+    def _write_row(self, values, formats):
+        for col, (value, fmt) in enumerate(zip(values, formats)):
+            if value is None or value == '':
+                self.ws.write_blank(self.row, col, None, fmt)
+            else:
+                self.ws.write(self.row, col, value, fmt)
+        self.row += 1
+
+    def write_student(self, student, marks, result):
+        values = [student['admission_no'], student['roll_no'], student['student_name']]
+        for subject in self.subjects:
+            for term in self.terms:
+                for comp in COMPONENT_ORDER:
+                    values.append(marks.get((subject, term, comp)))
+        if self.result_labels:
+            totals = {'Term I': 'term1_total', 'Term II': 'term2_total', 'Final (Avg)': 'grand_total',
+                      '%': 'percentage', 'Rank': 'section_rank'}
+            values.extend(result.get(totals.get(label)) if result else None for label in self.result_labels)
+        cell = self.formats['cell']
+        self._write_row(values, [cell, cell, self.formats['name']] + [cell] * (len(values) - 3))
+
+
+def export(conn, path, year, term, itersize):
+    sections = {r[0]: r[1:] for r in conn.execute(SECTIONS_SQL, {'year': year})}
+    if not sections:
+        sys.exit(f'❌ No enrollments for academic year {year}')
+    subjects = {}
+    for section_id, subject_name in conn.execute(SUBJECTS_SQL, {'year': year}):
+        subjects.setdefault(section_id, {})[subject_name] = None
+    terms = [r[0] for r in conn.execute('SELECT term_name FROM terms ORDER BY term_name')]
+    if term:
+        terms = [t for t in terms if t == term]
+    with_results = conn.execute("SELECT to_regclass('student_term_results')").fetchone()[0] is not None
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    formats = {
+        'header': workbook.add_format(HEADER_STYLE),
+        'cell': workbook.add_format(CELL_STYLE),
+        'name': workbook.add_format(NAME_STYLE),
+    }
+    used_names = set()
+    sheet, section_id, student, marks, result = None, None, None, {}, None
+    written = 0
+
+    def flush():
+        nonlocal written
+        if student is not None:
+            sheet.write_student(student, marks, result)
+            written += 1
+
+    sql = ROWS_SQL.format(result_columns=RESULT_COLUMNS if with_results else '',
+                          result_join=RESULT_JOIN if with_results else '')
+    with conn.cursor(name='cumulative_export') as cur:
+        cur.itersize = itersize
+        cur.execute(sql, {'year': year})
+        for row in cur:
+            row_section, student_id = row[0], row[1]
+            if student is None or student_id != student['id']:
+                flush()
+                student = {'id': student_id, 'admission_no': row[2], 'student_name': row[3], 'roll_no': row[4]}
+                marks = {}
+                result = dict(zip(['term1_total', 'term2_total', 'grand_total', 'percentage', 'section_rank'],
+                                  row[9:])) if with_results else None
+            if row_section != section_id:
+                section_id = row_section
+                class_name, section_name, count = sections[section_id]
+                name = sheet_name(class_name, section_name, used_names)
+                sheet = SectionSheet(workbook, formats, name, list(subjects.get(section_id, {})),
+                                     terms, with_results, final_avg=not term)
+                print(f'   📄 {name}: {count} students')
+            if row[5] is not None:
+                marks[(row[5], row[6], row[7])] = row[8]
+        flush()
+
+    workbook.close()
+    return len(sections), written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the whole-school cumulative scholastic workbook.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--academic-year-id', type=int, default=1)
+    parser.add_argument('--term', help="only this term, e.g. 'Term I' (default: cumulative)")
+    parser.add_argument('--itersize', type=int, default=5000, help='rows fetched per round trip')
+    parser.add_argument('-o', '--output', help='default: scholastic_cumulative_<academic year>.xlsx')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with psycopg.connect(args.dsn) as conn:
+        output = args.output
+        if not output:
+            year = conn.execute('SELECT year_name FROM academic_years WHERE id = %s',
+                                (args.academic_year_id,)).fetchone()
+            label = re.sub(r'[^\w.-]', '_', str(year[0] if year else args.academic_year_id))
+            output = f'scholastic_cumulative_{label}.xlsx'
+        print(f'📊 Exporting academic year {args.academic_year_id} to {output}...')
+        sheets, students = export(conn, output, args.academic_year_id, args.term, args.itersize)
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'✅ {students} students in {sheets} sheets, {time.perf_counter() - start:.1f}s, '
+          f'peak memory {peak_mb:.0f} MB')
+
+
+if __name__ == '__main__':
+    main()
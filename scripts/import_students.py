@@ -0,0 +1,217 @@
+"""Bulk-load students from a CSV file with COPY, for offline onboarding.
+
+Runs the same set-based import as POST /api/admin/students/import: rows are
+COPY'd into a temporary staging table, classes, sections and duplicate
+admission numbers are resolved with one joined query, and the valid rows are
+inserted into students and student_enrollments with one INSERT ... SELECT.
+
+The CSV uses the column order of the admin importer's spreadsheet
+(admission_no, student_name, father_name, mother_name, dob, class, section,
+admission_date, gender, ...); a first row whose first cell mentions
+"admission" is treated as a header.
+
+    python scripts/import_students.py students.csv --dry-run
+    python scripts/import_students.py students.csv --errors errors.json
+
+Per-row errors are reported as {"index", "admission_no", "error"}, like the
+preview endpoint. Requires psycopg 3 (pip install "psycopg[binary]").
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import psycopg
+except ImportError:
+    sys.exit('psycopg 3 is required: pip install "psycopg[binary]"')
+
+# ── SQL (kept in step with app/lib/student-import.ts) ──
+
+STAGING_COLUMNS = [
+    'admission_no', 'student_name', 'father_name', 'mother_name', 'dob', 'class_name', 'section_name',
+    'admission_date', 'gender', 'blood_group', 'address', 'phone_no', 'emergency_no', 'category',
+    'aadhar_no', 'ppp_id', 'apaar_id', 'srn_no', 'board_roll_x', 'board_roll_xii', 'education_reg_no',
+    'student_code', 'stream',
+]
+
+REQUIRED_COLUMNS = ['admission_no', 'student_name', 'father_name', 'dob', 'class_name', 'section_name']
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE student_import_staging (
+        idx INT PRIMARY KEY,
+        {', '.join(f'{c} TEXT' for c in STAGING_COLUMNS)},
+        subject_count INT,
+        class_id INT,
+        section_id INT,
+        error TEXT
+    ) ON COMMIT DROP
+"""
+
+COPY_SQL = f"COPY student_import_staging (idx, {', '.join(STAGING_COLUMNS)}, subject_count) FROM STDIN"
+
+RESOLVE_SQL = """
+    UPDATE student_import_staging st
+    SET class_id = r.class_id, section_id = r.section_id, error = r.error
+    FROM (
+        SELECT st.idx, c.id AS class_id, sec.id AS section_id,
+            CASE
+                WHEN dup.id IS NOT NULL THEN 'Admission number already exists'
+                WHEN st.idx > MIN(st.idx) OVER (PARTITION BY st.admission_no) THEN 'Admission number repeated in file'
+                WHEN st.dob !~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}$' THEN 'Invalid DOB Format (YYYY-MM-DD)'
+                WHEN c.id IS NULL THEN 'Class ''' || st.class_name || ''' not found'
+                WHEN sec.id IS NULL THEN 'Section ''' || st.section_name || ''' not found in Class ''' || st.class_name || ''''
+            END AS error
+        FROM student_import_staging st
+        LEFT JOIN (
+            SELECT DISTINCT ON (LOWER(class_name)) id, LOWER(class_name) AS name_key
+            FROM classes
+            ORDER BY LOWER(class_name), id DESC
+        ) c ON c.name_key = LOWER(st.class_name)
+        LEFT JOIN (
+            SELECT DISTINCT ON (class_id, LOWER(section_name)) id, class_id, LOWER(section_name) AS name_key
+            FROM sections
+            ORDER BY class_id, LOWER(section_name), id DESC
+        ) sec ON sec.class_id = c.id AND sec.name_key = LOWER(st.section_name)
+        LEFT JOIN students dup ON dup.admission_no = st.admission_no
+    ) r
+    WHERE st.idx = r.idx
+    RETURNING st.idx, st.admission_no, st.error
+"""
+
+INSERT_SQL = """
+    WITH inserted AS (
+        INSERT INTO students
+        (admission_no, student_name, father_name, mother_name, dob, admission_date,
+         blood_group, gender, address, phone_no, emergency_no, category,
+         aadhar_no, ppp_id, apaar_id, srn_no, board_roll_x, board_roll_xii, education_reg_no, student_code, stream, subject_count)
+        SELECT admission_no, student_name, father_name, COALESCE(mother_name, ''), dob::date,
+            COALESCE(NULLIF(admission_date, '')::date, CURRENT_DATE),
+            COALESCE(blood_group, ''), COALESCE(NULLIF(gender, ''), 'Male'), COALESCE(address, ''),
+            COALESCE(phone_no, ''), COALESCE(emergency_no, ''), COALESCE(NULLIF(category, ''), 'General'),
+            COALESCE(aadhar_no, ''), COALESCE(ppp_id, ''), COALESCE(apaar_id, ''), COALESCE(srn_no, ''),
+            COALESCE(board_roll_x, ''), COALESCE(board_roll_xii, ''), COALESCE(education_reg_no, ''),
+            COALESCE(student_code, ''), NULLIF(stream, ''), COALESCE(NULLIF(subject_count, 0), 5)
+        FROM student_import_staging
+        WHERE error IS NULL
+        ORDER BY idx
+        RETURNING id, admission_no
+    )
+    INSERT INTO student_enrollments (student_id, class_id, section_id, academic_year_id)
+    SELECT i.id, st.class_id, st.section_id, %s
+    FROM inserted i
+    JOIN student_import_staging st ON st.admission_no = i.admission_no AND st.error IS NULL
+"""
+
+MONTHS = {m: f'{i:02d}' for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+
+def normalize_date(value):
+    """DD-MMM-YY to YYYY-MM-DD, as normalizeDate in the import route."""
+    if not value or re.fullmatch(r'\d{4}-\d{2}-\d{2}', value):
+        return value
+    parts = value.split('-')
+    if len(parts) == 3 and parts[1].lower() in MONTHS and parts[1] in (parts[1].title(), parts[1].upper()):
+        year = '20' + parts[2] if len(parts[2]) == 2 else parts[2]
+        return f'{year}-{MONTHS[parts[1].lower()]}-{parts[0].zfill(2)}'
+    return value
+
+
+def read_csv(path):
+    """Rows as dicts in the importer's column order; blank lines are skipped."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = [r for r in csv.reader(f) if any(cell.strip() for cell in r)]
+    if rows and 'admission' in rows[0][0].lower():
+        rows = rows[1:]
+
+    students = []
+    for r in rows:
+        cells = [c.strip() for c in r] + [''] * (len(STAGING_COLUMNS) + 1 - len(r))
+        row = dict(zip(STAGING_COLUMNS, cells))
+        row['dob'] = normalize_date(row['dob'])
+        row['admission_date'] = normalize_date(row['admission_date'])
+        count = cells[len(STAGING_COLUMNS)]
+        row['subject_count'] = int(count) if count.isdigit() else 5
+        students.append(row)
+    return students
+
+
+def import_rows(conn, rows, academic_year_id, dry_run=False):
+    """Stage, resolve and (unless dry_run) insert rows in one transaction.
+
+    conn must be in autocommit mode so the block is a real transaction.
+    Returns (errors, imported). Rows missing a required column never reach
+    the database; the endpoint rejects those with a validation error.
+    """
+    errors = []
+    imported = 0
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute(CREATE_STAGING_SQL)
+        with cur.copy(COPY_SQL) as copy:
+            for idx, row in enumerate(rows):
+                missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+                if missing:
+                    errors.append({'index': idx, 'admission_no': row.get('admission_no', ''),
+                                   'error': f"Missing {', '.join(missing)}"})
+                    continue
+                copy.write_row([idx] + [row.get(c) or None for c in STAGING_COLUMNS] + [row.get('subject_count')])
+        cur.execute('ANALYZE student_import_staging')
+        cur.execute(RESOLVE_SQL)
+        errors.extend({'index': idx, 'admission_no': adm, 'error': err}
+                      for idx, adm, err in cur.fetchall() if err)
+        errors.sort(key=lambda e: e['index'])
+
+        if dry_run:
+            # Leaves the transaction block quietly, dropping the staging table
+            raise psycopg.Rollback()
+        cur.execute(INSERT_SQL, (academic_year_id,))
+        imported = cur.rowcount
+    return errors, imported
+
+
+def active_year(conn):
+    row = conn.execute('SELECT id FROM academic_years WHERE is_active = true LIMIT 1').fetchone()
+    if not row:
+        sys.exit('❌ No active academic year found')
+    return row[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-import students from CSV with COPY.')
+    parser.add_argument('csv', help='student rows in the admin importer column order')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--academic-year-id', type=int, help='default: the active academic year')
+    parser.add_argument('--dry-run', action='store_true', help='validate only (like preview)')
+    parser.add_argument('--errors', help='write per-row errors to this JSON file')
+    args = parser.parse_args()
+
+    rows = read_csv(args.csv)
+    if not rows:
+        sys.exit('❌ No rows found in the file')
+
+    start = time.perf_counter()
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        academic_year_id = args.academic_year_id or active_year(conn)
+        errors, imported = import_rows(conn, rows, academic_year_id, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    for e in errors[:20]:
+        print(f"   Row {e['index'] + 1} ({e['admission_no']}): {e['error']}")
+    if len(errors) > 20:
+        print(f'   ... and {len(errors) - 20} more')
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8') as f:
+            json.dump(errors, f, indent=2)
+
+    if args.dry_run:
+        print(f'🔍 {len(rows)} rows: {len(rows) - len(errors)} valid, {len(errors)} invalid ({elapsed:.2f}s)')
+    else:
+        print(f'✅ Imported: {imported}, Failed/Skipped: {len(errors)} ({elapsed:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,594 @@
+"""Query-driven index advisor for the report schema.
+
+  1. Parses the DDL (step2_database_schema_v1.sql, step3 and the users /
+     display_order additions the benchmarks seed) for tables, columns and the
+     indexes that already exist (primary keys, UNIQUE constraints, CREATE INDEX).
+  2. Collects the read queries embedded in app/api/**/route.ts and
+     app/lib/*.ts (template literals and quoted strings starting with SELECT
+     or WITH; writes, catalog queries and tables outside the DDL are skipped).
+  3. Seeds a scratch schema with scripts/bench_section_reports.py's seed at
+     school scale and at 10x (ten times the sections per class), binds every
+     $n to a sampled value from the column it is compared with, and runs
+     EXPLAIN (ANALYZE, BUFFERS) before and after creating candidate indexes.
+  4. Writes a migration in the scripts/migrate-*.js style with the candidates
+     the planner used and that sped a query up by --min-gain, and prints a
+     before/after latency report per query and scale.
+
+Candidates are composite indexes over a table's equality filters (most
+distinct column first), then its range filters and ORDER BY columns, with an
+INCLUDE list when the query names few enough columns of the table to be
+answered from the index alone. A candidate whose key an existing index
+already starts with is not proposed.
+
+    python scripts/index_advisor.py
+    python scripts/index_advisor.py --scales 1 10 --runs 5 --report index_report.json
+    python scripts/index_advisor.py --list-queries     # parse only, no database
+
+Requires psycopg 3 (pip install "psycopg[binary]") except for --list-queries.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import statistics
+from dataclasses import dataclass, field
+
+import bench_section_reports
+from bench_section_reports import MIGRATIONS_DDL, ROOT, USERS_DDL, require_psycopg
+
+DDL_FILES = ['step2_database_schema_v1.sql', 'step3_extend_student_schema.sql']
+QUERY_GLOBS = ['app/api/**/route.ts', 'app/lib/*.ts']
+
+# School scale: 12 classes x 4 sections x 40 students, 10 subjects
+SCHOOL = {'classes': 12, 'sections': 4, 'students': 40, 'subjects': 10}
+
+SQL_KEYWORDS = {
+    'on', 'where', 'join', 'left', 'right', 'inner', 'outer', 'full', 'cross', 'lateral',
+    'group', 'order', 'limit', 'using', 'natural', 'as', 'union', 'having', 'set', 'and',
+}
+
+
+# ── DDL ──
+
+@dataclass
+class Table:
+    name: str
+    columns: list = field(default_factory=list)
+    indexes: list = field(default_factory=list)  # key column lists
+    unique: list = field(default_factory=list)   # primary key / UNIQUE column lists
+
+
+def split_top_level(body):
+    """Split a CREATE TABLE body on commas that are not inside parentheses."""
+    parts, depth, current = [], 0, []
+    for ch in body:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append(''.join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def column_list(text):
+    return [c.strip().strip('"').lower() for c in text.split(',')]
+
+
+def parse_ddl(sql):
+    """Tables with their columns and existing index keys, keyed by name."""
+    sql = re.sub(r'--[^\n]*', '', sql)
+    tables = {}
+
+    for m in re.finditer(r'CREATE TABLE (?:IF NOT EXISTS )?(\w+)\s*\((.*?)\);', sql, re.I | re.S):
+        table = tables.setdefault(m.group(1).lower(), Table(m.group(1).lower()))
+        for part in split_top_level(m.group(2)):
+            constraint = re.match(r'(?:CONSTRAINT \w+ )?(PRIMARY KEY|UNIQUE)\s*\(([^)]*)\)', part, re.I)
+            if constraint:
+                table.indexes.append(column_list(constraint.group(2)))
+                table.unique.append(column_list(constraint.group(2)))
+            elif not re.match(r'(CONSTRAINT|FOREIGN KEY|CHECK)\b', part, re.I):
+                name = part.split()[0].strip('"').lower()
+                table.columns.append(name)
+                if re.search(r'\b(PRIMARY KEY|UNIQUE)\b', part, re.I):
+                    table.indexes.append([name])
+                    table.unique.append([name])
+
+    for m in re.finditer(r'ALTER TABLE (\w+)(.*?);', sql, re.I | re.S):
+        table = tables.get(m.group(1).lower())
+        if table:
+            for col in re.findall(r'ADD COLUMN (?:IF NOT EXISTS )?(\w+)', m.group(2), re.I):
+                if col.lower() not in table.columns:
+                    table.columns.append(col.lower())
+
+    for m in re.finditer(r'CREATE (UNIQUE )?INDEX (?:CONCURRENTLY )?(?:IF NOT EXISTS )?\w+\s+ON (\w+)\s*'
+                         r'(?:USING \w+\s*)?\(([^)]*)\)', sql, re.I):
+        table = tables.get(m.group(2).lower())
+        if table:
+            table.indexes.append(column_list(m.group(3)))
+            if m.group(1):
+                table.unique.append(column_list(m.group(3)))
+    return tables
+
+
+def load_schema():
+    parts = [USERS_DDL]
+    for name in DDL_FILES:
+        with open(os.path.join(ROOT, name), encoding='utf-8') as f:
+            parts.append(f.read())
+    parts.append(MIGRATIONS_DDL)
+    return parse_ddl('\n'.join(parts))
+
+
+# ── queries ──
+
+@dataclass
+class Query:
+    sql: str
+    locations: list
+    skipped: str = ''
+    tables: dict = field(default_factory=dict)       # alias -> table
+    equality: dict = field(default_factory=dict)     # table -> [columns]
+    ranges: dict = field(default_factory=dict)       # table -> [columns]
+    order_by: dict = field(default_factory=dict)     # table -> [columns]
+    joins: dict = field(default_factory=dict)        # table -> [columns]
+    selected: dict = field(default_factory=dict)     # table -> [columns], None for t.* / *
+    params: dict = field(default_factory=dict)       # n -> (table, column, is_array) or ('limit',)
+
+    @property
+    def label(self):
+        return self.locations[0]
+
+
+def line_of(text, offset):
+    return text.count('\n', 0, offset) + 1
+
+
+def extract_sql(path, text):
+    """(line, sql) for every read query literal in a TypeScript file."""
+    constants = {m.group(1): m.group(2) for m in re.finditer(r'const (\w+) = `([^`]*)`', text)}
+    found = []
+
+    def resolve(body):
+        # ${CONST} of a same-file template literal is inlined; anything else is dynamic
+        def sub(m):
+            name = m.group(1).strip()
+            if name in constants and '${' not in constants[name]:
+                return constants[name]
+            raise ValueError(name)
+        return re.sub(r'\$\{([^}]*)\}', sub, body)
+
+    for m in re.finditer(r'`([^`]*)`', text):
+        body = m.group(1)
+        if not re.match(r'\s*(SELECT|WITH)\b', body, re.I):
+            continue
+        try:
+            found.append((line_of(text, m.start()), resolve(body)))
+        except ValueError as dynamic:
+            found.append((line_of(text, m.start()), None, f'dynamic SQL (${{{dynamic}}})'))
+    for m in re.finditer(r"""(['"])((?:SELECT|WITH)\b[^'"\n]*)\1""", text, re.I):
+        found.append((line_of(text, m.start()), m.group(2)))
+    return found
+
+
+def collect_queries(schema):
+    queries = {}
+    for pattern in QUERY_GLOBS:
+        for path in sorted(glob.glob(os.path.join(ROOT, pattern), recursive=True)):
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            rel = os.path.relpath(path, ROOT)
+            for line, sql, *reason in extract_sql(path, text):
+                location = f'{rel}:{line}'
+                if sql is None:
+                    queries[location] = Query('', [location], skipped=reason[0])
+                    continue
+                key = ' '.join(sql.split())
+                if key in queries:
+                    queries[key].locations.append(location)
+                else:
+                    queries[key] = analyse(Query(sql.strip(), [location]), schema)
+    return list(queries.values())
+
+
+def analyse(query, schema):
+    """Fill in the tables, filters and parameter bindings of a query."""
+    sql = re.sub(r'--[^\n]*', '', query.sql)
+    if re.search(r'\b(INSERT\s+INTO|UPDATE\s+\w+(\s+\w+)?\s+SET|DELETE\s+FROM)\b', sql, re.I):
+        query.skipped = 'writes'
+        return query
+    if re.search(r'\b(information_schema|pg_catalog|pg_class|pg_indexes|pg_stats)\b', sql, re.I):
+        query.skipped = 'catalog query'
+        return query
+    if re.search(r'\bpg_advisory', sql, re.I):
+        query.skipped = 'takes locks'
+        return query
+
+    ctes = {m.lower() for m in re.findall(r'(\w+)\s+AS\s*\(', sql, re.I)}
+    for m in re.finditer(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.I):
+        name = m.group(1).lower()
+        if name in ctes or name in ('unnest', 'jsonb_to_recordset', 'generate_series', 'lateral'):
+            continue
+        if name not in schema:
+            query.skipped = f'table {name} is not in the step2/step3 schema'
+            return query
+        alias = (m.group(2) or '').lower()
+        query.tables[name] = name
+        if alias and alias not in SQL_KEYWORDS:
+            query.tables[alias] = name
+    if not query.tables:
+        query.skipped = 'no schema tables'
+        return query
+
+    def table_of(alias, column):
+        if alias:
+            return query.tables.get(alias.lower())
+        owners = {t for t in query.tables.values() if column in schema[t].columns}
+        return owners.pop() if len(owners) == 1 else None
+
+    def add(bucket, table, column):
+        cols = bucket.setdefault(table, [])
+        if column not in cols:
+            cols.append(column)
+
+    for m in re.finditer(r'(?:(\w+)\.)?(\w+)\s*=\s*(ANY\s*\(\s*)?\$(\d+)', sql, re.I):
+        table = table_of(m.group(1), m.group(2).lower())
+        if table and m.group(2).lower() in schema[table].columns:
+            add(query.equality, table, m.group(2).lower())
+            query.params.setdefault(int(m.group(4)), (table, m.group(2).lower(), bool(m.group(3))))
+    for m in re.finditer(r"(?:(\w+)\.)?(\w+)\s*=\s*(?:'[^']*'|\d+\b|TRUE\b|FALSE\b)", sql, re.I):
+        table = table_of(m.group(1), m.group(2).lower())
+        if table and m.group(2).lower() in schema[table].columns:
+            add(query.equality, table, m.group(2).lower())
+    for m in re.finditer(r'(?:(\w+)\.)?(\w+)\s*(?:<=|>=|<|>|BETWEEN)\s*\$(\d+)', sql, re.I):
+        table = table_of(m.group(1), m.group(2).lower())
+        if table and m.group(2).lower() in schema[table].columns:
+            add(query.ranges, table, m.group(2).lower())
+            query.params.setdefault(int(m.group(3)), (table, m.group(2).lower(), False))
+    for m in re.finditer(r'(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)', sql):
+        for alias, column in ((m.group(1), m.group(2)), (m.group(3), m.group(4))):
+            table = table_of(alias, column.lower())
+            if table and column.lower() in schema[table].columns:
+                add(query.joins, table, column.lower())
+    for m in re.finditer(r'\bLIMIT\s+\$(\d+)', sql, re.I):
+        query.params.setdefault(int(m.group(1)), ('limit',))
+
+    order = re.search(r'\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\)|$)', sql, re.I | re.S)
+    if order:
+        for m in re.finditer(r'(?:(\w+)\.)?(\w+)(?:\s+(?:ASC|DESC))?\s*(?:,|$)', order.group(1).strip(), re.I):
+            table = table_of(m.group(1), m.group(2).lower())
+            if table and m.group(2).lower() in schema[table].columns:
+                add(query.order_by, table, m.group(2).lower())
+
+    select = re.match(r'\s*SELECT\b(.*?)\bFROM\b', sql, re.I | re.S)
+    if select:
+        for alias, table in query.tables.items():
+            if re.search(rf'(^|[\s,]){re.escape(alias)}\.\*', select.group(1)) or re.match(r'\s*\*', select.group(1)):
+                query.selected[table] = None
+            elif query.selected.get(table, []) is not None:
+                for col in re.findall(rf'\b{re.escape(alias)}\.(\w+)', select.group(1)):
+                    add(query.selected, table, col.lower())
+    else:
+        query.selected = {t: None for t in query.tables.values()}
+
+    missing = sorted(set(int(n) for n in re.findall(r'\$(\d+)', sql)) - set(query.params))
+    if missing:
+        query.skipped = f'cannot bind ${missing[0]}'
+    return query
+
+
+# ── candidates ──
+
+@dataclass
+class Candidate:
+    table: str
+    key: list
+    include: list
+    queries: list = field(default_factory=list)
+
+    @property
+    def name(self):
+        return f"idx_{self.table}_{'_'.join(self.key)}"[:63]
+
+    def ddl(self, concurrently=False):
+        include = f" INCLUDE ({', '.join(self.include)})" if self.include else ''
+        return (f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {self.name} "
+                f"ON {self.table} ({', '.join(self.key)}){include}")
+
+
+def already_indexed(table, key, equality_count):
+    """
+    True when the equality columns pin down a single row through a primary key
+    or UNIQUE constraint, or an existing index leads with the equality set
+    followed by the rest of the key in order.
+    """
+    if any(set(unique) <= set(key[:equality_count]) for unique in table.unique):
+        return True
+    for index in table.indexes:
+        if len(index) >= len(key) and set(index[:equality_count]) == set(key[:equality_count]) \
+                and index[equality_count:len(key)] == key[equality_count:]:
+            return True
+    return False
+
+
+def candidates_for(queries, schema, n_distinct, max_include=3):
+    found = {}
+    for query in queries:
+        if query.skipped:
+            continue
+        for table, equality in query.equality.items():
+            equality = sorted(equality, key=lambda c: -n_distinct.get((table, c), 0))
+            key = equality + [c for c in query.ranges.get(table, []) + query.order_by.get(table, [])
+                              if c not in equality][:2]
+            if already_indexed(schema[table], key, len(equality)):
+                continue
+            selected = query.selected.get(table)
+            include = [c for c in selected + query.joins.get(table, []) if c not in key] \
+                if selected is not None else None
+            include = list(dict.fromkeys(include)) if include is not None else None
+            candidate = found.get((table, tuple(key)))
+            if candidate is None:
+                fits = include is not None and len(include) <= max_include
+                candidate = found[(table, tuple(key))] = Candidate(table, key, include if fits else [])
+            elif include is None or len(set(candidate.include) | set(include)) > max_include:
+                candidate.include = []
+            else:
+                candidate.include = sorted(set(candidate.include) | set(include))
+            candidate.queries.append(query.label)
+    return list(found.values())
+
+
+# ── measuring ──
+
+def sample_params(conn, query, batch):
+    """Literal for every $n: a common value of the column it is compared with."""
+    values = {}
+    for n, target in query.params.items():
+        if target[0] == 'limit':
+            values[n] = '10'
+            continue
+        table, column, is_array = target
+        if is_array:
+            row = conn.execute(
+                f'SELECT array_agg({column}) FROM (SELECT DISTINCT {column} FROM {table} '
+                f'WHERE {column} IS NOT NULL ORDER BY {column} LIMIT %s) v', (batch,)).fetchone()
+        else:
+            row = conn.execute(
+                f'SELECT {column} FROM {table} WHERE {column} IS NOT NULL '
+                f'GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT 1').fetchone()
+        if row is None or row[0] is None:
+            return None
+        values[n] = literal(conn, row[0])
+    return values
+
+
+def literal(conn, value):
+    if isinstance(value, list):
+        return f"ARRAY[{', '.join(literal(conn, v) for v in value)}]"
+    if isinstance(value, (int, float)):
+        return str(value)
+    from psycopg import sql as pgsql
+    return pgsql.Literal(value).as_string(conn)
+
+
+def bind(sql, values):
+    return re.sub(r'\$(\d+)', lambda m: values[int(m.group(1))], sql)
+
+
+def index_names(plan):
+    names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child in plan.get('Plans', []):
+        names |= index_names(child)
+    return names
+
+
+def explain(conn, sql, runs):
+    """Median execution time, shared buffers touched and indexes used."""
+    timings, plan = [], None
+    for i in range(runs + 1):
+        plan = conn.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}').fetchone()[0][0]
+        if i:  # the first run warms the plan cache and shared buffers
+            timings.append(plan['Execution Time'])
+    top = plan['Plan']
+    return {
+        'ms': round(statistics.median(timings), 3),
+        'buffers': top.get('Shared Hit Blocks', 0) + top.get('Shared Read Blocks', 0),
+        'indexes': sorted(index_names(top)),
+    }
+
+
+def measure(conn, bound, runs):
+    psycopg = require_psycopg()
+    results = {}
+    for label, sql in bound.items():
+        try:
+            results[label] = explain(conn, sql, runs)
+        except psycopg.Error as e:
+            results[label] = {'error': str(e).splitlines()[0]}
+    return results
+
+
+def run_scale(conn, schema, queries, scale, args):
+    seed_args = argparse.Namespace(
+        classes=SCHOOL['classes'], sections=SCHOOL['sections'] * scale,
+        students=SCHOOL['students'], subjects=SCHOOL['subjects'])
+    bench_section_reports.seed(conn, args.schema, seed_args)
+    conn.execute(f'SET search_path TO {args.schema}')
+
+    n_distinct = {}
+    for table, column, distinct in conn.execute(
+            'SELECT tablename, attname, n_distinct FROM pg_stats WHERE schemaname = %s', (args.schema,)):
+        rows = conn.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', (table,)).fetchone()[0]
+        n_distinct[(table, column)] = distinct if distinct >= 0 else -distinct * max(rows, 1)
+
+    bound, skipped = {}, {}
+    for query in queries:
+        if query.skipped:
+            continue
+        values = sample_params(conn, query, args.batch)
+        if values is None:
+            skipped[query.label] = 'no seeded data to bind parameters'
+        else:
+            bound[query.label] = bind(query.sql, values)
+
+    candidates = candidates_for([q for q in queries if q.label in bound], schema, n_distinct)
+    print(f'📐 Scale {scale}x: {len(bound)} queries, {len(candidates)} candidate indexes')
+    before = measure(conn, bound, args.runs)
+    for candidate in candidates:
+        conn.execute(candidate.ddl())
+    conn.execute('ANALYZE')
+    after = measure(conn, bound, args.runs)
+    return candidates, before, after, skipped
+
+
+def accepted(scales, min_gain):
+    """Candidates used after the change by a query that got at least min_gain faster."""
+    chosen = {}
+    for scale, (cands, before, after, _) in scales.items():
+        for candidate in cands:
+            for label in candidate.queries:
+                b, a = before.get(label, {}), after.get(label, {})
+                if 'ms' not in b or 'ms' not in a or candidate.name not in a['indexes']:
+                    continue
+                gain = b['ms'] / max(a['ms'], 0.001)
+                if gain >= 1 + min_gain:
+                    entry = chosen.setdefault(candidate.name, {'candidate': candidate, 'gains': []})
+                    entry['gains'].append((label, scale, gain))
+    return list(chosen.values())
+
+
+# ── output ──
+
+MIGRATION_TEMPLATE = """const {{ Pool }} = require('pg');
+require('dotenv').config({{ path: '.env.local' }});
+
+// Generated by scripts/index_advisor.py on {date}; re-run it after the report
+// queries change. CONCURRENTLY keeps score entry open while indexes build.
+
+const connectionString = process.argv[2] || process.env.DATABASE_URL;
+
+if (!connectionString) {{
+    console.error('❌ DATABASE_URL is not set.');
+    process.exit(1);
+}}
+
+const pool = new Pool({{
+    connectionString,
+    ssl: {{ rejectUnauthorized: false }}
+}});
+
+const INDEXES = [
+{indexes}];
+
+async function migrate() {{
+    console.log('🚀 Starting Schema Migration (Report Indexes)...');
+
+    try {{
+        for (const index of INDEXES) {{
+            console.log(`⚡ Creating ${{index.name}}...`);
+            await pool.query(index.sql);
+        }}
+        await pool.query('ANALYZE {tables}');
+        console.log('✅ Report indexes are ready!');
+
+    }} catch (err) {{
+        console.error('❌ Migration Failed:', err);
+    }} finally {{
+        await pool.end();
+    }}
+}}
+
+migrate();
+"""
+
+
+def migration_js(chosen):
+    entries = []
+    for entry in sorted(chosen, key=lambda e: e['candidate'].name):
+        candidate = entry['candidate']
+        lines = [f"        // {label} ({gain:.1f}x at {scale}x)" for label, scale, gain in entry['gains']]
+        entries.append('    {\n' + '\n'.join(lines) + '\n'
+                       f"        name: '{candidate.name}',\n"
+                       f"        sql: '{candidate.ddl(concurrently=True)}',\n"
+                       '    },\n')
+    tables = ', '.join(sorted({e['candidate'].table for e in chosen}))
+    return MIGRATION_TEMPLATE.format(
+        date=datetime.date.today().isoformat(), indexes=''.join(entries), tables=tables)
+
+
+def print_report(scales):
+    for scale, (_, before, after, skipped) in scales.items():
+        print(f'\n📊 Scale {scale}x (median of EXPLAIN ANALYZE execution time)\n')
+        print(f"{'Query':<52} {'before ms':>10} {'after ms':>9} {'gain':>6} {'buffers':>15}  indexes used after")
+        for label in sorted(before, key=lambda l: -before[l].get('ms', 0)):
+            b, a = before[label], after.get(label, {})
+            if 'ms' not in b or 'ms' not in a:
+                print(f"{label:<52} ⚠️ {b.get('error') or a.get('error')}")
+                continue
+            gain = b['ms'] / max(a['ms'], 0.001)
+            print(f"{label:<52} {b['ms']:>10.2f} {a['ms']:>9.2f} {gain:>5.1f}x "
+                  f"{b['buffers']:>7}→{a['buffers']:<7}  {', '.join(a['indexes']) or '-'}")
+        for label, reason in skipped.items():
+            print(f'{label:<52} ⏭️ {reason}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recommend indexes for the report queries.')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', 'postgresql://localhost/postgres'))
+    parser.add_argument('--schema', default='hpc_index_advisor', help='scratch schema (dropped and recreated)')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10], help='multiples of a school (sections per class)')
+    parser.add_argument('--batch', type=int, default=40, help='ids bound to each = ANY($n), one section')
+    parser.add_argument('--runs', type=int, default=5, help='timed EXPLAIN ANALYZE runs per query')
+    parser.add_argument('--min-gain', type=float, default=0.1, help='speed-up an index must give (0.1 = 10%%)')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'scripts', 'migrate-report-indexes.js'))
+    parser.add_argument('--report', help='also write the before/after numbers as JSON')
+    parser.add_argument('--list-queries', action='store_true', help='print the parsed queries and exit')
+    args = parser.parse_args()
+
+    schema = load_schema()
+    queries = collect_queries(schema)
+
+    if args.list_queries:
+        for query in queries:
+            status = f'⏭️ {query.skipped}' if query.skipped else \
+                f"filters {', '.join(f'{t}({cols})' for t, cols in query.equality.items()) or '-'}"
+            print(f'{query.label:<52} {status}')
+        return
+
+    print(f'🔎 {len(queries)} queries in {len(schema)} tables, '
+          f'{sum(not q.skipped for q in queries)} to explain')
+    psycopg = require_psycopg()
+    scales = {}
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        for scale in args.scales:
+            scales[scale] = run_scale(conn, schema, queries, scale, args)
+        conn.execute(f'DROP SCHEMA IF EXISTS {args.schema} CASCADE')
+
+    print_report(scales)
+    chosen = accepted(scales, args.min_gain)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                str(scale): {'before': before, 'after': after, 'skipped': skipped,
+                             'candidates': [c.ddl() for c in cands]}
+                for scale, (cands, before, after, skipped) in scales.items()
+            }, f, indent=2)
+
+    if not chosen:
+        print('\n✅ No index cleared the bar; nothing to migrate.')
+        return
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(migration_js(chosen))
+    print(f'\n✅ {len(chosen)} index(es) recommended → {os.path.relpath(args.output, ROOT)}')
+    for entry in chosen:
+        print(f"   {entry['candidate'].ddl()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+const { Pool } = require('pg');
+require('dotenv').config({ path: '.env.local' });
+
+const connectionString = process.argv[2] || process.env.DATABASE_URL;
+
+if (!connectionString) {
+    console.error('❌ DATABASE_URL is not set.');
+    process.exit(1);
+}
+
+const pool = new Pool({
+    connectionString,
+    ssl: { rejectUnauthorized: false }
+});
+
+async function migrate() {
+    console.log('🚀 Starting Schema Migration (Report Card Versions)...');
+
+    try {
+        // One row per student and year; bumped by every write that changes the
+        // report card so cached PDFs are never served stale
+        await pool.query(`
+            CREATE TABLE IF NOT EXISTS report_card_versions (
+                student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+                academic_year_id INT NOT NULL,
+                version          INT NOT NULL DEFAULT 0,
+                updated_at       TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (student_id, academic_year_id)
+            );
+        `);
+        console.log('✅ report_card_versions is ready!');
+
+    } catch (err) {
+        console.error('❌ Migration Failed:', err);
+    } finally {
+        await pool.end();
+    }
+}
+
+migrate();
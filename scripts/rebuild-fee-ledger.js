@@ -0,0 +1,113 @@
+const { Pool } = require('pg');
+require('dotenv').config({ path: '.env.local' });
+
+// Usage: node scripts/rebuild-fee-ledger.js [connection-string] [--from=YYYY-MM-DD] [--to=YYYY-MM-DD]
+// Without --from/--to every payment ever recorded is rolled up again.
+const args = process.argv.slice(2);
+const fromArg = args.find(a => a.startsWith('--from='));
+const toArg = args.find(a => a.startsWith('--to='));
+const connectionString = args.find(a => !a.startsWith('--')) || process.env.DATABASE_URL;
+
+if (!connectionString) {
+    console.error('❌ DATABASE_URL is not set.');
+    process.exit(1);
+}
+
+const pool = new Pool({
+    connectionString,
+    ssl: { rejectUnauthorized: false }
+});
+
+// Same table as app/api/setup/migrate
+const TABLE_SQL = `
+    CREATE TABLE IF NOT EXISTS fee_ledger_daily (
+        payment_date     DATE NOT NULL,
+        payment_mode     VARCHAR(50) NOT NULL,
+        academic_year_id INT NOT NULL DEFAULT 0,
+        class_id         INT NOT NULL DEFAULT 0,
+        section_id       INT NOT NULL DEFAULT 0,
+        fee_head_id      INT NOT NULL DEFAULT 0,
+        amount           NUMERIC(14,2) NOT NULL DEFAULT 0,
+        payment_count    INT NOT NULL DEFAULT 0,
+        updated_at       TIMESTAMPTZ DEFAULT NOW(),
+        PRIMARY KEY (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_fee_payments_payment_date
+        ON student_fee_payments (payment_date);
+`;
+
+// ── statements (kept in step with app/lib/fee-ledger.ts) ──
+
+// Payments recorded while the rebuild runs wait for it on this lock, then
+// add themselves on top of the rebuilt rows
+const LOCK_SQL = 'LOCK TABLE fee_ledger_daily IN EXCLUSIVE MODE';
+
+const DELETE_SQL = `
+    DELETE FROM fee_ledger_daily
+    WHERE ($1::date IS NULL OR payment_date >= $1)
+      AND ($2::date IS NULL OR payment_date <= $2)
+`;
+
+const INSERT_SQL = `
+    INSERT INTO fee_ledger_daily
+        (payment_date, payment_mode, academic_year_id, class_id, section_id, fee_head_id, amount, payment_count, updated_at)
+    SELECT fp.payment_date, COALESCE(fp.payment_mode, 'UNKNOWN'), COALESCE(fp.academic_year_id, 0),
+        COALESCE(se.class_id, 0), COALESCE(se.section_id, 0), COALESCE(fs.fee_head_id, 0),
+        SUM(fp.amount_paid), COUNT(*), NOW()
+    FROM student_fee_payments fp
+    LEFT JOIN fee_structures fs ON fs.id = fp.fee_structure_id
+    LEFT JOIN student_enrollments se ON se.student_id = fp.student_id AND se.academic_year_id = fp.academic_year_id
+    WHERE fp.payment_date IS NOT NULL
+      AND ($1::date IS NULL OR fp.payment_date >= $1)
+      AND ($2::date IS NULL OR fp.payment_date <= $2)
+    GROUP BY 1, 2, 3, 4, 5, 6
+`;
+
+// The rollups must add up to the payments they were built from
+const CHECK_SQL = `
+    SELECT
+        (SELECT COALESCE(SUM(amount_paid), 0) FROM student_fee_payments
+         WHERE payment_date IS NOT NULL
+           AND ($1::date IS NULL OR payment_date >= $1)
+           AND ($2::date IS NULL OR payment_date <= $2)) AS payments,
+        (SELECT COALESCE(SUM(amount), 0) FROM fee_ledger_daily
+         WHERE ($1::date IS NULL OR payment_date >= $1)
+           AND ($2::date IS NULL OR payment_date <= $2)) AS ledger
+`;
+
+async function rebuild() {
+    const from = fromArg ? fromArg.slice('--from='.length) : null;
+    const to = toArg ? toArg.slice('--to='.length) : null;
+    console.log(`🚀 Rebuilding fee_ledger_daily (${from || 'first payment'} → ${to || 'today'})...`);
+
+    try {
+        await pool.query(TABLE_SQL);
+
+        const client = await pool.connect();
+        try {
+            const start = Date.now();
+            await client.query('BEGIN');
+            await client.query(LOCK_SQL);
+            const deleted = await client.query(DELETE_SQL, [from, to]);
+            const inserted = await client.query(INSERT_SQL, [from, to]);
+            const check = await client.query(CHECK_SQL, [from, to]);
+            await client.query('COMMIT');
+
+            const { payments, ledger } = check.rows[0];
+            console.log(`✅ ${inserted.rowCount} rollup rows (${deleted.rowCount} replaced) in ${Date.now() - start} ms`);
+            console.log(`   Payments ₹${payments}, ledger ₹${ledger}${payments === ledger ? '' : '  ⚠️ MISMATCH'}`);
+        } catch (err) {
+            await client.query('ROLLBACK');
+            throw err;
+        } finally {
+            client.release();
+        }
+
+    } catch (err) {
+        console.error('❌ Rebuild Failed:', err);
+    } finally {
+        await pool.end();
+    }
+}
+
+rebuild();
@@ -0,0 +1,191 @@
+const { Pool } = require('pg');
+require('dotenv').config({ path: '.env.local' });
+
+// Usage: node scripts/rebuild-term-results.js [connection-string] [--year=<academic_year_id>]
+// Without --year every academic year that has enrollments is rebuilt.
+const args = process.argv.slice(2);
+const yearArg = args.find(a => a.startsWith('--year='));
+const connectionString = args.find(a => !a.startsWith('--')) || process.env.DATABASE_URL;
+
+if (!connectionString) {
+    console.error('❌ DATABASE_URL is not set.');
+    process.exit(1);
+}
+
+const pool = new Pool({
+    connectionString,
+    ssl: { rejectUnauthorized: false }
+});
+
+// Same table as app/api/setup/migrate
+const TABLE_SQL = `
+    CREATE TABLE IF NOT EXISTS student_term_results (
+        student_id       INT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+        academic_year_id INT NOT NULL,
+        class_id         INT NOT NULL,
+        section_id       INT NOT NULL,
+        subject_totals   JSONB NOT NULL DEFAULT '{}',
+        term1_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+        term1_subjects   INT NOT NULL DEFAULT 0,
+        term2_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+        term2_subjects   INT NOT NULL DEFAULT 0,
+        grand_total      NUMERIC(8,2) NOT NULL DEFAULT 0,
+        max_marks        INT NOT NULL DEFAULT 0,
+        percentage       NUMERIC(5,2),
+        section_rank     INT,
+        class_rank       INT,
+        updated_at       TIMESTAMPTZ DEFAULT NOW(),
+        PRIMARY KEY (student_id, academic_year_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_term_results_section_rank
+        ON student_term_results (academic_year_id, section_id, section_rank);
+    CREATE INDEX IF NOT EXISTS idx_term_results_class_rank
+        ON student_term_results (academic_year_id, class_id, class_rank);
+`;
+
+// ── statements (kept in step with app/lib/term-results.ts) ──
+
+const LOCK_SQL = `
+    SELECT pg_advisory_xact_lock(hashtext('student_term_results'), c.class_id)
+    FROM (
+        SELECT DISTINCT se.class_id
+        FROM student_enrollments se
+        WHERE se.academic_year_id = $1
+        ORDER BY se.class_id
+    ) c
+`;
+
+const REFRESH_SQL = `
+    WITH targets AS (
+        SELECT se.student_id, se.class_id, se.section_id
+        FROM student_enrollments se
+        WHERE se.academic_year_id = $1
+    ),
+    subject_terms AS (
+        SELECT t.student_id, cs.subject_id,
+            SUM(ss.marks) FILTER (WHERE tm.term_name = 'Term I') AS term1,
+            SUM(ss.marks) FILTER (WHERE tm.term_name = 'Term II') AS term2,
+            COALESCE(BOOL_OR(tm.term_name = 'Term I' AND ac.component_name IN ('Periodic Assessment', 'Terminal Assessment')), FALSE) AS has_term1,
+            COALESCE(BOOL_OR(tm.term_name = 'Term II' AND ac.component_name IN ('Periodic Assessment', 'Terminal Assessment')), FALSE) AS has_term2
+        FROM targets t
+        JOIN (SELECT DISTINCT class_id, subject_id FROM class_subjects WHERE academic_year_id = $1) cs
+            ON cs.class_id = t.class_id
+        LEFT JOIN (
+            scholastic_scores ss
+            JOIN assessment_components ac ON ac.id = ss.component_id AND ac.component_name IN
+                ('Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment')
+            JOIN terms tm ON tm.id = ss.term_id
+        ) ON ss.student_id = t.student_id AND ss.subject_id = cs.subject_id AND ss.academic_year_id = $1
+        GROUP BY t.student_id, cs.subject_id
+    ),
+    per_student AS (
+        SELECT student_id,
+            jsonb_object_agg(subject_id, jsonb_build_object(
+                'term1', COALESCE(term1, 0), 'term2', COALESCE(term2, 0),
+                'has_term1', has_term1, 'has_term2', has_term2
+            )) AS subject_totals,
+            COALESCE(SUM(term1) FILTER (WHERE has_term1), 0) AS term1_total,
+            COUNT(*) FILTER (WHERE has_term1) AS term1_subjects,
+            COALESCE(SUM(term2) FILTER (WHERE has_term2), 0) AS term2_total,
+            COUNT(*) FILTER (WHERE has_term2) AS term2_subjects,
+            COALESCE(SUM((COALESCE(term1, 0) + COALESCE(term2, 0)) / 2) FILTER (WHERE has_term1 OR has_term2), 0) AS grand_total
+        FROM subject_terms
+        GROUP BY student_id
+    ),
+    results AS (
+        SELECT t.student_id, t.class_id, t.section_id,
+            COALESCE(p.subject_totals, '{}'::jsonb) AS subject_totals,
+            COALESCE(p.term1_total, 0) AS term1_total, COALESCE(p.term1_subjects, 0) AS term1_subjects,
+            COALESCE(p.term2_total, 0) AS term2_total, COALESCE(p.term2_subjects, 0) AS term2_subjects,
+            COALESCE(p.grand_total, 0) AS grand_total,
+            GREATEST(COALESCE(p.term1_subjects, 0), COALESCE(p.term2_subjects, 0)) * 100 AS max_marks
+        FROM targets t
+        LEFT JOIN per_student p ON p.student_id = t.student_id
+    )
+    INSERT INTO student_term_results
+        (student_id, academic_year_id, class_id, section_id, subject_totals,
+         term1_total, term1_subjects, term2_total, term2_subjects, grand_total, max_marks, percentage, updated_at)
+    SELECT student_id, $1, class_id, section_id, subject_totals,
+        term1_total, term1_subjects, term2_total, term2_subjects, grand_total, max_marks,
+        CASE WHEN max_marks > 0 THEN ROUND(grand_total * 100 / max_marks, 2) END,
+        NOW()
+    FROM results
+    ON CONFLICT (student_id, academic_year_id) DO UPDATE SET
+        class_id = EXCLUDED.class_id,
+        section_id = EXCLUDED.section_id,
+        subject_totals = EXCLUDED.subject_totals,
+        term1_total = EXCLUDED.term1_total,
+        term1_subjects = EXCLUDED.term1_subjects,
+        term2_total = EXCLUDED.term2_total,
+        term2_subjects = EXCLUDED.term2_subjects,
+        grand_total = EXCLUDED.grand_total,
+        max_marks = EXCLUDED.max_marks,
+        percentage = EXCLUDED.percentage,
+        updated_at = NOW()
+`;
+
+// Students no longer enrolled in the year (deleted enrollments) drop out
+const PRUNE_SQL = `
+    DELETE FROM student_term_results r
+    WHERE r.academic_year_id = $1
+      AND NOT EXISTS (
+          SELECT 1 FROM student_enrollments se
+          WHERE se.student_id = r.student_id AND se.academic_year_id = r.academic_year_id
+      )
+`;
+
+const RANK_SQL = `
+    UPDATE student_term_results r
+    SET section_rank = x.section_rank, class_rank = x.class_rank
+    FROM (
+        SELECT student_id,
+            CASE WHEN percentage IS NOT NULL THEN RANK() OVER (PARTITION BY section_id ORDER BY percentage DESC NULLS LAST) END AS section_rank,
+            CASE WHEN percentage IS NOT NULL THEN RANK() OVER (PARTITION BY class_id ORDER BY percentage DESC NULLS LAST) END AS class_rank
+        FROM student_term_results
+        WHERE academic_year_id = $1
+    ) x
+    WHERE r.student_id = x.student_id AND r.academic_year_id = $1
+      AND (r.section_rank IS DISTINCT FROM x.section_rank OR r.class_rank IS DISTINCT FROM x.class_rank)
+`;
+
+async function rebuild() {
+    console.log('🚀 Rebuilding student_term_results...');
+
+    try {
+        await pool.query(TABLE_SQL);
+
+        let years;
+        if (yearArg) {
+            years = [parseInt(yearArg.slice('--year='.length), 10)];
+        } else {
+            const res = await pool.query('SELECT DISTINCT academic_year_id FROM student_enrollments ORDER BY academic_year_id');
+            years = res.rows.map(r => r.academic_year_id);
+        }
+
+        for (const year of years) {
+            const client = await pool.connect();
+            try {
+                const start = Date.now();
+                await client.query('BEGIN');
+                await client.query(LOCK_SQL, [year]);
+                const refreshed = await client.query(REFRESH_SQL, [year]);
+                const pruned = await client.query(PRUNE_SQL, [year]);
+                const ranked = await client.query(RANK_SQL, [year]);
+                await client.query('COMMIT');
+                console.log(`✅ Year ${year}: ${refreshed.rowCount} students, ${pruned.rowCount} pruned, ${ranked.rowCount} ranks changed (${Date.now() - start} ms)`);
+            } catch (err) {
+                await client.query('ROLLBACK');
+                throw err;
+            } finally {
+                client.release();
+            }
+        }
+
+    } catch (err) {
+        console.error('❌ Rebuild Failed:', err);
+    } finally {
+        await pool.end();
+    }
+}
+
+rebuild();
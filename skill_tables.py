@@ -0,0 +1,193 @@
+"""Generate the skill tables of the III-VIII card from app/lib/report-skills.ts.
+
+The Co-Scholastic and Personality Development tables used to be string
+literals pasted into the template by the codemods, one copy per domain. This
+stage writes their <tbody> groups from the config instead: one <tbody> per
+domain (paginate.py may break the page between them), the skill list as an
+array literal and one indexed lookup per row.
+
+Grades are indexed by domain, then sub-skill, then term. Sub-skill names
+repeat across domains ('Rhythm' is graded under both Dance and Music), so a
+lookup by sub-skill alone showed the same grade in both rows.
+
+    python skill_tables.py          # regenerate the tables
+    python skill_tables.py --check  # exit 1 if they are out of date
+"""
+import re
+from typing import Dict, List, NamedTuple
+
+from paginate import strip_pages
+from template_anchors import AnchorError, index_for, line_start, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+SKILLS_CONFIG = 'app/lib/report-skills.ts'
+
+# Section marker in the template -> config array it is generated from
+TABLES = (
+    ('CO-SCHOLASTIC DOMAINS', 'CO_SCHOLASTIC_DOMAINS'),
+    ('PERSONALITY DEVELOPMENT SKILLS', 'PERSONALITY_DOMAINS'),
+)
+
+TERMS = ('Term I', 'Term II')
+
+DOMAIN_RE = re.compile(
+    r"domain:\s*'(?P<domain>(?:[^'\\]|\\.)*)',\s*"
+    r"label:\s*'(?P<label>(?:[^'\\]|\\.)*)',\s*"
+    r"skills:\s*\[(?P<skills>.*?)\]",
+    re.DOTALL
+)
+STRING_RE = re.compile(r"'((?:[^'\\]|\\.)*)'")
+
+# Written by index_scores.py; replaced by the domain-keyed index below
+SUB_SKILL_INDEX = """    const coScholasticIndex = new Map<string, Map<string, any>>();
+    reportData.co_scholastic?.forEach((cs: any) => {
+        let byTerm = coScholasticIndex.get(cs.sub_skill_name);
+        if (!byTerm) coScholasticIndex.set(cs.sub_skill_name, byTerm = new Map());
+        if (!byTerm.has(cs.term_name)) byTerm.set(cs.term_name, cs);
+    });
+"""
+SUB_SKILL_LOOKUP = """    const getCoScholastic = (subSkill: string, term: string) => {
+        return coScholasticIndex.get(subSkill)?.get(term);
+    };
+
+    const getPersonality = getCoScholastic;
+"""
+
+SKILL_INDEX = """    // Sub-skill names repeat across domains (Dance and Music both grade
+    // 'Rhythm'), so co-scholastic and personality grades are keyed by domain first
+    const skillIndex = new Map<string, Map<string, Map<string, any>>>();
+    reportData.co_scholastic?.forEach((cs: any) => {
+        let bySkill = skillIndex.get(cs.domain_name);
+        if (!bySkill) skillIndex.set(cs.domain_name, bySkill = new Map());
+        let byTerm = bySkill.get(cs.sub_skill_name);
+        if (!byTerm) bySkill.set(cs.sub_skill_name, byTerm = new Map());
+        if (!byTerm.has(cs.term_name)) byTerm.set(cs.term_name, cs);
+    });
+"""
+SKILL_LOOKUP = """    // Grades of one table row by term; the table bodies are generated by skill_tables.py
+    const getSkillGrades = (domain: string, subSkill: string) => {
+        return skillIndex.get(domain)?.get(subSkill);
+    };
+"""
+
+
+class SkillDomain(NamedTuple):
+    domain: str
+    label: str
+    skills: List[str]
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r"\\(.)", r'\1', text)
+
+
+def _quote(text: str) -> str:
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _jsx_text(text: str) -> str:
+    return '{' + _quote(text) + '}' if re.search(r'[{}<>]', text) else text
+
+
+def load_config(source: str) -> Dict[str, List[SkillDomain]]:
+    config = {}
+    for _, name in TABLES:
+        start = source.find(f'export const {name}')
+        if start < 0:
+            raise AnchorError(f"{name} not found in {SKILLS_CONFIG}")
+        end = source.find('export ', start + 1)
+        block = source[start:end if end > 0 else len(source)]
+        domains = [
+            SkillDomain(_unescape(m['domain']), _unescape(m['label']),
+                        [_unescape(s) for s in STRING_RE.findall(m['skills'])])
+            for m in DOMAIN_RE.finditer(block)
+        ]
+        if not domains:
+            raise AnchorError(f"No domains found in {name} ({SKILLS_CONFIG})")
+        config[name] = domains
+    return config
+
+
+def read_config() -> Dict[str, List[SkillDomain]]:
+    with open(SKILLS_CONFIG, 'r', encoding='utf-8') as f:
+        return load_config(f.read())
+
+
+def table_body(domains: List[SkillDomain], indent: str) -> str:
+    """One <tbody> per domain, starting at indent."""
+    lines = []
+    for d in domains:
+        skills = ', '.join(_quote(s) for s in d.skills)
+        lines += [
+            "<tbody style={{ pageBreakInside: 'avoid' }}>",
+            f"    {{/* {d.label} */}}",
+            '    <tr className="domain-header">',
+            f"        <td colSpan={{3}} className=\"text-left\" style={{{{ textAlign: 'center' }}}}>{_jsx_text(d.label)}</td>",
+            '    </tr>',
+            f"    {{[{skills}].map(skill => {{",
+            f"        const grades = getSkillGrades({_quote(d.domain)}, skill);",
+            '        return (',
+            '            <tr key={skill}>',
+            "                <td className=\"text-left\" style={{ paddingLeft: '15px' }}>{skill}</td>",
+        ]
+        lines += [f"                <td>{{grades?.get('{term}')?.grade || ''}}</td>" for term in TERMS]
+        lines += [
+            '            </tr>',
+            '        );',
+            '    })}',
+            '</tbody>',
+        ]
+    return '\n'.join(indent + line for line in lines)
+
+
+def _table_bodies(content: str):
+    """(config name, start, end, indent) of the <tbody> run of every generated table."""
+    index = index_for(content)
+    spans = []
+    for marker, name in TABLES:
+        table = index.after('table', index.comment(marker).end)
+        tbodies = index.within('tbody', table)
+        if not tbodies:
+            raise AnchorError(f"No <tbody> in the {marker} table")
+        start = line_start(content, tbodies[0].start)
+        spans.append((name, start, tbodies[-1].end, content[start:tbodies[0].start]))
+    return spans
+
+
+def is_applied(content):
+    if SKILL_INDEX not in content or SUB_SKILL_INDEX in content:
+        return False
+    content = strip_pages(content)
+    config = read_config()
+    return all(content[start:end] == table_body(config[name], indent)
+               for name, start, end, indent in _table_bodies(content))
+
+
+def apply(content):
+    # Page wrappers split the tables; paginate.py writes them again afterwards
+    content = strip_pages(content)
+    config = read_config()
+    edits = [(start, end, table_body(config[name], indent))
+             for name, start, end, indent in _table_bodies(content)]
+
+    if SUB_SKILL_INDEX in content:
+        start = content.index(SUB_SKILL_INDEX)
+        edits.append((start, start + len(SUB_SKILL_INDEX), SKILL_INDEX))
+    elif SKILL_INDEX not in content:
+        raise AnchorError("Co-scholastic lookup map not found (run index_scores.py first)")
+    if SUB_SKILL_LOOKUP in content:
+        start = content.index(SUB_SKILL_LOOKUP)
+        edits.append((start, start + len(SUB_SKILL_LOOKUP), SKILL_LOOKUP))
+
+    return splice(content, edits)
+
+
+STAGE = Stage('skill_tables', is_applied, apply)
+
+
+def main():
+    main_for(FILEPATH, [STAGE])
+
+if __name__ == '__main__':
+    main()
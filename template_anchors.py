@@ -0,0 +1,260 @@
+"""Anchor index for the report-template codemods.
+
+A single linear scan over a TSX/HTML template records every section-marker
+comment ({/* ... */} in JSX, <!-- ... --> in HTML) and the spans of every
+<style>, <table>, <thead> and <tbody> element. Codemods look their insertion
+points up in the index and splice by offset instead of rescanning the whole
+file with regexes.
+
+Indexes are cached in memory and on disk under .cache/template-anchors,
+keyed by the content hash, so an unchanged template is never tokenized twice.
+"""
+import bisect
+import json
+import os
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+from template_pipeline import StageError, content_hash
+
+CACHE_DIR = os.path.join('.cache', 'template-anchors')
+
+# Bump when the on-disk layout changes so stale cache files are ignored
+INDEX_VERSION = 1
+
+# Intermediate pipeline states get indexed too; keep only the newest files
+MAX_CACHE_FILES = 64
+
+ELEMENTS = ('style', 'table', 'thead', 'tbody')
+
+TOKEN_RE = re.compile(
+    r'\{/\*\s*(?P<jsx>.*?)\s*\*/\}'
+    r'|<!--\s*(?P<html>.*?)\s*-->'
+    r'|<(?P<close>/?)(?P<tag>style|table|thead|tbody)\b',
+    re.DOTALL
+)
+STYLE_CLOSE_RE = re.compile(r'</style\s*>')
+
+
+class AnchorError(StageError):
+    """Raised when an anchor a codemod depends on is missing from the template."""
+
+
+class Span(NamedTuple):
+    # start: offset of '<' of the opening tag (or of the comment)
+    # inner_start: offset just after the opening tag
+    # inner_end: offset of '<' of the closing tag
+    # end: offset just after the closing tag (or the comment)
+    start: int
+    inner_start: int
+    inner_end: int
+    end: int
+
+
+def _tag_end(content: str, pos: int) -> int:
+    """Return the offset just after the '>' closing the tag that starts before pos.
+
+    JSX attributes can hold arbitrary expressions, so '>' only ends the tag
+    when it is outside braces and quotes.
+    """
+    depth = 0
+    quote = None
+    n = len(content)
+    while pos < n:
+        ch = content[pos]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'`':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+        elif ch == '>' and depth == 0:
+            return pos + 1
+        pos += 1
+    raise AnchorError(f"Unterminated tag at line {_line_of(content, pos)}")
+
+
+def _line_of(content: str, offset: int) -> int:
+    return content.count('\n', 0, offset) + 1
+
+
+class AnchorIndex:
+    def __init__(self, comments: Dict[str, List[Span]], elements: Dict[str, List[Span]]):
+        self.comments = comments
+        self.elements = elements
+        self._starts = {tag: [s.start for s in spans] for tag, spans in elements.items()}
+
+    # ── construction ──
+
+    @classmethod
+    def scan(cls, content: str) -> 'AnchorIndex':
+        comments: Dict[str, List[Span]] = {}
+        elements: Dict[str, List[Span]] = {tag: [] for tag in ELEMENTS}
+        stack: List[Tuple[str, int, int]] = []
+
+        pos = 0
+        while True:
+            m = TOKEN_RE.search(content, pos)
+            if not m:
+                break
+
+            text = m.group('jsx') if m.group('jsx') is not None else m.group('html')
+            if text is not None:
+                comments.setdefault(text, []).append(Span(m.start(), m.end(), m.end(), m.end()))
+                pos = m.end()
+                continue
+
+            tag = m.group('tag')
+            if m.group('close'):
+                if not stack or stack[-1][0] != tag:
+                    raise AnchorError(f"Unbalanced </{tag}> at line {_line_of(content, m.start())}")
+                _, start, inner_start = stack.pop()
+                end = _tag_end(content, m.end())
+                elements[tag].append(Span(start, inner_start, m.start(), end))
+                pos = end
+                continue
+
+            inner_start = _tag_end(content, m.end())
+            if tag == 'style':
+                # Style bodies are CSS inside a template literal: skip straight
+                # to the closing tag so selectors are never mistaken for anchors
+                close = STYLE_CLOSE_RE.search(content, inner_start)
+                if not close:
+                    raise AnchorError(f"Unclosed <style> at line {_line_of(content, m.start())}")
+                elements['style'].append(Span(m.start(), inner_start, close.start(), close.end()))
+                pos = close.end()
+                continue
+
+            stack.append((tag, m.start(), inner_start))
+            pos = inner_start
+
+        if stack:
+            tag, start, _ = stack[-1]
+            raise AnchorError(f"Unclosed <{tag}> at line {_line_of(content, start)}")
+
+        for spans in elements.values():
+            spans.sort()
+        return cls(comments, elements)
+
+    def to_json(self) -> dict:
+        return {
+            'version': INDEX_VERSION,
+            'comments': {k: [list(s) for s in v] for k, v in self.comments.items()},
+            'elements': {k: [list(s) for s in v] for k, v in self.elements.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'AnchorIndex':
+        return cls(
+            {k: [Span(*s) for s in v] for k, v in data['comments'].items()},
+            {k: [Span(*s) for s in v] for k, v in data['elements'].items()},
+        )
+
+    # ── lookups ──
+
+    def has_comment(self, name: str) -> bool:
+        return name in self.comments
+
+    def comment(self, name: str) -> Span:
+        spans = self.comments.get(name)
+        if not spans:
+            raise AnchorError(f"Missing section marker {{/* {name} */}}")
+        return spans[0]
+
+    def first(self, tag: str) -> Span:
+        spans = self.elements[tag]
+        if not spans:
+            raise AnchorError(f"Missing <{tag}> element")
+        return spans[0]
+
+    def after(self, tag: str, offset: int) -> Span:
+        """First <tag> element that opens at or after offset."""
+        spans = self.elements[tag]
+        i = bisect.bisect_left(self._starts[tag], offset)
+        if i == len(spans):
+            raise AnchorError(f"Missing <{tag}> after offset {offset}")
+        return spans[i]
+
+    def child(self, tag: str, outer: Span) -> Span:
+        """First <tag> element nested inside outer."""
+        spans = self.within(tag, outer)
+        if not spans:
+            raise AnchorError(f"Missing <{tag}> inside element at offset {outer.start}")
+        return spans[0]
+
+    def within(self, tag: str, outer: Span) -> List[Span]:
+        """All <tag> elements nested inside outer, in document order."""
+        spans = self.elements[tag]
+        lo = bisect.bisect_left(self._starts[tag], outer.inner_start)
+        hi = bisect.bisect_left(self._starts[tag], outer.inner_end)
+        return spans[lo:hi]
+
+
+_memory_cache: Dict[str, AnchorIndex] = {}
+
+
+def _prune_cache():
+    entries = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)]
+    if len(entries) <= MAX_CACHE_FILES:
+        return
+    entries.sort(key=os.path.getmtime)
+    for path in entries[:-MAX_CACHE_FILES]:
+        os.remove(path)
+
+
+def index_for(content: str) -> AnchorIndex:
+    """Return the anchor index for content, tokenizing only on a cache miss."""
+    key = content_hash(content)
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(CACHE_DIR, f'{key}.json')
+    index = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION:
+            index = AnchorIndex.from_json(data)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if index is None:
+        index = AnchorIndex.scan(content)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(index.to_json(), f)
+            _prune_cache()
+        except OSError:
+            # A read-only checkout still works, it just re-scans next time
+            pass
+
+    _memory_cache[key] = index
+    return index
+
+
+def line_start(content: str, offset: int) -> int:
+    """Move offset back over the indentation in front of it."""
+    while offset > 0 and content[offset - 1] in ' \t':
+        offset -= 1
+    return offset
+
+
+def splice(content: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Apply (start, end, replacement) edits in one pass.
+
+    Offsets refer to the original content; edits must not overlap.
+    """
+    pieces = []
+    pos = 0
+    for start, end, text in sorted(edits, key=lambda e: e[0]):
+        if start < pos:
+            raise AnchorError(f"Overlapping edits at offset {start}")
+        pieces.append(content[pos:start])
+        pieces.append(text)
+        pos = end
+    pieces.append(content[pos:])
+    return ''.join(pieces)
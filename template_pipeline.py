@@ -0,0 +1,167 @@
+import datetime
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional
+
+
+class StageError(Exception):
+    """Raised when a stage cannot find the code it is meant to rewrite."""
+
+
+class Stage(NamedTuple):
+    # name: shown in the pipeline report
+    # is_applied: returns True when the content already carries this stage's output
+    # apply: returns the rewritten content
+    name: str
+    is_applied: Callable[[str], bool]
+    apply: Callable[[str], str]
+
+
+class PipelineResult(NamedTuple):
+    filepath: str
+    applied: List[str]
+    skipped: List[str]
+    changed: bool
+    written: bool
+
+
+class SpanLog:
+    """Per-stage timings of one run, logged as one JSON line.
+
+    The line has the shape app/lib/metrics.ts logs for traced requests, so
+    template builds and report renders share one dashboard:
+
+      {"ts": "...", "event": "timings", "name": "build_report_template",
+       "status": "ok", "duration_ms": 41.2, "spans": [{"name": "stage.fix_sch", "ms": 3.1}, ...]}
+
+    Lines are appended to the file named by HPC_TIMINGS_LOG, or written to
+    stderr when it is unset.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans = []
+        self.status = 'ok'
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append({'name': name, 'ms': round((time.perf_counter() - start) * 1000, 2)})
+
+    def line(self) -> str:
+        return json.dumps({
+            'ts': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'event': 'timings',
+            'name': self.name,
+            'status': self.status,
+            'duration_ms': round((time.perf_counter() - self.start) * 1000, 2),
+            'spans': self.spans,
+        })
+
+    def emit(self):
+        write_timings(self.line())
+
+
+def write_timings(line: str):
+    path = os.environ.get('HPC_TIMINGS_LOG')
+    if path:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    else:
+        print(line, file=sys.stderr)
+
+
+@contextmanager
+def _maybe_span(spans: Optional[SpanLog], name: str):
+    if spans is None:
+        yield
+    else:
+        with spans.span(name):
+            yield
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def run_stages(content: str, stages: List[Stage], spans: Optional[SpanLog] = None):
+    """Run the stages in order over in-memory content.
+
+    Returns (new_content, applied_names, skipped_names). With `spans`, each
+    stage is timed as "stage.<name>" (the is_applied check included).
+    """
+    applied = []
+    skipped = []
+    for stage in stages:
+        with _maybe_span(spans, f'stage.{stage.name}'):
+            if stage.is_applied(content):
+                skipped.append(stage.name)
+                continue
+            content = stage.apply(content)
+            applied.append(stage.name)
+    return content, applied, skipped
+
+
+def run_pipeline(filepath: str, stages: List[Stage], write: bool = True,
+                 spans: Optional[SpanLog] = None) -> PipelineResult:
+    """Load the file once, run every pending stage and write back only on change."""
+    with _maybe_span(spans, 'read'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            original = f.read()
+
+    content, applied, skipped = run_stages(original, stages, spans)
+
+    changed = content_hash(content) != content_hash(original)
+    with _maybe_span(spans, 'write'):
+        written = write and write_if_changed(filepath, original, content)
+
+    return PipelineResult(filepath, applied, skipped, changed, written)
+
+
+def write_if_changed(filepath: str, original: str, content: str) -> bool:
+    # Compare hashes rather than timestamps so a no-op run never touches the file
+    if content_hash(content) == content_hash(original):
+        return False
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def print_result(result: PipelineResult):
+    for name in result.applied:
+        print(f"  applied  {name}")
+    for name in result.skipped:
+        print(f"  skipped  {name} (already applied)")
+
+    if result.written:
+        print(f"Updated {result.filepath}")
+    elif result.changed:
+        print(f"{result.filepath} is out of date")
+    else:
+        print(f"{result.filepath} is up to date")
+
+
+def main_for(filepath: str, stages: List[Stage]):
+    """Shared command-line entry point: pass --check to verify without writing."""
+    check = '--check' in sys.argv[1:]
+    spans = SpanLog(os.path.splitext(os.path.basename(sys.argv[0]))[0])
+    try:
+        result = run_pipeline(filepath, stages, write=not check, spans=spans)
+    except StageError as e:
+        print(f"Stage failed: {e}")
+        spans.status = 'error'
+        spans.emit()
+        sys.exit(1)
+    spans.emit()
+
+    print_result(result)
+    if check and result.changed:
+        sys.exit(1)
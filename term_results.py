@@ -0,0 +1,111 @@
+from template_anchors import AnchorError, index_for, splice
+from template_pipeline import Stage, main_for
+
+FILEPATH = 'app/components/reports/ReportTemplate_III_VIII.tsx'
+
+TERM_TOTAL_START = '    // Sum of the four components for one term, computed once per subject row\n'
+TERM_TOTAL_END = '        return { total, hasMarks };\n    };\n'
+
+# getTermTotal as left by index_scores.py, now keyed by the subject row so it
+# can read the per-subject totals stored in student_term_results
+STORED_TERM_TOTAL = """    // Term totals, grand total and percentage are precomputed in
+    // student_term_results; without a stored row (table not migrated yet)
+    // the four components are summed here
+    const termResults = reportData.term_results;
+    const SCHOLASTIC_COMPONENTS = ['Periodic Assessment', 'Subject Enrichment Activities', 'Internal Assessment', 'Terminal Assessment'];
+    const getTermTotal = (sub: any, term: string) => {
+        const key = term === 'Term I' ? 'term1' : 'term2';
+        if (termResults) {
+            const stored = termResults.subject_totals?.[sub.id];
+            return { total: stored?.[key] ?? 0, hasMarks: !!stored?.[`has_${key}`] };
+        }
+        let total = 0;
+        SCHOLASTIC_COMPONENTS.forEach(comp => {
+            const s = getScholasticScore(sub.subject_name, comp, term);
+            const num = s?.marks ? parseFloat(s.marks) : 0;
+            if (!isNaN(num)) total += num;
+        });
+        const hasMarks = !!(getScholasticScore(sub.subject_name, 'Periodic Assessment', term) ||
+            getScholasticScore(sub.subject_name, 'Terminal Assessment', term));
+        return { total, hasMarks };
+    };
+"""
+
+SUMMARY_START = '                                        const max1 = subjectCount1 * 100;\n'
+SUMMARY_END = '                                        return (\n'
+
+STORED_SUMMARY = """                                        if (termResults) {
+                                            grandTotal1 = termResults.term1_total;
+                                            grandTotal2 = termResults.term2_total;
+                                            grandTotalAvg = termResults.grand_total;
+                                            subjectCount1 = termResults.term1_subjects;
+                                            subjectCount2 = termResults.term2_subjects;
+                                        }
+
+                                        const max1 = subjectCount1 * 100;
+                                        const max2 = subjectCount2 * 100;
+                                        const maxAvg = termResults ? termResults.max_marks : Math.max(subjectCount1, subjectCount2) * 100;
+
+                                        const p1 = max1 > 0 ? ((grandTotal1 / max1) * 100).toFixed(2) : '';
+                                        const p2 = max2 > 0 ? ((grandTotal2 / max2) * 100).toFixed(2) : '';
+                                        const pAvg = termResults
+                                            ? (termResults.percentage != null ? termResults.percentage.toFixed(2) : '')
+                                            : (maxAvg > 0 ? ((grandTotalAvg / maxAvg) * 100).toFixed(2) : '');
+
+"""
+
+INTERFACE_END = '    subjects?: any[];\n}\n'
+INTERFACE_FIELD = '    subjects?: any[];\n    // Row of student_term_results (see app/lib/term-results.ts), or null\n    term_results?: any;\n}\n'
+
+ROW_CALLS = [
+    ("getTermTotal(subject, 'Term I')", "getTermTotal(sub, 'Term I')"),
+    ("getTermTotal(subject, 'Term II')", "getTermTotal(sub, 'Term II')"),
+]
+
+
+def is_applied(content):
+    return 'const termResults = reportData.term_results' in content
+
+
+def apply(content):
+    index = index_for(content)
+    table = index.after('table', index.comment('SCHOLASTIC DOMAINS').start)
+    tbody = index.child('tbody', table)
+
+    helper_start = content.find(TERM_TOTAL_START)
+    helper_end = content.find(TERM_TOTAL_END, helper_start) if helper_start != -1 else -1
+    if helper_end == -1:
+        raise AnchorError("Missing getTermTotal helper (run index_scores.py first)")
+    helper_end += len(TERM_TOTAL_END)
+
+    summary_start = content.find(SUMMARY_START, tbody.inner_start, tbody.inner_end)
+    summary_end = content.find(SUMMARY_END, summary_start, tbody.inner_end) if summary_start != -1 else -1
+    if summary_end == -1:
+        raise AnchorError("Scholastic <tbody> has no grand total block (run fix_sch.py first)")
+
+    interface_end = content.find(INTERFACE_END)
+    if interface_end == -1 or interface_end > helper_start:
+        raise AnchorError("Missing ReportData interface")
+
+    edits = [
+        (interface_end, interface_end + len(INTERFACE_END), INTERFACE_FIELD),
+        (helper_start, helper_end, STORED_TERM_TOTAL),
+        (summary_start, summary_end, STORED_SUMMARY),
+    ]
+    for old, new in ROW_CALLS:
+        at = content.find(old, tbody.inner_start, summary_start)
+        if at == -1:
+            raise AnchorError(f"Scholastic <tbody> has no {old} call")
+        edits.append((at, at + len(old), new))
+
+    return splice(content, sorted(edits))
+
+
+STAGE = Stage('term_results', is_applied, apply)
+
+
+def main():
+    main_for(FILEPATH, [STAGE])
+
+if __name__ == '__main__':
+    main()